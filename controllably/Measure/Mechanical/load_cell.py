@@ -21,7 +21,6 @@ from typing import NamedTuple, Iterable
 import pandas as pd
 
 # Local application imports
-from ...core import datalogger
 from ..measure import Measurer
 
 G = 9.81
@@ -163,9 +162,9 @@ class LoadCell(Measurer):
         return super().getData(*args, **kwargs)
     
     def getDataframe(self, data_store: Iterable[NamedTuple, datetime]) -> pd.DataFrame:
-        df = datalogger.get_dataframe(data_store=data_store, fields=self.device.data_type._fields)
-        df['corrected_value'] = df['value'].apply(self._correct_value)
-        df['force'] = df['corrected_value'].apply(self._calculate_force)
+        df = super().getDataframe(data_store=data_store)
+        df['corrected_value'] = self._correct_value(df['value'].to_numpy(dtype=float))
+        df['force'] = self._calculate_force(df['corrected_value'].to_numpy())
         return df
     
     def atForce(self, 
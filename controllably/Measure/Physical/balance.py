@@ -20,7 +20,6 @@ from typing import NamedTuple, Iterable
 import pandas as pd
 
 # Local application 
-from ...core import datalogger
 from ..Mechanical.load_cell import LoadCell
 
 G = 9.81
@@ -116,10 +115,8 @@ class Balance(LoadCell):
         return
     
     def getDataframe(self, data_store: Iterable[NamedTuple, datetime]) -> pd.DataFrame:
-        df = datalogger.get_dataframe(data_store=data_store, fields=self.device.data_type._fields)
-        df['corrected_value'] = df['value'].apply(self._correct_value)
-        df['force'] = df['corrected_value'].apply(self._calculate_force)
-        df['mass'] = df['corrected_value'].apply(self._calculate_mass)
+        df = super().getDataframe(data_store=data_store)
+        df['mass'] = self._calculate_mass(df['corrected_value'].to_numpy())
         return df
     
     def atMass(self, mass: float) -> float:
@@ -44,9 +44,9 @@ class Measurer:
         `verbose` (bool, optional): verbosity of class. Defaults to False.
     
     ### Attributes and properties:
-        `buffer` (deque): data buffer for the device
+        `buffer` (deque|ColumnStore): data buffer for the device
         `buffer_df` (pd.DataFrame): data buffer as a DataFrame
-        `records` (deque): records for the device
+        `records` (deque|ColumnStore): records for the device
         `records_df` (pd.DataFrame): records as a DataFrame
         `record_event` (threading.Event): event for recording data
         `program` (Program): program to run
@@ -85,6 +85,8 @@ class Measurer:
         self.buffer: deque[tuple[NamedTuple, datetime]] = deque(maxlen=MAX_LEN)
         self.records: deque[tuple[NamedTuple, datetime]] = deque()
         self.record_event = threading.Event()
+        self._dataframe_caches: dict[str, datalogger.DataFrameCache] = dict()
+        self._record_writer: datalogger.RecordWriter|None = None
         
         # Measurer specific attributes
         self.program: Program|Any|None = None
@@ -264,7 +266,16 @@ class Measurer:
         Returns:
             pd.DataFrame: dataframe of data collected
         """
-        return datalogger.get_dataframe(data_store=data_store, fields=self.device.data_type._fields)
+        fields = self.device.data_type._fields
+        for name in ('buffer', 'records'):
+            if data_store is not getattr(self, name, None):
+                continue
+            cache = self._dataframe_caches.get(name)
+            if cache is None or cache.fields != tuple(fields):
+                cache = datalogger.DataFrameCache(fields)
+                self._dataframe_caches[name] = cache
+            return cache.update(data_store)
+        return datalogger.get_dataframe(data_store=data_store, fields=fields)
     
     def saveData(self, filepath:str|Path):
         """
@@ -278,7 +289,15 @@ class Measurer:
         self.records_df.to_csv(filepath)
         return
     
-    def record(self, on: bool, show: bool = False, clear_cache: bool = False, *, callback: Callable|None = None, **kwargs):
+    def record(self, 
+        on: bool, 
+        show: bool = False, 
+        clear_cache: bool = False, 
+        *, 
+        callback: Callable|None = None, 
+        save_to: str|Path|None = None,
+        **kwargs
+    ):
         """
         Record data from the device
         
@@ -287,11 +306,22 @@ class Measurer:
             show (bool, optional): whether to show data. Defaults to False.
             clear_cache (bool, optional): whether to clear the cache. Defaults to False.
             callback (Callable, optional): callback function to process data. Defaults to None.
+            save_to (str|Path|None, optional): directory to persist the records to while recording. Defaults to None.
+            **kwargs: keyword arguments for `datalogger.RecordWriter` when `save_to` is given, or for `datalogger.record`
         """
+        writer_keys = ('file_format', 'flush_every', 'flush_interval', 'fsync', 'trim')
+        writer_kwargs = {key: kwargs.pop(key) for key in writer_keys if key in kwargs}
+        if on and save_to is not None:
+            self._record_writer = datalogger.RecordWriter(
+                self.records, save_to, self.device.data_type._fields, **writer_kwargs
+            )
+        writer = kwargs.pop('writer', self._record_writer)
+        if not on:
+            self._record_writer = None
         self.device.clearDeviceBuffer()
         return datalogger.record(
             on=on, show=show, clear_cache=clear_cache, data_store=self.records, 
-            device=self.device, callback=callback, event=self.record_event, **kwargs
+            device=self.device, callback=callback, event=self.record_event, writer=writer, **kwargs
         )
     
     def stream(self, on: bool, show: bool = False, *, callback: Callable|None = None, **kwargs):
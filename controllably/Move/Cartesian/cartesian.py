@@ -84,6 +84,7 @@ class Gantry(GCode):
         `halt`: halt robot movement
         `home`: make the robot go home
         `isFeasible`: checks and returns whether the target coordinates is feasible
+        `isPathFeasible`: checks and returns whether the path through the waypoints avoids the deck exclusion zones
         `loadDeck`: load `Deck` layout object to mover
         `loadDeckFromDict`: load `Deck` layout object from dictionary
         `loadDeckFromFile`: load `Deck` layout object from file
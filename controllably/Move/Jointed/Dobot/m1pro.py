@@ -125,6 +125,7 @@ class M1Pro(Dobot):
         `halt`: halt robot movement
         `home`: make the robot go home
         `isFeasible`: checks and returns whether the target coordinates is feasible and sets the handedness of the robot if necessary
+        `isPathFeasible`: checks and returns whether the path through the waypoints avoids the deck exclusion zones
         `loadDeck`: load `Deck` layout object to mover
         `loadDeckFromDict`: load `Deck` layout object from dictionary
         `loadDeckFromFile`: load `Deck` layout object from file
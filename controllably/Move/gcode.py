@@ -133,6 +133,7 @@ class GCode(Mover):
         `halt`: halt robot movement
         `home`: make the robot go home
         `isFeasible`: checks and returns whether the target coordinates is feasible
+        `isPathFeasible`: checks and returns whether the path through the waypoints avoids the deck exclusion zones
         `loadDeck`: load `Deck` layout object to mover
         `loadDeckFromDict`: load `Deck` layout object from dictionary
         `loadDeckFromFile`: load `Deck` layout object from file
@@ -459,3 +460,21 @@ class GCode(Mover):
         self.setSpeedFactor(1.0)
         self.settings = self.device.getSettings()
         return
+    
+    def _get_move_path(self, start: np.ndarray, end: np.ndarray) -> np.ndarray:
+        """
+        Get the waypoints travelled through when moving from start to end, in robot coordinates.
+        Moves up along Z before moving in XY, and moves in XY before moving down along Z, as in `moveTo`.
+        
+        Args:
+            start (np.ndarray): start coordinates
+            end (np.ndarray): end coordinates
+            
+        Returns:
+            np.ndarray: array of shape (3,3) of waypoint coordinates
+        """
+        if start[2] < end[2]:
+            corner = (*start[:2], end[2])
+        else:
+            corner = (*end[:2], start[2])
+        return np.array([start, corner, end], dtype=float)
@@ -24,7 +24,7 @@ from scipy.spatial.transform import Rotation
 # Local application imports
 from ..core import factory
 from ..core.device import Device
-from ..core.position import Deck, Labware, Position, BoundingVolume, get_transform, convert_to_position
+from ..core.position import Deck, Labware, Position, PositionArray, BoundingBox, BoundingVolume, get_transform, convert_to_position
 
 # Configure logging
 from controllably import CustomLevelFilter
@@ -82,6 +82,7 @@ class Mover:
         `halt`: halt robot movement
         `home`: make the robot go home
         `isFeasible`: checks and returns whether the target coordinates is feasible
+        `isPathFeasible`: checks and returns whether the path through the waypoints avoids the deck exclusion zones
         `loadDeck`: load `Deck` layout object to mover
         `loadDeckFromDict`: load `Deck` layout object from dictionary
         `loadDeckFromFile`: load `Deck` layout object from file
@@ -409,6 +410,36 @@ class Mover:
             raise RuntimeError(f"Target position {position} is not feasible")
         return feasible
     
+    def isPathFeasible(self, waypoints: Sequence[Sequence[float]]|np.ndarray, external: bool = True, tool_offset: bool = True) -> bool:
+        """
+        Checks and returns whether the straight segments between consecutive waypoints avoid the deck exclusion zones.
+        Exclusion zones that contain the first waypoint are ignored, so that the robot can move out of them.
+        This check is not run by `moveTo` and `safeMoveTo`, which only check the target position with `isFeasible`.
+        
+        Args:
+            waypoints (Sequence[Sequence[float]]|np.ndarray): array of shape (K,3) of waypoint coordinates
+            external (bool, optional): whether the waypoints are in external coordinates. Defaults to True.
+            tool_offset (bool, optional): whether to consider the tool offset. Defaults to True.
+            
+        Returns:
+            bool: whether the path is feasible
+        """
+        waypoints = np.asarray(waypoints, dtype=float)
+        assert waypoints.ndim == 2 and waypoints.shape[1] == 3 and len(waypoints) >= 2, "Ensure waypoints is an array of at least 2 x,y,z coordinates"
+        if not isinstance(self.deck, Deck):
+            return True
+        if not external:
+            waypoints = self._get_work_coordinates(waypoints, tool_offset=tool_offset)
+        start_zones = set(self.deck.getCollisions(waypoints[0]))
+        collisions = self.deck.getSweptCollisions(waypoints[:-1], waypoints[1:])
+        feasible = True
+        for start, end, collides_with in zip(waypoints[:-1], waypoints[1:], collisions):
+            collides_with = [name for name in collides_with if name not in start_zones]
+            if len(collides_with):
+                self._logger.warning(f"Path from {tuple(start)} to {tuple(end)} collides with {collides_with}")
+                feasible = False
+        return feasible
+    
     def loadDeck(self, deck: Deck):
         """
         Load `Deck` layout object to mover
@@ -789,7 +820,8 @@ class Mover:
         robot: bool = False
     ) -> Position:
         """
-        Safe version of moveTo by moving in to safe height first
+        Safe version of moveTo by moving in to safe height first. If a deck is loaded, the robot instead travels at
+        the lowest height below safe height where the path stays clear of the deck exclusion zones.
         
         Args:
             to (Sequence[float] | Position | np.ndarray): target position
@@ -821,9 +853,14 @@ class Mover:
         speed_factor_up = self.speed_factor if speed_factor_up is None else speed_factor_up
         speed_factor_down = self.speed_factor if speed_factor_down is None else speed_factor_down
         
-        # Move up to safe height
-        if self.robot_position.z < self.safe_height:
+        # Move up to the lowest height clear of the deck, or to safe height
+        target_robot_coordinates = move_to.coordinates if robot else self._get_robot_coordinates(move_to.coordinates.reshape(1,3))[0]
+        travel_height = self._get_travel_height(self.robot_position.coordinates, target_robot_coordinates)
+        if travel_height >= self.safe_height:
             self.moveToSafeHeight(speed_factor=speed_factor_up)
+        elif self.robot_position.z < travel_height:
+            travel_position = self.robot_position.translate([0,0,travel_height - self.robot_position.z], inplace=False)
+            self.moveTo(travel_position, speed_factor_up, robot=True)
         
         # Move laterally to safe height above target position
         if self._has_rotation and rotation and rotation_before_lateral:
@@ -992,6 +1029,112 @@ class Mover:
         """
         raise NotImplementedError
     
+    def _get_move_path(self, start: np.ndarray, end: np.ndarray) -> np.ndarray:
+        """
+        Get the waypoints travelled through when moving from start to end, in robot coordinates
+        
+        Args:
+            start (np.ndarray): start coordinates
+            end (np.ndarray): end coordinates
+            
+        Returns:
+            np.ndarray: array of shape (K,3) of waypoint coordinates
+        """
+        return np.array([start, end], dtype=float)
+    
+    def _get_travel_height(self, start: np.ndarray, end: np.ndarray, clearance: float = 1.0) -> float:
+        """
+        Get the lowest height, up to the safe height, at which the robot can travel laterally from start to end
+        without passing through the deck exclusion zones, in robot coordinates.
+        Exclusion zones that contain the start or end are only ignored on the vertical legs out of and into them.
+        
+        Args:
+            start (np.ndarray): start coordinates
+            end (np.ndarray): end coordinates
+            clearance (float, optional): clearance above the top of exclusion zones. Defaults to 1.0.
+            
+        Returns:
+            float: travel height
+        """
+        default_height = max(start[2], self.safe_height)
+        lowest_height = max(start[2], end[2])
+        if not isinstance(self.deck, Deck) or lowest_height >= default_height:
+            return default_height
+        
+        tops = [max(zone.bounds[:,2]) for zone in self.deck.exclusion_zone.values() if isinstance(zone, BoundingBox)]
+        tops = self._get_robot_coordinates(np.array([(0,0,top) for top in tops]).reshape(-1,3))[:,2] + clearance
+        heights = np.unique([lowest_height, *tops[(tops > lowest_height) & (tops < default_height)]])
+        paths = [self._get_safe_move_path(start, end, height) for height in heights]
+        segments = np.concatenate([np.stack([leg[:-1], leg[1:]], axis=1) for path in paths for leg in path])
+        segments = self._get_work_coordinates(segments.reshape(-1,3)).reshape(-1,2,3)
+        
+        work_start, work_end = self._get_work_coordinates(np.array([start, end], dtype=float))
+        start_zones = set(self.deck.getCollisions(work_start))
+        end_zones = set(self.deck.getCollisions(work_end))
+        lateral_zones = (start_zones | end_zones) if np.allclose(start[:2], end[:2]) else set()
+        collisions = iter(self.deck.getSweptCollisions(segments[:,0], segments[:,1]))
+        for height, path in zip(heights, paths):
+            clear = True
+            for leg, ignored_zones in zip(path, (start_zones, lateral_zones, end_zones)):
+                leg_collisions = [next(collisions) for _ in range(len(leg)-1)]
+                clear = clear and all(set(collides_with) <= ignored_zones for collides_with in leg_collisions)
+            if clear:
+                return float(height)
+        return default_height
+    
+    def _get_safe_move_path(self, start: np.ndarray, end: np.ndarray, height: float) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Get the waypoints travelled through by `safeMoveTo` when travelling laterally at a given height, in robot coordinates
+        
+        Args:
+            start (np.ndarray): start coordinates
+            end (np.ndarray): end coordinates
+            height (float): travel height
+            
+        Returns:
+            tuple[np.ndarray, np.ndarray, np.ndarray]: arrays of shape (K,3) of waypoint coordinates for the legs up, across and down
+        """
+        above_start = np.array([*start[:2], max(start[2], height)])
+        above_end = np.array([*end[:2], above_start[2]])
+        return (
+            self._get_move_path(start, above_start),
+            self._get_move_path(above_start, above_end),
+            self._get_move_path(above_end, end)
+        )
+    
+    def _get_robot_coordinates(self, coordinates: np.ndarray, tool_offset: bool = True) -> np.ndarray:
+        """
+        Transform an array of work coordinates to robot coordinates
+        
+        Args:
+            coordinates (np.ndarray): array of shape (K,3) of work coordinates
+            tool_offset (bool, optional): whether to consider the tool offset. Defaults to True.
+            
+        Returns:
+            np.ndarray: array of shape (K,3) of robot coordinates
+        """
+        positions = self.transformWorkToRobot(PositionArray(coordinates), self.calibrated_offset, self.scale)
+        if tool_offset:
+            positions = self.transformToolToRobot(positions, self.tool_offset)
+        return positions.coordinates
+    
+    def _get_work_coordinates(self, coordinates: np.ndarray, tool_offset: bool = True) -> np.ndarray:
+        """
+        Transform an array of robot coordinates to work coordinates
+        
+        Args:
+            coordinates (np.ndarray): array of shape (K,3) of robot coordinates
+            tool_offset (bool, optional): whether to consider the tool offset. Defaults to True.
+            
+        Returns:
+            np.ndarray: array of shape (K,3) of work coordinates
+        """
+        positions = PositionArray(coordinates)
+        if tool_offset:
+            positions = self.transformRobotToTool(positions, self.tool_offset)
+        positions = self.transformRobotToWork(positions, self.calibrated_offset, self.scale)
+        return positions.coordinates
+    
     def _get_move_wait_time(self, 
         distances: np.ndarray, 
         speeds: np.ndarray, 
@@ -1033,20 +1176,20 @@ class Mover:
     
     @staticmethod
     def transformRobotToWork(
-        internal_position: Position,
+        internal_position: Position|PositionArray,
         offset: Position,
         scale: float = 1.0
-    ) -> Position:
+    ) -> Position|PositionArray:
         """
         Transform robot coordinates to work coordinates
         
         Args:
-            internal_position (Position): robot position
+            internal_position (Position|PositionArray): robot position(s)
             offset (Position): calibrated offset
             scale (float, optional): scale factor. Defaults to 1.0.
             
         Returns:
-            Position: work position
+            Position|PositionArray: work position(s), of the same type as the input
         """
         translate = offset.coordinates
         rotate = offset.Rotation
@@ -1054,24 +1197,24 @@ class Mover:
         # Translate-Rotate-Scale
         coordinates = scale*rotate.apply(translate+internal_position.coordinates)
         rotation = rotate * internal_position.Rotation
-        return Position(coordinates, rotation)
+        return type(internal_position)(coordinates, rotation)
     
     @staticmethod
     def transformWorkToRobot(
-        external_position: Position,
+        external_position: Position|PositionArray,
         offset: Position,
         scale: float = 1.0
-    ) -> Position:
+    ) -> Position|PositionArray:
         """
         Transform work coordinates to robot coordinates
         
         Args:
-            external_position (Position): work position
+            external_position (Position|PositionArray): work position(s)
             offset (Position): calibrated offset
             scale (float, optional): scale factor. Defaults to 1.0.
             
         Returns:
-            Position: robot position
+            Position|PositionArray: robot position(s), of the same type as the input
         """
         inv_scale = 1 / scale
         inv_offset = offset.invert()
@@ -1080,45 +1223,45 @@ class Mover:
         # Invert: Scale-Rotate-Translate
         coordinates = inv_translate+inv_rotate.apply(inv_scale*external_position.coordinates)
         rotation = inv_rotate * external_position.Rotation
-        return Position(coordinates, rotation)
+        return type(external_position)(coordinates, rotation)
     
     @staticmethod
     def transformRobotToTool(
-        internal_position: Position,
+        internal_position: Position|PositionArray,
         offset: Position
-    ) -> Position:
+    ) -> Position|PositionArray:
         """
         Transform robot coordinates to tool coordinates
         
         Args:
-            internal_position (Position): robot position
+            internal_position (Position|PositionArray): robot position(s)
             offset (Position): tool offset
             
         Returns:
-            Position: tool position
+            Position|PositionArray: tool position(s), of the same type as the input
         """
         coordinates = internal_position.coordinates + offset.coordinates
         rotation = internal_position.rotation + offset.rotation
-        return Position(coordinates, Rotation.from_euler('zyx', rotation, degrees=True))
+        return type(internal_position)(coordinates, Rotation.from_euler('zyx', rotation, degrees=True))
     
     @staticmethod
     def transformToolToRobot(
-        external_position: Position,
+        external_position: Position|PositionArray,
         offset: Position
-    ) -> Position:
+    ) -> Position|PositionArray:
         """
         Transform tool coordinates to robot coordinates
         
         Args:
-            external_position (Position): tool position
+            external_position (Position|PositionArray): tool position(s)
             offset (Position): tool offset
             
         Returns:
-            Position: robot position
+            Position|PositionArray: robot position(s), of the same type as the input
         """
         coordinates = external_position.coordinates - offset.coordinates
         rotation = external_position.rotation - offset.rotation
-        return Position(coordinates, Rotation.from_euler('zyx', rotation, degrees=True))
+        return type(external_position)(coordinates, Rotation.from_euler('zyx', rotation, degrees=True))
     
     @staticmethod
     def _calculate_travel_time(
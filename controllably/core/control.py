@@ -7,7 +7,12 @@ Attributes:
     
 ## Classes:
     `ClassMethods`: class to store methods of a class.
+    `FlowControl`: class to store flow control settings for relaying packets.
     `TwoTierQueue`: a queue that can handle two types of items: normal and high-priority.
+    `SendQueue`: a queue that sends packets to a single destination in the background.
+    `ExecutionLane`: a serial lane of commands for a single object.
+    `LaneBarrier`: a command that spans several lanes.
+    `DataBuffer`: a buffer of replies keyed by request ID, bounded in age and size.
     `Proxy`: a proxy class to handle remote method calls.
     `Controller`: a class to control the flow of data and commands between models and views.
 
@@ -16,13 +21,18 @@ Attributes:
 # Standard library imports
 from __future__ import annotations
 import builtins
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
 from dataclasses import dataclass
+import heapq
 import inspect
 import logging
+import pickle
 import queue
 import threading
 import time
-from typing import Callable, Mapping, Any, Iterable, Type
+from typing import Callable, Mapping, Any, Iterable, Iterator, Type
 import uuid
 
 # Local application imports
@@ -48,13 +58,34 @@ class ClassMethods:
     methods: dict[str, dict[str, str]]
 
 
+@dataclass
+class FlowControl:
+    """ 
+    Class to store flow control settings for relaying packets through per-destination send queues.
+    
+    ### Attributes:
+        `max_pending` (int): maximum number of queued packets per destination, 0 for unbounded.
+        `credits` (int|None): maximum number of unanswered requests per destination, None for unlimited.
+        `credit_timeout` (float|None): time after which the credit of an unanswered request is returned, None to wait for the reply.
+        `block` (bool): flag to wait for space in a full queue (back-pressure) instead of dropping the packet.
+        `timeout` (float|None): time to wait for space in a full queue, None to wait indefinitely.
+    """
+    max_pending: int = 0
+    credits: int|None = None
+    credit_timeout: float|None = 60
+    block: bool = True
+    timeout: float|None = None
+
+
 class TwoTierQueue:
     """
     A queue that can handle two types of items: normal and high-priority.
+    Items are kept in a single binary heap keyed by (tier, rank, sequence), so high-priority items
+    are returned first in order of rank, and items of the same rank in the order they were put.
     
     ### Attributes:
-        `normal_queue` (queue.Queue): queue for normal items.
-        `high_priority_queue` (queue.PriorityQueue): queue for high-priority items.
+        `normal_queue` (TwoTierQueue.Tier): view of the normal items.
+        `high_priority_queue` (TwoTierQueue.Tier): view of the high-priority items.
         `last_used_queue_normal` (bool): flag to indicate the last used queue.
         `priority_counter` (int): counter for high-priority items.
         
@@ -74,24 +105,60 @@ class TwoTierQueue:
         `reset`: reset the queue
     """
     
+    PRIORITY_TIER = 0
+    NORMAL_TIER = 1
+    
+    class Tier:
+        """ 
+        View of one tier of a `TwoTierQueue`.
+        
+        ### Methods:
+            `qsize`: return the number of items in the tier
+            `empty`: check if the tier is empty
+            `full`: check if the tier is full
+        """
+        def __init__(self, parent: TwoTierQueue, tier: int):
+            self._parent = parent
+            self._tier = tier
+            return
+        
+        def qsize(self) -> int:
+            """Return the number of items in the tier."""
+            return self._parent._tier_sizes[self._tier]
+        
+        def empty(self) -> bool:
+            """Check if the tier is empty."""
+            return self.qsize() == 0
+        
+        def full(self) -> bool:
+            """Check if the tier is full."""
+            return False
+    
     def __init__(self):
-        self.normal_queue = queue.Queue()
-        self.high_priority_queue = queue.PriorityQueue()
+        self._heap: list[tuple[int, int|float, int, Any]] = []
+        self._sequence = 0
+        self._tier_sizes = {self.PRIORITY_TIER: 0, self.NORMAL_TIER: 0}
+        self._unfinished_tasks = 0
+        self._mutex = threading.Lock()
+        self._not_empty = threading.Condition(self._mutex)
+        self._all_tasks_done = threading.Condition(self._mutex)
+        self.normal_queue = TwoTierQueue.Tier(self, self.NORMAL_TIER)
+        self.high_priority_queue = TwoTierQueue.Tier(self, self.PRIORITY_TIER)
         self.last_used_queue_normal = True
         self.priority_counter = 0
         return
 
     def qsize(self):
         """Return the size of the queue."""
-        return self.normal_queue.qsize() + self.high_priority_queue.qsize()
+        return len(self._heap)
     
     def empty(self):
         """Check if the queue is empty."""
-        return self.normal_queue.empty() and self.high_priority_queue.empty()
+        return len(self._heap) == 0
     
     def full(self):
         """Check if the queue is full."""
-        return self.normal_queue.full() or self.high_priority_queue.full()
+        return False
     
     def put(self, item: Any, block: bool = True, timeout: float|None = None, *, priority: bool = False, rank: int|None = None):
         """
@@ -105,8 +172,9 @@ class TwoTierQueue:
             rank (int, optional): rank of the high-priority item. Defaults to None.
         """
         if priority or rank is not None:
-            self.priority_counter += 1
-            rank = self.priority_counter if rank is None else rank
+            with self._mutex:
+                self.priority_counter += 1
+                rank = self.priority_counter if rank is None else rank
             self.put_priority(item, rank, block=block, timeout=timeout)
         else:
             self.put_queue(item, block=block, timeout=timeout)
@@ -134,21 +202,14 @@ class TwoTierQueue:
         Returns:
             Any: item from the queue.
         """
-        item = None
-        start_time = time.perf_counter()
-        while True:
-            if not self.high_priority_queue.empty():
-                _, item = self.high_priority_queue.get(block=False)
-                self.last_used_queue_normal = False
-                break
-            elif not self.normal_queue.empty():
-                item = self.normal_queue.get(block=False)
-                self.last_used_queue_normal = True
-                break
-            if not block:
-                break
-            if timeout is not None and (time.perf_counter()-start_time) >= timeout:
-                break
+        with self._not_empty:
+            if block:
+                self._not_empty.wait_for(lambda: len(self._heap), timeout=timeout)
+            if not len(self._heap):
+                return None
+            tier, _, _, item = heapq.heappop(self._heap)
+            self._tier_sizes[tier] -= 1
+            self.last_used_queue_normal = (tier == self.NORMAL_TIER)
         return item
     
     def get_nowait(self) -> Any:
@@ -162,12 +223,19 @@ class TwoTierQueue:
     
     def task_done(self):
         """Mark a task as done."""
-        return self.normal_queue.task_done() if self.last_used_queue_normal else self.high_priority_queue.task_done()
+        with self._all_tasks_done:
+            unfinished = self._unfinished_tasks - 1
+            if unfinished < 0:
+                raise ValueError('task_done() called too many times')
+            self._unfinished_tasks = unfinished
+            if unfinished == 0:
+                self._all_tasks_done.notify_all()
+        return
     
     def join(self):
         """Wait for all tasks to be done."""
-        self.normal_queue.join()
-        self.high_priority_queue.join()
+        with self._all_tasks_done:
+            self._all_tasks_done.wait_for(lambda: self._unfinished_tasks == 0)
         return
     
     def put_first(self, item: Any):
@@ -177,7 +245,8 @@ class TwoTierQueue:
         Args:
             item (Any): item to put in the queue.
         """
-        self.put_priority(item, rank=0)
+        with self._mutex:
+            self._push(item, self.PRIORITY_TIER, 0, -(self._sequence+1))
         return
     
     def put_priority(self, item: Any, rank: int, block: bool = True, timeout: float|None = None):
@@ -190,8 +259,8 @@ class TwoTierQueue:
             block (bool, optional): flag to block the queue. Defaults to True.
             timeout (float, optional): time to wait for the queue. Defaults to None.
         """
-        self.high_priority_queue.put((rank, item), block=block, timeout=timeout)
-        
+        with self._mutex:
+            self._push(item, self.PRIORITY_TIER, rank, self._sequence+1)
         return
     
     def put_queue(self, item: Any, block: bool = True, timeout: float|None = None):
@@ -203,16 +272,519 @@ class TwoTierQueue:
             block (bool, optional): flag to block the queue. Defaults to True.
             timeout (float, optional): time to wait for the queue. Defaults to None.
         """
-        self.normal_queue.put(item, block=block, timeout=timeout)
+        with self._mutex:
+            self._push(item, self.NORMAL_TIER, 0, self._sequence+1)
         return
 
     def reset(self):
         """Reset the queue."""
-        self.normal_queue = queue.Queue()
-        self.high_priority_queue = queue.PriorityQueue()
-        self.last_used_queue_normal = True
-        self.priority_counter = 0
+        with self._mutex:
+            self._heap = []
+            self._sequence = 0
+            self._tier_sizes = {self.PRIORITY_TIER: 0, self.NORMAL_TIER: 0}
+            self._unfinished_tasks = 0
+            self._all_tasks_done.notify_all()
+            self.last_used_queue_normal = True
+            self.priority_counter = 0
+        return
+    
+    def _push(self, item: Any, tier: int, rank: int|float, sequence: int):
+        """
+        Push an item onto the heap. Must be called with the lock held.
+        
+        Args:
+            item (Any): item to put in the queue.
+            tier (int): tier of the item
+            rank (int|float): rank of the item within the tier
+            sequence (int): sequence number to order items of the same rank
+        """
+        self._sequence += 1
+        heapq.heappush(self._heap, (tier, rank, sequence, item))
+        self._tier_sizes[tier] += 1
+        self._unfinished_tasks += 1
+        self._not_empty.notify()
+        return
+
+
+class SendQueue:
+    """
+    A queue that sends packets to a single destination in the background.
+    
+    ### Constructor:
+        `callback` (Callable): callback to send packets to the destination
+        `max_pending` (int, optional): maximum number of queued packets, 0 for unbounded. Defaults to 0.
+        `credits` (int|None, optional): maximum number of unacknowledged packets, None for unlimited. Defaults to None.
+        `credit_timeout` (float|None, optional): time after which the credit of an unacknowledged packet is returned. Defaults to None.
+        `interval` (float, optional): minimum interval between consecutive packets. Defaults to 0.
+        `block` (bool, optional): flag to wait for space in a full queue instead of dropping the packet. Defaults to True.
+        `timeout` (float|None, optional): time to wait for space in a full queue. Defaults to None.
+        
+    ### Attributes:
+        `callback` (Callable): callback to send packets to the destination
+        `credits` (int|None): maximum number of unacknowledged packets
+        `credit_timeout` (float|None): time after which the credit of an unacknowledged packet is returned
+        `interval` (float): minimum interval between consecutive packets
+        `block` (bool): flag to wait for space in a full queue
+        `timeout` (float|None): time to wait for space in a full queue
+        `sent_count` (int): number of packets sent
+        `dropped_count` (int): number of packets dropped
+        `expired_count` (int): number of credits returned after the credit timeout
+        `in_flight` (int): number of unacknowledged packets
+        `pending` (int): number of queued packets
+        `is_running` (bool): whether the send loop is running
+        
+    ### Methods:
+        `put`: queue a packet to be sent
+        `acknowledge`: acknowledge sent packets, returning their credits
+        `start`: start the send loop
+        `stop`: stop the send loop
+    """
+    
+    def __init__(self, 
+        callback: Callable, 
+        max_pending: int = 0, 
+        credits: int|None = None, 
+        *, 
+        credit_timeout: float|None = None, 
+        interval: float = 0, 
+        block: bool = True, 
+        timeout: float|None = None
+    ):
+        """
+        Initialize the SendQueue class.
+        
+        Args:
+            callback (Callable): callback to send packets to the destination
+            max_pending (int, optional): maximum number of queued packets, 0 for unbounded. Defaults to 0.
+            credits (int|None, optional): maximum number of unacknowledged packets, None for unlimited. Defaults to None.
+            credit_timeout (float|None, optional): time after which the credit of an unacknowledged packet is returned. Defaults to None.
+            interval (float, optional): minimum interval between consecutive packets. Defaults to 0.
+            block (bool, optional): flag to wait for space in a full queue instead of dropping the packet. Defaults to True.
+            timeout (float|None, optional): time to wait for space in a full queue. Defaults to None.
+        """
+        assert credits is None or credits > 0, "Ensure credits is a positive integer"
+        self.callback = callback
+        self.credits = credits
+        self.credit_timeout = credit_timeout
+        self.interval = interval
+        self.block = block
+        self.timeout = timeout
+        self.sent_count = 0
+        self.dropped_count = 0
+        self.expired_count = 0
+        
+        self._in_flight = 0
+        self._sent_times: deque[float] = deque()
+        self._last_sent = 0.0
+        self._lock = threading.Lock()
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._credit_semaphore = threading.Semaphore(credits) if credits is not None else None
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread|None = None
+        return
+    
+    @property
+    def in_flight(self) -> int:
+        """Number of unacknowledged packets"""
+        return self._in_flight
+    
+    @property
+    def pending(self) -> int:
+        """Number of queued packets"""
+        return self._queue.qsize()
+    
+    @property
+    def is_running(self) -> bool:
+        """Whether the send loop is running"""
+        return self._thread is not None and self._thread.is_alive()
+    
+    def put(self, packet: str|bytes) -> bool:
+        """
+        Queue a packet to be sent
+        
+        Args:
+            packet (str|bytes): the packet to send
+            
+        Returns:
+            bool: whether the packet was queued
+        """
+        if not self.is_running:
+            self.start()
+        try:
+            self._queue.put(packet, block=self.block, timeout=self.timeout)
+        except queue.Full:
+            self.dropped_count += 1
+            logger.warning(f"Send queue full, dropped packet ({self.dropped_count} dropped)")
+            return False
+        return True
+    
+    def acknowledge(self, count: int = 1) -> int:
+        """
+        Acknowledge sent packets, returning their credits
+        
+        Args:
+            count (int, optional): number of packets to acknowledge. Defaults to 1.
+            
+        Returns:
+            int: number of credits returned
+        """
+        if self._credit_semaphore is None:
+            return 0
+        with self._lock:
+            count = min(count, self._in_flight)
+            self._in_flight -= count
+            for _ in range(count):
+                self._sent_times.popleft()
+        for _ in range(count):
+            self._credit_semaphore.release()
+        return count
+    
+    def start(self):
+        """Start the send loop"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._loop_send, daemon=True)
+            self._thread.start()
+        return
+    
+    def stop(self, timeout: float|None = None):
+        """
+        Stop the send loop
+        
+        Args:
+            timeout (float|None, optional): time to wait for the loop to stop. Defaults to None.
+        """
+        self._stop_event.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=timeout)
+        return
+    
+    def _loop_send(self):
+        """Loop to send queued packets"""
+        while not self._stop_event.is_set():
+            try:
+                packet = self._queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            if self._credit_semaphore is not None:
+                while not self._credit_semaphore.acquire(timeout=0.1):
+                    if self._stop_event.is_set():
+                        return
+                    self._expire_credits()
+                with self._lock:
+                    self._in_flight += 1
+                    self._sent_times.append(time.perf_counter())
+            wait_time = self.interval - (time.perf_counter() - self._last_sent)
+            if wait_time > 0:
+                time.sleep(wait_time)
+            try:
+                self.callback(packet)
+            except Exception as e:
+                logger.error(f"Failed to send packet: {e}")
+                self.acknowledge()
+            self._last_sent = time.perf_counter()
+            self.sent_count += 1
+            self._queue.task_done()
+        return
+    
+    def _expire_credits(self):
+        """Return the credits of packets left unacknowledged for longer than the credit timeout"""
+        if self.credit_timeout is None:
+            return
+        expired = 0
+        with self._lock:
+            now = time.perf_counter()
+            while len(self._sent_times) and (now - self._sent_times[0]) >= self.credit_timeout:
+                self._sent_times.popleft()
+                self._in_flight -= 1
+                expired += 1
+            self.expired_count += expired
+        for _ in range(expired):
+            self._credit_semaphore.release()
+        if expired:
+            logger.warning(f"Returned {expired} credit(s) of unacknowledged packets after {self.credit_timeout}s")
+        return
+
+
+class ExecutionLane:
+    """
+    A serial lane of commands for a single object. Commands in a lane are executed in order,
+    while different lanes run in parallel on the thread pool of the controller.
+    
+    ### Constructor:
+        `lane_id` (str): ID of the lane, i.e. the object ID of its commands
+        
+    ### Attributes and properties:
+        `lane_id` (str): ID of the lane
+        `command_queue` (TwoTierQueue): queue of commands waiting in the lane
+        `lock` (threading.Lock): lock for scheduling the lane
+        `is_active` (bool): whether the lane is scheduled on the thread pool
+        `is_held` (bool): whether the lane is held at a barrier until a command spanning several lanes completes
+        `executed_count` (int): number of commands executed
+        `busy_time` (float): time spent executing commands, in seconds
+        `created_time` (float): time the lane was created
+        `depth` (int): number of commands waiting in the lane
+        `utilisation` (float): fraction of time since creation spent executing commands
+        
+    ### Methods:
+        `getMetrics`: get the metrics of the lane
+    """
+    
+    def __init__(self, lane_id: str):
+        """
+        Initialize the ExecutionLane class.
+        
+        Args:
+            lane_id (str): ID of the lane, i.e. the object ID of its commands
+        """
+        self.lane_id = lane_id
+        self.command_queue = TwoTierQueue()
+        self.lock = threading.Lock()
+        self.is_active = False
+        self.is_held = False
+        self.executed_count = 0
+        self.busy_time = 0.0
+        self.created_time = time.perf_counter()
+        return
+    
+    @property
+    def depth(self) -> int:
+        """Number of commands waiting in the lane"""
+        return self.command_queue.qsize()
+    
+    @property
+    def utilisation(self) -> float:
+        """Fraction of time since creation spent executing commands"""
+        duration = time.perf_counter() - self.created_time
+        return min(self.busy_time/duration, 1.0) if duration > 0 else 0.0
+    
+    def getMetrics(self) -> dict[str, Any]:
+        """
+        Get the metrics of the lane
+        
+        Returns:
+            dict[str, Any]: depth, activity, executed count, busy time and utilisation of the lane
+        """
+        return dict(
+            depth = self.depth,
+            active = self.is_active,
+            executed = self.executed_count,
+            busy_time = self.busy_time,
+            utilisation = self.utilisation
+        )
+
+
+class LaneBarrier:
+    """
+    A command that spans several lanes, such as a batch request acting on several objects. The barrier is
+    queued in each of its lanes, and the command runs once every lane has reached it. The lanes that arrive
+    early are held until the command completes, so the command keeps its place in the order of each lane.
+    Barriers are queued in the order they are dispatched, regardless of priority and rank, as lanes that
+    reach two barriers in opposite orders would hold each other forever.
+    
+    ### Constructor:
+        `command` (Mapping[str, Any]): the command to run
+        `lane_ids` (Iterable[str]): IDs of the lanes the command spans
+        
+    ### Attributes:
+        `command` (Mapping[str, Any]): the command to run
+        `lane_ids` (tuple[str]): IDs of the lanes the command spans
+        
+    ### Methods:
+        `arrive`: mark a lane as having reached the barrier
+    """
+    
+    def __init__(self, command: Mapping[str, Any], lane_ids: Iterable[str]):
+        """
+        Initialize the LaneBarrier class.
+        
+        Args:
+            command (Mapping[str, Any]): the command to run
+            lane_ids (Iterable[str]): IDs of the lanes the command spans
+        """
+        self.command = command
+        self.lane_ids = tuple(lane_ids)
+        self._waiting = set(self.lane_ids)
+        self._lock = threading.Lock()
+        return
+    
+    def arrive(self, lane_id: str) -> bool:
+        """
+        Mark a lane as having reached the barrier
+        
+        Args:
+            lane_id (str): ID of the lane
+            
+        Returns:
+            bool: whether this was the last lane to arrive, i.e. the command can run
+        """
+        with self._lock:
+            self._waiting.discard(lane_id)
+            return not len(self._waiting)
+
+
+class DataBuffer(dict):
+    """
+    A buffer of replies keyed by request ID, bounded in age and size. Requests that are never closed,
+    such as fire-and-forget calls, timed out requests and replies from unexpected senders, are evicted
+    once they are older than the time to live, or oldest first once the buffer is full. Pinned keys,
+    such as the registration, are never evicted. Requests held by a waiting thread are not evicted 
+    either, and their age restarts from the end of the wait.
+    
+    ### Constructor:
+        `ttl` (float|None, optional): time to live of a request, in seconds, None for no limit. Defaults to None.
+        `max_size` (int|None, optional): maximum number of requests, None for no limit. Defaults to None.
+        `pinned` (Iterable[str], optional): keys that are never evicted. Defaults to ('registration',).
+        
+    ### Attributes:
+        `ttl` (float|None): time to live of a request, in seconds
+        `max_size` (int|None): maximum number of requests
+        `pinned` (set[str]): keys that are never evicted
+        `expired_count` (int): number of requests evicted after their time to live
+        `overflow_count` (int): number of requests evicted to keep within the maximum size
+        
+    ### Methods:
+        `hold`: hold a request while a thread waits on it, so that it is not evicted
+        `release`: release a held request, restarting its age
+        `evict`: evict expired requests and the oldest requests over the maximum size
+        `outstanding`: get the age, number of unread replies and waiting flag of each request
+        `getMetrics`: get the metrics of the buffer
+    """
+    
+    def __init__(self, ttl: float|None = None, max_size: int|None = None, pinned: Iterable[str] = ('registration',)):
+        """
+        Initialize the DataBuffer class.
+        
+        Args:
+            ttl (float|None, optional): time to live of a request, in seconds, None for no limit. Defaults to None.
+            max_size (int|None, optional): maximum number of requests, None for no limit. Defaults to None.
+            pinned (Iterable[str], optional): keys that are never evicted. Defaults to ('registration',).
+        """
+        super().__init__()
+        assert max_size is None or max_size > 0, "Ensure max_size is a positive integer"
+        self.ttl = ttl
+        self.max_size = max_size
+        self.pinned = set(pinned)
+        self.expired_count = 0
+        self.overflow_count = 0
+        
+        self._timestamps: dict[str, float] = dict()
+        self._waiters: dict[str, int] = dict()
+        self._lock = threading.Lock()
+        return
+    
+    def __setitem__(self, key: str, value: Any):
+        if key not in self.pinned:
+            with self._lock:
+                if key not in self._timestamps:
+                    self._timestamps[key] = time.perf_counter()
+        super().__setitem__(key, value)
+        return
+    
+    def __delitem__(self, key: str):
+        super().__delitem__(key)
+        with self._lock:
+            self._timestamps.pop(key, None)
+        return
+    
+    def pop(self, key: str, *args) -> Any:
+        with self._lock:
+            self._timestamps.pop(key, None)
+        return super().pop(key, *args)
+    
+    def clear(self):
+        with self._lock:
+            self._timestamps.clear()
+        super().clear()
+        return
+    
+    def hold(self, key: str):
+        """
+        Hold a request while a thread waits on it, so that it is not evicted
+        
+        Args:
+            key (str): the request ID
+        """
+        with self._lock:
+            self._waiters[key] = self._waiters.get(key, 0) + 1
+        return
+    
+    def release(self, key: str):
+        """
+        Release a held request, restarting its age from now
+        
+        Args:
+            key (str): the request ID
+        """
+        with self._lock:
+            count = self._waiters.pop(key, 0) - 1
+            if count > 0:
+                self._waiters[key] = count
+            if key in self._timestamps:
+                self._timestamps.pop(key)
+                self._timestamps[key] = time.perf_counter()
         return
+    
+    def evict(self) -> list[str]:
+        """
+        Evict expired requests and the oldest requests over the maximum size
+        
+        Returns:
+            list[str]: the evicted request IDs
+        """
+        evicted = []
+        now = time.perf_counter()
+        with self._lock:
+            for key, timestamp in self._timestamps.items():
+                if key in self._waiters:
+                    continue
+                if self.ttl is not None and (now - timestamp) > self.ttl:
+                    self.expired_count += 1
+                elif self.max_size is not None and (len(self._timestamps) - len(evicted)) > self.max_size:
+                    self.overflow_count += 1
+                else:
+                    break
+                evicted.append(key)
+            for key in evicted:
+                self._timestamps.pop(key)
+                super().pop(key, None)
+        if evicted:
+            logger.warning(f"Evicted {len(evicted)} unclosed request(s) from data buffer: {evicted[:5]}{' ...' if len(evicted) > 5 else ''}")
+        return evicted
+    
+    def outstanding(self) -> dict[str, dict[str, Any]]:
+        """
+        Get the age, number of unread replies and waiting flag of each request, oldest first
+        
+        Returns:
+            dict[str, dict[str, Any]]: age in seconds, number of replies and whether a thread is waiting, keyed by request ID
+        """
+        now = time.perf_counter()
+        with self._lock:
+            timestamps = dict(self._timestamps)
+            waiting = set(self._waiters)
+        return {
+            key: dict(age=now-timestamp, replies=len(self.get(key, {})), waiting=(key in waiting)) 
+            for key,timestamp in timestamps.items()
+        }
+    
+    def getMetrics(self) -> dict[str, Any]:
+        """
+        Get the metrics of the buffer
+        
+        Returns:
+            dict[str, Any]: number of outstanding requests and unread replies, age of the oldest request and eviction counts
+        """
+        outstanding = self.outstanding()
+        return dict(
+            requests = len(outstanding),
+            replies = sum(request['replies'] for request in outstanding.values()),
+            oldest_age = max((request['age'] for request in outstanding.values()), default=0.0),
+            expired = self.expired_count,
+            overflow = self.overflow_count
+        )
 
 
 class Proxy:
@@ -233,6 +805,7 @@ class Proxy:
         `factory`: factory method to create a new class with methods and properties of the prime object
         `createMethodEmitter`: create a method emitter for the proxy class
         `createPropertyEmitter`: create a property emitter for the proxy class
+        `batch`: collect remote calls and transmit them as a single batch request
         `bindController`: bind a controller to the proxy
         `releaseController`: release the controller from the proxy
     """
@@ -253,6 +826,7 @@ class Proxy:
         self.object_id = object_id or id(prime)
         self.controller: Controller|None = None
         self.remote = False
+        self._batch: list[tuple[dict[str, Any], Future]]|None = None
         return
     
     @classmethod
@@ -307,14 +881,13 @@ class Proxy:
                 args = args,
                 kwargs = kwargs
             )
+            if self._batch is not None:
+                return self._defer(command)
             request_id = controller.transmitRequest(command, target=target)
             response: dict = controller.retrieveData(request_id, sender=sender, data_only=False)
             data = response.get('data')
             if response.get('status', '') != 'completed':
-                error_type_name, message = data.split('!!', maxsplit=1)
-                error_type = getattr(builtins, error_type_name, Exception)
-                exception = error_type(message)
-                raise exception
+                raise self._to_exception(data)
             return data
         methodEmitter.__name__ = method.__name__
         methodEmitter.__doc__ = method.__doc__
@@ -344,6 +917,8 @@ class Proxy:
             target = self.controller.registry.get(self.object_id, [])
             sender = target[0] if len(target) else None
             command = dict(method='getattr', args=[self.object_id, attr_name])
+            if self._batch is not None:
+                return self._defer(command)
             request_id = controller.transmitRequest(command, target=target)
             return controller.retrieveData(request_id, sender=sender)
         getterEmitter.__name__ = attr_name
@@ -361,10 +936,63 @@ class Proxy:
             target = self.controller.registry.get(self.object_id, [])
             sender = target[0] if len(target) else None
             command = dict(method='setattr', args=[self.object_id, attr_name, value])
+            if self._batch is not None:
+                return self._defer(command)
             request_id = controller.transmitRequest(command, target=target)
             return controller.retrieveData(request_id, sender=sender)
         return property(getterEmitter, setterEmitter)
     
+    @contextmanager
+    def batch(self, timeout: int|float = 5) -> Iterator[None]:
+        """
+        Collect the remote calls made within the context and transmit them as a single batch request on exit.
+        Method calls and property accesses within the context return futures, which are resolved together
+        from the single reply when the context exits. Errors from individual calls are set on their futures.
+        
+        Args:
+            timeout (int|float, optional): the timeout for the batch reply. Defaults to 5.
+        """
+        assert isinstance(self.controller, Controller), 'No controller is bound to this Proxy.'
+        assert self._batch is None, 'A batch is already being collected on this Proxy.'
+        self._batch = []
+        try:
+            yield
+        except BaseException:
+            for _,future in self._batch:
+                future.cancel()
+            raise
+        finally:
+            calls, self._batch = self._batch, None
+        if not len(calls):
+            return
+        
+        controller = self.controller
+        target = controller.registry.get(self.object_id, [])
+        sender = target[0] if len(target) else None
+        try:
+            request_id = controller.transmitRequest([command for command,_ in calls], target=target)
+            response: dict|None = controller.retrieveData(request_id, timeout, sender=sender, data_only=False)
+            if response is None:
+                raise TimeoutError(f"No reply to batch request: {request_id}")
+            results = response.get('data')
+            if response.get('status', '') != 'completed':
+                raise self._to_exception(results)
+            if not isinstance(results, list) or len(results) != len(calls):
+                raise ValueError(f"Expected {len(calls)} results in reply to batch request: {request_id}")
+            for (_,future),result in zip(calls, results):
+                result = result if isinstance(result, Mapping) else dict(data=result, status='error')
+                data = result.get('data')
+                if result.get('status', '') != 'completed':
+                    future.set_exception(self._to_exception(data))
+                    continue
+                future.set_result(data)
+        except Exception as e:
+            logger.error(f"Batch request failed: {e}")
+            for _,future in calls:
+                if not future.done():
+                    future.set_exception(e)
+        return
+    
     def bindController(self, controller: Controller):
         """
         Bind a controller to the proxy.
@@ -399,6 +1027,42 @@ class Proxy:
         self.controller = None
         self.remote = False
         return controller
+    
+    @staticmethod
+    def _to_exception(data: Any) -> Exception:
+        """
+        Rebuild the exception from the data of an error reply, i.e. a string of the form `"ErrorType!!message"`
+        
+        Args:
+            data (Any): the data of the error reply
+            
+        Returns:
+            Exception: the exception, or a generic `Exception` if the data is not in the expected form
+        """
+        if not isinstance(data, str) or '!!' not in data:
+            return Exception(f"Unable to read response: {data!r}")
+        error_type_name, message = data.split('!!', maxsplit=1)
+        error_type = getattr(builtins, error_type_name, Exception)
+        if not (isinstance(error_type, type) and issubclass(error_type, Exception)):
+            error_type = Exception
+        try:
+            return error_type(message)
+        except TypeError:
+            return Exception(f"{error_type_name}: {message}")
+    
+    def _defer(self, command: dict[str, Any]) -> Future:
+        """
+        Add a command to the batch being collected
+        
+        Args:
+            command (dict[str, Any]): the command to add
+            
+        Returns:
+            Future: the future resolved with the result of the command
+        """
+        future = Future()
+        self._batch.append((command, future))
+        return future
 
 
 class Controller:
@@ -408,18 +1072,29 @@ class Controller:
     ### Constructor:
         `role` (str): the role of the controller
         `interpreter` (Interpreter): the interpreter to use
-        `relay_delay` (int, optional): delay for relaying data. Defaults to 1.
+        `relay_delay` (float, optional): minimum interval between packets relayed to the same destination. Defaults to 0.
+        `flow_control` (FlowControl|None, optional): flow control settings to relay through send queues. Defaults to None.
+        `concurrent` (bool, optional): flag to execute commands in one serial lane per object on a thread pool. Defaults to False.
+        `max_workers` (int|None, optional): maximum number of threads for concurrent execution. Defaults to None.
+        `buffer_ttl` (float|None, optional): time to live of requests in the data buffer, in seconds, None for no limit. Defaults to 600.
+        `buffer_size` (int|None, optional): maximum number of requests in the data buffer, None for no limit. Defaults to 10000.
         
     ### Attributes and properties:
         `role` (str): the role of the controller
         `interpreter` (Interpreter): the interpreter to use
         `address` (str|None): the address of the controller
-        `relay_delay` (int): delay for relaying data
+        `relay_delay` (float): minimum interval between packets relayed to the same destination
+        `flow_control` (FlowControl|None): flow control settings to relay through send queues
+        `send_queues` (dict[tuple[str,str], SendQueue]): send queues, keyed by callback type and address
         `relays` (list): list of relays
         `callbacks` (dict[str, dict[str, Callable]]): dictionary of callbacks
         `events` (dict[str, threading.Event]): dictionary of events
         `command_queue` (TwoTierQueue): command queue
-        `data_buffer` (dict): data buffer
+        `concurrent` (bool): flag to execute commands in one serial lane per object on a thread pool
+        `max_workers` (int|None): maximum number of threads for concurrent execution
+        `lanes` (dict[str, ExecutionLane]): execution lanes, keyed by object ID
+        `data_buffer` (DataBuffer): data buffer of replies, keyed by request ID
+        `data_conditions` (dict[str, threading.Condition]): conditions signalled when data for a request arrives
         `objects` (dict): dictionary of objects
         `object_methods` (dict[str, ClassMethods]): dictionary of object methods
         `object_attributes` (dict[str, tuple[str]]): dictionary of object attributes
@@ -439,12 +1114,16 @@ class Controller:
         `start`: start the execution loop
         `stop`: stop the execution loop
         `executeCommand`: execute a command
+        `getLaneMetrics`: get the metrics of the execution lanes
         `transmitRequest`: transmit a request
         `receiveData`: receive data
         `retrieveData`: retrieve data
+        `getOutstandingRequests`: get the requests waiting in the data buffer
+        `getBufferMetrics`: get the metrics of the data buffer
         `getAttributes`: get attributes of the controller
         `getMethods`: get methods of the controller
         `relay`: relay a request or data
+        `acknowledge`: acknowledge requests relayed to an address
         `relayRequest`: relay a request
         `relayData`: relay data
         `subscribe`: subscribe to a relay
@@ -452,14 +1131,29 @@ class Controller:
         `setAddress`: set the address of the controller
     """
     
-    def __init__(self, role: str, interpreter: Interpreter, *, relay_delay: int = 1):
+    def __init__(self, 
+        role: str, 
+        interpreter: Interpreter, 
+        *, 
+        relay_delay: float = 0, 
+        flow_control: FlowControl|None = None,
+        concurrent: bool = False,
+        max_workers: int|None = None,
+        buffer_ttl: float|None = 600,
+        buffer_size: int|None = 10_000
+    ):
         """
         Initialize the Controller class.
         
         Args:
             role (str): the role of the controller
             interpreter (Interpreter): the interpreter to use
-            relay_delay (int, optional): delay for relaying data. Defaults to 1.
+            relay_delay (float, optional): minimum interval between packets relayed to the same destination. Defaults to 0.
+            flow_control (FlowControl|None, optional): flow control settings to relay through send queues. Defaults to None.
+            concurrent (bool, optional): flag to execute commands in one serial lane per object on a thread pool. Defaults to False.
+            max_workers (int|None, optional): maximum number of threads for concurrent execution. Defaults to None.
+            buffer_ttl (float|None, optional): time to live of requests in the data buffer, in seconds, None for no limit. Defaults to 600.
+            buffer_size (int|None, optional): maximum number of requests in the data buffer, None for no limit. Defaults to 10000.
         """
         assert role in ('model', 'view', 'both', 'relay'), f"Invalid role: {role}"
         assert isinstance(interpreter, Interpreter), f"Invalid interpreter: {interpreter}"
@@ -468,11 +1162,22 @@ class Controller:
         self.address = None
         
         self.relay_delay = relay_delay
+        self.flow_control = flow_control
+        self.send_queues: dict[tuple[str,str], SendQueue] = dict()
+        self._last_relayed: dict[tuple[str,str], float] = dict()
+        self._relay_locks: dict[tuple[str,str], threading.Lock] = dict()
+        self._relay_lock = threading.Lock()
         self.relays = []
         self.callbacks: dict[str, dict[str,Callable]] = dict(request={}, data={}, listen={})
         self.events: dict[str, threading.Event] = dict()
         self.command_queue = TwoTierQueue()
-        self.data_buffer = dict()
+        self.concurrent = concurrent
+        self.max_workers = max_workers
+        self.lanes: dict[str, ExecutionLane] = dict()
+        self._executor: ThreadPoolExecutor|None = None
+        self.data_buffer = DataBuffer(ttl=buffer_ttl, max_size=buffer_size)
+        self.data_conditions: dict[str, threading.Condition] = dict()
+        self._data_conditions_lock = threading.Lock()
         self.objects = {}
         self.object_methods: dict[str, ClassMethods] = dict()
         self.object_attributes: dict[str, tuple[str]] = dict()
@@ -723,6 +1428,8 @@ class Controller:
     def start(self):
         """Start the execution loop"""
         assert self.role in ('model', 'both'), "Only the model can start execution loop"
+        if self.concurrent:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='lane')
         self.execution_event.set()
         self._threads['execution'] = threading.Thread(target=self._loop_execution, daemon=True)
         logger.info("Starting execution loop")
@@ -757,6 +1464,8 @@ class Controller:
         if object_id not in self.objects:
             if method_name in ('exposeMethods','exposeAttributes'):
                 return getattr(self,method_name)(), dict(status='completed')
+            elif method_name == 'batch':
+                return self._execute_batch(command), dict(status='completed')
             elif method_name in ('getattr', 'setattr', 'delattr'):
                 args = command.get('args', [])
                 kwargs = command.get('kwargs', {})
@@ -810,6 +1519,15 @@ class Controller:
         logger.info(f"Completed command: {command}")
         return out, dict(status='completed')
     
+    def getLaneMetrics(self) -> dict[str, dict[str, Any]]:
+        """
+        Get the metrics of the execution lanes
+        
+        Returns:
+            dict[str, dict[str, Any]]: depth, activity, executed count, busy time and utilisation, keyed by object ID
+        """
+        return {lane_id: lane.getMetrics() for lane_id,lane in list(self.lanes.items())}
+    
     def _loop_execution(self):
         """Execution loop"""
         assert self.role in ('model', 'both'), "Only the model can execute commands"
@@ -817,10 +1535,7 @@ class Controller:
             try:
                 command = self.command_queue.get(timeout=5)
                 if command is not None:
-                    metadata = self.extractMetadata(command)
-                    data,status = self.executeCommand(command)
-                    logger.debug(status)
-                    self.transmitData(data, metadata=metadata, status=status)
+                    self._handle_command(command)
                     self.command_queue.task_done()
             except queue.Empty:
                 time.sleep(0.1)
@@ -836,9 +1551,7 @@ class Controller:
             try:
                 command = self.command_queue.get(timeout=1)
                 if command is not None:
-                    metadata = self.extractMetadata(command)
-                    data,status = self.executeCommand(command)
-                    self.transmitData(data, metadata=metadata, status=status)
+                    self._handle_command(command)
                     self.command_queue.task_done()
             except queue.Empty:
                 break
@@ -847,11 +1560,167 @@ class Controller:
             except ConnectionError:
                 break
         self.command_queue.join()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        return
+    
+    def _handle_command(self, command: Mapping[str, Any]):
+        """
+        Execute a command and transmit the result, or dispatch it to its lane in concurrent execution
+        
+        Args:
+            command (Mapping[str, Any]): the command to handle
+        """
+        if self._executor is None:
+            self._process_command(command)
+            return
+        lane_ids = self._get_lane_ids(command)
+        item = command if len(lane_ids) == 1 else LaneBarrier(command, lane_ids)
+        for lane_id in lane_ids:
+            if lane_id not in self.lanes:
+                self.lanes[lane_id] = ExecutionLane(lane_id)
+            lane = self.lanes[lane_id]
+            with lane.lock:
+                if isinstance(item, LaneBarrier):
+                    # Barriers keep the order they are dispatched in, so that every lane reaches them in the same order
+                    lane.command_queue.put_queue(item)
+                else:
+                    lane.command_queue.put(item, priority=command.get("priority", False), rank=command.get("rank", None))
+                if lane.is_active or lane.is_held:
+                    continue
+                lane.is_active = True
+            self._executor.submit(self._run_lane, lane)
+        return
+    
+    def _execute_batch(self, command: Mapping[str, Any]) -> list[dict[str, Any]]:
+        """
+        Execute the commands of a batch request in order. Each command succeeds or fails on its own.
+        
+        Args:
+            command (Mapping[str, Any]): the batch command, with the list of commands as its first argument
+            
+        Returns:
+            list[dict[str, Any]]: the data and status of each command, in order
+        """
+        args = command.get('args', [])
+        commands = args[0] if len(args) else command.get('kwargs', {}).get('commands', [])
+        results = []
+        for sub_command in commands:
+            try:
+                data,status = self.executeCommand(sub_command)
+            except Exception as e:
+                logger.error(f"Error executing batched command: {sub_command}")
+                data,status = f"{e.__class__.__name__}!!{e}", dict(status='error')
+            results.append(dict(data=data, **status))
+        return results
+    
+    def _get_lane_ids(self, command: Mapping[str, Any]) -> list[str]:
+        """
+        Get the IDs of the lanes for a command, i.e. the object IDs the command acts on.
+        A batch request runs in the lanes of all the objects its commands act on.
+        
+        Args:
+            command (Mapping[str, Any]): the command
+            
+        Returns:
+            list[str]: the lane IDs
+        """
+        object_id = command.get('object_id', '')
+        if object_id not in self.objects and command.get('method', '') == 'batch':
+            args = command.get('args', [])
+            commands = args[0] if len(args) else command.get('kwargs', {}).get('commands', [])
+            lane_ids = {lane_id for sub_command in commands for lane_id in self._get_lane_ids(sub_command)}
+            return sorted(lane_ids) if len(lane_ids) else ['']
+        if object_id not in self.objects and command.get('method', '') in ('getattr', 'setattr', 'delattr'):
+            args = command.get('args', [])
+            object_id = args[0] if len(args) else command.get('kwargs', {}).get('object_id', '')
+        return [str(object_id)]
+    
+    def _process_command(self, command: Mapping[str, Any]):
+        """
+        Execute a command and transmit the result
+        
+        Args:
+            command (Mapping[str, Any]): the command to process
+        """
+        metadata = self.extractMetadata(command)
+        data,status = self.executeCommand(command)
+        logger.debug(status)
+        try:
+            self.transmitData(data, metadata=metadata, status=status)
+        except (TypeError, ValueError, AttributeError, RecursionError, pickle.PicklingError) as e:
+            logger.error(f"Unable to encode the result of command: {command}")
+            logger.error(f"{e.__class__.__name__}: {e}")
+            self.transmitData(f"{e.__class__.__name__}!!{e}", metadata=metadata, status=dict(status='error'))
+        return
+    
+    def _run_lane(self, lane: ExecutionLane):
+        """
+        Execute the commands in a lane until it is empty
+        
+        Args:
+            lane (ExecutionLane): the lane to run
+        """
+        while True:
+            with lane.lock:
+                command = lane.command_queue.get_nowait()
+                if command is None:
+                    lane.is_active = False
+                    return
+                if isinstance(command, LaneBarrier) and not command.arrive(lane.lane_id):
+                    lane.is_held = True
+                    lane.is_active = False
+                    lane.command_queue.task_done()
+                    return
+            if isinstance(command, LaneBarrier):
+                self._run_barrier(command, lane)
+                continue
+            start_time = time.perf_counter()
+            try:
+                self._process_command(command)
+            except Exception as e:
+                logger.error(f"Error processing command in lane [{lane.lane_id}]: {e}")
+            finally:
+                lane.busy_time += (time.perf_counter() - start_time)
+                lane.executed_count += 1
+                lane.command_queue.task_done()
+    
+    def _run_barrier(self, barrier: LaneBarrier, lane: ExecutionLane):
+        """
+        Run a command spanning several lanes in the last lane to reach it, then release the other lanes
+        
+        Args:
+            barrier (LaneBarrier): the barrier of the command
+            lane (ExecutionLane): the lane running the command
+        """
+        start_time = time.perf_counter()
+        try:
+            self._process_command(barrier.command)
+        except Exception as e:
+            logger.error(f"Error processing command in lanes {list(barrier.lane_ids)}: {e}")
+        finally:
+            lane.busy_time += (time.perf_counter() - start_time)
+            lane.executed_count += 1
+            lane.command_queue.task_done()
+        for lane_id in barrier.lane_ids:
+            other = self.lanes[lane_id]
+            if other is lane:
+                continue
+            with other.lock:
+                other.is_held = False
+                if other.is_active or not other.depth:
+                    continue
+                other.is_active = True
+            try:
+                self._executor.submit(self._run_lane, other)
+            except RuntimeError:    # Executor is shutting down
+                self._run_lane(other)
         return
     
     # View side
     def transmitRequest(self, 
-        command: Mapping[str, Any], 
+        command: Mapping[str, Any]|Iterable[Mapping[str, Any]], 
         target: Iterable[int|str]|None = None, 
         *, 
         private:bool = True, 
@@ -859,10 +1728,12 @@ class Controller:
         rank: int|None = None
     ) -> str:
         """
-        Transmit a request
+        Transmit a request. A list of commands is transmitted as a single batch request, 
+        which is executed in order and answered with a single reply listing the data and 
+        status of each command.
         
         Args:
-            command (Mapping[str, Any]): the command to transmit
+            command (Mapping[str, Any]|Iterable[Mapping[str, Any]]): the command, or list of commands, to transmit
             target (Iterable[int|str]|None, optional): the target addresses. Defaults to None.
             private (bool, optional): flag to indicate private transmission. Defaults to True.
             priority (bool, optional): flag to indicate high-priority transmission. Defaults to False.
@@ -875,8 +1746,12 @@ class Controller:
         sender = [self.address or str(id(self))] if private else []
         target = list(target) if target is not None else []
         target.extend(self.relays)
+        if not isinstance(command, Mapping):
+            command = dict(method='batch', args=[list(command)])
         request_id = uuid.uuid4().hex
         self.data_buffer[request_id] = dict()
+        self._get_data_condition(request_id)
+        self._evict_data()
         command['address'] = dict(sender=sender, target=target)
         command['request_id'] = request_id
         command['priority'] = priority
@@ -906,10 +1781,16 @@ class Controller:
             logger.info(f"[{self.address or str(id(self))}] Received data from {sender}")
         
         reply_data = {reply_id: data}
-        if request_id not in self.data_buffer:
-            self.data_buffer[request_id] = reply_data
+        is_new = request_id not in self.data_buffer
+        condition = self.data_conditions.get(request_id, None)
+        if condition is None:
+            self._store_data(request_id, reply_data)
         else:
-            self.data_buffer[request_id].update(reply_data)
+            with condition:
+                self._store_data(request_id, reply_data)
+                condition.notify_all()
+        if is_new:
+            self._evict_data()
         logger.debug('Received data')
         return
     
@@ -925,11 +1806,14 @@ class Controller:
         close_request: bool = True
     ) -> Any | dict[tuple[str,str], Any]:
         """
-        Retrieve data
+        Retrieve data. Waits on the condition of the request, which is signalled by `receiveData`
+        as soon as a reply arrives. If a listen callback is subscribed for the sender, the data is
+        pulled from the callback instead.
         
         Args:
             request_id (str): the request ID
             timeout (int|float, optional): the timeout. Defaults to 5.
+            sender (str|None, optional): the sender to pull data from. Defaults to None.
             min_count (int|None, optional): the minimum count. Defaults to 1.
             max_count (int|None, optional): the maximum count. Defaults to 1.
             default (Any|None, optional): the default value. Defaults to None.
@@ -940,22 +1824,37 @@ class Controller:
             Any | dict[tuple[str,str], Any]: the retrieved data
         """
         assert self.role in ('view', 'both'), "Only the view can listen for data"
+        condition = self._get_data_condition(request_id)
         all_data = dict()
         count = 0
         data = default
+        response = None
         start_time = time.perf_counter()
-        while request_id in self.data_buffer:
-            time.sleep(0.1)
-            if min_count and (count >= min_count):
-                break
-            if (time.perf_counter()-start_time) >= timeout:
-                logger.warning(f"Timeout retrieving data for request_id: {request_id}")
-                logger.warning("Please try again later.")
-                return all_data if len(all_data) else None
-            if len(self.data_buffer[request_id]):
-                reply_ids = list(self.data_buffer[request_id].keys())
-                for reply_id in reply_ids:
-                    response = self.data_buffer[request_id].pop(reply_id)
+        self.data_buffer.hold(request_id)
+        try:
+            while request_id in self.data_buffer:
+                if min_count and (count >= min_count):
+                    break
+                remaining = timeout - (time.perf_counter()-start_time)
+                if remaining <= 0:
+                    logger.warning(f"Timeout retrieving data for request_id: {request_id}")
+                    logger.warning("Please try again later.")
+                    return all_data if len(all_data) else None
+                
+                with condition:
+                    replies = self.data_buffer.get(request_id, {})
+                    if not len(replies) and sender not in self.callbacks['listen']:
+                        condition.wait(remaining)
+                        continue
+                    reply_ids = list(replies.keys())
+                    if max_count:
+                        reply_ids = reply_ids[:max_count-count]
+                    responses = [(reply_id, replies.pop(reply_id)) for reply_id in reply_ids]
+                if not len(responses):
+                    self.receiveData(sender=sender, request_id=request_id)
+                    continue
+                
+                for reply_id, response in responses:
                     status = response.get('status', None)
                     data = response.get('data', default)
                     sender = response.get('address', {}).get('sender', [])[0]
@@ -970,15 +1869,34 @@ class Controller:
                     if count >= max_count:
                         break
                     start_time = time.perf_counter()
-                continue
-            else:
-                self.receiveData(sender=sender, request_id=request_id)
+                if count >= max_count:
+                    break
+        finally:
+            self.data_buffer.release(request_id)
         if close_request:
-            self.data_buffer.pop(request_id, None)
+            self._close_request(request_id)
         if max_count == 1:
             return (data if data_only else response)
         return all_data
     
+    def getOutstandingRequests(self) -> dict[str, dict[str, Any]]:
+        """
+        Get the requests waiting in the data buffer, i.e. transmitted but not yet retrieved and closed
+        
+        Returns:
+            dict[str, dict[str, Any]]: age in seconds and number of unread replies, keyed by request ID
+        """
+        return self.data_buffer.outstanding()
+    
+    def getBufferMetrics(self) -> dict[str, Any]:
+        """
+        Get the metrics of the data buffer
+        
+        Returns:
+            dict[str, Any]: number of outstanding requests and unread replies, age of the oldest request and eviction counts
+        """
+        return self.data_buffer.getMetrics()
+    
     def getAttributes(self, target: Iterable[int]|None = None, *, private: bool = True) -> dict:
         """
         Get attributes
@@ -1040,7 +1958,8 @@ class Controller:
     # Controller side
     def relay(self, packet: str|bytes|None, callback_type:str, addresses: Iterable[int]|None = None):
         """
-        Relay a message
+        Relay a message. Packets are sent directly, or through per-destination send queues if
+        `flow_control` is set. Consecutive packets to the same destination are spaced by at least `relay_delay`.
         
         Args:
             packet (str|bytes|None): the message to relay
@@ -1058,23 +1977,51 @@ class Controller:
                 if len(self.relays) == 0:
                     logger.warning(f"Callback not found for address: {address}")
                 continue
+            if self.flow_control is not None:
+                self._get_send_queue(callback_type, address).put(packet)
+                continue
             callback = self.callbacks[callback_type][address]
-            callback(packet)
-        if self.relay_delay > 0:
-            time.sleep(self.relay_delay)
+            if self.relay_delay <= 0:
+                callback(packet)
+                continue
+            key = (callback_type, address)
+            with self._relay_lock:
+                lock = self._relay_locks.setdefault(key, threading.Lock())
+            with lock:
+                wait_time = self.relay_delay - (time.perf_counter() - self._last_relayed.get(key, 0))
+                if wait_time > 0:
+                    time.sleep(wait_time)
+                callback(packet)
+                self._last_relayed[key] = time.perf_counter()
         return
     
+    def acknowledge(self, address: str, count: int = 1) -> int:
+        """
+        Acknowledge requests relayed to an address, returning their credits
+        
+        Args:
+            address (str): the address the requests were relayed to
+            count (int, optional): the number of requests to acknowledge. Defaults to 1.
+            
+        Returns:
+            int: the number of credits returned
+        """
+        send_queue = self.send_queues.get(('request', str(address)))
+        if send_queue is None:
+            return 0
+        return send_queue.acknowledge(count)
+    
     def relayRequest(self, packet: str|bytes|None = None, **kwargs):
         """
-        Relay a request
+        Relay a request, routing on the header decoded by the interpreter
         
         Args:
             packet (str|bytes, optional): the request to relay. Defaults to None.
         """
         # if packet is None:
         #     packet = self.callbacks['listen'](**kwargs)
-        content = self.interpreter.decodeRequest(packet)
-        addresses = content.get('address', {}).get('target', [])
+        header = self.interpreter.decodeRequestHeader(packet)
+        addresses = header.get('address', {}).get('target', [])
         self.relay(packet, 'request', addresses=addresses)
         if self.role in ('relay', 'both'):
             logger.debug('Relayed request')
@@ -1082,18 +2029,22 @@ class Controller:
     
     def relayData(self, packet: str|bytes|None = None, **kwargs):
         """
-        Relay data
+        Relay data, routing on the header decoded by the interpreter. Only registrations are fully decoded.
         
         Args:
             packet (str|bytes, optional): the packet to relay. Defaults to None.
         """
         # if packet is None:
         #     packet = self.callbacks['listen'](**kwargs)
-        content = self.interpreter.decodeData(packet)
-        addresses = content.get('address', {}).get('target', [])
+        header = self.interpreter.decodeDataHeader(packet)
+        addresses = header.get('address', {}).get('target', [])
+        if self.flow_control is not None and header.get('request_id', '') != 'registration':
+            sender = kwargs.get('sender') or (header.get('address', {}).get('sender', []) or [None])[0]
+            self.acknowledge(sender)
         if self.role in ('relay', 'both') and len(addresses) == 0:
-            if content.get('request_id', '') == 'registration':
-                if content.get('reply_id', '') != self.address:
+            if header.get('request_id', '') == 'registration':
+                if header.get('reply_id', '') != self.address:
+                    content = self.interpreter.decodeData(packet)
                     if 'registration' not in self.data_buffer:
                         self.data_buffer['registration'] = dict()
                     sender = content.get('address', {}).get('sender', ['UNKNOWN'])[0]
@@ -1161,6 +2112,11 @@ class Controller:
         key = address
         key = str(key)
         callback = self.callbacks[callback_type].pop(key, None)
+        with self._relay_lock:
+            send_queue = self.send_queues.pop((callback_type, key), None)
+        if send_queue is not None:
+            send_queue.stop()
+        self._last_relayed.pop((callback_type, key), None)
         if callback is None:
             logger.warning(f"{key} was not subscribed to {callback_type}")
             return
@@ -1178,3 +2134,80 @@ class Controller:
         assert isinstance(address, (int,str)), f"Invalid address: {address}"
         self.address = address
         return
+    
+    def _close_request(self, request_id: str):
+        """
+        Close a request, removing its data and condition
+        
+        Args:
+            request_id (str): the request ID
+        """
+        self.data_buffer.pop(request_id, None)
+        with self._data_conditions_lock:
+            self.data_conditions.pop(request_id, None)
+        return
+    
+    def _evict_data(self):
+        """Evict expired requests from the data buffer, waking any thread still waiting on them"""
+        for request_id in self.data_buffer.evict():
+            with self._data_conditions_lock:
+                condition = self.data_conditions.pop(request_id, None)
+            if condition is not None:
+                with condition:
+                    condition.notify_all()
+        return
+    
+    def _get_data_condition(self, request_id: str) -> threading.Condition:
+        """
+        Get the condition for a request, creating it if it does not exist
+        
+        Args:
+            request_id (str): the request ID
+            
+        Returns:
+            threading.Condition: the condition for the request
+        """
+        with self._data_conditions_lock:
+            if request_id not in self.data_conditions:
+                self.data_conditions[request_id] = threading.Condition()
+            return self.data_conditions[request_id]
+    
+    def _store_data(self, request_id: str, reply_data: dict[str, Any]):
+        """
+        Store reply data in the data buffer
+        
+        Args:
+            request_id (str): the request ID
+            reply_data (dict[str, Any]): the reply data, keyed by reply ID
+        """
+        if request_id not in self.data_buffer:
+            self.data_buffer[request_id] = reply_data
+        else:
+            self.data_buffer[request_id].update(reply_data)
+        return
+    
+    def _get_send_queue(self, callback_type: str, address: str) -> SendQueue:
+        """
+        Get the send queue for a destination, creating it if it does not exist
+        
+        Args:
+            callback_type (str): the callback type
+            address (str): the address of the destination
+            
+        Returns:
+            SendQueue: the send queue for the destination
+        """
+        key = (callback_type, address)
+        with self._relay_lock:
+            if key not in self.send_queues:
+                flow_control = self.flow_control or FlowControl()
+                self.send_queues[key] = SendQueue(
+                    self.callbacks[callback_type][address],
+                    max_pending = flow_control.max_pending,
+                    credits = (flow_control.credits if callback_type == 'request' else None),
+                    credit_timeout = flow_control.credit_timeout,
+                    interval = self.relay_delay,
+                    block = flow_control.block,
+                    timeout = flow_control.timeout
+                )
+            return self.send_queues[key]
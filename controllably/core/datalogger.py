@@ -2,6 +2,18 @@
 """
 This module provides functions to record and stream data from a streaming device.
 
+Attributes:
+    DEFAULT_CAPACITY (int): default number of samples held by a column store (or each chunk, when growing)
+    FLUSH_EVERY (int): default number of new samples that triggers a flush of a record writer
+    FLUSH_INTERVAL (float): default number of seconds after which new samples are flushed by a record writer
+    MANIFEST_FILENAME (str): filename of the manifest of a recording session
+
+## Classes:
+    `ColumnStore`: Columnar, preallocated data store for streamed data
+    `DataFrameCache`: Incrementally maintained DataFrame of a data store
+    `RecordWriter`: Background writer that persists a data store to disk while recording
+    `RecordReader`: Reader that lazily reassembles a recording session
+
 ## Functions:
     `get_dataframe`: Convert a list of tuples to a pandas DataFrame
     `record`: Record data from a streaming device
@@ -15,7 +27,11 @@ from __future__ import annotations
 from collections import deque
 from datetime import datetime
 import functools
+from itertools import islice
+import json
 import logging
+import os
+from pathlib import Path
 import sys
 import threading
 import time
@@ -23,6 +39,7 @@ from typing import NamedTuple, Any, Iterable, Callable
 
 # Third party imports
 import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
 
 # Local application imports
@@ -31,6 +48,877 @@ from .device import StreamingDevice
 # Configure logging
 logger = logging.getLogger(__name__)
 
+DEFAULT_CAPACITY = 1000
+FLUSH_EVERY = 1000
+FLUSH_INTERVAL = 5.0
+MANIFEST_FILENAME = 'manifest.json'
+NAT = np.iinfo(np.int64).min
+DTYPES = {bool: np.bool_, int: np.int64, float: np.float64}
+
+class ColumnStore:
+    """
+    Columnar, preallocated data store for streamed data.
+    Drop-in replacement for `deque[tuple[NamedTuple, datetime]]` data stores, backed by one NumPy array per field
+    and an int64 timestamp column (nanoseconds since epoch).
+    
+    With `grow=False`, the store is a ring buffer that keeps the latest `capacity` samples, like `deque(maxlen=capacity)`.
+    With `grow=True`, full chunks of `capacity` samples are sealed and a new chunk is allocated, so no samples are dropped.
+    
+    ### Constructor:
+        `data_type` (NamedTuple): data type of the samples
+        `capacity` (int, optional): number of samples held (or per chunk, when growing). Defaults to DEFAULT_CAPACITY.
+        `grow` (bool, optional): whether to grow into chunked storage instead of overwriting the oldest samples. Defaults to False.
+        
+    ### Attributes and properties:
+        `data_type` (NamedTuple): data type of the samples
+        `fields` (tuple[str]): field names of the data type
+        `dtypes` (dict[str, np.dtype]): NumPy dtype of each field
+        `capacity` (int): number of samples held (or per chunk, when growing)
+        `grow` (bool): whether to grow into chunked storage
+        `maxlen` (int|None): maximum number of samples held, or None if growing
+        `total_count` (int): number of samples appended since creation or the last clear
+        
+    ### Methods:
+        `append`: append a `(NamedTuple, datetime)` sample
+        `extend`: append multiple `(NamedTuple, datetime)` samples
+        `extendColumns`: append a batch of samples as typed columns
+        `clear`: remove all samples
+        `latest`: get the latest sample
+        `getColumns`: get the stored samples as chronologically ordered columns
+        `to_dataframe`: get the stored samples as a DataFrame
+    """
+    
+    def __init__(self, data_type: NamedTuple, capacity: int = DEFAULT_CAPACITY, *, grow: bool = False):
+        """
+        Initialize ColumnStore class
+        
+        Args:
+            data_type (NamedTuple): data type of the samples
+            capacity (int, optional): number of samples held (or per chunk, when growing). Defaults to DEFAULT_CAPACITY.
+            grow (bool, optional): whether to grow into chunked storage instead of overwriting the oldest samples. Defaults to False.
+        """
+        assert isinstance(capacity, int) and capacity > 0, "Ensure capacity is a positive integer"
+        self.data_type = data_type
+        self.fields = tuple(data_type._fields)
+        self.dtypes = {field: np.dtype(DTYPES.get(data_type.__annotations__.get(field), object)) for field in self.fields}
+        self.capacity = capacity
+        self.grow = grow
+        self._lock = threading.RLock()
+        self.clear()
+        return
+    
+    def __getitem__(self, index: int) -> tuple[NamedTuple, datetime|None]:
+        assert isinstance(index, int), "Ensure index is an integer"
+        with self._lock:
+            length = len(self)
+            index = index + length if index < 0 else index
+            if not 0 <= index < length:
+                raise IndexError("ColumnStore index out of range")
+            if index >= self._sealed_count:
+                position = index - self._sealed_count
+                if not self.grow:
+                    position = (self._start + position) % self.capacity
+                return self._get_row(self._columns, self._timestamps, position)
+            for columns, timestamps in self._chunks:
+                if index < len(timestamps):
+                    return self._get_row(columns, timestamps, index)
+                index -= len(timestamps)
+        raise IndexError("ColumnStore index out of range")
+    
+    def __iter__(self):
+        columns, timestamps = self.getColumns()
+        rows = zip(*[columns[field].tolist() for field in self.fields]) if len(self.fields) else [()]*len(timestamps)
+        return zip(map(self.data_type._make, rows), self._to_datetimes(timestamps))
+    
+    def __len__(self) -> int:
+        return self._sealed_count + self._size
+    
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.data_type.__name__}, capacity={self.capacity}, grow={self.grow}, len={len(self)})"
+    
+    @property
+    def maxlen(self) -> int|None:
+        """Maximum number of samples held, or None if growing"""
+        return None if self.grow else self.capacity
+    
+    @property
+    def total_count(self) -> int:
+        """Number of samples appended since creation or the last clear"""
+        return self._total_count
+    
+    def append(self, item: tuple[NamedTuple, datetime|None]):
+        """
+        Append a `(NamedTuple, datetime)` sample
+        
+        Args:
+            item (tuple[NamedTuple, datetime|None]): sample and timestamp
+        """
+        data, timestamp = item
+        with self._lock:
+            position = self._next_position()
+            for field, value in zip(self.fields, data):
+                self._columns[field][position] = value
+            self._timestamps[position] = self._to_nanoseconds(timestamp)
+            self._total_count += 1
+        return
+    
+    def extend(self, items: Iterable[tuple[NamedTuple, datetime|None]]):
+        """
+        Append multiple `(NamedTuple, datetime)` samples
+        
+        Args:
+            items (Iterable[tuple[NamedTuple, datetime|None]]): samples and timestamps
+        """
+        with self._lock:
+            for item in items:
+                self.append(item)
+        return
+    
+    def extendColumns(self, columns: dict[str, Iterable], timestamps: Iterable[datetime|None]|np.ndarray):
+        """
+        Append a batch of samples as typed columns
+        
+        Args:
+            columns (dict[str, Iterable]): values of each field
+            timestamps (Iterable[datetime|None]|np.ndarray): timestamps of the samples
+        """
+        timestamps = self._to_nanoseconds_array(timestamps)
+        columns = {field: np.asarray(columns[field], dtype=self.dtypes[field]) for field in self.fields}
+        count = len(timestamps)
+        assert all(len(column) == count for column in columns.values()), "Ensure all columns have the same length"
+        with self._lock:
+            offset = 0
+            if not self.grow and count > self.capacity:
+                offset = count - self.capacity
+                self._total_count += offset
+            while offset < count:
+                if self.grow and self._size == self.capacity:
+                    self._seal()
+                if self.grow:
+                    n = min(count - offset, self.capacity - self._size)
+                    positions = slice(self._size, self._size + n)
+                    self._size += n
+                else:
+                    n = count - offset
+                    positions = (self._start + self._size + np.arange(n)) % self.capacity
+                    overflow = max(0, self._size + n - self.capacity)
+                    self._start = (self._start + overflow) % self.capacity
+                    self._size = min(self.capacity, self._size + n)
+                for field in self.fields:
+                    self._columns[field][positions] = columns[field][offset:offset+n]
+                self._timestamps[positions] = timestamps[offset:offset+n]
+                self._total_count += n
+                offset += n
+        return
+    
+    def clear(self):
+        """Remove all samples"""
+        with self._lock:
+            self._chunks: list[tuple[dict[str, np.ndarray], np.ndarray]] = []
+            self._sealed_count = 0
+            self._columns, self._timestamps = self._allocate()
+            self._start = 0
+            self._size = 0
+            self._total_count = 0
+        return
+    
+    def latest(self) -> tuple[NamedTuple, datetime|None]|None:
+        """
+        Get the latest sample
+        
+        Returns:
+            tuple[NamedTuple, datetime|None]|None: latest sample and timestamp, or None if empty
+        """
+        with self._lock:
+            return self[-1] if len(self) else None
+    
+    def getColumns(self, start: int|None = None) -> tuple[dict[str, np.ndarray], np.ndarray]:
+        """
+        Get the stored samples as chronologically ordered columns.
+        Returns views without copying when the samples lie in a single chunk that will not be overwritten.
+        
+        Args:
+            start (int|None, optional): only return samples from this position in `total_count` onwards. Defaults to None.
+        
+        Returns:
+            tuple[dict[str, np.ndarray], np.ndarray]: values of each field, and int64 timestamps in nanoseconds
+        """
+        with self._lock:
+            columns, timestamps = self._get_all_columns()
+            if start is None:
+                return columns, timestamps
+            offset = min(max(0, start - (self._total_count - len(self))), len(self))
+            return {field: column[offset:] for field,column in columns.items()}, timestamps[offset:]
+    
+    def to_dataframe(self) -> pd.DataFrame:
+        """
+        Get the stored samples as a DataFrame, with a `timestamp` column followed by the fields.
+        Wraps the underlying arrays without copying where `getColumns` returns views.
+        
+        Returns:
+            pd.DataFrame: DataFrame object
+        """
+        columns, timestamps = self.getColumns()
+        data = {'timestamp': timestamps.view('datetime64[ns]')}
+        data.update(columns)
+        return pd.DataFrame(data, copy=False)
+    
+    def _allocate(self) -> tuple[dict[str, np.ndarray], np.ndarray]:
+        """
+        Allocate a new chunk
+        
+        Returns:
+            tuple[dict[str, np.ndarray], np.ndarray]: empty field columns and timestamp column
+        """
+        columns = {field: np.empty(self.capacity, dtype=dtype) for field,dtype in self.dtypes.items()}
+        return columns, np.full(self.capacity, NAT, dtype=np.int64)
+    
+    def _get_all_columns(self) -> tuple[dict[str, np.ndarray], np.ndarray]:
+        """
+        Get all stored samples as chronologically ordered columns
+        
+        Returns:
+            tuple[dict[str, np.ndarray], np.ndarray]: values of each field, and int64 timestamps in nanoseconds
+        """
+        if not self.grow:
+            order = np.roll(np.arange(self._size), -self._start) if self._size == self.capacity else slice(0, self._size)
+            columns = {field: self._columns[field][order].copy() for field in self.fields}
+            return columns, self._timestamps[order].copy()
+        segments = self._chunks + [({field: column[:self._size] for field,column in self._columns.items()}, self._timestamps[:self._size])]
+        segments = [segment for segment in segments if len(segment[1])] or segments[-1:]
+        if len(segments) == 1:
+            return segments[0]
+        columns = {field: np.concatenate([segment[0][field] for segment in segments]) for field in self.fields}
+        return columns, np.concatenate([segment[1] for segment in segments])
+    
+    def _get_row(self, columns: dict[str, np.ndarray], timestamps: np.ndarray, position: int) -> tuple[NamedTuple, datetime|None]:
+        """
+        Get a single sample
+        
+        Args:
+            columns (dict[str, np.ndarray]): field columns
+            timestamps (np.ndarray): timestamp column
+            position (int): position in the columns
+            
+        Returns:
+            tuple[NamedTuple, datetime|None]: sample and timestamp
+        """
+        data = self.data_type._make(columns[field][position:position+1].tolist()[0] for field in self.fields)
+        return data, self._to_datetimes(timestamps[position:position+1])[0]
+    
+    def _next_position(self) -> int:
+        """
+        Reserve the position for the next sample
+        
+        Returns:
+            int: position in the active chunk
+        """
+        if self.grow:
+            if self._size == self.capacity:
+                self._seal()
+            self._size += 1
+            return self._size - 1
+        position = (self._start + self._size) % self.capacity
+        if self._size == self.capacity:
+            self._start = (self._start + 1) % self.capacity
+        else:
+            self._size += 1
+        return position
+    
+    def _seal(self):
+        """Seal the full active chunk and allocate a new one"""
+        self._chunks.append((self._columns, self._timestamps))
+        self._sealed_count += self._size
+        self._columns, self._timestamps = self._allocate()
+        self._size = 0
+        return
+    
+    @staticmethod
+    def _to_datetimes(timestamps: np.ndarray) -> list[datetime|None]:
+        """
+        Convert int64 nanosecond timestamps to datetimes
+        
+        Args:
+            timestamps (np.ndarray): int64 timestamps in nanoseconds
+            
+        Returns:
+            list[datetime|None]: datetimes, with None for missing timestamps
+        """
+        return timestamps.view('datetime64[ns]').astype('datetime64[us]').tolist()
+    
+    @staticmethod
+    def _to_nanoseconds(timestamp: datetime|None) -> int:
+        """
+        Convert a datetime to an int64 nanosecond timestamp
+        
+        Args:
+            timestamp (datetime|None): datetime
+            
+        Returns:
+            int: timestamp in nanoseconds
+        """
+        if timestamp is None:
+            return NAT
+        return np.datetime64(timestamp, 'ns').astype(np.int64)
+    
+    @classmethod
+    def _to_nanoseconds_array(cls, timestamps: Iterable[datetime|None]|np.ndarray) -> np.ndarray:
+        """
+        Convert datetimes to an int64 nanosecond timestamp array
+        
+        Args:
+            timestamps (Iterable[datetime|None]|np.ndarray): datetimes, or datetime64/int64 array
+            
+        Returns:
+            np.ndarray: timestamps in nanoseconds
+        """
+        if isinstance(timestamps, np.ndarray) and timestamps.dtype.kind == 'M':
+            return timestamps.astype('datetime64[ns]').view(np.int64)
+        if isinstance(timestamps, np.ndarray) and timestamps.dtype == np.int64:
+            return timestamps
+        return np.array([cls._to_nanoseconds(timestamp) for timestamp in timestamps], dtype=np.int64)
+
+
+class DataFrameCache:
+    """
+    Incrementally maintained DataFrame of a data store.
+    Only samples appended since the last update are converted, and are appended to growable column arrays. Samples
+    dropped from the head of a bounded `deque` (i.e. with `maxlen`) are dropped from the columns without conversion.
+    The cache is rebuilt if the data store is replaced or cleared.
+    
+    ### Constructor:
+        `fields` (Iterable[str]): list of field names
+        
+    ### Attributes and properties:
+        `fields` (tuple[str]): list of field names
+        
+    ### Methods:
+        `clear`: clear the cached DataFrame
+        `update`: convert newly appended samples and get the DataFrame
+    """
+    
+    def __init__(self, fields: Iterable[str]):
+        """
+        Initialize DataFrameCache class
+        
+        Args:
+            fields (Iterable[str]): list of field names
+        """
+        self.fields = tuple(fields)
+        self._lock = threading.Lock()
+        self.clear()
+        return
+    
+    def clear(self):
+        """Clear the cached DataFrame"""
+        self._columns: dict[str, np.ndarray]|None = None
+        self._dtypes: dict[str, Any] = dict()
+        self._start = 0
+        self._end = 0
+        self._store_id: int|None = None
+        self._count = 0
+        self._first = None
+        self._last = None
+        return
+    
+    def update(self, data_store: Iterable[tuple[NamedTuple,datetime]]|ColumnStore) -> pd.DataFrame:
+        """
+        Convert newly appended samples and get the DataFrame
+        
+        Args:
+            data_store (Iterable[tuple[NamedTuple,datetime]]|ColumnStore): data store
+            
+        Returns:
+            pd.DataFrame: DataFrame object
+        """
+        if isinstance(data_store, ColumnStore):
+            return data_store.to_dataframe()
+        with self._lock:
+            count = len(data_store)
+            changes = self._get_changes(data_store, count)
+            if changes is None:
+                self.clear()
+                changes = (count, 0)
+            n_new, n_dropped = changes
+            self._start = min(self._start + n_dropped, self._end)
+            if n_new:
+                new_data = list(islice(reversed(data_store), n_new))[::-1]
+                self._append(get_dataframe(new_data, self.fields))
+            self._store_id = id(data_store)
+            self._count = count
+            self._first = data_store[0] if count else None
+            self._last = data_store[-1] if count else None
+            if self._columns is None:
+                return get_dataframe([], self.fields)
+            columns = {}
+            for name,column in self._columns.items():
+                values = column[self._start:self._end]
+                dtype = self._dtypes[name]
+                columns[name] = values.copy() if dtype is None else pd.array(values, dtype=dtype, copy=True)
+            return pd.DataFrame(columns, copy=False)
+    
+    def _get_changes(self, data_store: Iterable[tuple[NamedTuple,datetime]], count: int) -> tuple[int,int]|None:
+        """
+        Get the number of samples appended to and dropped from the data store since the last update
+        
+        Args:
+            data_store (Iterable[tuple[NamedTuple,datetime]]): data store
+            count (int): current number of samples in the data store
+            
+        Returns:
+            tuple[int,int]|None: number of samples appended and dropped, or None if the cache has to be rebuilt
+        """
+        if self._columns is None or id(data_store) != self._store_id:
+            return None
+        if not self._count:
+            return (count, 0)
+        for n_new,item in enumerate(reversed(data_store)):
+            if item is self._last:
+                break
+        else:
+            return None
+        n_dropped = self._count + n_new - count
+        if n_dropped < 0:
+            return None
+        if n_dropped == 0 and data_store[0] is not self._first:
+            return None
+        if n_dropped > 0 and getattr(data_store, 'maxlen', None) is None:
+            return None
+        return (n_new, n_dropped)
+    
+    def _append(self, new_df: pd.DataFrame):
+        """
+        Append converted samples to the column arrays, growing them as needed
+        
+        Args:
+            new_df (pd.DataFrame): DataFrame of the new samples
+        """
+        if self._columns is not None and list(self._columns) != list(new_df.columns):
+            self.clear()
+        n_rows = len(new_df)
+        size = self._end - self._start
+        if self._columns is None:
+            self._columns = {name: np.empty(0, dtype=self._get_numpy_dtype(new_df[name])) for name in new_df.columns}
+            self._dtypes = {name: self._get_extension_dtype(new_df[name]) for name in new_df.columns}
+        capacity = len(next(iter(self._columns.values()), []))
+        grow = self._end + n_rows > capacity
+        new_capacity = max(2*(size + n_rows), 64) if grow else capacity
+        resized = False
+        for name,column in self._columns.items():
+            new_dtype = self._get_numpy_dtype(new_df[name])
+            dtype = column.dtype
+            if new_dtype != dtype:
+                try:
+                    dtype = np.result_type(dtype, new_dtype)
+                except TypeError:
+                    dtype = np.dtype(object)
+                if self._dtypes[name] != self._get_extension_dtype(new_df[name]):
+                    self._dtypes[name] = None
+            if grow or dtype != column.dtype:
+                self._columns[name] = np.empty(new_capacity, dtype=dtype)
+                self._columns[name][:size] = column[self._start:self._end]
+                resized = True
+        if resized:
+            self._start, self._end = 0, size
+        for name,column in self._columns.items():
+            column[self._end:self._end+n_rows] = new_df[name].to_numpy(dtype=column.dtype)
+        self._end += n_rows
+        return
+    
+    @staticmethod
+    def _get_numpy_dtype(column: pd.Series) -> np.dtype:
+        """Get the NumPy dtype used to store a column"""
+        return column.dtype if isinstance(column.dtype, np.dtype) else np.dtype(object)
+    
+    @staticmethod
+    def _get_extension_dtype(column: pd.Series) -> Any:
+        """Get the pandas extension dtype of a column, or None if it is a NumPy dtype"""
+        return None if isinstance(column.dtype, np.dtype) else column.dtype
+
+
+class RecordWriter:
+    """
+    Background writer that persists a data store to disk while recording.
+    New samples are flushed every `flush_every` samples or `flush_interval` seconds, whichever comes first,
+    as numbered segments listed in a JSON manifest. Segments are either CSV files or directories of `.npy` columns.
+    
+    ### Constructor:
+        `data_store` (deque|ColumnStore): data store to persist
+        `directory` (Path|str): directory of the recording session
+        `fields` (Iterable[str]): list of field names
+        `file_format` (str, optional): segment format, either 'csv' or 'npy'. Defaults to 'csv'.
+        `flush_every` (int, optional): number of new samples that triggers a flush. Defaults to FLUSH_EVERY.
+        `flush_interval` (float, optional): number of seconds after which new samples are flushed. Defaults to FLUSH_INTERVAL.
+        `fsync` (str, optional): when to fsync files to disk, one of 'always', 'close' or 'never'. Defaults to 'close'.
+        `trim` (bool, optional): whether to remove flushed samples from a `deque` data store to bound memory. Defaults to False.
+        
+    ### Attributes and properties:
+        `data_store` (deque|ColumnStore): data store to persist
+        `directory` (Path): directory of the recording session
+        `fields` (tuple[str]): list of field names
+        `file_format` (str): segment format
+        `flush_every` (int): number of new samples that triggers a flush
+        `flush_interval` (float): number of seconds after which new samples are flushed
+        `fsync` (str): when to fsync files to disk
+        `trim` (bool): whether to remove flushed samples from a `deque` data store
+        `manifest` (dict): manifest of the recording session
+        `is_running` (bool): whether the writer thread is running
+        `written_count` (int): number of samples written to disk
+        `lost_count` (int): number of samples dropped by the data store before they could be written.
+            A bounded `deque` that overflows between checks of the writer drops samples that cannot be counted.
+        
+    ### Methods:
+        `start`: start the writer thread
+        `stop`: stop the writer thread and flush the remaining samples
+        `flush`: write new samples to a new segment
+    """
+    
+    def __init__(self, 
+        data_store: deque|ColumnStore, 
+        directory: Path|str, 
+        fields: Iterable[str],
+        *,
+        file_format: str = 'csv',
+        flush_every: int = FLUSH_EVERY,
+        flush_interval: float = FLUSH_INTERVAL,
+        fsync: str = 'close',
+        trim: bool = False
+    ):
+        """
+        Initialize RecordWriter class
+        
+        Args:
+            data_store (deque|ColumnStore): data store to persist
+            directory (Path|str): directory of the recording session
+            fields (Iterable[str]): list of field names
+            file_format (str, optional): segment format, either 'csv' or 'npy'. Defaults to 'csv'.
+            flush_every (int, optional): number of new samples that triggers a flush. Defaults to FLUSH_EVERY.
+            flush_interval (float, optional): number of seconds after which new samples are flushed. Defaults to FLUSH_INTERVAL.
+            fsync (str, optional): when to fsync files to disk, one of 'always', 'close' or 'never'. Defaults to 'close'.
+            trim (bool, optional): whether to remove flushed samples from a `deque` data store to bound memory. Defaults to False.
+        """
+        assert file_format in ('csv', 'npy'), "Ensure file_format is either 'csv' or 'npy'"
+        assert fsync in ('always', 'close', 'never'), "Ensure fsync is one of 'always', 'close' or 'never'"
+        assert flush_every > 0 and flush_interval > 0, "Ensure flush_every and flush_interval are positive"
+        self.data_store = data_store
+        self.directory = Path(directory)
+        self.fields = tuple(fields)
+        self.file_format = file_format
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self.trim = trim
+        
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.manifest = dict(fields=list(self.fields), format=file_format, count=0, segments=[])
+        self.lost_count = 0
+        self._written = 0
+        self._appended = 0
+        self._last_seen = None
+        self._last_written = None
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread|None = None
+        return
+    
+    def __enter__(self):
+        """Context manager enter method"""
+        self.start()
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Context manager exit method"""
+        self.stop()
+        return False
+    
+    @property
+    def is_running(self) -> bool:
+        """Whether the writer thread is running"""
+        return isinstance(self._thread, threading.Thread) and self._thread.is_alive()
+    
+    @property
+    def written_count(self) -> int:
+        """Number of samples written to disk"""
+        return self.manifest['count']
+    
+    def start(self):
+        """Start the writer thread"""
+        if self.is_running:
+            return
+        self._stop_event.clear()
+        self._last_flush = time.monotonic()
+        self._thread = threading.Thread(target=self._loop_write, daemon=True)
+        self._thread.start()
+        return
+    
+    def stop(self):
+        """Stop the writer thread and flush the remaining samples"""
+        self._stop_event.set()
+        if self.is_running:
+            self._thread.join()
+        self.flush(sync=(self.fsync != 'never'))
+        return
+    
+    def flush(self, sync: bool|None = None) -> int:
+        """
+        Write new samples to a new segment
+        
+        Args:
+            sync (bool|None, optional): whether to fsync the files. Defaults to None, which follows the `fsync` policy.
+            
+        Returns:
+            int: number of samples written
+        """
+        sync = (self.fsync == 'always') if sync is None else sync
+        with self._lock:
+            self._last_flush = time.monotonic()
+            columns, timestamps = self._get_new_columns()
+            count = len(timestamps)
+            if not count:
+                return 0
+            index = len(self.manifest['segments'])
+            name = f"segment_{index:06d}" + ('.csv' if self.file_format == 'csv' else '')
+            path = self.directory / name
+            if self.file_format == 'csv':
+                data = {'timestamp': timestamps.view('datetime64[ns]')}
+                data.update(columns)
+                pd.DataFrame(data, copy=False).to_csv(path, index=False)
+                self._sync_file(path, sync)
+            else:
+                path.mkdir(exist_ok=True)
+                for key, column in dict(timestamp=timestamps, **columns).items():
+                    column = column.astype(str) if column.dtype == object else column
+                    np.save(path / f"{key}.npy", column)
+                    self._sync_file(path / f"{key}.npy", sync)
+            self.manifest['segments'].append(dict(name=name, count=count, start=int(timestamps[0]), end=int(timestamps[-1])))
+            self.manifest['count'] += count
+            self._write_manifest(sync)
+            self._mark_written(count)
+        return count
+    
+    def _get_new_columns(self) -> tuple[dict[str, np.ndarray], np.ndarray]:
+        """
+        Get the samples appended to the data store since the last flush
+        
+        Returns:
+            tuple[dict[str, np.ndarray], np.ndarray]: values of each field, and int64 timestamps in nanoseconds
+        """
+        data_store = self.data_store
+        if isinstance(data_store, ColumnStore):
+            total_count = data_store.total_count
+            if total_count < self._written:
+                logger.warning("Data store was cleared while recording to disk")
+                self._written = 0
+            lost = max(0, (total_count - len(data_store)) - self._written)
+            if lost:
+                logger.warning(f"{lost} sample(s) were dropped before they could be written to disk")
+                self.lost_count += lost
+                self._written += lost
+            columns, timestamps = data_store.getColumns(start=self._written)
+            return {field: columns[field] for field in self.fields}, timestamps
+        
+        new_data = self._scan_deque(collect=True)
+        if len(new_data):
+            self._last_written = new_data[-1]
+        df = get_dataframe(new_data, self.fields)
+        timestamps = pd.to_datetime(df['timestamp']).to_numpy(dtype='datetime64[ns]').view(np.int64)
+        return {field: df[field].to_numpy() for field in self.fields}, timestamps
+    
+    def _loop_write(self):
+        """Writer loop"""
+        poll_interval = min(0.1, self.flush_interval)
+        while not self._stop_event.wait(poll_interval):
+            if isinstance(self.data_store, ColumnStore):
+                pending = self.data_store.total_count - self._written
+            else:
+                with self._lock:
+                    self._scan_deque()
+                    pending = self._appended - self._written
+            timed_out = (time.monotonic() - self._last_flush) >= self.flush_interval
+            if pending >= self.flush_every or (pending > 0 and timed_out):
+                try:
+                    self.flush()
+                except OSError as e:
+                    logger.error(f"Failed to write records to {self.directory}")
+                    logger.debug(e)
+        return
+    
+    def _mark_written(self, count: int):
+        """
+        Mark samples as written, removing them from a `deque` data store if trimming
+        
+        Args:
+            count (int): number of samples written
+        """
+        self._written += count
+        if self.trim and isinstance(self.data_store, deque):
+            for _ in range(min(count, len(self.data_store))):
+                item = self.data_store.popleft()
+                self._last_seen = None if item is self._last_seen else self._last_seen
+            self._last_written = None
+        return
+    
+    def _scan_deque(self, collect: bool = False) -> list[tuple[NamedTuple,datetime]]:
+        """
+        Count the samples appended to a `deque` data store since the last scan, by walking back from the newest sample
+        to the last sample seen. When collecting, also walk back to the last sample written, and count the unwritten
+        samples that the data store has dropped since.
+        
+        Args:
+            collect (bool, optional): whether to collect the samples not yet written. Defaults to False.
+            
+        Returns:
+            list[tuple[NamedTuple,datetime]]: samples appended since the last scan, preceded by the older samples not yet written if collecting
+        """
+        data_store = self.data_store
+        last_seen = self._last_seen
+        unwritten = self._appended - self._written
+        while True:
+            try:
+                newest, new_items, old_items, found = None, [], [], (last_seen is None)
+                iterator = reversed(data_store)
+                for item in iterator:
+                    newest = item if newest is None else newest
+                    if item is last_seen:
+                        found = True
+                        break
+                    new_items.append(item)
+                if collect and found and last_seen is not None and unwritten > 0:
+                    old_items.append(last_seen)
+                    for item in iterator:
+                        if item is self._last_written or len(old_items) >= unwritten:
+                            break
+                        old_items.append(item)
+                break
+            except RuntimeError:    # Data store was appended to during the walk
+                continue
+        
+        lost = (unwritten - len(old_items)) if (collect and found) else 0
+        if not found and getattr(data_store, 'maxlen', None) is not None and len(new_items) >= data_store.maxlen:
+            logger.warning("Data store overflowed between checks, dropping samples that could not be counted")
+            lost = unwritten
+        elif not found:
+            logger.warning("Data store was cleared while recording to disk")
+            self._written = self._appended
+        if lost:
+            logger.warning(f"{lost} sample(s) were dropped before they could be written to disk")
+            self.lost_count += lost
+            self._written += lost
+        self._appended += len(new_items)
+        self._last_seen = newest if newest is not None else (last_seen if found else None)
+        return (new_items + old_items)[::-1]
+    
+    def _sync_file(self, path: Path, sync: bool):
+        """
+        Fsync a file to disk
+        
+        Args:
+            path (Path): path to file
+            sync (bool): whether to fsync the file
+        """
+        if not sync:
+            return
+        with open(path, 'rb+') as file:
+            os.fsync(file.fileno())
+        return
+    
+    def _write_manifest(self, sync: bool):
+        """
+        Atomically replace the manifest
+        
+        Args:
+            sync (bool): whether to fsync the manifest
+        """
+        path = self.directory / MANIFEST_FILENAME
+        temp_path = path.with_suffix('.tmp')
+        with open(temp_path, 'w') as file:
+            json.dump(self.manifest, file, indent=2)
+            if sync:
+                file.flush()
+                os.fsync(file.fileno())
+        os.replace(temp_path, path)
+        return
+
+
+class RecordReader:
+    """
+    Reader that lazily reassembles a recording session written by `RecordWriter`.
+    Segments are only read from disk when iterated over; `.npy` segments are memory-mapped.
+    
+    ### Constructor:
+        `directory` (Path|str): directory of the recording session
+        
+    ### Attributes and properties:
+        `directory` (Path): directory of the recording session
+        `manifest` (dict): manifest of the recording session
+        `fields` (tuple[str]): list of field names
+        
+    ### Methods:
+        `refresh`: reload the manifest
+        `iterSegments`: iterate over the segments as DataFrames
+        `to_dataframe`: reassemble the session into a single DataFrame
+    """
+    
+    def __init__(self, directory: Path|str):
+        """
+        Initialize RecordReader class
+        
+        Args:
+            directory (Path|str): directory of the recording session
+        """
+        self.directory = Path(directory)
+        self.manifest = dict()
+        self.refresh()
+        return
+    
+    def __iter__(self):
+        return self.iterSegments()
+    
+    def __len__(self) -> int:
+        return self.manifest.get('count', 0)
+    
+    @property
+    def fields(self) -> tuple[str]:
+        """List of field names"""
+        return tuple(self.manifest.get('fields', []))
+    
+    def refresh(self):
+        """Reload the manifest"""
+        with open(self.directory / MANIFEST_FILENAME) as file:
+            self.manifest = json.load(file)
+        return
+    
+    def iterSegments(self):
+        """
+        Iterate over the segments as DataFrames
+        
+        Yields:
+            pd.DataFrame: DataFrame of each segment
+        """
+        for segment in self.manifest.get('segments', []):
+            path = self.directory / segment['name']
+            if self.manifest.get('format') == 'csv':
+                df = pd.read_csv(path, parse_dates=['timestamp'])
+                yield df[['timestamp', *self.fields]]
+                continue
+            data = {'timestamp': np.load(path / 'timestamp.npy', mmap_mode='r').view('datetime64[ns]')}
+            data.update({field: np.load(path / f"{field}.npy", mmap_mode='r') for field in self.fields})
+            yield pd.DataFrame(data, copy=False)
+    
+    def to_dataframe(self) -> pd.DataFrame:
+        """
+        Reassemble the session into a single DataFrame
+        
+        Returns:
+            pd.DataFrame: DataFrame object
+        """
+        segments = list(self.iterSegments())
+        if not len(segments):
+            return pd.DataFrame(columns=['timestamp', *self.fields])
+        return pd.concat(segments, ignore_index=True)
+
+
 def get_dataframe(data_store:Iterable[tuple[NamedTuple,datetime]], fields:Iterable[str]) -> pd.DataFrame:
     """ 
     Convert a list of tuples to a pandas DataFrame.
@@ -43,6 +931,8 @@ def get_dataframe(data_store:Iterable[tuple[NamedTuple,datetime]], fields:Iterab
     Returns:
         pd.DataFrame: DataFrame object
     """
+    if isinstance(data_store, ColumnStore):
+        return data_store.to_dataframe()
     try:
         data,timestamps = list([x for x in zip(*data_store)])
     except ValueError:
@@ -61,7 +951,9 @@ def record(
     split_stream: bool = True,
     callback: Callable[[str],Any]|None = None,
     query: Any|None = None,
-    event: threading.Event|None = None
+    event: threading.Event|None = None,
+    batch: bool = False,
+    writer: RecordWriter|None = None
 ):
     """ 
     Record data from a streaming device.
@@ -75,6 +967,8 @@ def record(
         split_stream (bool, optional): whether to split the stream and data processing threads. Defaults to True.
         query (Any|None, optional): query to pass to the streaming device. Defaults to None.
         event (threading.Event | None, optional): event to set or clear. Defaults to None.
+        batch (bool, optional): whether to process the streamed data in batches. Defaults to False.
+        writer (RecordWriter|None, optional): background writer to persist the data store while recording. Defaults to None.
     """
     if clear_cache:
         data_store.clear()
@@ -83,9 +977,12 @@ def record(
     
     device.stopStream()
     time.sleep(0.1)
+    if isinstance(writer, RecordWriter) and not on:
+        writer.stop()
     if on:
-        device.startStream(data=device.processInput(query), buffer=data_store, split_stream=split_stream, callback=callback)
+        device.startStream(data=device.processInput(query), buffer=data_store, split_stream=split_stream, callback=callback, batch=batch)
         device.showStream(show)
+        _ = writer.start() if isinstance(writer, RecordWriter) else None
     return
 
 def stream( 
@@ -97,7 +994,8 @@ def stream(
     split_stream: bool = True,
     callback: Callable[[str],Any]|None = None,
     query: Any|None = None,
-    event: threading.Event|None = None
+    event: threading.Event|None = None,
+    batch: bool = False
 ):
     """
     Stream data from a streaming device.
@@ -110,11 +1008,12 @@ def stream(
         split_stream (bool, optional): whether to split the stream and data processing threads. Defaults to True.
         query (Any|None, optional): query to pass to the streaming device. Defaults to None.
         event (threading.Event | None, optional): event to set or clear. Defaults to None.
+        batch (bool, optional): whether to process the streamed data in batches. Defaults to False.
     """
     if isinstance(event, threading.Event):
         _ = event.set() if on else event.clear()
     if on:
-        device.startStream(data=device.processInput(query), buffer=data_store, split_stream=split_stream, callback=callback)
+        device.startStream(data=device.processInput(query), buffer=data_store, split_stream=split_stream, callback=callback, batch=batch)
         device.showStream(show)
     else:
         device.stopStream()
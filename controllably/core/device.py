@@ -6,6 +6,7 @@ Attributes:
     READ_FORMAT (str): default read format for device connections
     WRITE_FORMAT (str): default write format for device connections
     Data (NamedTuple): default data type for device connections
+    PARSER_CACHE_SIZE (int): maximum number of compiled output parsers to cache
 
 ## Classes:
     `Device`: Protocol for device connection classes
@@ -14,6 +15,10 @@ Attributes:
     `BaseDevice`: Base class for device connections
     `SerialDevice`: Class for serial device connections
     `SocketDevice`: Class for socket device connections
+    `OutputParser`: Compiled parser for device output
+
+## Functions:
+    `get_output_parser`: Get a cached compiled parser for a read format and data type
 
 <i>Documentation last updated: 2025-02-22</i>
 """
@@ -22,8 +27,10 @@ from __future__ import annotations
 from collections import deque
 from copy import deepcopy
 from datetime import datetime
+import functools
 import logging
 import queue
+import re
 import socket
 from string import Formatter
 import threading
@@ -32,6 +39,7 @@ from types import SimpleNamespace
 from typing import Any, NamedTuple, Protocol, Callable
 
 # Third party imports
+import numpy as np
 import parse
 import serial
 
@@ -42,6 +50,214 @@ logger = logging.getLogger(__name__)
 READ_FORMAT = "{data}\n"
 WRITE_FORMAT = "{data}\n"
 Data = NamedTuple("Data", [("data", str)])
+PARSER_CACHE_SIZE = 128
+
+class OutputParser:
+    """
+    OutputParser compiles a read format and data type into a reusable parser
+    
+    ### Constructor:
+        `format_out` (str): format for the data
+        `data_type` (NamedTuple): data type for the data
+        
+    ### Attributes and properties:
+        `format_out` (str): format for the data
+        `data_type` (NamedTuple): data type for the data
+        `pattern` (parse.Parser): compiled parse pattern
+        `regex` (re.Pattern|None): line-anchored regular expression for batch parsing, if the format supports it
+        `converters` (tuple[tuple[str,type,Callable]]): field name, field type and converter for each field
+        
+    ### Methods:
+        `convert`: convert parsed fields into the data type
+        `parse`: parse the data into the data type
+        `parseBatch`: parse a batch of data into typed columns
+    """
+    
+    def __init__(self, format_out:str, data_type:NamedTuple):
+        """
+        Initialize OutputParser class
+        
+        Args:
+            format_out (str): format for the data
+            data_type (NamedTuple): data type for the data
+        """
+        fields = set([field for _, field, _, _ in Formatter().parse(format_out) if field and not field.startswith('_')])
+        assert set(data_type._fields) == fields, "Ensure data type fields match read format fields"
+        self.format_out = format_out
+        self.data_type = data_type
+        self.pattern = parse.compile(format_out)
+        self.regex = self._compile_regex(format_out)
+        self.converters = tuple(
+            (key, value, self._get_converter(value)) for key, value in data_type.__annotations__.items()
+        )
+        return
+    
+    def convert(self, named: dict[str, Any]) -> NamedTuple:
+        """
+        Convert parsed fields into the data type
+        
+        Args:
+            named (dict[str, Any]): parsed fields
+            
+        Returns:
+            NamedTuple: converted data
+            
+        Raises:
+            ValueError: if a field cannot be converted to its type
+        """
+        values = []
+        for key, value, converter in self.converters:
+            try:
+                values.append(converter(named[key]))
+            except ValueError:
+                raise ValueError(f"Failed to convert {key}: {named[key]} to type {value}")
+        return self.data_type._make(values)
+    
+    def parse(self, data: str) -> NamedTuple|None:
+        """
+        Parse the data into the data type
+        
+        Args:
+            data (str): data to parse
+            
+        Returns:
+            NamedTuple|None: parsed data, or None if the data does not match the format
+            
+        Raises:
+            TypeError: if data is not a string
+            ValueError: if a field cannot be converted to its type
+        """
+        parse_out = self.pattern.parse(data)
+        if parse_out is None:
+            return None
+        return self.convert(parse_out.named)
+    
+    def parseBatch(self, data: list[str]) -> tuple[list[int], dict[str, np.ndarray]]:
+        """
+        Parse a batch of data into typed columns
+        
+        Args:
+            data (list[str]): data to parse
+            
+        Returns:
+            tuple[list[int], dict[str, np.ndarray]]: indices of the data that matched the format, and the typed columns
+            
+        Raises:
+            TypeError: if the format does not support batch parsing, or data contains non-string items
+            ValueError: if a field cannot be converted to its type
+        """
+        if self.regex is None:
+            raise TypeError("Format does not support batch parsing")
+        if not all(isinstance(line, str) and '\n' not in line for line in data):
+            raise TypeError("Ensure batch data are single-line strings")
+        offsets = dict()
+        offset = 0
+        for index, line in enumerate(data):
+            offsets[offset] = index
+            offset += len(line) + 1
+        indices = []
+        raw_columns = {key: [] for key,_,_ in self.converters}
+        for match in self.regex.finditer('\n'.join(data)):
+            indices.append(offsets[match.start()])
+            for key, values in raw_columns.items():
+                values.append(match.group(key))
+        columns = dict()
+        for key, value, converter in self.converters:
+            try:
+                columns[key] = self._convert_column(raw_columns[key], value, converter)
+            except ValueError:
+                raise ValueError(f"Failed to convert {key} to type {value}")
+        return indices, columns
+    
+    @staticmethod
+    def _compile_regex(format_out: str) -> re.Pattern|None:
+        """
+        Compile a line-anchored regular expression for the format
+        
+        Args:
+            format_out (str): format for the data
+            
+        Returns:
+            re.Pattern|None: compiled regular expression, or None if the format uses format specs, conversions, anonymous or repeated fields
+        """
+        expression = ''
+        names = set()
+        for literal, field, spec, conversion in Formatter().parse(format_out):
+            expression += re.escape(literal)
+            if field is None:
+                continue
+            if not field.isidentifier() or spec or conversion or field in names:
+                return None
+            names.add(field)
+            expression += f"(?P<{field}>.+?)"
+        return re.compile(f"^{expression}$", re.MULTILINE|re.IGNORECASE)
+    
+    @staticmethod
+    def _convert_column(values: list[str], value: type, converter: Callable[[Any], Any]) -> np.ndarray:
+        """
+        Convert a column of strings to the field type
+        
+        Args:
+            values (list[str]): column of strings
+            value (type): field type
+            converter (Callable[[Any], Any]): converter for a single value
+            
+        Returns:
+            np.ndarray: typed column
+        """
+        column = np.array(values, dtype=str)
+        if value is int:
+            try:
+                return column.astype(np.int64)
+            except ValueError:
+                return column.astype(np.float64).astype(np.int64)
+        if value is float:
+            return column.astype(np.float64)
+        if value is bool:
+            return ~np.isin(np.char.lower(column), ['false', '0', 'no'])
+        if value is str:
+            return column
+        return np.array([converter(v) for v in values], dtype=object)
+    
+    @staticmethod
+    def _get_converter(value: type) -> Callable[[Any], Any]:
+        """
+        Get the converter for a field type
+        
+        Args:
+            value (type): field type
+            
+        Returns:
+            Callable[[Any], Any]: converter function
+        """
+        if value is int:
+            def converter(field: Any) -> int:
+                if isinstance(field, str) and not field.isnumeric():
+                    field = float(field)
+                return int(field)
+            return converter
+        if value is bool:
+            def converter(field: Any) -> bool:
+                if isinstance(field, str):
+                    return field.lower() not in ['false', '0', 'no']
+                return bool(field)
+            return converter
+        return value
+
+@functools.lru_cache(maxsize=PARSER_CACHE_SIZE)
+def get_output_parser(format_out:str, data_type:NamedTuple) -> OutputParser:
+    """
+    Get a cached compiled parser for a read format and data type
+    
+    Args:
+        format_out (str): format for the data
+        data_type (NamedTuple): data type for the data
+        
+    Returns:
+        OutputParser: compiled parser
+    """
+    return OutputParser(format_out, data_type)
+
 
 class Device(Protocol):
     """Protocol for device connection classes"""
@@ -291,8 +507,7 @@ class BaseDevice:
         self.read_format = read_format
         self.write_format = write_format
         self.eol = self.read_format.replace(self.read_format.rstrip(), '')
-        fields = set([field for _, field, _, _ in Formatter().parse(read_format) if field and not field.startswith('_')])
-        assert set(data_type._fields) == fields, "Ensure data type fields match read format fields"
+        get_output_parser(read_format.strip(), data_type)
         
         # Streaming attributes
         self.buffer = deque()
@@ -531,38 +746,21 @@ class BaseDevice:
         format_out = format_out or self.read_format
         format_out = format_out.strip()
         data_type = data_type or self.data_type
-        fields = set([field for _, field, _, _ in Formatter().parse(format_out) if field and not field.startswith('_')])
-        assert set(data_type._fields) == fields, "Ensure data type fields match read format fields"
+        parser = get_output_parser(format_out, data_type)
         
         try:
-            parse_out = parse.parse(format_out, data)
+            processed_data = parser.parse(data)
         except TypeError:
             if data:
                 self._logger.warning(f"Failed to parse data: {data!r}")
-            # self.clearDeviceBuffer()
-            # time.sleep(0.01)
             return None, timestamp
-        if parse_out is None:
+        except ValueError as e:
+            self._logger.warning(e)
+            return None, timestamp
+        if processed_data is None:
             if data:
                 self._logger.warning(f"Failed to parse data: {data!r}")
-            # self.clearDeviceBuffer()
-            # time.sleep(0.01)
             return None, timestamp
-        parsed = {k:v for k,v in parse_out.named.items() if not k.startswith('_')}
-        for key, value in data_type.__annotations__.items():
-            try:
-                if value is int and not parsed[key].isnumeric():
-                    parsed[key] = float(parsed[key])
-                elif value is bool:
-                    parsed[key] = parsed[key].lower() not in ['false', '0', 'no']
-                parsed[key] = value(parsed[key])
-            except ValueError:
-                self._logger.warning(f"Failed to convert {key}: {parsed[key]} to type {value}")
-                # self.clearDeviceBuffer()
-                # time.sleep(0.01)
-                # parsed[key] = None
-                return None ,timestamp
-        processed_data = data_type(**parsed) 
         
         if self.show_event.is_set():
             print(processed_data)
@@ -646,7 +844,8 @@ class BaseDevice:
         show: bool = False,
         sync_start: threading.Barrier|None = None,
         split_stream: bool = True,
-        callback: Callable[[str],Any]|None = None
+        callback: Callable[[str],Any]|None = None,
+        batch: bool = False
     ):
         """
         Start the stream
@@ -660,6 +859,7 @@ class BaseDevice:
             sync_start (threading.Barrier|None, optional): synchronization barrier. Defaults to None.
             split_stream (bool, optional): whether to split the stream and data processing threads. Defaults to True.
             callback (Callable[[str],Any]|None, optional): callback function to call with the streamed data. Defaults to None.
+            batch (bool, optional): whether to process all pending data in batches. Only applies when split_stream is True. Defaults to False.
         """
         sync_start = sync_start or threading.Barrier(2, timeout=2)
         assert isinstance(sync_start, threading.Barrier), "Ensure sync_start is a threading.Barrier"
@@ -676,7 +876,7 @@ class BaseDevice:
             )
             self.threads['process'] = threading.Thread(
                 target=self._loop_process_data, 
-                kwargs=dict(buffer=buffer, format_out=format_out, data_type=data_type, sync_start=sync_start), 
+                kwargs=dict(buffer=buffer, format_out=format_out, data_type=data_type, sync_start=sync_start, batch=batch), 
                 daemon=True
             )
         else:
@@ -708,6 +908,7 @@ class BaseDevice:
         sync_start:threading.Barrier|None = None,
         split_stream: bool = True,
         callback: Callable[[str],Any]|None = None,
+        batch: bool = False,
         **kwargs
     ):
         """
@@ -720,14 +921,16 @@ class BaseDevice:
             sync_start (threading.Barrier|None, optional): synchronization barrier. Defaults to None.
             split_stream (bool, optional): whether to split the stream and data processing threads. Defaults to True.
             callback (Callable[[str],Any]|None, optional): callback function to call with the streamed data. Defaults to None.
+            batch (bool, optional): whether to process all pending data in batches. Defaults to False.
         """
-        return self.startStream(data=data, buffer=buffer, sync_start=sync_start, split_stream=split_stream, callback=callback, **kwargs) if on else self.stopStream()
+        return self.startStream(data=data, buffer=buffer, sync_start=sync_start, split_stream=split_stream, callback=callback, batch=batch, **kwargs) if on else self.stopStream()
     
     def _loop_process_data(self, 
         buffer: deque|None = None,
         format_out: str|None = None, 
         data_type: NamedTuple|None = None, 
-        sync_start: threading.Barrier|None = None
+        sync_start: threading.Barrier|None = None,
+        batch: bool = False
     ):
         """ 
         Process the data
@@ -737,15 +940,22 @@ class BaseDevice:
             format_out (str|None, optional): format for the data. Defaults to None.
             data_type (NamedTuple|None, optional): data type for the data. Defaults to None.
             sync_start (threading.Barrier|None, optional): synchronization barrier. Defaults to None.
+            batch (bool, optional): whether to process all pending data in batches. Defaults to False.
         """
         if buffer is None:
             buffer = self.buffer
-        assert isinstance(buffer, deque), "Ensure buffer is a deque"
+        assert isinstance(buffer, deque) or hasattr(buffer, "extendColumns"), "Ensure buffer is a deque or a columnar data store"
         if isinstance(sync_start, threading.Barrier):
             sync_start.wait()
         
         while self.stream_event.is_set():
             try:
+                if batch:
+                    items = self._get_pending_data(timeout=5)
+                    self._process_batch(items, buffer=buffer, format_out=format_out, data_type=data_type)
+                    for _ in items:
+                        self.data_queue.task_done()
+                    continue
                 out, now = self.data_queue.get(timeout=5)
                 out, now = self.processOutput(out, format_out=format_out, data_type=data_type, timestamp=now)
                 if out is not None:
@@ -761,6 +971,12 @@ class BaseDevice:
         
         while self.data_queue.qsize() > 0:
             try:
+                if batch:
+                    items = self._get_pending_data(timeout=1)
+                    self._process_batch(items, buffer=buffer, format_out=format_out, data_type=data_type)
+                    for _ in items:
+                        self.data_queue.task_done()
+                    continue
                 out, now = self.data_queue.get(timeout=1)
                 out, now = self.processOutput(out, format_out=format_out, data_type=data_type, timestamp=now)
                 if out is not None:
@@ -773,6 +989,79 @@ class BaseDevice:
         self.data_queue.join()
         return
     
+    def _get_pending_data(self, timeout: int|float = 5) -> list[tuple[str, datetime]]:
+        """
+        Wait for data in the data queue, then drain everything pending
+        
+        Args:
+            timeout (int|float, optional): timeout for the first item. Defaults to 5.
+            
+        Returns:
+            list[tuple[str, datetime]]: pending raw data and timestamps
+            
+        Raises:
+            queue.Empty: if no data arrives within the timeout
+        """
+        items = [self.data_queue.get(timeout=timeout)]
+        while True:
+            try:
+                items.append(self.data_queue.get_nowait())
+            except queue.Empty:
+                break
+        return items
+    
+    def _process_batch(self, 
+        items: list[tuple[str, datetime]],
+        buffer: deque,
+        format_out: str|None = None, 
+        data_type: NamedTuple|None = None
+    ):
+        """
+        Process a batch of raw data and append the results to the buffer
+        
+        Buffers that provide `extendColumns(columns, timestamps)` receive the batch as typed columns;
+        otherwise the batch is appended as `(NamedTuple, datetime)` rows.
+        Falls back to processing each item individually if the batch cannot be parsed as a whole.
+        
+        Args:
+            items (list[tuple[str, datetime]]): raw data and timestamps
+            buffer (deque): buffer to store the processed data
+            format_out (str|None, optional): format for the data. Defaults to None.
+            data_type (NamedTuple|None, optional): data type for the data. Defaults to None.
+        """
+        format_out = (format_out or self.read_format).strip()
+        data_type = data_type or self.data_type
+        parser = get_output_parser(format_out, data_type)
+        raw_data, timestamps = zip(*items) if len(items) else ((),())
+        try:
+            indices, columns = parser.parseBatch(list(raw_data))
+        except (TypeError, ValueError) as e:
+            self._logger.debug(f"Processing batch individually: {e}")
+            for out, now in items:
+                out, now = self.processOutput(out, format_out=format_out, data_type=data_type, timestamp=now)
+                if out is not None:
+                    buffer.append((out, now))
+            return
+        if len(indices) < len(raw_data):
+            matched = set(indices)
+            for index, out in enumerate(raw_data):
+                if index not in matched and out:
+                    self._logger.warning(f"Failed to parse data: {out!r}")
+        if not len(indices):
+            return
+        timestamps = [timestamps[index] for index in indices]
+        if hasattr(buffer, 'extendColumns'):
+            buffer.extendColumns(columns, timestamps)
+            rows = None
+        else:
+            rows = [data_type._make(values) for values in zip(*[column.tolist() for column in columns.values()])]
+            buffer.extend(zip(rows, timestamps))
+        if self.show_event.is_set():
+            rows = rows or [data_type._make(values) for values in zip(*[column.tolist() for column in columns.values()])]
+            for row in rows:
+                print(row)
+        return
+    
     def _loop_stream(self,
         data:str|None = None, 
         sync_start:threading.Barrier|None = None,
@@ -798,7 +1087,7 @@ class BaseDevice:
         if not split_stream:
             if buffer is None:
                 buffer = self.buffer
-            assert isinstance(buffer, deque), "Ensure buffer is a deque"
+            assert isinstance(buffer, deque) or hasattr(buffer, "extendColumns"), "Ensure buffer is a deque or a columnar data store"
         if isinstance(sync_start, threading.Barrier):
             sync_start.wait()
         if not callable(callback):
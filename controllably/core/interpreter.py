@@ -1,40 +1,142 @@
 # -*- coding: utf-8 -*-
 """ 
-This module contains the `Interpreter` abstract class and its implementation `JSONInterpreter`.
+This module contains the `Interpreter` abstract class and its implementations `JSONInterpreter`, 
+`BinaryInterpreter` and `EnvelopeInterpreter`.
+
+Attributes:
+    COMPRESSION_CODECS (dict[str, tuple[int, Callable, Callable]]): compression codecs for `EnvelopeInterpreter`, with their IDs, keyed by name
 
 ## Classes:
     `Interpreter`: Abstract class for encoding and decoding messages.
     `JSONInterpreter`: Class for encoding and decoding messages in JSON format.
+    `BinaryInterpreter`: Class for encoding and decoding messages in a compact binary format.
+    `EnvelopeInterpreter`: Class for wrapping messages of another interpreter behind a routing header.
+    `Reference`: Reference to a `Well`, `Labware`, `Slot` or `Deck` decoded from a message.
 
 <i>Documentation last updated: 2025-06-11</i>
 """
 # Standard library imports
 from __future__ import annotations
 import ast
+import base64
+from collections import deque, namedtuple
+from datetime import datetime
+from functools import lru_cache, partial
+from io import StringIO
 import json
+import lzma
 import pickle
-from typing import Mapping, Any
+import struct
+import sys
+from typing import Callable, Iterable, Mapping, NamedTuple, Any
+import zlib
 
 # Third party imports
+import numpy as np
 import pandas as pd
+from scipy.spatial.transform import Rotation
 
 # Local application imports
-from .position import Position
+from .position import Deck, Labware, Position, PositionArray, Slot, Well
+
+COMPRESSION_CODECS: dict[str, tuple[int, Callable[[bytes], bytes], Callable[[bytes], bytes]]] = dict(
+    zlib = (1, zlib.compress, zlib.decompress),
+    lzma = (2, lzma.compress, lzma.decompress),
+)
+try:
+    import zstandard
+    COMPRESSION_CODECS['zstd'] = (3, zstandard.compress, zstandard.decompress)
+except ImportError:
+    pass
+try:
+    import lz4.frame
+    COMPRESSION_CODECS['lz4'] = (4, lz4.frame.compress, lz4.frame.decompress)
+except ImportError:
+    pass
+
+class Reference(NamedTuple):
+    """
+    Reference to a `Well`, `Labware`, `Slot` or `Deck`, decoded from a message in place of the object itself
+    
+    ### Attributes:
+        `type` (str): type of the referenced object
+        `name` (str): name of the referenced object
+        `lineage` (tuple[str, ...]): names of the parents of the object, outermost first
+        `center` (tuple[float, ...]|None): center of the object when it was encoded
+    """
+    
+    type: str
+    name: str
+    lineage: tuple[str, ...] = ()
+    center: tuple[float, ...]|None = None
 
 class Interpreter:
     """
     Abstract class for encoding and decoding messages.
     
+    Types that a format cannot encode natively are encoded as extension types, shared by all interpreters. 
+    An extension type has an encoder that converts an instance into natively encodable values, and a 
+    decoder that converts these values back. NumPy arrays and scalars, NamedTuples, `datetime`, `deque`, 
+    `Position`, `PositionArray`, pandas objects, and references to `Well`, `Labware`, `Slot` and `Deck` are registered by default.
+    
+    ### Attributes:
+        `extensions` (dict[str, tuple[type, Callable, Callable]]): extension types, with their encoders and decoders, keyed by name
+    
     ### Methods:
+        `registerExtension`: Register an extension type.
+        `findExtension`: Find the name of the extension type of a value.
         `decodeRequest`: Decode a request message into a command dictionary.
         `encodeData`: Encode data into a message.
         `encodeRequest`: Encode a command dictionary into a request message.
         `decodeData`: Decode a message into data.
+        `decodeRequestHeader`: Decode the routing fields of a request message.
+        `decodeDataHeader`: Decode the routing fields of a data message.
     """
     
+    extensions: dict[str, tuple[type, Callable[[Any], Any], Callable[[Any], Any]]] = dict()
+    
     def __init__(self):
         return
     
+    @classmethod
+    def registerExtension(cls, 
+        name: str, 
+        type_: type, 
+        encoder: Callable[[Any], Any], 
+        decoder: Callable[[Any], Any]
+    ):
+        """
+        Register an extension type. The encoder converts an instance of the type into 
+        encodable values, and the decoder converts these values back into an instance.
+        
+        Args:
+            name (str): name of the extension type, at most 255 bytes when UTF-8 encoded
+            type_ (type): the type to encode
+            encoder (Callable[[Any], Any]): function to convert an instance into encodable values
+            decoder (Callable[[Any], Any]): function to convert decoded values into an instance
+        """
+        assert len(name.encode('utf-8')) < 256, f"Extension name too long: {name}"
+        cls.extensions[name] = (type_, encoder, decoder)
+        return
+    
+    @classmethod
+    def findExtension(cls, value: Any) -> str|None:
+        """
+        Find the name of the extension type of a value. NamedTuples are matched before their registered types.
+        
+        Args:
+            value (Any): the value to encode
+            
+        Returns:
+            str|None: name of the extension type, or None if the type is not registered
+        """
+        if isinstance(value, tuple) and hasattr(value, '_fields'):
+            return 'namedtuple'
+        for name,(type_,_,_) in cls.extensions.items():
+            if isinstance(value, type_):
+                return name
+        return None
+    
     @staticmethod
     def decodeRequest(packet: str|bytes) -> dict[str, Any]:
         """
@@ -91,11 +193,45 @@ class Interpreter:
         data = packet
         return data
     
+    def decodeRequestHeader(self, packet: str|bytes) -> dict[str, Any]:
+        """
+        Decode the routing fields (`address`, `request_id`, `reply_id`) of a request message. 
+        Interpreters without a routing header decode the whole message.
+        
+        Args:
+            packet (str|bytes): request message
+            
+        Returns:
+            dict[str, Any]: dictionary with at least the routing fields present in the message
+        """
+        return self.decodeRequest(packet)
+    
+    def decodeDataHeader(self, packet: str|bytes) -> dict[str, Any]:
+        """
+        Decode the routing fields (`address`, `request_id`, `reply_id`) of a data message. 
+        Interpreters without a routing header decode the whole message.
+        
+        Args:
+            packet (str|bytes): data message
+            
+        Returns:
+            dict[str, Any]: dictionary with at least the routing fields present in the message
+        """
+        return self.decodeData(packet)
+    
     
 class JSONInterpreter(Interpreter):
     """
     Class for encoding and decoding messages in JSON format.
     
+    Values that JSON cannot encode natively are encoded as tagged objects, `{"__ext__": name, "value": ...}`, 
+    using the extension types registered with `Interpreter.registerExtension`. Byte strings, and pickles of 
+    anything else as a last resort, are tagged and encoded in base64. Dictionaries with keys that are not 
+    strings are tagged and encoded as lists of key-value pairs. `Position`, `pd.DataFrame` and `pd.Series` 
+    values at the top level of the data are encoded as JSON strings. If the data still cannot be encoded, 
+    it is pickled as a whole. Requests never carry pickles, as decoding a pickle can run arbitrary code; 
+    values in requests must be of a JSON type or a registered extension type.
+    
     ### Methods:
         `decodeRequest`: Decode a request message into a command dictionary.
         `encodeData`: Encode data into a message.
@@ -103,6 +239,8 @@ class JSONInterpreter(Interpreter):
         `decodeData`: Decode a message into data
     """
     
+    TAG = '__ext__'
+    
     def __init__(self):
         return
     
@@ -117,7 +255,8 @@ class JSONInterpreter(Interpreter):
         Returns:
             dict[str, Any]: command dictionary
         """
-        command = json.loads(packet)
+        object_hook = partial(JSONInterpreter._object_hook, allow_pickle=False)
+        command = json.loads(bytes(packet) if isinstance(packet, memoryview) else packet, object_hook=object_hook)
         return command
     
     @staticmethod
@@ -139,11 +278,12 @@ class JSONInterpreter(Interpreter):
             elif isinstance(v, (pd.DataFrame, pd.Series)):
                 data[k] = v.to_json(orient='table')
         try:
-            packet = json.dumps(data).encode('utf-8')
-        except TypeError:
-            content = data.pop('data')
-            data.update(dict(pickled = str(pickle.dumps(content))))
-            packet = json.dumps(data).encode('utf-8')
+            packet = json.dumps(JSONInterpreter._prepare(data), default=JSONInterpreter._default).encode('utf-8')
+        except (TypeError, ValueError, RecursionError):
+            content = data.pop('data', None)
+            data = JSONInterpreter._prepare(data)
+            data['data'] = {JSONInterpreter.TAG: 'pickle', 'data': base64.b64encode(pickle.dumps(content)).decode('ascii')}
+            packet = json.dumps(data, default=JSONInterpreter._default).encode('utf-8')
         return packet
     
     @staticmethod
@@ -157,7 +297,8 @@ class JSONInterpreter(Interpreter):
         Returns:
             bytes: request message
         """
-        request = json.dumps(command).encode('utf-8')
+        default = partial(JSONInterpreter._default, allow_pickle=False)
+        request = json.dumps(JSONInterpreter._prepare(command), default=default).encode('utf-8')
         return request
     
     @staticmethod
@@ -171,8 +312,9 @@ class JSONInterpreter(Interpreter):
         Returns:
             dict[str, Any]: decoded data
         """
-        data: dict[str, Any] = json.loads(packet)
+        data: dict[str, Any] = json.loads(bytes(packet) if isinstance(packet, memoryview) else packet, object_hook=JSONInterpreter._object_hook)
         if 'data' not in data and 'pickled' in data:
+            # Messages from earlier versions pickle the data into the repr of a byte string
             pickled = data.pop('pickled')
             data.update(dict(data = pickle.loads(ast.literal_eval(pickled))))
         elif 'data' in data:
@@ -181,6 +323,790 @@ class JSONInterpreter(Interpreter):
                 if isinstance(v, str) and v.startswith('Position('):
                     data[k] = Position.fromJSON(v)
                 if isinstance(v, str) and v.startswith('{"schema":'):
-                    data[k] = pd.read_json(v, orient='table')
+                    data[k] = pd.read_json(StringIO(v), orient='table')
         return data
-    
\ No newline at end of file
+    
+    @staticmethod
+    def _prepare(value: Any) -> Any:
+        """
+        Tag the NamedTuples in a value, which JSON would otherwise encode as plain arrays, 
+        and the dictionaries with keys that are not strings, which JSON cannot encode
+        
+        Args:
+            value (Any): value to be encoded
+            
+        Returns:
+            Any: value with NamedTuples and dictionaries with non-string keys replaced by tagged objects
+        """
+        value_type = type(value)
+        if value_type in (str, int, float, bool) or value is None:
+            return value
+        elif value_type is dict:
+            if not all(type(k) is str for k in value):
+                items = [[JSONInterpreter._prepare(k), JSONInterpreter._prepare(v)] for k,v in value.items()]
+                return {JSONInterpreter.TAG: 'dict', 'items': items}
+            return {k: JSONInterpreter._prepare(v) for k,v in value.items()}
+        elif value_type is list or value_type is tuple:
+            return [JSONInterpreter._prepare(item) for item in value]
+        elif isinstance(value, tuple) and hasattr(value, '_fields'):
+            return JSONInterpreter._default(value)
+        return value
+    
+    @staticmethod
+    def _default(value: Any, allow_pickle: bool = True) -> dict[str, Any]:
+        """
+        Encode a value that JSON cannot encode natively as a tagged object
+        
+        Args:
+            value (Any): value to be encoded
+            allow_pickle (bool, optional): whether to pickle values of unregistered types. Defaults to True.
+            
+        Returns:
+            dict[str, Any]: tagged object
+        """
+        tag = JSONInterpreter.TAG
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            return {tag: 'bytes', 'data': base64.b64encode(value).decode('ascii')}
+        name = Interpreter.findExtension(value)
+        if name is None and not allow_pickle:
+            raise TypeError(f"Unable to encode {type(value).__name__} in a request. Register it with `Interpreter.registerExtension`")
+        elif name is None:
+            return {tag: 'pickle', 'data': base64.b64encode(pickle.dumps(value)).decode('ascii')}
+        encoder = Interpreter.extensions[name][1]
+        return {tag: name, 'value': JSONInterpreter._prepare(encoder(value))}
+    
+    @staticmethod
+    def _object_hook(obj: dict[str, Any], allow_pickle: bool = True) -> Any:
+        """
+        Decode a tagged object back into its value
+        
+        Args:
+            obj (dict[str, Any]): decoded JSON object
+            allow_pickle (bool, optional): whether to unpickle pickled values. Defaults to True.
+            
+        Returns:
+            Any: value of a tagged object, or the object itself
+        """
+        name = obj.get(JSONInterpreter.TAG)
+        if name is None or len(obj) != 2:
+            return obj
+        elif name == 'bytes':
+            return base64.b64decode(obj['data'])
+        elif name == 'pickle' and not allow_pickle:
+            raise ValueError("Pickled values are not accepted in requests. Register the type with `Interpreter.registerExtension`")
+        elif name == 'pickle':
+            return pickle.loads(base64.b64decode(obj['data']))
+        elif name == 'dict':
+            return {JSONInterpreter._to_key(k): v for k,v in obj['items']}
+        elif name not in Interpreter.extensions:
+            raise ValueError(f"Unknown extension type: {name}")
+        return Interpreter.extensions[name][2](obj['value'])
+    
+    @staticmethod
+    def _to_key(value: Any) -> Any:
+        """
+        Restore a decoded dictionary key, turning the lists that JSON decodes tuples into back into tuples
+        
+        Args:
+            value (Any): decoded key
+            
+        Returns:
+            Any: hashable key
+        """
+        if isinstance(value, list):
+            return tuple(JSONInterpreter._to_key(item) for item in value)
+        return value
+    
+
+class BinaryInterpreter(Interpreter):
+    """
+    Class for encoding and decoding messages in a compact binary format.
+    
+    Messages are length-prefixed envelopes of tagged values, similar to MessagePack. NumPy arrays and 
+    numeric DataFrame columns travel as raw buffers with dtype and shape headers, and are decoded 
+    without copying as read-only views onto the message. Other types travel as extension types, 
+    registered with `Interpreter.registerExtension`. Anything else is pickled as a last resort, except in 
+    requests, which never carry pickles as decoding a pickle can run arbitrary code.
+    
+    ### Methods:
+        `decodeRequest`: Decode a request message into a command dictionary.
+        `encodeData`: Encode data into a message.
+        `encodeRequest`: Encode a command dictionary into a request message.
+        `decodeData`: Decode a message into data
+    """
+    
+    MAGIC = b'CLB'
+    VERSION = 1
+    _header = struct.Struct('<3sBQ')
+    _length = struct.Struct('<I')
+    _int = struct.Struct('<q')
+    _float = struct.Struct('<d')
+    _alignment = 8
+    
+    def __init__(self):
+        return
+    
+    @staticmethod
+    def decodeRequest(packet: bytes) -> dict[str, Any]:
+        """
+        Decode a request message into a command dictionary.
+        
+        Args:
+            packet (bytes): request message
+            
+        Returns:
+            dict[str, Any]: command dictionary
+        """
+        return BinaryInterpreter._unpack_envelope(packet, allow_pickle=False)
+    
+    @staticmethod
+    def encodeData(data: Mapping[str, Any]) -> bytes:
+        """
+        Encode data into a message.
+        
+        Args:
+            data (Mapping[str, Any]): data to be encoded
+            
+        Returns:
+            bytes: encoded message
+        """
+        return BinaryInterpreter._pack_envelope(data)
+    
+    @staticmethod
+    def encodeRequest(command: Mapping[str, Any]) -> bytes:
+        """
+        Encode a command dictionary into a request message.
+        
+        Args:
+            command (Mapping[str, Any]): command dictionary
+            
+        Returns:
+            bytes: request message
+        """
+        return BinaryInterpreter._pack_envelope(command, allow_pickle=False)
+    
+    @staticmethod
+    def decodeData(packet: bytes) -> dict[str, Any]:
+        """
+        Decode a message into data. Arrays and numeric DataFrame columns in the data are read-only 
+        views onto the message; copy them before modifying in place.
+        
+        Args:
+            packet (bytes): message to be decoded
+            
+        Returns:
+            dict[str, Any]: decoded data
+        """
+        return BinaryInterpreter._unpack_envelope(packet)
+    
+    @staticmethod
+    def _pack_envelope(value: Any, allow_pickle: bool = True) -> bytes:
+        """
+        Pack a value into a message, prefixed with the header and length of the body
+        
+        Args:
+            value (Any): value to be packed
+            allow_pickle (bool, optional): whether to pickle values of unregistered types. Defaults to True.
+            
+        Returns:
+            bytes: message
+        """
+        cls = BinaryInterpreter
+        chunks = [b'']
+        offset = cls._pack(value, chunks, cls._header.size, allow_pickle)
+        chunks[0] = cls._header.pack(cls.MAGIC, cls.VERSION, offset - cls._header.size)
+        return b''.join(chunks)
+    
+    @staticmethod
+    def _unpack_envelope(packet: bytes|bytearray|memoryview, allow_pickle: bool = True) -> Any:
+        """
+        Unpack a message, checking its header and length
+        
+        Args:
+            packet (bytes|bytearray|memoryview): message to be unpacked
+            allow_pickle (bool, optional): whether to unpickle pickled values. Defaults to True.
+            
+        Returns:
+            Any: unpacked value
+        """
+        cls = BinaryInterpreter
+        view = memoryview(packet).cast('B')
+        if len(view) < cls._header.size:
+            raise ValueError(f"Message too short: {len(view)} bytes")
+        magic, version, length = cls._header.unpack_from(view)
+        if magic != cls.MAGIC or version != cls.VERSION:
+            raise ValueError(f"Unrecognised message header: {magic!r} v{version}")
+        if length != len(view) - cls._header.size:
+            raise ValueError(f"Message length mismatch: expected {length} bytes, got {len(view) - cls._header.size}")
+        value, _ = cls._unpack(view, cls._header.size, allow_pickle)
+        return value
+    
+    @staticmethod
+    def _pack(value: Any, chunks: list[bytes|np.ndarray], offset: int, allow_pickle: bool = True) -> int:
+        """
+        Pack a value, appending its chunks to the list
+        
+        Args:
+            value (Any): value to be packed
+            chunks (list[bytes|np.ndarray]): chunks of the message
+            offset (int): offset of the value in the message
+            allow_pickle (bool, optional): whether to pickle values of unregistered types. Defaults to True.
+            
+        Returns:
+            int: offset of the end of the value in the message
+        """
+        cls = BinaryInterpreter
+        if value is None:
+            chunks.append(b'N')
+            return offset + 1
+        elif isinstance(value, (bool, np.bool_)):
+            chunks.append(b'T' if value else b'F')
+            return offset + 1
+        elif isinstance(value, (int, np.integer)) and -2**63 <= value < 2**63:
+            chunks.append(b'i' + cls._int.pack(value))
+            return offset + 1 + cls._int.size
+        elif isinstance(value, int):
+            return cls._pack_bytes(b'I', str(value).encode('ascii'), chunks, offset)
+        elif isinstance(value, (float, np.floating)):
+            chunks.append(b'f' + cls._float.pack(value))
+            return offset + 1 + cls._float.size
+        elif isinstance(value, str):
+            return cls._pack_bytes(b's', value.encode('utf-8'), chunks, offset)
+        elif isinstance(value, (bytes, bytearray, memoryview)):
+            return cls._pack_bytes(b'b', value, chunks, offset)
+        elif isinstance(value, (list, tuple)) and not hasattr(value, '_fields'):
+            chunks.append((b'l' if isinstance(value, list) else b't') + cls._length.pack(len(value)))
+            offset += 1 + cls._length.size
+            for item in value:
+                offset = cls._pack(item, chunks, offset, allow_pickle)
+            return offset
+        elif isinstance(value, Mapping):
+            chunks.append(b'm' + cls._length.pack(len(value)))
+            offset += 1 + cls._length.size
+            for k,v in value.items():
+                offset = cls._pack(k, chunks, offset, allow_pickle)
+                offset = cls._pack(v, chunks, offset, allow_pickle)
+            return offset
+        elif isinstance(value, np.ndarray) and not value.dtype.hasobject and value.dtype.fields is None:
+            return cls._pack_array(value, chunks, offset)
+        
+        name = cls.findExtension(value)
+        if name is not None:
+            name_bytes = name.encode('utf-8')
+            chunks.append(b'x' + bytes([len(name_bytes)]) + name_bytes)
+            return cls._pack(cls.extensions[name][1](value), chunks, offset + 2 + len(name_bytes), allow_pickle)
+        if not allow_pickle:
+            raise TypeError(f"Unable to encode {type(value).__name__} in a request. Register it with `Interpreter.registerExtension`")
+        return cls._pack_bytes(b'p', pickle.dumps(value), chunks, offset)
+    
+    @staticmethod
+    def _pack_bytes(tag: bytes, value: bytes|bytearray|memoryview, chunks: list[bytes|np.ndarray], offset: int) -> int:
+        """
+        Pack a length-prefixed byte string
+        
+        Args:
+            tag (bytes): tag of the value
+            value (bytes|bytearray|memoryview): byte string to be packed
+            chunks (list[bytes|np.ndarray]): chunks of the message
+            offset (int): offset of the value in the message
+            
+        Returns:
+            int: offset of the end of the value in the message
+        """
+        length = memoryview(value).nbytes
+        chunks.append(tag + BinaryInterpreter._length.pack(length))
+        chunks.append(value)
+        return offset + 1 + BinaryInterpreter._length.size + length
+    
+    @staticmethod
+    def _pack_array(array: np.ndarray, chunks: list[bytes|np.ndarray], offset: int) -> int:
+        """
+        Pack an array as its dtype and shape, followed by its raw buffer aligned within the message
+        
+        Args:
+            array (np.ndarray): array to be packed
+            chunks (list[bytes|np.ndarray]): chunks of the message
+            offset (int): offset of the value in the message
+            
+        Returns:
+            int: offset of the end of the value in the message
+        """
+        dtype = array.dtype.str.encode('ascii')
+        header = b'a' + bytes([len(dtype)]) + dtype + bytes([array.ndim]) + struct.pack(f'<{array.ndim}Q', *array.shape)
+        offset += len(header)
+        padding = -offset % BinaryInterpreter._alignment
+        chunks.append(header + bytes(padding))
+        chunks.append(np.ascontiguousarray(array))
+        return offset + padding + array.nbytes
+    
+    @staticmethod
+    def _unpack(view: memoryview, offset: int, allow_pickle: bool = True) -> tuple[Any, int]:
+        """
+        Unpack a value from the message
+        
+        Args:
+            view (memoryview): view of the message
+            offset (int): offset of the value in the message
+            allow_pickle (bool, optional): whether to unpickle pickled values. Defaults to True.
+            
+        Returns:
+            tuple[Any, int]: unpacked value, and offset of the end of the value in the message
+        """
+        cls = BinaryInterpreter
+        tag = chr(view[offset])
+        offset += 1
+        if tag == 'N':
+            return None, offset
+        elif tag in 'TF':
+            return tag == 'T', offset
+        elif tag == 'i':
+            return cls._int.unpack_from(view, offset)[0], offset + cls._int.size
+        elif tag == 'f':
+            return cls._float.unpack_from(view, offset)[0], offset + cls._float.size
+        elif tag in 'sbIp':
+            length = cls._length.unpack_from(view, offset)[0]
+            offset += cls._length.size
+            value = view[offset:offset+length]
+            offset += length
+            if tag == 's':
+                return str(value, 'utf-8'), offset
+            elif tag == 'I':
+                return int(str(value, 'ascii')), offset
+            elif tag == 'p' and not allow_pickle:
+                raise ValueError("Pickled values are not accepted in requests. Register the type with `Interpreter.registerExtension`")
+            elif tag == 'p':
+                return pickle.loads(value), offset
+            return value.tobytes(), offset
+        elif tag in 'lt':
+            length = cls._length.unpack_from(view, offset)[0]
+            offset += cls._length.size
+            items = []
+            for _ in range(length):
+                item, offset = cls._unpack(view, offset, allow_pickle)
+                items.append(item)
+            return (items if tag == 'l' else tuple(items)), offset
+        elif tag == 'm':
+            length = cls._length.unpack_from(view, offset)[0]
+            offset += cls._length.size
+            mapping = dict()
+            for _ in range(length):
+                k, offset = cls._unpack(view, offset, allow_pickle)
+                mapping[k], offset = cls._unpack(view, offset, allow_pickle)
+            return mapping, offset
+        elif tag == 'a':
+            return cls._unpack_array(view, offset)
+        elif tag == 'x':
+            length = view[offset]
+            name = str(view[offset+1:offset+1+length], 'utf-8')
+            if name not in cls.extensions:
+                raise ValueError(f"Unknown extension type: {name}")
+            value, offset = cls._unpack(view, offset + 1 + length, allow_pickle)
+            return cls.extensions[name][2](value), offset
+        raise ValueError(f"Unknown tag {tag!r} at offset {offset-1}")
+    
+    @staticmethod
+    def _unpack_array(view: memoryview, offset: int) -> tuple[np.ndarray, int]:
+        """
+        Unpack an array as a read-only view onto the message
+        
+        Args:
+            view (memoryview): view of the message
+            offset (int): offset of the array header in the message, after the tag
+            
+        Returns:
+            tuple[np.ndarray, int]: unpacked array, and offset of the end of the array in the message
+        """
+        length = view[offset]
+        dtype = np.dtype(str(view[offset+1:offset+1+length], 'ascii'))
+        offset += 1 + length
+        ndim = view[offset]
+        shape = struct.unpack_from(f'<{ndim}Q', view, offset + 1)
+        offset += 1 + 8*ndim
+        offset += -offset % BinaryInterpreter._alignment
+        count = int(np.prod(shape, dtype=np.int64))
+        array = np.frombuffer(view, dtype=dtype, count=count, offset=offset) if count else np.empty(0, dtype=dtype)
+        return array.reshape(shape), offset + count*dtype.itemsize
+
+class EnvelopeInterpreter(Interpreter):
+    """
+    Class for wrapping the messages of another interpreter behind a small routing header, so that 
+    relays can route a message without decoding its payload. All controllers exchanging messages 
+    must use an `EnvelopeInterpreter` around the same interpreter.
+    
+    The header holds a fixed part (magic, version, compression codec, address counts, field lengths and 
+    payload length), followed by the sender and target addresses, the request ID and the reply ID as 
+    UTF-8 strings. The payload is the message encoded by the wrapped interpreter, aligned to 8 bytes, 
+    and is forwarded untouched.
+    
+    Payloads of at least `threshold` bytes are compressed with the first available codec in `compression`, 
+    and kept compressed only if smaller. The codec is flagged in the header of each message, so receivers 
+    decompress whatever they are sent, as long as the codec is available to them.
+    
+    ### Constructor:
+        `interpreter` (Interpreter|None, optional): interpreter for the payload. Defaults to `JSONInterpreter`.
+        `compression` (str|Iterable[str]|None, optional): compression codec, or codecs in order of preference. Defaults to None.
+        `threshold` (int, optional): minimum payload size in bytes to compress. Defaults to 1024.
+    
+    ### Attributes:
+        `interpreter` (Interpreter): interpreter for the payload
+        `compression` (str|None): name of the compression codec used, if any
+        `threshold` (int): minimum payload size in bytes to compress
+    
+    ### Methods:
+        `decodeRequest`: Decode a request message into a command dictionary.
+        `encodeData`: Encode data into a message.
+        `encodeRequest`: Encode a command dictionary into a request message.
+        `decodeData`: Decode a message into data
+        `decodeRequestHeader`: Decode the routing fields of a request message.
+        `decodeDataHeader`: Decode the routing fields of a data message.
+    """
+    
+    MAGIC = b'CLE'
+    VERSION = 2
+    _header = struct.Struct('<3sBBxHHHHQ')
+    _length = struct.Struct('<H')
+    _alignment = 8
+    
+    def __init__(self, 
+        interpreter: Interpreter|None = None, 
+        *, 
+        compression: str|Iterable[str]|None = None, 
+        threshold: int = 1024
+    ):
+        """
+        Initialize the EnvelopeInterpreter class
+        
+        Args:
+            interpreter (Interpreter|None, optional): interpreter for the payload. Defaults to `JSONInterpreter`.
+            compression (str|Iterable[str]|None, optional): compression codec, or codecs in order of preference. Defaults to None.
+            threshold (int, optional): minimum payload size in bytes to compress. Defaults to 1024.
+        """
+        interpreter = interpreter or JSONInterpreter()
+        assert isinstance(interpreter, Interpreter), f"Invalid interpreter: {interpreter}"
+        self.interpreter = interpreter
+        self.compression: str|None = None
+        self.threshold = threshold
+        
+        preferences = [compression] if isinstance(compression, str) else list(compression or [])
+        available = [name for name in preferences if name in COMPRESSION_CODECS]
+        if len(preferences) and not len(available):
+            raise ValueError(f"No available compression codec in {preferences}. Available: {list(COMPRESSION_CODECS)}")
+        if len(available):
+            self.compression = available[0]
+        return
+    
+    def decodeRequest(self, packet: bytes) -> dict[str, Any]:
+        """
+        Decode a request message into a command dictionary.
+        
+        Args:
+            packet (bytes): request message
+            
+        Returns:
+            dict[str, Any]: command dictionary
+        """
+        header, payload = self._unpack_envelope(packet)
+        return self.interpreter.decodeRequest(self._decompress(payload, header['codec']))
+    
+    def encodeData(self, data: Mapping[str, Any]) -> bytes:
+        """
+        Encode data into a message.
+        
+        Args:
+            data (Mapping[str, Any]): data to be encoded
+            
+        Returns:
+            bytes: encoded message
+        """
+        return self._pack_envelope(data, self.interpreter.encodeData(data), self._compress)
+    
+    def encodeRequest(self, command: Mapping[str, Any]) -> bytes:
+        """
+        Encode a command dictionary into a request message.
+        
+        Args:
+            command (Mapping[str, Any]): command dictionary
+            
+        Returns:
+            bytes: request message
+        """
+        return self._pack_envelope(command, self.interpreter.encodeRequest(command), self._compress)
+    
+    def decodeData(self, packet: bytes) -> dict[str, Any]:
+        """
+        Decode a message into data.
+        
+        Args:
+            packet (bytes): message to be decoded
+            
+        Returns:
+            dict[str, Any]: decoded data
+        """
+        header, payload = self._unpack_envelope(packet)
+        return self.interpreter.decodeData(self._decompress(payload, header['codec']))
+    
+    def decodeRequestHeader(self, packet: bytes) -> dict[str, Any]:
+        """
+        Decode the routing fields (`address`, `request_id`, `reply_id`) of a request message, without decoding the payload.
+        
+        Args:
+            packet (bytes): request message
+            
+        Returns:
+            dict[str, Any]: routing fields
+        """
+        header, _ = self._unpack_envelope(packet)
+        header.pop('codec')
+        return header
+    
+    def decodeDataHeader(self, packet: bytes) -> dict[str, Any]:
+        """
+        Decode the routing fields (`address`, `request_id`, `reply_id`) of a data message, without decoding the payload.
+        
+        Args:
+            packet (bytes): data message
+            
+        Returns:
+            dict[str, Any]: routing fields
+        """
+        header, _ = self._unpack_envelope(packet)
+        header.pop('codec')
+        return header
+    
+    def _compress(self, payload: bytes) -> tuple[int, bytes]:
+        """
+        Compress a payload if it is large enough, and if compressing makes it smaller
+        
+        Args:
+            payload (bytes): encoded payload
+            
+        Returns:
+            tuple[int, bytes]: ID of the codec used (0 if uncompressed), and the payload
+        """
+        if self.compression is None or len(payload) < self.threshold:
+            return 0, payload
+        codec_id, compress, _ = COMPRESSION_CODECS[self.compression]
+        compressed = compress(payload)
+        if len(compressed) >= len(payload):
+            return 0, payload
+        return codec_id, compressed
+    
+    @staticmethod
+    def _decompress(payload: memoryview, codec_id: int) -> memoryview|bytes:
+        """
+        Decompress a payload with the codec flagged in its header
+        
+        Args:
+            payload (memoryview): view of the payload
+            codec_id (int): ID of the codec (0 if uncompressed)
+            
+        Returns:
+            memoryview|bytes: decompressed payload
+        """
+        if codec_id == 0:
+            return payload
+        for _,(_id,_,decompress) in COMPRESSION_CODECS.items():
+            if _id == codec_id:
+                return decompress(payload)
+        raise ValueError(f"Unsupported compression codec ID: {codec_id}. Available: {list(COMPRESSION_CODECS)}")
+    
+    @staticmethod
+    def _pack_envelope(
+        content: Mapping[str, Any], 
+        payload: bytes, 
+        compress: Callable[[bytes], tuple[int, bytes]]|None = None
+    ) -> bytes:
+        """
+        Prefix an encoded payload with the routing header of its content
+        
+        Args:
+            content (Mapping[str, Any]): command or data dictionary
+            payload (bytes): encoded payload
+            compress (Callable[[bytes], tuple[int, bytes]]|None, optional): function to compress the payload, returning the codec ID. Defaults to None.
+            
+        Returns:
+            bytes: message
+        """
+        cls = EnvelopeInterpreter
+        codec_id, payload = compress(payload) if compress is not None else (0, payload)
+        address = content.get('address', {})
+        sender = [str(a).encode('utf-8') for a in address.get('sender', [])]
+        target = [str(a).encode('utf-8') for a in address.get('target', [])]
+        request_id = str(content.get('request_id', '')).encode('utf-8')
+        reply_id = str(content.get('reply_id', '')).encode('utf-8')
+        chunks = [cls._header.pack(cls.MAGIC, cls.VERSION, codec_id, len(sender), len(target), len(request_id), len(reply_id), len(payload))]
+        for a in sender + target:
+            chunks.append(cls._length.pack(len(a)) + a)
+        chunks.extend([request_id, reply_id])
+        offset = sum(len(chunk) for chunk in chunks)
+        chunks.extend([bytes(-offset % cls._alignment), payload])
+        return b''.join(chunks)
+    
+    @staticmethod
+    def _unpack_envelope(packet: bytes|bytearray|memoryview) -> tuple[dict[str, Any], memoryview]:
+        """
+        Split a message into its routing fields and its payload
+        
+        Args:
+            packet (bytes|bytearray|memoryview): message
+            
+        Returns:
+            tuple[dict[str, Any], memoryview]: routing fields with the codec ID, and view of the payload
+        """
+        cls = EnvelopeInterpreter
+        view = memoryview(packet).cast('B')
+        if len(view) < cls._header.size:
+            raise ValueError(f"Message too short: {len(view)} bytes")
+        magic, version, codec_id, n_sender, n_target, n_request_id, n_reply_id, n_payload = cls._header.unpack_from(view)
+        if magic != cls.MAGIC or version != cls.VERSION:
+            raise ValueError(f"Unrecognised message header: {magic!r} v{version}")
+        offset = cls._header.size
+        addresses = []
+        for _ in range(n_sender + n_target):
+            length = cls._length.unpack_from(view, offset)[0]
+            addresses.append(str(view[offset+2:offset+2+length], 'utf-8'))
+            offset += 2 + length
+        request_id = str(view[offset:offset+n_request_id], 'utf-8')
+        offset += n_request_id
+        reply_id = str(view[offset:offset+n_reply_id], 'utf-8')
+        offset += n_reply_id
+        offset += -offset % cls._alignment
+        if len(view) - offset != n_payload:
+            raise ValueError(f"Message length mismatch: expected {n_payload} bytes, got {len(view) - offset}")
+        header = dict(
+            address = dict(sender=addresses[:n_sender], target=addresses[n_sender:]),
+            request_id = request_id,
+            reply_id = reply_id,
+            codec = codec_id
+        )
+        return header, view[offset:]
+
+
+# Extension types
+def _encode_array(array: np.ndarray) -> dict[str, Any]:
+    if array.dtype.hasobject:
+        return dict(dtype='object', shape=array.shape, items=array.ravel().tolist())
+    dtype = array.dtype.str if array.dtype.fields is None else array.dtype.descr
+    return dict(dtype=dtype, shape=array.shape, data=np.ascontiguousarray(array).tobytes())
+
+def _decode_array(value: dict[str, Any]) -> np.ndarray:
+    shape = tuple(value['shape'])
+    if value['dtype'] == 'object':
+        array = np.empty(len(value['items']), dtype=object)
+        for i,item in enumerate(value['items']):
+            array[i] = item
+        return array.reshape(shape)
+    dtype = value['dtype']
+    dtype = np.dtype(dtype) if isinstance(dtype, str) else np.dtype([tuple(field) for field in dtype])
+    return np.frombuffer(value['data'], dtype=dtype).reshape(shape)
+
+def _encode_scalar(scalar: np.generic) -> tuple[str, Any]:
+    return scalar.dtype.str, scalar.item()
+
+def _decode_scalar(value: tuple[str, Any]) -> np.generic:
+    dtype, item = value
+    return np.array(item, dtype=np.dtype(dtype))[()]
+
+def _encode_namedtuple(value: NamedTuple) -> dict[str, Any]:
+    value_type = type(value)
+    return dict(module=value_type.__module__, name=value_type.__name__, fields=list(value._fields), values=list(value))
+
+def _decode_namedtuple(value: dict[str, Any]) -> NamedTuple:
+    fields = tuple(value['fields'])
+    value_type = getattr(sys.modules.get(value['module']), value['name'], None)
+    if not (isinstance(value_type, type) and issubclass(value_type, tuple) and getattr(value_type, '_fields', None) == fields):
+        value_type = _get_namedtuple_type(value['name'], fields)
+    return value_type(*value['values'])
+
+@lru_cache(maxsize=None)
+def _get_namedtuple_type(name: str, fields: tuple[str, ...]) -> type:
+    return namedtuple(name, fields)
+
+def _encode_deque(value: deque) -> dict[str, Any]:
+    return dict(items=list(value), maxlen=value.maxlen)
+
+def _decode_deque(value: dict[str, Any]) -> deque:
+    return deque(value['items'], value['maxlen'])
+
+def _encode_position(position: Position) -> tuple:
+    return tuple(map(float, position.coordinates)), tuple(position.Rotation.as_quat()), position.rotation_type, position.degrees
+
+def _decode_position(value: tuple) -> Position:
+    coordinates, quaternion, rotation_type, degrees = value
+    return Position(coordinates, Rotation.from_quat(quaternion), rotation_type, degrees)
+
+def _encode_position_array(positions: PositionArray) -> tuple:
+    return positions.coordinates, positions.Rotation.as_quat(), positions.rotation_type, positions.degrees
+
+def _decode_position_array(value: tuple) -> PositionArray:
+    coordinates, quaternions, rotation_type, degrees = value
+    return PositionArray(coordinates, Rotation.from_quat(quaternions), rotation_type, degrees)
+
+def _encode_reference(obj: Well|Labware|Slot|Deck) -> dict[str, Any]:
+    lineage = []
+    parent = obj.parent
+    while parent is not None:
+        lineage.insert(0, parent.name)
+        parent = getattr(parent, 'parent', None)
+    return dict(name=obj.name, lineage=lineage, center=tuple(map(float, obj.center)))
+
+def _decode_reference(type_name: str, value: dict[str, Any]) -> Reference:
+    center = tuple(value['center']) if value['center'] is not None else None
+    return Reference(type_name, value['name'], tuple(value['lineage']), center)
+
+def _encode_values(values: pd.Series|pd.Index) -> tuple[str, np.ndarray|list]:
+    dtype = values.dtype
+    if isinstance(dtype, np.dtype) and not dtype.hasobject:
+        return str(dtype), values.to_numpy(copy=False)
+    return str(dtype), values.tolist()
+
+def _decode_values(dtype: str, values: np.ndarray|list) -> np.ndarray|pd.api.extensions.ExtensionArray|list:
+    if isinstance(values, np.ndarray):
+        return values
+    try:
+        return pd.array(values, dtype=dtype)
+    except (TypeError, ValueError):
+        return values
+
+def _encode_index(index: pd.Index) -> dict[str, Any]:
+    if isinstance(index, pd.RangeIndex):
+        return dict(range=(index.start, index.stop, index.step), name=index.name)
+    dtype, values = _encode_values(index)
+    return dict(dtype=dtype, values=values, name=index.name)
+
+def _decode_index(value: dict[str, Any]) -> pd.Index:
+    if 'range' in value:
+        return pd.RangeIndex(*value['range'], name=value['name'])
+    values = _decode_values(value['dtype'], value['values'])
+    return pd.Index(values, name=value['name'], copy=False)
+
+def _encode_series(series: pd.Series) -> dict[str, Any]:
+    dtype, values = _encode_values(series)
+    return dict(dtype=dtype, values=values, index=series.index, name=series.name)
+
+def _decode_series(value: dict[str, Any]) -> pd.Series:
+    values = _decode_values(value['dtype'], value['values'])
+    return pd.Series(values, index=value['index'], name=value['name'], copy=False)
+
+def _encode_frame(frame: pd.DataFrame) -> dict[str, Any]:
+    columns = [_encode_values(column) for _,column in frame.items()]
+    return dict(columns=columns, names=frame.columns, index=frame.index)
+
+def _decode_frame(value: dict[str, Any]) -> pd.DataFrame:
+    columns = {i: _decode_values(dtype, values) for i,(dtype,values) in enumerate(value['columns'])}
+    frame = pd.DataFrame(columns, index=value['index'], copy=False)
+    frame.columns = value['names']
+    return frame
+
+Interpreter.registerExtension('ndarray', np.ndarray, _encode_array, _decode_array)
+Interpreter.registerExtension('numpy', np.generic, _encode_scalar, _decode_scalar)
+Interpreter.registerExtension('namedtuple', tuple, _encode_namedtuple, _decode_namedtuple)
+Interpreter.registerExtension('datetime', datetime, datetime.isoformat, datetime.fromisoformat)
+Interpreter.registerExtension('deque', deque, _encode_deque, _decode_deque)
+Interpreter.registerExtension('Position', Position, _encode_position, _decode_position)
+Interpreter.registerExtension('PositionArray', PositionArray, _encode_position_array, _decode_position_array)
+for _type in (Well, Labware, Slot, Deck):
+    Interpreter.registerExtension(_type.__name__, _type, _encode_reference, partial(_decode_reference, _type.__name__))
+Interpreter.registerExtension('DataFrame', pd.DataFrame, _encode_frame, _decode_frame)
+Interpreter.registerExtension('Series', pd.Series, _encode_series, _decode_series)
+Interpreter.registerExtension('Index', pd.Index, _encode_index, _decode_index)
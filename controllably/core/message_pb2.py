@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+# Generated by the protocol buffer compiler.  DO NOT EDIT!
+# source: message.proto
+"""Generated protocol buffer code."""
+from google.protobuf.internal import builder as _builder
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import symbol_database as _symbol_database
+# @@protoc_insertion_point(imports)
+
+_sym_db = _symbol_database.Default()
+
+
+
+
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\rmessage.proto\x12\x1b\x63ontrollably.core.messaging\"\xc7\x04\n\x07Request\x12\x17\n\nrequest_id\x18\x01 \x01(\tH\x00\x88\x01\x01\x12\x35\n\x07\x61\x64\x64ress\x18\x02 \x01(\x0b\x32$.controllably.core.messaging.Address\x12\x15\n\x08priority\x18\x03 \x01(\x08H\x01\x88\x01\x01\x12\x11\n\x04rank\x18\x04 \x01(\x05H\x02\x88\x01\x01\x12\x16\n\tobject_id\x18\x05 \x01(\tH\x03\x88\x01\x01\x12\x13\n\x06method\x18\x06 \x01(\tH\x04\x88\x01\x01\x12\x30\n\x04\x61rgs\x18\x07 \x03(\x0b\x32\".controllably.core.messaging.Value\x12@\n\x06kwargs\x18\x08 \x03(\x0b\x32\x30.controllably.core.messaging.Request.KwargsEntry\x12>\n\x05\x65xtra\x18\t \x03(\x0b\x32/.controllably.core.messaging.Request.ExtraEntry\x1aQ\n\x0bKwargsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\x31\n\x05value\x18\x02 \x01(\x0b\x32\".controllably.core.messaging.Value:\x02\x38\x01\x1aP\n\nExtraEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\x31\n\x05value\x18\x02 \x01(\x0b\x32\".controllably.core.messaging.Value:\x02\x38\x01\x42\r\n\x0b_request_idB\x0b\n\t_priorityB\x07\n\x05_rankB\x0c\n\n_object_idB\t\n\x07_method\"\xac\x03\n\x05Reply\x12\x15\n\x08reply_id\x18\x01 \x01(\tH\x00\x88\x01\x01\x12\x17\n\nrequest_id\x18\x02 \x01(\tH\x01\x88\x01\x01\x12\x35\n\x07\x61\x64\x64ress\x18\x03 \x01(\x0b\x32$.controllably.core.messaging.Address\x12\x15\n\x08priority\x18\x04 \x01(\x08H\x02\x88\x01\x01\x12\x11\n\x04rank\x18\x05 \x01(\x05H\x03\x88\x01\x01\x12\x13\n\x06status\x18\x06 \x01(\tH\x04\x88\x01\x01\x12\x30\n\x04\x64\x61ta\x18\x07 \x01(\x0b\x32\".controllably.core.messaging.Value\x12<\n\x05\x65xtra\x18\x08 \x03(\x0b\x32-.controllably.core.messaging.Reply.ExtraEntry\x1aP\n\nExtraEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\x31\n\x05value\x18\x02 \x01(\x0b\x32\".controllably.core.messaging.Value:\x02\x38\x01\x42\x0b\n\t_reply_idB\r\n\x0b_request_idB\x0b\n\t_priorityB\x07\n\x05_rankB\t\n\x07_status\")\n\x07\x41\x64\x64ress\x12\x0e\n\x06sender\x18\x01 \x03(\t\x12\x0e\n\x06target\x18\x02 \x03(\t\"\xe6\x03\n\x05Value\x12\x14\n\nnull_value\x18\x01 \x01(\x08H\x00\x12\x14\n\nbool_value\x18\x02 \x01(\x08H\x00\x12\x13\n\tint_value\x18\x03 \x01(\x12H\x00\x12\x15\n\x0b\x66loat_value\x18\x04 \x01(\x01H\x00\x12\x16\n\x0cstring_value\x18\x05 \x01(\tH\x00\x12\x15\n\x0b\x62ytes_value\x18\x06 \x01(\x0cH\x00\x12<\n\nlist_value\x18\x07 \x01(\x0b\x32&.controllably.core.messaging.ValueListH\x00\x12=\n\x0btuple_value\x18\x08 \x01(\x0b\x32&.controllably.core.messaging.ValueListH\x00\x12:\n\tmap_value\x18\t \x01(\x0b\x32%.controllably.core.messaging.ValueMapH\x00\x12\x39\n\x0b\x61rray_value\x18\n \x01(\x0b\x32\".controllably.core.messaging.ArrayH\x00\x12\x41\n\x0f\x65xtension_value\x18\x0b \x01(\x0b\x32&.controllably.core.messaging.ExtensionH\x00\x12\x17\n\rpickled_value\x18\x0c \x01(\x0cH\x00\x42\x06\n\x04kind\"?\n\tValueList\x12\x32\n\x06values\x18\x01 \x03(\x0b\x32\".controllably.core.messaging.Value\"p\n\x08ValueMap\x12\x30\n\x04keys\x18\x01 \x03(\x0b\x32\".controllably.core.messaging.Value\x12\x32\n\x06values\x18\x02 \x03(\x0b\x32\".controllably.core.messaging.Value\"3\n\x05\x41rray\x12\r\n\x05\x64type\x18\x01 \x01(\t\x12\r\n\x05shape\x18\x02 \x03(\x04\x12\x0c\n\x04\x64\x61ta\x18\x03 \x01(\x0c\"L\n\tExtension\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\x31\n\x05value\x18\x02 \x01(\x0b\x32\".controllably.core.messaging.Valueb\x06proto3')
+
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, globals())
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'message_pb2', globals())
+if _descriptor._USE_C_DESCRIPTORS == False:
+
+  DESCRIPTOR._options = None
+  _REQUEST_KWARGSENTRY._options = None
+  _REQUEST_KWARGSENTRY._serialized_options = b'8\001'
+  _REQUEST_EXTRAENTRY._options = None
+  _REQUEST_EXTRAENTRY._serialized_options = b'8\001'
+  _REPLY_EXTRAENTRY._options = None
+  _REPLY_EXTRAENTRY._serialized_options = b'8\001'
+  _REQUEST._serialized_start=47
+  _REQUEST._serialized_end=630
+  _REQUEST_KWARGSENTRY._serialized_start=405
+  _REQUEST_KWARGSENTRY._serialized_end=486
+  _REQUEST_EXTRAENTRY._serialized_start=488
+  _REQUEST_EXTRAENTRY._serialized_end=568
+  _REPLY._serialized_start=633
+  _REPLY._serialized_end=1061
+  _REPLY_EXTRAENTRY._serialized_start=488
+  _REPLY_EXTRAENTRY._serialized_end=568
+  _ADDRESS._serialized_start=1063
+  _ADDRESS._serialized_end=1104
+  _VALUE._serialized_start=1107
+  _VALUE._serialized_end=1593
+  _VALUELIST._serialized_start=1595
+  _VALUELIST._serialized_end=1658
+  _VALUEMAP._serialized_start=1660
+  _VALUEMAP._serialized_end=1772
+  _ARRAY._serialized_start=1774
+  _ARRAY._serialized_end=1825
+  _EXTENSION._serialized_start=1827
+  _EXTENSION._serialized_end=1903
+# @@protoc_insertion_point(module_scope)
@@ -8,6 +8,7 @@ Attributes:
 
 ## Classes:
     `Position`: represents a 3D position with orientation
+    `PositionArray`: represents a batch of 3D positions with orientations, for vectorised transforms
     `Well`: represents a single well in a Labware object
     `Labware`: represents a single Labware object
     `Slot`: represents a single Slot object on a Deck object or another Labware object (for stackable Labware)
@@ -324,6 +325,258 @@ class Position:
         return Position(coordinates, self.Rotation)
     
 
+@dataclass
+class PositionArray:
+    """
+    `PositionArray` represents a batch of 3D positions with orientations, for vectorised transforms
+
+    ### Constructor:
+        `_coordinates` (Sequence[Sequence[float]]|numpy.ndarray): array of shape (N,3) of X,Y,Z coordinates
+        `Rotation` (Rotation|None, optional): stacked scipy.spatial.transform.Rotation object of length N, or a single Rotation applied to all positions. Defaults to None.
+        `rotation_type` (str, optional): preferred representation of rotation (quaternion, matrix, angle_axis, euler, mrp). Defaults to 'euler'.
+        `degrees` (bool, optional): whether to use degrees for euler angles. Defaults to True.
+
+    ### Attributes and properties:
+        `coordinates` (numpy.ndarray): array of shape (N,3) of X,Y,Z coordinates
+        `degrees` (bool): whether to use degrees for euler angles
+        `Rotation` (Rotation): stacked scipy.spatial.transform.Rotation object
+        `rotation` (numpy.ndarray): rotations in preferred representation
+        `rotation_type` (str): preferred representation of rotation
+        `rot_matrix` (numpy.ndarray): array of shape (N,3,3) of rotation matrices
+        `x` (numpy.ndarray): X coordinates
+        `y` (numpy.ndarray): Y coordinates
+        `z` (numpy.ndarray): Z coordinates
+        `a` (numpy.ndarray): euler angles a (rotation about x-axis)
+        `b` (numpy.ndarray): euler angles b (rotation about y-axis)
+        `c` (numpy.ndarray): euler angles c (rotation about z-axis)
+    
+    ### Methods:
+        `fromJSON`: create a `PositionArray` object from string
+        `fromPositions`: create a `PositionArray` object from `Position` objects
+        `toJSON`: convert `PositionArray` to string
+        `toPositions`: convert `PositionArray` to a list of `Position` objects
+        `apply`: apply `PositionArray` to another `PositionArray` or `Position`
+        `invert`: invert vectors and rotations
+        `orientate`: orientate self by a rotation
+        `translate`: translate self by a vector, or by one vector per position
+    """
+    
+    _coordinates: Sequence[Sequence[float]]|np.ndarray
+    Rotation: Rotation|None = None
+    rotation_type: str = 'euler'
+    degrees: bool = True
+    
+    def __post_init__(self):
+        assert self.rotation_type in ['quaternion','matrix','angle_axis','euler','mrp'], f"Invalid rotation type: {self.rotation_type}"
+        coordinates = np.array(self._coordinates, dtype=float)
+        assert coordinates.ndim == 2 and coordinates.shape[1] == 3 and len(coordinates), "Please input an array of x,y,z coordinates"
+        self._coordinates = coordinates
+        if self.Rotation is None:
+            self.Rotation = Rotation.identity(len(coordinates))
+        assert isinstance(self.Rotation, Rotation), "Please input a Rotation object"
+        if self.Rotation.single:
+            self.Rotation = Rotation.from_quat(np.tile(self.Rotation.as_quat(), (len(coordinates),1)))
+        assert len(self.Rotation) == len(coordinates), "Please input one rotation per position"
+        return
+    
+    def __str__(self):
+        return f"{len(self)} positions | {self.rotation_type}"
+    
+    def __repr__(self):
+        return f"{self.coordinates}|{self.rotation}"
+    
+    def __len__(self) -> int:
+        return len(self._coordinates)
+    
+    def __iter__(self) -> Iterator[Position]:
+        return iter(self.toPositions())
+    
+    def __getitem__(self, key:int|slice|Sequence[int]|np.ndarray) -> Position|PositionArray:
+        if isinstance(key, (int,np.integer)):
+            return Position(self._coordinates[key], self.Rotation[key], self.rotation_type, self.degrees)
+        return PositionArray(self._coordinates[key], self.Rotation[key], self.rotation_type, self.degrees)
+    
+    def __eq__(self, value: PositionArray) -> bool:
+        if not isinstance(value, PositionArray) or len(value) != len(self):
+            return False
+        return np.allclose(self.coordinates, value.coordinates) and np.allclose(self.Rotation.as_quat(), value.Rotation.as_quat())
+    
+    @staticmethod
+    def fromJSON(value:str) -> PositionArray:
+        """
+        Create a `PositionArray` object from string
+
+        Args:
+            value (str): string representation of `PositionArray`
+
+        Returns:
+            PositionArray: `PositionArray` object
+        """
+        assert isinstance(value, str), "Please input a valid string"
+        details = json.loads(value)
+        order = details.get('order', 'xyzw')
+        if order not in ('wxyz', 'xyzw'):
+            raise ValueError(f"Invalid quaternion order: {order}")
+        rotation = Rotation.from_quat(details['quaternions'], scalar_first=(order == 'wxyz'))
+        return PositionArray(details['coordinates'], rotation)
+    
+    @staticmethod
+    def fromPositions(positions:Sequence[Position]) -> PositionArray:
+        """
+        Create a `PositionArray` object from `Position` objects
+
+        Args:
+            positions (Sequence[Position]): `Position` objects
+
+        Returns:
+            PositionArray: `PositionArray` object
+        """
+        assert len(positions) and all(isinstance(position, Position) for position in positions), "Please input a sequence of Position objects"
+        coordinates = [position.coordinates for position in positions]
+        rotation = Rotation.concatenate([position.Rotation for position in positions])
+        return PositionArray(coordinates, rotation, positions[0].rotation_type, positions[0].degrees)
+    
+    def toJSON(self, *, scalar_first: bool = False) -> str:
+        order = 'wxyz' if scalar_first else 'xyzw'
+        return json.dumps(dict(
+            coordinates = self._coordinates.tolist(),
+            quaternions = self.Rotation.as_quat(scalar_first=scalar_first).tolist(),
+            order = order
+        ))
+    
+    def toPositions(self) -> list[Position]:
+        """
+        Convert `PositionArray` to a list of `Position` objects
+
+        Returns:
+            list[Position]: `Position` objects
+        """
+        return [Position(coordinates, rotation, self.rotation_type, self.degrees) for coordinates,rotation in zip(self._coordinates, self.Rotation)]
+        
+    @property
+    def coordinates(self) -> np.ndarray[float]:
+        """Array of shape (N,3) of X,Y,Z coordinates"""
+        return self._coordinates.copy()
+    @coordinates.setter
+    def coordinates(self, value: Sequence[Sequence[float]]|np.ndarray[float]):
+        value = np.array(value, dtype=float)
+        assert value.shape == self._coordinates.shape, "Please input an array of x,y,z coordinates, one for each position"
+        self._coordinates = value
+        return
+    
+    @property
+    def rotation(self) -> np.ndarray:
+        """Rotations in preferred representation"""
+        if self.rotation_type == 'quaternion':
+            return self.Rotation.as_quat()
+        elif self.rotation_type == 'matrix':
+            return self.Rotation.as_matrix()
+        elif self.rotation_type == 'angle_axis':
+            return self.Rotation.as_rotvec()
+        elif self.rotation_type == 'euler':
+            return self.Rotation.as_euler('zyx', degrees=self.degrees)
+        elif self.rotation_type == 'mrp':
+            return self.Rotation.as_mrp()
+        raise ValueError(f"Invalid rotation type: {self.rotation_type}")
+    @rotation.setter
+    def rotation(self, value: Rotation):
+        assert isinstance(value, Rotation) and not value.single and len(value) == len(self), "Please input a Rotation object, one for each position"
+        self.Rotation = value
+        return
+    
+    @property
+    def rot_matrix(self) -> np.ndarray:
+        """Array of shape (N,3,3) of rotation matrices"""
+        return self.Rotation.as_matrix()
+    
+    @property
+    def x(self) -> np.ndarray:
+        """X coordinates"""
+        return self._coordinates[:,0].copy()
+    
+    @property
+    def y(self) -> np.ndarray:
+        """Y coordinates"""
+        return self._coordinates[:,1].copy()
+    
+    @property
+    def z(self) -> np.ndarray:
+        """Z coordinates"""
+        return self._coordinates[:,2].copy()
+    
+    @property
+    def a(self) -> np.ndarray:
+        """Euler angles a (rotation about x-axis)"""
+        return self.Rotation.as_euler('zyx', degrees=self.degrees)[:,2]
+    
+    @property
+    def b(self) -> np.ndarray:
+        """Euler angles b (rotation about y-axis)"""
+        return self.Rotation.as_euler('zyx', degrees=self.degrees)[:,1]
+    
+    @property
+    def c(self) -> np.ndarray:
+        """Euler angles c (rotation about z-axis)"""
+        return self.Rotation.as_euler('zyx', degrees=self.degrees)[:,0]
+    
+    def apply(self, other:PositionArray|Position) -> PositionArray:
+        """
+        Apply self to other `PositionArray` or `Position`, first translating and then orientating
+
+        Args:
+            other (PositionArray|Position): other `PositionArray`, or `Position` to be broadcast to each position
+
+        Returns:
+            PositionArray: other transformed by self
+        """
+        if isinstance(other, Position):
+            other = PositionArray(np.tile(other.coordinates, (len(self),1)), other.Rotation, other.rotation_type, other.degrees)
+        return other.translate(self._coordinates).orientate(self.Rotation)
+    
+    def invert(self) -> PositionArray:
+        """
+        Invert vectors and rotations
+
+        Returns:
+            PositionArray: inverted `PositionArray`
+        """
+        return PositionArray(-self._coordinates, self.Rotation.inv())
+    
+    def orientate(self, by:Rotation, inplace:bool = True) -> PositionArray:
+        """
+        Orientate self by a rotation, or by one rotation per position
+        
+        Args:
+            by (Rotation): rotation to orientate by
+            inplace (bool, optional): whether to update self in place. Defaults to True.
+            
+        Returns:
+            PositionArray: updated `PositionArray`, self if `inplace=True`
+        """
+        if inplace:
+            self.Rotation = by*self.Rotation
+            return self
+        rotation = by*self.Rotation
+        return PositionArray(self._coordinates, rotation)
+    
+    def translate(self, by:Sequence[float]|np.ndarray, inplace:bool = True) -> PositionArray:
+        """
+        Translate self by a vector, or by one vector per position
+        
+        Args:
+            by (Sequence[float]|numpy.ndarray): translation vector, or array of shape (N,3) of translation vectors
+            inplace (bool, optional): whether to update self in place. Defaults to True.
+            
+        Returns:
+            PositionArray: updated `PositionArray`, self if `inplace=True`
+        """
+        if inplace:
+            self.coordinates = self._coordinates + np.array(by)
+            return self
+        coordinates = self._coordinates + np.array(by)
+        return PositionArray(coordinates, self.Rotation)
+    
+
 @dataclass
 class Well:
     """
@@ -414,7 +667,10 @@ class Well:
     @property
     def center(self) -> np.ndarray:
         """Center of well base"""
-        return self.reference.coordinates + self.reference.Rotation.apply(self.offset)
+        index = self._get_index()
+        if index is None:
+            return self.reference.coordinates + self.reference.Rotation.apply(self.offset)
+        return self.parent._get_well_table().centers[index].copy()
      
     @property
     def bottom(self) -> np.ndarray:
@@ -429,11 +685,17 @@ class Well:
     @property
     def top(self) -> np.ndarray:
         """Top of well"""
-        return self.center + np.array((0,0,self.depth))
+        index = self._get_index()
+        if index is None:
+            return self.center + np.array((0,0,self.depth))
+        return self.parent._get_well_table().tops[index].copy()
     
     @property
     def base_area(self) -> float:
         """Base area in mm^2"""
+        index = self._get_index()
+        if index is not None and self.parent._well_table.base_areas[index] > 0:
+            return float(self.parent._well_table.base_areas[index])
         area = 0
         if self.shape == 'circular':
             area = np.pi/4 * self.dimensions[0]**2
@@ -486,6 +748,17 @@ class Well:
         """
         return self.top + np.array(offset)
     
+    def _get_index(self) -> int|None:
+        """
+        Get the index of the well in the coordinate tables of the parent Labware
+        
+        Returns:
+            int|None: index of the well, None if the well is not one of the wells of the parent Labware
+        """
+        if not isinstance(self.parent, Labware) or self.parent._wells.get(self.name) is not self:
+            return None
+        return self.parent._well_index.get(self.name)
+    
     def _draw(self, ax: plt.Axes, zoom_out:bool = False, **kwargs) -> matplotlib.patches.Patch|None:
         """
         Draw self on matplotlib axis
@@ -543,6 +816,11 @@ class Labware:
         `columns` (dict[int, list[str]]): columns and wells in columns
         `rows` (dict[str, list[str]]): rows and wells in rows
         `at` (SimpleNamespace): namespace of all Wells
+        `well_offsets` (numpy.ndarray): array of shape (W,3) of well offsets from Labware reference point, in the order of `wells`
+        `well_centers` (numpy.ndarray): array of shape (W,3) of well base centers, in the order of `wells`
+        `well_tops` (numpy.ndarray): array of shape (W,3) of well tops, in the order of `wells`
+        `well_depths` (numpy.ndarray): array of shape (W,) of well depths, in the order of `wells`
+        `well_base_areas` (numpy.ndarray): array of shape (W,) of well base areas in mm^2, in the order of `wells`
         `is_stackable` (bool): whether Labware is stackable
         `is_tiprack` (bool): whether Labware is a tiprack
         `slot_above` (Slot|None): Slot above (for stackable Labware)
@@ -553,6 +831,7 @@ class Labware:
         `fromTop`: offset from top of Labware
         `getAllPositions`: get all positions in Labware
         `getWell`: get `Well` using its name
+        `getWellIndices`: get the indices of wells in the well coordinate arrays
         `listColumns`: list wells by columns
         `listRows`: list  wells by rows
         `listWells`: list wells, by columns or rows
@@ -569,6 +848,8 @@ class Labware:
     _dimensions: tuple[float] = field(init=False, default=(0,0,0))
     exclusion_zone: BoundingBox|None = field(init=False, default=None)
     _wells: dict[str, Well] = field(init=False, default_factory=dict)
+    _well_index: dict[str, int] = field(init=False, default_factory=dict)
+    _well_table: SimpleNamespace|None = field(init=False, default=None, repr=False)
     _ordering: list[list[str]] = field(init=False, default_factory=list)
     _is_stackable: bool = field(init=False, default=False)
     is_tiprack: bool = field(init=False, default=False)
@@ -584,6 +865,7 @@ class Labware:
         self.is_tiprack = self._details.get('parameters',{}).get('isTiprack', False)
         self._ordering = self._details.get('ordering', [[]])
         self._wells = {name:Well(name=name, _details=details, parent=self) for name,details in self._details.get('wells',{}).items()}
+        self._build_well_table()
         
         buffer = self._details.get('exclusionBuffer', ((0,0,0),(0,0,0)))
         self.exclusion_zone = BoundingBox(
@@ -709,6 +991,31 @@ class Labware:
         """Namespace of all wells"""
         return SimpleNamespace(**self._wells)
     
+    @property
+    def well_offsets(self) -> np.ndarray:
+        """Array of shape (W,3) of well offsets from Labware reference point, in the order of `wells`"""
+        return self._get_well_table().offsets
+    
+    @property
+    def well_centers(self) -> np.ndarray:
+        """Array of shape (W,3) of well base centers, in the order of `wells`"""
+        return self._get_well_table().centers
+    
+    @property
+    def well_tops(self) -> np.ndarray:
+        """Array of shape (W,3) of well tops, in the order of `wells`"""
+        return self._get_well_table().tops
+    
+    @property
+    def well_depths(self) -> np.ndarray:
+        """Array of shape (W,) of well depths, in the order of `wells`"""
+        return self._get_well_table().depths
+    
+    @property
+    def well_base_areas(self) -> np.ndarray:
+        """Array of shape (W,) of well base areas in mm^2, in the order of `wells`"""
+        return self._get_well_table().base_areas
+    
     @property
     def is_stackable(self) -> bool:
         """Whether Labware is stackable"""
@@ -745,10 +1052,11 @@ class Labware:
         """
         positions = dict()
         positions['self'] = tuple(self.top)
-        for well in self._wells.values():
+        table = self._get_well_table()
+        for well,top,bottom in zip(self._wells.values(), table.tops, table.centers):
             positions[well.name.replace(' ','_')] = dict(
-                top = tuple(well.top), 
-                bottom = tuple(well.bottom), 
+                top = tuple(top), 
+                bottom = tuple(bottom), 
                 dimensions = well.dimensions,
                 depth = well.depth
             )
@@ -767,6 +1075,20 @@ class Labware:
         assert name in self._wells, f"Well '{name}' not found in Labware '{self.name}'"
         return self._wells.get(name)
     
+    def getWellIndices(self, names:Sequence[str]) -> np.ndarray:
+        """
+        Get the indices of wells in the well coordinate arrays (e.g. `well_tops`)
+        
+        Args:
+            names (Sequence[str]): names of wells
+            
+        Returns:
+            numpy.ndarray: indices of wells
+        """
+        missing = [name for name in names if name not in self._well_index]
+        assert not missing, f"Well(s) {missing} not found in Labware '{self.name}'"
+        return np.array([self._well_index[name] for name in names], dtype=int)
+    
     def listColumns(self) -> list[list[str]]:
         """List wells by columns"""
         return self._ordering
@@ -791,6 +1113,52 @@ class Labware:
             return list(self.wells_rows.values())
         raise ValueError(f"Invalid argument: {by}")
     
+    def _build_well_table(self):
+        """Build the arrays of well offsets, depths and base areas, and the index of each well in these arrays"""
+        wells = list(self._wells.values())
+        self._well_index = {well.name: index for index,well in enumerate(wells)}
+        base_areas = np.zeros(len(wells))
+        for index,well in enumerate(wells):
+            if well.shape == 'circular':
+                base_areas[index] = np.pi/4 * well.dimensions[0]**2
+            elif well.shape == 'rectangular':
+                base_areas[index] = well.dimensions[0]*well.dimensions[1]
+        offsets = np.array([well.offset for well in wells], dtype=float).reshape(-1,3)
+        depths = np.array([well.depth for well in wells], dtype=float)
+        for array in (offsets, depths, base_areas):
+            array.flags.writeable = False
+        self._well_table = SimpleNamespace(
+            offsets = offsets,
+            depths = depths,
+            base_areas = base_areas,
+            centers = None,
+            tops = None,
+            reference = None
+        )
+        return
+    
+    def _get_well_table(self) -> SimpleNamespace:
+        """
+        Get the arrays of well coordinates, recomputing the centers and tops if the reference point has changed
+        
+        Returns:
+            SimpleNamespace: read-only arrays of well `offsets`, `centers`, `tops`, `depths` and `base_areas`
+        """
+        table = self._well_table
+        reference = self.reference
+        cached = table.reference
+        if cached is not None and cached._coordinates == reference._coordinates:
+            if cached.Rotation is reference.Rotation or np.array_equal(cached.Rotation.as_quat(), reference.Rotation.as_quat()):
+                return table
+        centers = reference.coordinates + (reference.Rotation.apply(table.offsets.copy()).reshape(-1,3) if len(table.offsets) else table.offsets)
+        tops = centers + np.outer(table.depths, (0,0,1))
+        for array in (centers, tops):
+            array.flags.writeable = False
+        table.centers = centers
+        table.tops = tops
+        table.reference = Position(reference.coordinates, reference.Rotation)
+        return table
+    
     def _add_slot_above(self) -> Slot|None:
         """ 
         Add Slot above for stackable Labware
@@ -1068,6 +1436,7 @@ class Slot:
         self.loaded_labware = labware
         if isinstance(self.loaded_labware.slot_above, Slot):
             self._add_slot_above(self.loaded_labware.slot_above)
+        self._invalidate_exclusion_zone()
         return
     
     def loadLabwareFromConfigs(self, details:dict[str, Any]):
@@ -1105,6 +1474,7 @@ class Slot:
         labware = self.loaded_labware
         self.loaded_labware = None
         self._delete_slot_above()
+        self._invalidate_exclusion_zone()
         return labware
     
     def _add_slot_above(self, slot_above: Slot, directly:bool = True) -> Slot|None:
@@ -1124,6 +1494,7 @@ class Slot:
             self.parent._slots[slot_above.name] = slot_above
         elif isinstance(self.parent, Labware):
             self.slot_below._add_slot_above(slot_above, directly=False)
+        self._invalidate_exclusion_zone()
         return slot_above
     
     def _delete_slot_above(self, slot_above: Slot|None = None, directly:bool = True) -> Slot|None:
@@ -1144,7 +1515,17 @@ class Slot:
             self.slot_below._delete_slot_above(slot_above, directly=False)
         if directly:
             self.slot_above = None
+        self._invalidate_exclusion_zone()
         return slot_above
+    
+    def _invalidate_exclusion_zone(self):
+        """Invalidate the cached exclusion zones of the Deck that this Slot is on"""
+        parent = self.parent
+        while isinstance(parent, (Slot, Labware)):
+            parent = parent.parent
+        if isinstance(parent, Deck):
+            parent._invalidate_exclusion_zone()
+        return
 
     def _draw(self, ax:plt.Axes, zoom_out:bool = False, **kwargs) -> list[matplotlib.patches.Patch]:
         """
@@ -1211,8 +1592,11 @@ class Deck:
         `fromConfigs`: factory method to load Deck details from dictionary
         `fromFile`: factory method to load Deck from file
         `getAllPositions`: get all positions in Deck
+        `getCollisions`: get the names of the exclusion zones that the coordinates collide with
         `getSlot`: get `Slot` using its name or index
+        `getSweptCollisions`: get the names of the exclusion zones that the straight segments from start to end coordinates pass through
         `isExcluded`: checks and returns whether the coordinates are in an excluded region
+        `isPathExcluded`: checks and returns whether the straight segments between consecutive waypoints pass through an excluded region
         `loadNestedDeck`: load nested `Deck` object from dictionary
         `loadLabware`: load `Labware` into `Slot`
         `removeLabware`: remove Labware from `Slot` using its name or index
@@ -1233,6 +1617,8 @@ class Deck:
     _slots: dict[str, Slot] = field(init=False, default_factory=dict)
     _zones: dict[str, Deck] = field(init=False, default_factory=dict)
     entry_waypoints: list[Position] = field(init=False, default_factory=list)
+    _exclusion_version: int = field(init=False, default=0)
+    _exclusion_cache: SimpleNamespace|None = field(init=False, default=None, repr=False)
     
     def __post_init__(self):
         dimensions = np.array(self._details.get('dimensions',(0,0,0)))
@@ -1338,17 +1724,12 @@ class Deck:
     @property
     def exclusion_zone(self) -> dict[str, BoundingBox]:
         """Exclusion zones to avoid"""
-        bounds = dict()
-        for slot in self._slots.values():
-            if not isinstance(slot, Slot):
-                continue
-            if not isinstance(slot.loaded_labware, Labware):
-                continue
-            bounds[slot.name] = slot.loaded_labware.exclusion_zone
-        for zone_name, zone in self._zones.items():
-            for name,bound in zone.exclusion_zone.items():
-                bounds[f"{zone_name}_{name}"] = bound
-        return bounds
+        return dict(self._get_exclusion_cache().zones)
+    
+    @property
+    def _exclusion_arrays(self) -> SimpleNamespace:
+        """Exclusion zones stacked into arrays for vectorised collision checks"""
+        return self._get_exclusion_cache().arrays
     
     @property
     def slots(self) -> dict[str, Slot]:
@@ -1400,25 +1781,81 @@ class Deck:
             value = f"slot_{value:02}"
         return self._slots.get(value, None)
     
-    def isExcluded(self, coordinates:Sequence[float]|np.ndarray) -> bool:
+    def getCollisions(self, coordinates:Sequence[float]|np.ndarray) -> list[str]|list[list[str]]:
+        """
+        Get the names of the exclusion zones that the coordinates collide with
+        
+        Args:
+            coordinates (Sequence[float]|numpy.ndarray): x,y,z coordinates, or an array of shape (M,3) for a batch of points
+            
+        Returns:
+            list[str]|list[list[str]]: names of colliding exclusion zones, or one list of names per point for a batch of points
+        """
+        points = np.asarray(coordinates, dtype=float)
+        assert points.shape[-1] == 3 and points.ndim in (1,2), "Please input valid x,y,z coordinates"
+        arrays = self._exclusion_arrays
+        inside = self._check_exclusion(np.atleast_2d(points), arrays)
+        collisions = [[arrays.names[idx] for idx in np.flatnonzero(row)] for row in inside]
+        return collisions[0] if points.ndim == 1 else collisions
+    
+    def isExcluded(self, coordinates:Sequence[float]|np.ndarray) -> bool|np.ndarray[bool]:
         """
         Checks and returns whether the coordinates are in an excluded region
         
         Args:
-            coordinates (Sequence[float]|numpy.ndarray): x,y,z coordinates
+            coordinates (Sequence[float]|numpy.ndarray): x,y,z coordinates, or an array of shape (M,3) for a batch of points
             
         Returns:
-            bool: whether coordinates are in an excluded region
-        """
-        assert len(coordinates) == 3, "Please input valid x,y,z coordinates"
-        collides_with = []
-        for name,bounds in self.exclusion_zone.items():
-            if coordinates in bounds:
-                collides_with.append(name)
-        if len(collides_with) == 0:
-            return False
-        logger.warning(f"Coordinates {tuple(coordinates)} collides with {collides_with}")
-        return True
+            bool|numpy.ndarray[bool]: whether coordinates are in an excluded region, or one flag per point for a batch of points
+        """
+        points = np.asarray(coordinates, dtype=float)
+        assert points.shape[-1] == 3 and points.ndim in (1,2), "Please input valid x,y,z coordinates"
+        collisions = self.getCollisions(np.atleast_2d(points))
+        for point, collides_with in zip(np.atleast_2d(points), collisions):
+            if len(collides_with):
+                logger.warning(f"Coordinates {tuple(point)} collides with {collides_with}")
+        excluded = np.array([len(collides_with) > 0 for collides_with in collisions])
+        return bool(excluded[0]) if points.ndim == 1 else excluded
+    
+    def getSweptCollisions(self, start:Sequence[float]|np.ndarray, end:Sequence[float]|np.ndarray) -> list[str]|list[list[str]]:
+        """
+        Get the names of the exclusion zones that the straight segments from start to end coordinates pass through
+        
+        Args:
+            start (Sequence[float]|numpy.ndarray): x,y,z coordinates of the start, or an array of shape (M,3) for a batch of segments
+            end (Sequence[float]|numpy.ndarray): x,y,z coordinates of the end, or an array of shape (M,3) for a batch of segments
+            
+        Returns:
+            list[str]|list[list[str]]: names of colliding exclusion zones, or one list of names per segment for a batch of segments
+        """
+        starts = np.asarray(start, dtype=float)
+        ends = np.asarray(end, dtype=float)
+        assert starts.shape == ends.shape, "Ensure start and end coordinates have the same shape"
+        assert starts.shape[-1] == 3 and starts.ndim in (1,2), "Please input valid x,y,z coordinates"
+        arrays = self._exclusion_arrays
+        inside = self._check_swept(np.atleast_2d(starts), np.atleast_2d(ends), arrays)
+        collisions = [[arrays.names[idx] for idx in np.flatnonzero(row)] for row in inside]
+        return collisions[0] if starts.ndim == 1 else collisions
+    
+    def isPathExcluded(self, waypoints:Sequence[Sequence[float]]|np.ndarray) -> bool:
+        """
+        Checks and returns whether the straight segments between consecutive waypoints pass through an excluded region
+        
+        Args:
+            waypoints (Sequence[Sequence[float]]|numpy.ndarray): array of shape (K,3) of x,y,z coordinates
+            
+        Returns:
+            bool: whether the path passes through an excluded region
+        """
+        waypoints = np.asarray(waypoints, dtype=float)
+        assert waypoints.ndim == 2 and waypoints.shape[1] == 3 and len(waypoints) >= 2, "Please input at least 2 waypoints of x,y,z coordinates"
+        collisions = self.getSweptCollisions(waypoints[:-1], waypoints[1:])
+        excluded = False
+        for start, end, collides_with in zip(waypoints[:-1], waypoints[1:], collisions):
+            if len(collides_with):
+                logger.warning(f"Path from {tuple(start)} to {tuple(end)} collides with {collides_with}")
+                excluded = True
+        return excluded
     
     def loadNestedDeck(self, name:str, details:dict[str, Any]):
         """
@@ -1440,6 +1877,7 @@ class Deck:
         deck.name = name if not self.name.startswith('zone') else f"{self.name}_sub{name}"
         self._zones[name] = deck
         self._slots[name] = SimpleNamespace(**deck._slots)
+        self._invalidate_exclusion_zone()
         return
     
     def loadLabware(self, dst_slot: Slot, labware:Labware):
@@ -1512,6 +1950,145 @@ class Deck:
         fig.set_size_inches(new_size)
         return fig,ax
     
+    def _get_exclusion_cache(self) -> SimpleNamespace:
+        """
+        Get the cached exclusion zones, rebuilding them if the layout has changed since they were cached
+        
+        Returns:
+            SimpleNamespace: version of the layout, exclusion zones by name and exclusion zones stacked into arrays
+        """
+        cache = self._exclusion_cache
+        if cache is not None and cache.version == self._exclusion_version:
+            return cache
+        version = self._exclusion_version
+        zones = dict()
+        for slot in self._slots.values():
+            if not isinstance(slot, Slot):
+                continue
+            if not isinstance(slot.loaded_labware, Labware):
+                continue
+            zones[slot.name] = slot.loaded_labware.exclusion_zone
+        for zone_name, zone in self._zones.items():
+            for name,bound in zone._get_exclusion_cache().zones.items():
+                zones[f"{zone_name}_{name}"] = bound
+        self._exclusion_cache = SimpleNamespace(version=version, zones=zones, arrays=self._stack_exclusion_zone(zones))
+        return self._exclusion_cache
+    
+    def _invalidate_exclusion_zone(self):
+        """Invalidate the cached exclusion zones of this Deck and its parent Decks"""
+        self._exclusion_version += 1
+        if isinstance(self.parent, Deck):
+            self.parent._invalidate_exclusion_zone()
+        return
+    
+    @staticmethod
+    def _stack_exclusion_zone(zones:dict[str, BoundingVolume]) -> SimpleNamespace:
+        """
+        Stack exclusion zones into arrays for vectorised collision checks
+        
+        Args:
+            zones (dict[str, BoundingVolume]): exclusion zones by name
+            
+        Returns:
+            SimpleNamespace: exclusion zones stacked into arrays
+            
+            - `names` (list[str]): names of exclusion zones
+            - `bounds` (numpy.ndarray): (N,2,3) lower and upper bounds, in the frame of the reference point for rotated boxes
+            - `rotated` (numpy.ndarray): indices of rotated boxes
+            - `origins` (numpy.ndarray): (K,3) reference points of rotated boxes
+            - `inverse` (numpy.ndarray): (K,3,3) inverse rotation matrices of rotated boxes
+            - `volumes` (dict[int, BoundingVolume]): other bounding volumes, keyed by index
+        """
+        names = list()
+        bounds = list()
+        rotated = list()
+        origins = list()
+        inverse = list()
+        volumes = dict()
+        for idx,(name,zone) in enumerate(zones.items()):
+            names.append(name)
+            if not isinstance(zone, BoundingBox):
+                bounds.append(np.full((2,3), np.nan))
+                volumes[idx] = zone
+            elif zone.is_axis_aligned:
+                bounds.append(np.sort(zone.bounds, axis=0))
+            else:
+                bounds.append(zone.local_bounds)
+                rotated.append(idx)
+                origins.append(zone.reference.coordinates)
+                inverse.append(zone.reference.Rotation.inv().as_matrix())
+        return SimpleNamespace(
+            names = names,
+            bounds = np.array(bounds, dtype=float).reshape(-1,2,3),
+            rotated = np.array(rotated, dtype=int),
+            origins = np.array(origins, dtype=float).reshape(-1,3),
+            inverse = np.array(inverse, dtype=float).reshape(-1,3,3),
+            volumes = volumes
+        )
+    
+    def _check_exclusion(self, points:np.ndarray, arrays:SimpleNamespace) -> np.ndarray[bool]:
+        """
+        Check a batch of points against all exclusion zones
+        
+        Args:
+            points (numpy.ndarray): (M,3) array of x,y,z coordinates
+            arrays (SimpleNamespace): exclusion zones stacked into arrays
+            
+        Returns:
+            numpy.ndarray[bool]: (M,N) flags of whether each point is within each exclusion zone
+        """
+        frames = self._to_box_frames(points, arrays)
+        inside = np.all((arrays.bounds[:,0] <= frames) & (frames <= arrays.bounds[:,1]), axis=2)
+        for idx,volume in arrays.volumes.items():
+            inside[:,idx] = [point in volume for point in points]
+        return inside
+    
+    def _check_swept(self, starts:np.ndarray, ends:np.ndarray, arrays:SimpleNamespace) -> np.ndarray[bool]:
+        """
+        Check a batch of straight segments against all exclusion zones, using the slab test on each box.
+        Bounding volumes other than boxes are only checked at the ends of each segment.
+        
+        Args:
+            starts (numpy.ndarray): (M,3) array of x,y,z coordinates of segment starts
+            ends (numpy.ndarray): (M,3) array of x,y,z coordinates of segment ends
+            arrays (SimpleNamespace): exclusion zones stacked into arrays
+            
+        Returns:
+            numpy.ndarray[bool]: (M,N) flags of whether each segment passes through each exclusion zone
+        """
+        origins = self._to_box_frames(starts, arrays)
+        directions = self._to_box_frames(ends, arrays) - origins
+        lower, upper = arrays.bounds[:,0], arrays.bounds[:,1]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t_lower = (lower - origins) / directions
+            t_upper = (upper - origins) / directions
+        parallel = (directions == 0)
+        within = (lower <= origins) & (origins <= upper)
+        t_near = np.where(parallel, np.where(within, -np.inf, np.inf), np.minimum(t_lower, t_upper))
+        t_far = np.where(parallel, np.where(within, np.inf, -np.inf), np.maximum(t_lower, t_upper))
+        t_enter = t_near.max(axis=2)
+        t_exit = t_far.min(axis=2)
+        inside = (t_enter <= t_exit) & (t_exit >= 0) & (t_enter <= 1)
+        for idx,volume in arrays.volumes.items():
+            inside[:,idx] = [(start in volume) or (end in volume) for start,end in zip(starts, ends)]
+        return inside
+    
+    def _to_box_frames(self, points:np.ndarray, arrays:SimpleNamespace) -> np.ndarray:
+        """
+        Express a batch of points in the frame of each exclusion zone
+        
+        Args:
+            points (numpy.ndarray): (M,3) array of x,y,z coordinates
+            arrays (SimpleNamespace): exclusion zones stacked into arrays
+            
+        Returns:
+            numpy.ndarray: (M,N,3) array of x,y,z coordinates, in the frame of the reference point for rotated boxes
+        """
+        frames = np.repeat(points[:,np.newaxis,:], len(arrays.names), axis=1)
+        if len(arrays.rotated):
+            frames[:,arrays.rotated] = np.einsum('kij,mkj->mki', arrays.inverse, points[:,np.newaxis,:] - arrays.origins)
+        return frames
+    
     def _draw(self, ax: plt.Axes, zoom_out:bool = False, *, color_iterator:Iterator|None = None, **kwargs) -> list[matplotlib.patches.Patch]:
         """
         Draw Deck on matplotlib axis
@@ -1620,6 +2197,8 @@ class BoundingBox(BoundingVolume):
         `dimensions` (numpy.ndarray): x,y,z dimensions
         `buffer` (numpy.ndarray): lower and upper buffer
         `bounds` (numpy.ndarray): lower and upper bounds
+        `is_axis_aligned` (bool): whether the edges of BoundingBox are parallel to the x,y,z axes
+        `local_bounds` (numpy.ndarray): lower and upper bounds in the frame of the reference point
         
     ### Methods:
         `contains`: check if point is within BoundingBox
@@ -1642,7 +2221,7 @@ class BoundingBox(BoundingVolume):
         self.dimensions = np.array(self.dimensions)
         self.buffer = np.array(self.buffer)
         
-        self.parametric_function['box'] = lambda p: all([min(b) <= p[i] <= max(b) for i,b in enumerate(list(zip(*self.bounds)))])
+        self.parametric_function['box'] = lambda p: self._contains_box(p)
         return
     
     def __add__(self, other:BoundingVolume|BoundingBox|None) -> BoundingVolume|BoundingBox:
@@ -1689,4 +2268,32 @@ class BoundingBox(BoundingVolume):
         other_corner = self.reference.coordinates + dimensions
         bounds = np.array([self.reference.coordinates, other_corner])
         return bounds + self.reference.Rotation.apply(self.buffer)
-    
\ No newline at end of file
+    
+    @property
+    def is_axis_aligned(self) -> bool:
+        """Whether the edges of BoundingBox are parallel to the x,y,z axes"""
+        matrix = np.abs(self.reference.Rotation.as_matrix())
+        return bool(np.allclose(matrix, np.round(matrix)))
+    
+    @property
+    def local_bounds(self) -> np.ndarray:
+        """Lower and upper bounds in the frame of the reference point"""
+        return np.sort([self.buffer[0], self.dimensions + self.buffer[1]], axis=0)
+    
+    def _contains_box(self, point:Sequence[float]|np.ndarray) -> bool:
+        """
+        Check if point is within the box, in the frame of the reference point if the box is rotated
+        
+        Args:
+            point (Sequence[float]|numpy.ndarray): x,y,z coordinates
+            
+        Returns:
+            bool: whether point is within the box
+        """
+        point = np.asarray(point, dtype=float)
+        if self.is_axis_aligned:
+            bounds = np.sort(self.bounds, axis=0)
+        else:
+            point = self.reference.Rotation.inv().apply(point - self.reference.coordinates)
+            bounds = self.local_bounds
+        return bool(np.all((bounds[0] <= point) & (point <= bounds[1])))
@@ -0,0 +1,254 @@
+# -*- coding: utf-8 -*-
+"""
+This module contains the `ProtobufInterpreter` class, which encodes and decodes messages with the
+`Request` and `Reply` Protocol Buffers messages defined in `dev/message.proto`. The generated code
+is vendored in `message_pb2`, and needs the `protobuf` runtime (`pip install control-lab-ly[protobuf]`).
+
+## Classes:
+    `ProtobufInterpreter`: Class for encoding and decoding messages in Protocol Buffers format.
+
+<i>Documentation last updated: 2025-06-11</i>
+"""
+# Standard library imports
+from __future__ import annotations
+import pickle
+from typing import Mapping, Any
+
+# Third party imports
+import numpy as np
+
+# Local application imports
+from .interpreter import Interpreter
+from . import message_pb2
+
+INT64_RANGE = (-2**63, 2**63)
+INT32_RANGE = (-2**31, 2**31)
+
+class ProtobufInterpreter(Interpreter):
+    """
+    Class for encoding and decoding messages in Protocol Buffers format.
+    
+    Commands are encoded as `Request` messages and replies as `Reply` messages. Arguments, keyword
+    arguments and reply data are typed `Value` messages. NumPy arrays travel as raw buffers with
+    dtype and shape, and other types as the extension types registered on `Interpreter`,
+    with pickling as a last resort. Keys that do not fit the schema travel in the `extra` map.
+    Addresses are sent as strings, and empty `args` and `kwargs` are left out.
+    
+    ### Methods:
+        `decodeRequest`: Decode a request message into a command dictionary.
+        `encodeData`: Encode data into a message.
+        `encodeRequest`: Encode a command dictionary into a request message.
+        `decodeData`: Decode a message into data
+    """
+    
+    def __init__(self):
+        return
+    
+    @staticmethod
+    def decodeRequest(packet: bytes) -> dict[str, Any]:
+        """
+        Decode a request message into a command dictionary.
+        
+        Args:
+            packet (bytes): request message
+        
+        Returns:
+            dict[str, Any]: command dictionary
+        """
+        request = message_pb2.Request.FromString(packet)
+        command = ProtobufInterpreter._from_message(request)
+        if len(request.args):
+            command['args'] = [ProtobufInterpreter._from_value(value) for value in request.args]
+        if len(request.kwargs):
+            command['kwargs'] = {k: ProtobufInterpreter._from_value(v) for k,v in request.kwargs.items()}
+        return command
+    
+    @staticmethod
+    def encodeData(data: Mapping[str, Any]) -> bytes:
+        """
+        Encode data into a message.
+        
+        Args:
+            data (Mapping[str, Any]): data to be encoded
+        
+        Returns:
+            bytes: encoded message
+        """
+        reply = message_pb2.Reply()
+        for key,value in data.items():
+            if key == 'data':
+                ProtobufInterpreter._to_value(value, reply.data)
+            elif not ProtobufInterpreter._set_field(reply, key, value):
+                ProtobufInterpreter._to_value(value, reply.extra[key])
+        return reply.SerializeToString()
+    
+    @staticmethod
+    def encodeRequest(command: Mapping[str, Any]) -> bytes:
+        """
+        Encode a command dictionary into a request message.
+        
+        Args:
+            command (Mapping[str, Any]): command dictionary
+        
+        Returns:
+            bytes: request message
+        """
+        request = message_pb2.Request()
+        for key,value in command.items():
+            if key == 'args' and isinstance(value, list):
+                for arg in value:
+                    ProtobufInterpreter._to_value(arg, request.args.add())
+            elif key == 'kwargs' and isinstance(value, Mapping) and all(isinstance(k, str) for k in value):
+                for k,v in value.items():
+                    ProtobufInterpreter._to_value(v, request.kwargs[k])
+            elif not ProtobufInterpreter._set_field(request, key, value):
+                ProtobufInterpreter._to_value(value, request.extra[key])
+        return request.SerializeToString()
+    
+    @staticmethod
+    def decodeData(packet: bytes) -> dict[str, Any]:
+        """
+        Decode a message into data. Arrays in the data are read-only.
+        
+        Args:
+            packet (bytes): message to be decoded
+        
+        Returns:
+            dict[str, Any]: decoded data
+        """
+        reply = message_pb2.Reply.FromString(packet)
+        data = ProtobufInterpreter._from_message(reply)
+        if reply.HasField('data'):
+            data['data'] = ProtobufInterpreter._from_value(reply.data)
+        return data
+    
+    @staticmethod
+    def _set_field(message: message_pb2.Request|message_pb2.Reply, key: str, value: Any) -> bool:
+        """
+        Set a scalar or address field of the message, if the value fits the schema
+        
+        Args:
+            message (message_pb2.Request|message_pb2.Reply): the message
+            key (str): the field name
+            value (Any): the value of the field
+        
+        Returns:
+            bool: whether the field was set
+        """
+        if key == 'address' and isinstance(value, Mapping) and set(value) <= {'sender', 'target'}:
+            message.address.SetInParent()
+            for k,v in value.items():
+                getattr(message.address, k).extend(str(address) for address in v)
+            return True
+        field = message.DESCRIPTOR.fields_by_name.get(key)
+        if field is None or key in ('extra', 'data') or field.message_type is not None:
+            return False
+        if field.type == field.TYPE_STRING and isinstance(value, str):
+            setattr(message, key, value)
+            return True
+        if field.type == field.TYPE_BOOL and isinstance(value, bool):
+            setattr(message, key, value)
+            return True
+        if field.type == field.TYPE_INT32 and isinstance(value, int) and not isinstance(value, bool) and INT32_RANGE[0] <= value < INT32_RANGE[1]:
+            setattr(message, key, value)
+            return True
+        return False
+    
+    @staticmethod
+    def _from_message(message: message_pb2.Request|message_pb2.Reply) -> dict[str, Any]:
+        """
+        Get the scalar, address and extra fields set on the message
+        
+        Args:
+            message (message_pb2.Request|message_pb2.Reply): the message
+        
+        Returns:
+            dict[str, Any]: the fields set on the message
+        """
+        content = dict()
+        for field in message.DESCRIPTOR.fields:
+            if field.message_type is None and message.HasField(field.name):
+                content[field.name] = getattr(message, field.name)
+        if message.HasField('address'):
+            content['address'] = dict(sender=list(message.address.sender), target=list(message.address.target))
+        for k,v in message.extra.items():
+            content[k] = ProtobufInterpreter._from_value(v)
+        return content
+    
+    @staticmethod
+    def _to_value(obj: Any, value: message_pb2.Value):
+        """
+        Fill a `Value` message with an object
+        
+        Args:
+            obj (Any): the object
+            value (message_pb2.Value): the `Value` message to fill
+        """
+        if obj is None:
+            value.null_value = True
+        elif isinstance(obj, (bool, np.bool_)):
+            value.bool_value = bool(obj)
+        elif isinstance(obj, (int, np.integer)) and INT64_RANGE[0] <= obj < INT64_RANGE[1]:
+            value.int_value = int(obj)
+        elif isinstance(obj, (float, np.floating)) and not isinstance(obj, np.longdouble):
+            value.float_value = float(obj)
+        elif isinstance(obj, str):
+            value.string_value = obj
+        elif isinstance(obj, (bytes, bytearray, memoryview)):
+            value.bytes_value = bytes(obj)
+        elif isinstance(obj, (list, tuple)) and not hasattr(obj, '_fields'):
+            values = value.list_value if isinstance(obj, list) else value.tuple_value
+            values.SetInParent()
+            for item in obj:
+                ProtobufInterpreter._to_value(item, values.values.add())
+        elif isinstance(obj, Mapping):
+            value.map_value.SetInParent()
+            for k,v in obj.items():
+                ProtobufInterpreter._to_value(k, value.map_value.keys.add())
+                ProtobufInterpreter._to_value(v, value.map_value.values.add())
+        elif isinstance(obj, np.ndarray) and not obj.dtype.hasobject and obj.dtype.fields is None:
+            value.array_value.dtype = obj.dtype.str
+            value.array_value.shape.extend(obj.shape)
+            value.array_value.data = np.ascontiguousarray(obj).tobytes()
+        else:
+            name = Interpreter.findExtension(obj)
+            if name is None:
+                value.pickled_value = pickle.dumps(obj)
+                return
+            value.extension_value.name = name
+            ProtobufInterpreter._to_value(Interpreter.extensions[name][1](obj), value.extension_value.value)
+        return
+    
+    @staticmethod
+    def _from_value(value: message_pb2.Value) -> Any:
+        """
+        Get the object held by a `Value` message
+        
+        Args:
+            value (message_pb2.Value): the `Value` message
+        
+        Returns:
+            Any: the object
+        """
+        kind = value.WhichOneof('kind')
+        if kind in (None, 'null_value'):
+            return None
+        elif kind == 'list_value':
+            return [ProtobufInterpreter._from_value(item) for item in value.list_value.values]
+        elif kind == 'tuple_value':
+            return tuple(ProtobufInterpreter._from_value(item) for item in value.tuple_value.values)
+        elif kind == 'map_value':
+            keys = [ProtobufInterpreter._from_value(k) for k in value.map_value.keys]
+            values = [ProtobufInterpreter._from_value(v) for v in value.map_value.values]
+            return dict(zip(keys, values))
+        elif kind == 'array_value':
+            array = value.array_value
+            return np.frombuffer(array.data, dtype=np.dtype(array.dtype)).reshape(tuple(array.shape))
+        elif kind == 'extension_value':
+            name = value.extension_value.name
+            if name not in Interpreter.extensions:
+                raise ValueError(f"Unknown extension type: {name}")
+            return Interpreter.extensions[name][2](ProtobufInterpreter._from_value(value.extension_value.value))
+        elif kind == 'pickled_value':
+            return pickle.loads(value.pickled_value)
+        return getattr(value, kind)
@@ -1,12 +1,26 @@
 # -*- coding: utf-8 -*-
-""" 
+"""
 This module provides a FastAPI server for managing commands and replies in a distributed system.
 
+Commands wait in a bounded queue for each target worker, and replies are kept by request ID for
+`REPLY_TTL` seconds. Workers and users either long-poll the REST endpoints, which wait up to a timeout
+for a new command or reply, or connect to the WebSocket endpoints `/ws/worker/{target}` and
+`/ws/user/{user_id}`, where commands and replies are pushed as soon as they are placed.
+
 Attributes:
     PORT (int): The port number for the FastAPI server.
     HOST (str): The host address for the FastAPI server.
-    
+    MAX_PENDING (int): The maximum number of messages waiting for each target.
+    MAX_REPLIES (int): The maximum number of replies kept.
+    REPLY_TTL (float): The time in seconds that a reply is kept after it is placed.
+    MAX_WAIT (float): The longest time in seconds that a request may wait for a command or reply.
+
+## Classes:
+    `TargetQueue`: Bounded queue of messages for one target.
+    `ReplyBuffer`: Replies by request ID, evicted after a time to live.
+
 ## Functions:
+    `call_in_loop`: Call a function in the event loop of the server.
     `place_command`: Place a command in the outbound queue.
     `place_reply`: Place a reply in the outbound queue.
     `start_server`: Start the FastAPI server if it is not already running.
@@ -14,28 +28,32 @@ Attributes:
 <i>Documentation last updated: 2025-06-11</i>
 """
 # Key imports
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query, WebSocket, WebSocketDisconnect
 from pydantic import BaseModel
 import requests
 import uvicorn
 
 # Standard library imports
+import asyncio
+from collections import OrderedDict
+from contextlib import asynccontextmanager
 import json
-from typing import Any
+import logging
+import time
+from typing import Any, Callable
 
 # Local application imports
 from ....core.control import Controller
 from ....core.interpreter import JSONInterpreter
 
+logger = logging.getLogger(__name__)
+
 PORT = 8000
 HOST = 'http://localhost'
-
-app = FastAPI()
-outbound_replies = dict()
-outbound_commands = dict()
-worker_registry = dict()
-hub = Controller('both', JSONInterpreter(), relay_delay=0)
-hub.setAddress('HUB')
+MAX_PENDING = 1000
+MAX_REPLIES = 10_000
+REPLY_TTL = 60
+MAX_WAIT = 30
 
 
 class Command(BaseModel):
@@ -63,38 +81,263 @@ class Reply(BaseModel):
     status: str
     data: Any
 
+class TargetQueue(asyncio.Queue):
+    """
+    Bounded queue of messages for one target, awaited with a timeout by the endpoints.
+
+    ### Constructor:
+        `maxsize` (int): The maximum number of messages in the queue, defaults to `MAX_PENDING`.
+
+    ### Methods:
+        `peek`: List the messages in the queue without removing them.
+        `clear`: Remove all messages from the queue.
+        `get_within`: Get a message, waiting up to a timeout.
+    """
+
+    def __init__(self, maxsize: int = MAX_PENDING):
+        super().__init__(maxsize)
+        return
+
+    def peek(self) -> list[Any]:
+        """
+        List the messages in the queue without removing them.
+
+        Returns:
+            list[Any]: The messages in the queue.
+        """
+        return list(self._queue)
+
+    def clear(self):
+        """Remove all messages from the queue."""
+        self._queue.clear()
+        return
+
+    async def get_within(self, timeout: float) -> Any|None:
+        """
+        Get a message, waiting up to a timeout.
+
+        Args:
+            timeout (float): The time in seconds to wait for a message, 0 to not wait.
+
+        Returns:
+            Any|None: The message, or None if there is none within the timeout.
+        """
+        try:
+            if timeout <= 0:
+                return self.get_nowait()
+            return await asyncio.wait_for(self.get(), timeout)
+        except (asyncio.QueueEmpty, asyncio.TimeoutError):
+            return None
+
+class ReplyBuffer:
+    """
+    Replies by request ID, kept for a time to live after they are placed and up to a maximum number,
+    so that replies to abandoned requests do not accumulate. Readers can wait for a reply up to a timeout.
+
+    ### Constructor:
+        `ttl` (float): The time in seconds that a reply is kept after it is placed, defaults to `REPLY_TTL`.
+        `maxsize` (int): The maximum number of replies kept, defaults to `MAX_REPLIES`.
+
+    ### Attributes:
+        `ttl` (float): The time in seconds that a reply is kept after it is placed.
+        `maxsize` (int): The maximum number of replies kept.
+        `replies` (OrderedDict[str, tuple[float, Reply]]): The replies with the time they expire, oldest first.
+
+    ### Methods:
+        `put`: Keep a reply, and wake the readers waiting for it.
+        `get`: Get a reply.
+        `get_within`: Get a reply, waiting up to a timeout.
+        `pop`: Remove a reply.
+        `clear`: Remove all replies.
+        `evict`: Remove the expired replies.
+    """
+
+    def __init__(self, ttl: float = REPLY_TTL, maxsize: int = MAX_REPLIES):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.replies: OrderedDict[str, tuple[float, Reply]] = OrderedDict()
+        self._waiters: dict[str, asyncio.Event] = dict()
+        return
+
+    def __contains__(self, request_id: str) -> bool:
+        return self.get(request_id) is not None
+
+    def put(self, reply: Reply):
+        """
+        Keep a reply, and wake the readers waiting for it.
+
+        Args:
+            reply (Reply): The reply to keep.
+        """
+        self.evict()
+        self.replies[reply.request_id] = (time.monotonic() + self.ttl, reply)
+        self.replies.move_to_end(reply.request_id)
+        while len(self.replies) > self.maxsize:
+            self.replies.popitem(last=False)
+        waiter = self._waiters.pop(reply.request_id, None)
+        if waiter is not None:
+            waiter.set()
+        return
+
+    def get(self, request_id: str) -> Reply|None:
+        """
+        Get a reply.
+
+        Args:
+            request_id (str): The request ID of the reply.
+
+        Returns:
+            Reply|None: The reply, or None if there is none.
+        """
+        expiry, reply = self.replies.get(request_id, (0, None))
+        if reply is not None and expiry < time.monotonic():
+            self.evict()
+            return None
+        return reply
+
+    async def get_within(self, request_id: str, timeout: float) -> Reply|None:
+        """
+        Get a reply, waiting up to a timeout.
+
+        Args:
+            request_id (str): The request ID of the reply.
+            timeout (float): The time in seconds to wait for the reply, 0 to not wait.
+
+        Returns:
+            Reply|None: The reply, or None if there is none within the timeout.
+        """
+        reply = self.get(request_id)
+        if reply is not None or timeout <= 0:
+            return reply
+        waiter = self._waiters.setdefault(request_id, asyncio.Event())
+        try:
+            await asyncio.wait_for(waiter.wait(), timeout)
+        except asyncio.TimeoutError:
+            if not waiter.is_set() and self._waiters.get(request_id) is waiter:
+                self._waiters.pop(request_id)
+        return self.get(request_id)
+
+    def pop(self, request_id: str) -> Reply|None:
+        """
+        Remove a reply.
+
+        Args:
+            request_id (str): The request ID of the reply.
+
+        Returns:
+            Reply|None: The reply, or None if there is none.
+        """
+        return self.replies.pop(request_id, (0, None))[1]
+
+    def clear(self):
+        """Remove all replies."""
+        self.replies.clear()
+        return
+
+    def evict(self):
+        """Remove the expired replies."""
+        now = time.monotonic()
+        while self.replies:
+            request_id, (expiry, _) = next(iter(self.replies.items()))
+            if expiry >= now:
+                break
+            self.replies.pop(request_id)
+        return
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Keep the event loop of the server, so that other threads can place commands and replies.
+
+    Args:
+        app (FastAPI): The FastAPI app.
+    """
+    global event_loop
+    event_loop = asyncio.get_running_loop()
+    yield
+    event_loop = None
+
+app = FastAPI(lifespan=lifespan)
+event_loop: asyncio.AbstractEventLoop|None = None
+outbound_replies = ReplyBuffer()
+outbound_commands: dict[str, TargetQueue] = dict()
+worker_registry = dict()
+reply_channels: dict[str, TargetQueue] = dict()
+hub = Controller('both', JSONInterpreter(), relay_delay=0)
+hub.setAddress('HUB')
+
+
+def call_in_loop(function: Callable, *args) -> Any:
+    """
+    Call a function in the event loop of the server. From other threads, the call is scheduled
+    in the event loop and does not return a result.
+
+    Args:
+        function (Callable): The function to call.
+        *args: The arguments of the function.
+
+    Returns:
+        Any: The result of the function, if called in the event loop.
+    """
+    try:
+        running_loop = asyncio.get_running_loop()
+    except RuntimeError:
+        running_loop = None
+    if event_loop is None or running_loop is event_loop:
+        return function(*args)
+    event_loop.call_soon_threadsafe(function, *args)
+    return
+
 def place_command(command: Command) -> str:
     """
-    Place a command in the outbound queue.
-    
+    Place a command in the outbound queue of each target.
+
     Args:
         command (Command): The command to place in the outbound queue.
-        
+
     Returns:
         str: The request ID of the command.
+
+    Raises:
+        HTTPException: The outbound queue of a target is full.
     """
     targets = command.address.get('target',[])
     targets = targets or list(worker_registry.keys())
+    full = []
     for target in targets:
         if target not in outbound_commands:
-            outbound_commands[target] = dict()
-        outbound_commands[target][command.request_id] = command
+            outbound_commands[target] = TargetQueue()
+        try:
+            outbound_commands[target].put_nowait(command)
+        except asyncio.QueueFull:
+            full.append(target)
+    if full:
+        logger.warning(f"Outbound queue full, dropping command {command.request_id} for: {full}")
+        raise HTTPException(status_code=503, detail=f"Outbound queue full for targets: {full}")
     return command.request_id
 
 def place_reply(reply: Reply) -> str:
     """
-    Place a reply in the outbound queue.
-    
+    Place a reply in the outbound queue, and push it to the targets that are connected by WebSocket.
+
     Args:
         reply (Reply): The reply to place in the outbound queue.
-        
+
     Returns:
         str: The reply ID of the reply.
     """
     targets = reply.address.get('target',[])
     if reply.request_id == 'registration':
         targets.append('HUB')
-    outbound_replies[reply.request_id] = reply
+    channels = [reply_channels[target] for target in targets if target in reply_channels]
+    for channel in channels:
+        try:
+            channel.put_nowait(reply)
+        except asyncio.QueueFull:
+            logger.warning(f"Reply queue full, dropping reply {reply.reply_id}")
+    if not channels or reply.request_id == 'registration':
+        outbound_replies.put(reply)
     if 'HUB' in targets and reply.request_id == 'registration':
         for worker in reply.address.get('sender',[]):
             if worker not in worker_registry:
@@ -105,7 +348,7 @@ def place_reply(reply: Reply) -> str:
 def start_server(host: str = HOST, port: int = PORT):
     """
     Start the FastAPI server if it is not already running.
-    
+
     Args:
         host (str): The host address for the server.
         port (int): The port number for the server.
@@ -122,42 +365,42 @@ def start_server(host: str = HOST, port: int = PORT):
 
 # Main
 @app.get("/")
-def read_root() -> dict:
+async def read_root() -> dict:
     """
     Root endpoint for the FastAPI server.
-    
+
     Returns:
         dict: A simple greeting message.
     """
     return {"Hello": "World"}
 
 @app.get("/registry")
-def registry() -> dict:
+async def registry() -> dict:
     """
     See the registry of workers.
-    
+
     Returns:
         dict: A dictionary containing the worker registry.
     """
     return worker_registry
 
 @app.post("/register/model")
-def register_model(target: str) -> dict:
+async def register_model(target: str) -> dict:
     """
     Register the model with the hub.
-    
+
     Args:
         target (str): The target worker to register.
-        
+
     Returns:
         dict: A dictionary containing the list of registered workers.
     """
     if target not in worker_registry:
         worker_registry[target] = dict()
     if target not in outbound_commands:
-        outbound_commands[target] = dict()
+        outbound_commands[target] = TargetQueue()
     if target not in hub.callbacks['request']:
-        hub.subscribe(lambda content: place_command(Command(**json.loads(content))), 'request', target)
+        hub.subscribe(lambda content: call_in_loop(place_command, Command(**json.loads(content))), 'request', target)
     get_methods_command = dict(method='exposeMethods')
     hub.transmitRequest(get_methods_command, [target])
     return {'workers': [k for k in worker_registry]}
@@ -165,65 +408,68 @@ def register_model(target: str) -> dict:
 
 # Commands
 @app.get("/commands")
-def commands() -> dict:
+async def commands() -> dict:
     """
     Get the commands in the outbound queue.
-    
+
     Returns:
         dict: A dictionary containing the outbound commands.
     """
-    return outbound_commands
+    return {target: {command.request_id: command for command in queue.peek()} for target,queue in outbound_commands.items()}
 
 @app.post("/command")
-def send_command(command: Command) -> dict:
+async def send_command(command: Command) -> dict:
     """
     Send a command to the hub.
-    
+
     Args:
         command (Command): The command to send.
-        
+
     Returns:
         dict: A dictionary containing the request ID of the command.
     """
     request_id = place_command(command)
     return {"request_id": request_id}
-    
+
 @app.get("/command/{target}")
-def get_command(target: str) -> Command:
+async def get_command(target: str, timeout: float = Query(0, ge=0, le=MAX_WAIT)) -> Command:
     """
     Get a command from the hub.
-    
+
     Args:
         target (str): The target worker to get the command for.
-        
+        timeout (float): The time in seconds to wait for a command, defaults to 0.
+
     Returns:
         Command: The command for the specified target worker.
     """
-    request_ids = list(outbound_commands[target].keys()) if target in outbound_commands else []
-    request_id = request_ids[0] if len(request_ids) > 0 else None
-    if request_id is None:
+    if target not in outbound_commands:
+        outbound_commands[target] = TargetQueue()
+    command = await outbound_commands[target].get_within(timeout)
+    if command is None:
         raise HTTPException(status_code=404, detail=f"No pending requests for target: {target}")
-    return outbound_commands[target].pop(request_id)
+    return command
 
 @app.get("/command/clear")
-def clear_commands() -> dict:
+async def clear_commands() -> dict:
     """
     Clear the commands in the outbound queue.
-    
+
     Returns:
         dict: A dictionary indicating the status of the clear operation.
     """
-    outbound_commands.clear()
+    for queue in outbound_commands.values():
+        queue.clear()
     return {"status": "cleared"}
 
 @app.get("/command/clear/{target}")
-def clear_commands_target(target: str) -> dict:
+async def clear_commands_target(target: str) -> dict:
     """
     Clear the commands in the outbound queue for a specific target.
-    
+
     Args:
         target (str): The target worker to clear the commands for.
-        
+
     Returns:
         dict: A dictionary indicating the status of the clear operation.
     """
@@ -236,49 +482,52 @@ def clear_commands_target(target: str) -> dict:
 
 # Replies
 @app.get("/replies")
-def replies() -> dict:
+async def replies() -> dict:
     """
     Get the replies in the outbound queue.
-    
+
     Returns:
         dict: A dictionary containing the outbound replies.
     """
-    return outbound_replies
+    outbound_replies.evict()
+    return {request_id: reply for request_id,(_,reply) in outbound_replies.replies.items()}
 
 @app.post("/reply")
-def send_reply(reply: Reply) -> dict:
+async def send_reply(reply: Reply) -> dict:
     """
     Send a command to the hub.
-    
+
     Args:
         reply (Reply): The reply to send.
-        
+
     Returns:
         dict: A dictionary containing the reply ID of the reply.
     """
     reply_id = place_reply(reply)
     return {"reply_id": reply_id}
-    
+
 @app.get("/reply/{request_id}")
-def get_reply(request_id: str) -> Reply:
+async def get_reply(request_id: str, timeout: float = Query(0, ge=0, le=MAX_WAIT)) -> Reply:
     """
     Get a command from the hub.
-    
+
     Args:
         request_id (str): The request ID to get the reply for.
-        
+        timeout (float): The time in seconds to wait for the reply, defaults to 0.
+
     Returns:
         Reply: The reply for the specified request ID.
     """
-    if request_id not in outbound_replies:
+    reply = await outbound_replies.get_within(request_id, timeout)
+    if reply is None:
         raise HTTPException(status_code=404, detail=f"No pending replies to request: {request_id}")
-    return outbound_replies[request_id]
- 
+    return reply
+
 @app.get("/reply/clear")
-def clear_replies() -> dict:
+async def clear_replies() -> dict:
     """
     Clear the replies in the outbound queue.
-    
+
     Returns:
         dict: A dictionary indicating the status of the clear operation.
     """
@@ -286,25 +535,86 @@ def clear_replies() -> dict:
     return {"status": "cleared"}
 
 @app.get("/reply/clear/{request_id}")
-def clear_replies_target(request_id: str) -> dict:
+async def clear_replies_target(request_id: str) -> dict:
     """
     Clear the replies in the outbound queue for a specific request_id.
-    
+
     Args:
         request_id (str): The request ID to clear the reply for.
-        
+
     Returns:
         dict: A dictionary indicating the status of the clear operation.
     """
-    if request_id in outbound_replies:
-        outbound_replies.pop(request_id)
+    if outbound_replies.pop(request_id) is not None:
         return {"status": "cleared"}
     else:
         raise HTTPException(status_code=404, detail=f"No pending replies to request: {request_id}")
 
 
+# WebSockets
+async def push(websocket: WebSocket, queue: TargetQueue):
+    """
+    Push the messages put in a queue to a WebSocket client.
+
+    Args:
+        websocket (WebSocket): The WebSocket connection.
+        queue (TargetQueue): The queue of messages.
+    """
+    while True:
+        message = await queue.get()
+        await websocket.send_json(message.model_dump())
+
+@app.websocket("/ws/worker/{target}")
+async def worker_socket(websocket: WebSocket, target: str):
+    """
+    Push commands to a worker as they are placed, and receive its replies.
+    Commands already waiting in the outbound queue are pushed on connection.
+
+    Args:
+        websocket (WebSocket): The WebSocket connection.
+        target (str): The address of the worker.
+    """
+    await websocket.accept()
+    if target not in outbound_commands:
+        outbound_commands[target] = TargetQueue()
+    pusher = asyncio.create_task(push(websocket, outbound_commands[target]))
+    try:
+        while True:
+            place_reply(Reply(**(await websocket.receive_json())))
+    except WebSocketDisconnect:
+        pass
+    finally:
+        pusher.cancel()
+    return
+
+@app.websocket("/ws/user/{user_id}")
+async def user_socket(websocket: WebSocket, user_id: str):
+    """
+    Receive commands from a user, and push the replies addressed to the user as they are placed.
+
+    Args:
+        websocket (WebSocket): The WebSocket connection.
+        user_id (str): The address of the user.
+    """
+    await websocket.accept()
+    channel = TargetQueue()
+    reply_channels[user_id] = channel
+    pusher = asyncio.create_task(push(websocket, channel))
+    try:
+        while True:
+            try:
+                place_command(Command(**(await websocket.receive_json())))
+            except HTTPException as e:
+                logger.warning(e.detail)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        pusher.cancel()
+        if reply_channels.get(user_id) is channel:
+            reply_channels.pop(user_id)
+    return
+
 
-    
 # Start the server if not yet running
 if __name__ == "__main__":
     start_server()
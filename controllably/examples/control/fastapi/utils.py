@@ -1,15 +1,22 @@
 # -*- coding: utf-8 -*-
 """
 This module provides a FastAPI server for managing commands and replies in a distributed system.
+Clients either long-poll the REST endpoints of the hub, or connect to its WebSocket endpoints to have
+commands and replies pushed to them. REST requests reuse a keep-alive session for each thread and hub.
 
 Attributes:
     CONNECTION_ERRORS (tuple): Tuple of exceptions that indicate connection errors.
+    RECEIVE_TIMEOUT (float): Time to wait for a pushed message before checking for termination.
+    LONG_POLL_TIMEOUT (float): Time for the hub to wait for a command or reply before answering a poll.
 
 ## Classes:
     `FastAPIWorkerClient`: Client for managing worker connections to the FastAPI server.
     `FastAPIUserClient`: Client for managing user connections to the FastAPI server.
     
 ## Functions:
+    `get_session`: Get the keep-alive session to a hub for the current thread.
+    `create_websocket_sender`: Create a callback that sends encoded messages over a WebSocket connection.
+    `create_websocket_receiver`: Create a loop that passes messages pushed over a WebSocket connection to a callback.
     `create_fastapi_user`: Create a FastAPI client instance for user interaction.
     `create_fastapi_worker`: Create a FastAPI client instance for worker interaction.
 
@@ -24,6 +31,8 @@ import threading
 import time
 from typing import Any, Callable
 import urllib3
+from websockets.exceptions import ConnectionClosed
+from websockets.sync.client import connect, ClientConnection
 
 # Local application imports
 from ....core.control import Controller
@@ -35,6 +44,72 @@ logger = logging.getLogger(__name__)
 CustomLevelFilter().setModuleLevel(__name__, logging.INFO)
 
 CONNECTION_ERRORS = (ConnectionRefusedError, ConnectionError, urllib3.exceptions.NewConnectionError, urllib3.exceptions.MaxRetryError)
+RECEIVE_TIMEOUT = 0.1
+LONG_POLL_TIMEOUT = 1
+
+_sessions = threading.local()
+
+def get_session(url: str) -> requests.Session:
+    """
+    Get the keep-alive session to a hub for the current thread, so that requests reuse a pooled connection
+    instead of opening a new one each time. Sessions are not shared across threads.
+    
+    Args:
+        url (str): The URL of the FastAPI server.
+        
+    Returns:
+        requests.Session: The session to the hub.
+    """
+    if not hasattr(_sessions, 'by_url'):
+        _sessions.by_url = dict()
+    if url not in _sessions.by_url:
+        _sessions.by_url[url] = requests.Session()
+    return _sessions.by_url[url]
+
+def create_websocket_sender(connection: ClientConnection) -> Callable[[str|bytes], None]:
+    """
+    Create a callback that sends encoded messages over a WebSocket connection as text.
+    
+    Args:
+        connection (ClientConnection): The WebSocket connection.
+        
+    Returns:
+        Callable[[str|bytes], None]: A function that sends a message.
+    """
+    def send(message: str|bytes):
+        connection.send(message.decode('utf-8') if isinstance(message, bytes) else message)
+        return
+    return send
+
+def create_websocket_receiver(
+    connection: ClientConnection, 
+    receive: Callable[[str], Any], 
+    terminate: threading.Event
+) -> Callable[[], None]:
+    """
+    Create a loop that passes messages pushed over a WebSocket connection to a callback until terminated.
+    
+    Args:
+        connection (ClientConnection): The WebSocket connection.
+        receive (Callable[[str], Any]): The callback for each message.
+        terminate (threading.Event): An event to signal termination.
+        
+    Returns:
+        Callable[[], None]: A function that runs the loop.
+    """
+    def loop():
+        with connection:
+            while not terminate.is_set():
+                try:
+                    message = connection.recv(timeout=RECEIVE_TIMEOUT)
+                except TimeoutError:
+                    continue
+                except ConnectionClosed:
+                    logger.error('Connection Error')
+                    break
+                receive(message)
+        return
+    return loop
 
 class FastAPIWorkerClient:
     """ 
@@ -55,6 +130,7 @@ class FastAPIWorkerClient:
         
     ### Methods:
         `update_registry`: Register a worker with the hub.
+        `connect_websocket`: Register a worker with the hub and connect it to the WebSocket push channel.
         `get_command`: Get a command from the hub for a specific worker.
         `send_reply`: Send a reply to the hub.
         `create_listen_loop`: Create a loop for the worker to listen for commands from the hub.
@@ -97,7 +173,7 @@ class FastAPIWorkerClient:
         Returns:
             dict[str, Any]: The registry of the hub.
         """
-        response = requests.post(f"{self.url}/register/model?target={worker.address}")
+        response = get_session(self.url).post(f"{self.url}/register/model?target={worker.address}")
         registry = response.json()
         logger.debug(registry)
         if response.status_code == 200:
@@ -112,10 +188,38 @@ class FastAPIWorkerClient:
                 self.pause_events[worker.address].clear()
         return registry
     
+    def connect_websocket(self, worker: Controller, terminate: threading.Event|None = None) -> Callable:
+        """
+        Register a worker with the hub and connect it to the WebSocket push channel.
+        Commands are pushed to the worker as soon as they are placed, and replies are sent back on the same connection.
+        
+        Args:
+            worker (Controller): The worker controller to register.
+            terminate (threading.Event|None): An event to signal termination, defaults to None.
+            
+        Returns:
+            Callable: A function that runs the loop for the worker to receive commands.
+        """
+        response = get_session(self.url).post(f"{self.url}/register/model?target={worker.address}")
+        logger.debug(response.json())
+        response.raise_for_status()
+        connection = connect(f"{self.url.replace('http', 'ws', 1)}/ws/worker/{worker.address}")
+        self.workers[worker.address] = worker
+        terminate = terminate if terminate is not None else threading.Event()
+        worker.events[self.url] = terminate
+        worker.subscribe(create_websocket_sender(connection), 'data', 'HUB')
+        def receive(message: str):
+            command = json.loads(message)
+            command['address']['sender'].append('HUB')
+            logger.debug(command)
+            worker.receiveRequest(json.dumps(command), sender=self.url)
+            return
+        return create_websocket_receiver(connection, receive, terminate)
+    
     @staticmethod
     def get_command(target: str, url: str, terminate: threading.Event|None = None) -> dict[str, Any]:
         """
-        Get a reply from the hub.
+        Get a command from the hub, waiting up to `LONG_POLL_TIMEOUT` for each poll.
         
         Args:
             target (str): The address of the target worker.
@@ -128,13 +232,12 @@ class FastAPIWorkerClient:
         terminate = terminate if terminate is not None else threading.Event()
         while not terminate.is_set():
             try:
-                response = requests.get(f"{url}/command/{target}")
+                response = get_session(url).get(f"{url}/command/{target}", params=dict(timeout=LONG_POLL_TIMEOUT))
             except Exception:
                 logger.error('Connection Error')
                 raise ConnectionError
             if response.status_code == 200:
                 break
-            time.sleep(0.1)
         if terminate.is_set():
             raise InterruptedError
         command = response.json()
@@ -156,7 +259,7 @@ class FastAPIWorkerClient:
         """
         reply_json = json.loads(reply)
         try:
-            response = requests.post(f"{url}/reply", json=reply_json)
+            response = get_session(url).post(f"{url}/reply", json=reply_json)
         except Exception:
             logger.error('Connection Error')
             raise ConnectionError
@@ -192,7 +295,6 @@ class FastAPIWorkerClient:
                     logger.debug('PAUSED')
                     continue
                 try:
-                    time.sleep(0.1)
                     worker.receiveRequest(sender=sender)
                 except CONNECTION_ERRORS:
                     logger.error(f'Connection Error: {worker.address}')
@@ -223,6 +325,7 @@ class FastAPIUserClient:
     
     ### Methods:
         `join_hub`: Join a hub with the user controller.
+        `join_hub_websocket`: Join a hub with the user controller over the WebSocket push channel.
         `send_command`: Send a command to the hub.
         `get_reply`: Get a reply from the hub based on a request ID.
     """
@@ -262,7 +365,7 @@ class FastAPIUserClient:
             dict[str, Any]: The registry of the hub.
         """
         try:
-            response = requests.get(f"{self.url}/registry")
+            response = get_session(self.url).get(f"{self.url}/registry")
         except Exception:
             logger.error('Connection Error')
             raise ConnectionError
@@ -277,6 +380,37 @@ class FastAPIUserClient:
         user.data_buffer['registration'] = {k:{'data':v} for k,v in registry.items()}
         return registry
 
+    def join_hub_websocket(self, user: Controller, terminate: threading.Event|None = None) -> dict[str, Any]:
+        """
+        Join a hub over the WebSocket push channel. Commands are sent on the connection,
+        and replies are pushed to the user as soon as they are placed.
+        
+        Args:
+            user (Controller): The user controller to join the hub.
+            terminate (threading.Event|None): An event to signal termination, defaults to None.
+            
+        Returns:
+            dict[str, Any]: The registry of the hub.
+        """
+        try:
+            response = get_session(self.url).get(f"{self.url}/registry")
+        except Exception:
+            logger.error('Connection Error')
+            raise ConnectionError
+        registry = response.json()
+        logger.debug(registry)
+        connection = connect(f"{self.url.replace('http', 'ws', 1)}/ws/user/{user.address}")
+        self.users[user.address] = user
+        terminate = terminate if terminate is not None else threading.Event()
+        user.events[self.url] = terminate
+        send = create_websocket_sender(connection)
+        for worker_address in registry:
+            user.subscribe(send, 'request', worker_address)
+        user.data_buffer['registration'] = {k:{'data':v} for k,v in registry.items()}
+        receive = lambda message: user.receiveData(message, sender=self.url)
+        threading.Thread(target=create_websocket_receiver(connection, receive, terminate), daemon=True).start()
+        return registry
+
     @staticmethod
     def send_command(command:str|bytes, url: str, request_ids: dict[str, Controller], users: dict[str, Controller]) -> dict[str, Any]:
         """
@@ -293,11 +427,14 @@ class FastAPIUserClient:
         """
         command_json = json.loads(command)
         try:
-            response = requests.post(f"{url}/command", json=command_json)
+            response = get_session(url).post(f"{url}/command", json=command_json)
         except Exception:
             logger.error('Connection Error')
             raise ConnectionError
         request_id = response.json()
+        if response.status_code != 200:
+            logger.warning(request_id)
+            return request_id
         user_id = command_json.get('address', {}).get('sender', [None])[0]
         request_ids[request_id['request_id']] = users[user_id]
         return request_id
@@ -305,7 +442,7 @@ class FastAPIUserClient:
     @staticmethod
     def get_reply(request_id: str, url: str, terminate: threading.Event|None = None) -> dict[str, Any]:
         """
-        Get a reply from the hub.
+        Get a reply from the hub, waiting up to `LONG_POLL_TIMEOUT` for each poll.
         
         Args:
             request_id (str): The ID of the request to get the reply for.
@@ -318,13 +455,12 @@ class FastAPIUserClient:
         terminate = terminate if terminate is not None else threading.Event()
         while not terminate.is_set():
             try:
-                response = requests.get(f"{url}/reply/{request_id}")
+                response = get_session(url).get(f"{url}/reply/{request_id}", params=dict(timeout=LONG_POLL_TIMEOUT))
             except Exception:
                 logger.error('Connection Error')
                 raise ConnectionError
             if response.status_code == 200:
                 break
-            time.sleep(0.1)
         if terminate.is_set():
             raise InterruptedError
         reply = response.json()
@@ -332,7 +468,7 @@ class FastAPIUserClient:
         return reply
 
 
-def create_fastapi_user(host:str, port:int, address:str|None = None) -> tuple[Controller, dict[str,Any]]:
+def create_fastapi_user(host:str, port:int, address:str|None = None, websocket:bool = True) -> tuple[Controller, dict[str,Any]]:
     """
     Create a FastAPI client instance.
     
@@ -340,6 +476,7 @@ def create_fastapi_user(host:str, port:int, address:str|None = None) -> tuple[Co
         host (str): The host address for the FastAPI server.
         port (int): The port number for the FastAPI server.
         address (str|None): The address of the user, defaults to None.
+        websocket (bool): Whether to receive replies over the WebSocket push channel instead of polling, defaults to True.
         
     Returns:
         tuple[Controller, dict[str, Any]]: A tuple containing the Controller instance and a dictionary with the client.
@@ -348,12 +485,15 @@ def create_fastapi_user(host:str, port:int, address:str|None = None) -> tuple[Co
     if address is not None:
         user.setAddress(address)
     client = FastAPIUserClient(host, port)
-    client.join_hub(user)
+    if websocket:
+        client.join_hub_websocket(user)
+    else:
+        client.join_hub(user)
     return user, {
         'client': client
     }
     
-def create_fastapi_worker(host:str, port:int, address:str|None = None) -> tuple[Controller, dict[str,Any]]:
+def create_fastapi_worker(host:str, port:int, address:str|None = None, websocket:bool = True) -> tuple[Controller, dict[str,Any]]:
     """
     Create a FastAPI client instance.
     
@@ -361,6 +501,7 @@ def create_fastapi_worker(host:str, port:int, address:str|None = None) -> tuple[
         host (str): The host address for the FastAPI server.
         port (int): The port number for the FastAPI server.
         address (str|None): The address of the worker, defaults to None.
+        websocket (bool): Whether to receive commands over the WebSocket push channel instead of polling, defaults to True.
         
     Returns:
         tuple[Controller, dict[str, Any]]: A tuple containing the Controller instance and a dictionary with the client.
@@ -372,10 +513,14 @@ def create_fastapi_worker(host:str, port:int, address:str|None = None) -> tuple[
     client = FastAPIWorkerClient(host, port)
     terminate = threading.Event()
     client.terminate_events[worker.address] = terminate
-    client.update_registry(worker, terminate=terminate)
-    pause = threading.Event()
-    client.pause_events[worker.address] = pause
-    worker_thread = threading.Thread(target=client.create_listen_loop(worker, sender=client.url, terminate=terminate, pause=pause), daemon=True)
+    if websocket:
+        listen_loop = client.connect_websocket(worker, terminate=terminate)
+    else:
+        client.update_registry(worker, terminate=terminate)
+        pause = threading.Event()
+        client.pause_events[worker.address] = pause
+        listen_loop = client.create_listen_loop(worker, sender=client.url, terminate=terminate, pause=pause)
+    worker_thread = threading.Thread(target=listen_loop, daemon=True)
     worker_thread.start()
     return worker, {
         'terminate': terminate,
@@ -1,3 +1,4 @@
 # -*- coding: utf-8 -*-
 """This module provides a socket server for managing commands and replies in a distributed system."""
-from .utils import create_socket_hub, create_socket_user, create_socket_worker
\ No newline at end of file
+from .utils import create_socket_hub, create_socket_user, create_socket_worker
+from .async_utils import create_async_socket_hub, create_async_socket_user, create_async_socket_worker
\ No newline at end of file
@@ -0,0 +1,472 @@
+# -*- coding: utf-8 -*-
+"""
+This module provides an asyncio socket server and client for managing connections in a distributed system.
+Packets use the same length-prefixed frames as `utils`, so asyncio and threaded hubs and clients can
+be mixed. Many clients can share one event loop thread.
+
+## Classes:
+    `QueueBridge`: Adapter that bridges `Controller` callbacks to an asyncio queue.
+    `AsyncSocketServer`: Class for handling asyncio socket server operations.
+    `AsyncSocketClient`: Class for handling asyncio socket client operations.
+
+## Functions:
+    `read_packet`: Read a length-prefixed packet from a stream.
+    `write_packets`: Write the packets put on a queue to a stream.
+    `close_stream`: Write the packets left on a queue and close the stream.
+    `wait_for_event`: Wait for a threading event without blocking the event loop.
+    `start_event_loop`: Start an asyncio event loop in a background thread.
+    `create_async_socket_user`: Create an asyncio Socket client instance.
+    `create_async_socket_worker`: Create an asyncio Socket worker instance.
+    `create_async_socket_hub`: Create an asyncio Socket hub instance.
+
+<i>Documentation last updated: 2025-06-11</i>
+"""
+# Standard library imports
+from __future__ import annotations
+import asyncio
+import logging
+import threading
+import time
+from typing import Any
+
+# Local application imports
+from ....core.control import Controller
+from ....core.interpreter import JSONInterpreter
+from .utils import CONNECTED, EXIT, FRAME_HEADER, MAX_FRAME_SIZE, encode_frame
+
+# Configure logging
+from controllably import CustomLevelFilter
+logger = logging.getLogger(__name__)
+CustomLevelFilter().setModuleLevel(__name__, logging.INFO)
+
+TERMINATE_CHECK_INTERVAL = 0.1
+CLOSE_TIMEOUT = 1
+
+async def read_packet(reader: asyncio.StreamReader, max_size: int = MAX_FRAME_SIZE) -> bytes:
+    """
+    Read a length-prefixed packet from a stream
+    
+    Args:
+        reader (asyncio.StreamReader): the stream reader
+        max_size (int, optional): maximum number of bytes in a packet. Defaults to MAX_FRAME_SIZE.
+    
+    Returns:
+        bytes: the packet
+    
+    Raises:
+        asyncio.IncompleteReadError: the peer closed the connection
+        ConnectionError: the packet is longer than the maximum size
+    """
+    header = await reader.readexactly(FRAME_HEADER.size)
+    length = FRAME_HEADER.unpack(header)[0]
+    if length > max_size:
+        raise ConnectionError(f"Frame of {length} bytes exceeds the maximum of {max_size} bytes")
+    return await reader.readexactly(length)
+
+async def write_packets(queue: asyncio.Queue, writer: asyncio.StreamWriter):
+    """
+    Write the packets put on a queue to a stream, until None is put on the queue. Packets queued
+    together are written before waiting for the stream to drain.
+    
+    Args:
+        queue (asyncio.Queue): the queue of packets
+        writer (asyncio.StreamWriter): the stream writer
+    """
+    while True:
+        packets = [await queue.get()]
+        while not queue.empty():
+            packets.append(queue.get_nowait())
+        for packet in packets:
+            if packet is None:
+                await writer.drain()
+                return
+            writer.write(encode_frame(packet))
+        await writer.drain()
+
+async def close_stream(queue: asyncio.Queue, sender: asyncio.Task, writer: asyncio.StreamWriter):
+    """
+    Write the packets left on a queue and close the stream
+    
+    Args:
+        queue (asyncio.Queue): the queue of packets
+        sender (asyncio.Task): the task running `write_packets`
+        writer (asyncio.StreamWriter): the stream writer
+    """
+    try:
+        await asyncio.wait_for(queue.put(None), CLOSE_TIMEOUT)
+        await asyncio.wait_for(sender, CLOSE_TIMEOUT)
+    except Exception:
+        sender.cancel()
+    writer.close()
+    return
+
+async def wait_for_event(event: threading.Event):
+    """
+    Wait for a threading event without blocking the event loop
+    
+    Args:
+        event (threading.Event): the event
+    """
+    while not event.is_set():
+        await asyncio.sleep(TERMINATE_CHECK_INTERVAL)
+    return
+
+def start_event_loop() -> tuple[asyncio.AbstractEventLoop, threading.Thread]:
+    """
+    Start an asyncio event loop in a background thread
+    
+    Returns:
+        tuple[asyncio.AbstractEventLoop, threading.Thread]: the event loop and its thread
+    """
+    loop = asyncio.new_event_loop()
+    loop_thread = threading.Thread(target=loop.run_forever, daemon=True)
+    loop_thread.start()
+    return loop, loop_thread
+
+
+class QueueBridge:
+    """
+    Adapter that bridges the callbacks of a `Controller` to an asyncio queue. The controller calls `send`
+    from its own threads or from the event loop, and the packets are put on the queue in the event loop.
+    Must be created in the event loop.
+    
+    ### Constructor:
+        `max_pending` (int, optional): maximum number of queued packets, 0 for unbounded. Defaults to 0.
+    
+    ### Attributes:
+        `loop` (asyncio.AbstractEventLoop): the event loop
+        `queue` (asyncio.Queue): the queue of packets to send
+    
+    ### Methods:
+        `send`: put a packet on the queue
+    """
+    
+    def __init__(self, max_pending: int = 0):
+        """
+        Initialize the bridge
+        
+        Args:
+            max_pending (int, optional): maximum number of queued packets, 0 for unbounded. Defaults to 0.
+        """
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(max_pending)
+        self._loop_thread_id = threading.get_ident()
+        return
+    
+    def send(self, packet: str|bytes):
+        """
+        Put a packet on the queue
+        
+        Args:
+            packet (str|bytes): the packet to send
+        """
+        if threading.get_ident() == self._loop_thread_id:
+            self._put(packet)
+            return
+        if self.loop.is_closed():
+            raise ConnectionError("Event loop is closed")
+        self.loop.call_soon_threadsafe(self._put, packet)
+        return
+    
+    def _put(self, packet: str|bytes):
+        """
+        Put a packet on the queue, dropping it if the queue is full
+        
+        Args:
+            packet (str|bytes): the packet to send
+        """
+        try:
+            self.queue.put_nowait(packet)
+        except asyncio.QueueFull:
+            logger.warning(f"Send queue full, dropping packet: {packet[:100]!r}")
+        return
+
+
+class AsyncSocketServer:
+    @staticmethod
+    async def handle_client(
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        controller: Controller,
+        *,
+        max_pending: int = 0
+    ):
+        """
+        Handles communication with a single client
+        
+        Args:
+            reader (asyncio.StreamReader): the stream reader
+            writer (asyncio.StreamWriter): the stream writer
+            controller (Controller): the controller
+            max_pending (int, optional): maximum number of packets queued for the client, 0 for unbounded. Defaults to 0.
+        """
+        addr = writer.get_extra_info('peername')
+        client_addr = f"{addr[0]}:{addr[1]}"
+        logger.info(f"Client connected from {addr}")
+        bridge = QueueBridge(max_pending)
+        sender = asyncio.create_task(write_packets(bridge.queue, writer))
+        bridge.send(f"{CONNECTED}{client_addr}")
+        client_role = None
+        try:
+            handshake = (await read_packet(reader)).decode("utf-8", "replace")
+            logger.info(handshake)
+            client_role = handshake.replace(CONNECTED, '', 1) if handshake.startswith(CONNECTED) else None
+            if client_role not in ('model', 'view'):
+                raise ConnectionError(f"Invalid handshake: {handshake}")
+            callback_type = 'request' if client_role == 'model' else 'data'
+            receive_method = controller.receiveRequest
+            if controller.role == 'relay':
+                receive_method = controller.relayData if client_role == 'model' else controller.relayRequest
+            controller.subscribe(bridge.send, callback_type, client_addr)
+            if client_role == 'view' and controller.role != 'model':    # Models already broadcast the registry on subscribe
+                controller.broadcastRegistry(target=[client_addr])
+            
+            while True:
+                packet = await read_packet(reader)
+                if packet == EXIT:
+                    bridge.send(EXIT)
+                    break
+                try:
+                    receive_method(packet, sender=client_addr)
+                except Exception as e:
+                    logger.error(f"Error handling packet from [{client_addr}]: {e}")
+        except (asyncio.IncompleteReadError, ConnectionError) as e:
+            if not isinstance(e, asyncio.IncompleteReadError):
+                logger.error(e)
+        finally:
+            if client_role in ('model', 'view'):
+                controller.unsubscribe('request' if client_role == 'model' else 'data', client_addr)
+                controller.data_buffer.get('registration', {}).pop(client_addr, None)
+            await close_stream(bridge.queue, sender, writer)
+            logger.warning(f"Disconnected from client [{client_addr}]")
+        return
+    
+    @staticmethod
+    async def start_server(
+        host: str,
+        port: int,
+        controller: Controller,
+        *,
+        n_connections: int = 128,
+        max_pending: int = 0,
+        terminate: threading.Event|None = None
+    ):
+        """
+        Starts the server, serving all clients from the event loop. On termination, the connections 
+        of clients that are still connected are closed.
+        
+        Args:
+            host (str): the host
+            port (int): the port, 0 to pick a free port
+            controller (Controller): the controller
+            n_connections (int, optional): the backlog of connections waiting to be accepted. Defaults to 128.
+            max_pending (int, optional): maximum number of packets queued for each client, 0 for unbounded. Defaults to 0.
+            terminate (threading.Event|None, optional): the termination event. Defaults to None.
+        """
+        handlers: set[asyncio.Task] = set()
+        async def handle_client(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+            task = asyncio.current_task()
+            handlers.add(task)
+            try:
+                await AsyncSocketServer.handle_client(reader, writer, controller, max_pending=max_pending)
+            finally:
+                handlers.discard(task)
+        server = await asyncio.start_server(handle_client, host, port, backlog=n_connections, reuse_address=True)
+        port = server.sockets[0].getsockname()[1]
+        logger.info(f"Server listening on {host}:{port}")
+        controller.setAddress(f"{host}:{port}")
+        
+        terminate = threading.Event() if terminate is None else terminate
+        async with server:
+            await wait_for_event(terminate)
+            server.close()
+            # From Python 3.12, leaving the context waits for every connection to close
+            for task in list(handlers):
+                task.cancel()
+            await asyncio.gather(*handlers, return_exceptions=True)
+        logger.warning(f"Server [{host}:{port}] stopped.")
+        return
+
+
+class AsyncSocketClient:
+    @staticmethod
+    async def start_client(
+        host: str,
+        port: int,
+        controller: Controller,
+        relay: bool = False,
+        *,
+        terminate: threading.Event|None = None
+    ):
+        """
+        Starts the client
+        
+        Args:
+            host (str): the host
+            port (int): the port
+            controller (Controller): the controller
+            relay (bool, optional): flag to indicate relay. Defaults to False.
+            terminate (threading.Event|None, optional): the termination event. Defaults to None.
+        """
+        match controller.role:
+            case 'model':
+                callback_type = 'data'
+                receive_method = controller.receiveRequest
+            case 'view':
+                callback_type = 'request'
+                receive_method = controller.receiveData
+            case _:
+                raise ValueError(f"Invalid role: {controller.role}")
+        
+        host_addr = f"{host}:{port}"
+        terminate = threading.Event() if terminate is None else terminate
+        try:
+            reader, writer = await asyncio.open_connection(host, port)
+            logger.info(f"Connected to server at {host_addr}")
+            handshake = (await read_packet(reader)).decode("utf-8", "replace")
+            logger.info(handshake)
+            if not handshake.startswith(CONNECTED):
+                raise ConnectionError(f"Invalid handshake: {handshake}")
+            controller.setAddress(handshake.replace(CONNECTED, '', 1))
+            bridge = QueueBridge()
+            sender = asyncio.create_task(write_packets(bridge.queue, writer))
+            bridge.send(f"{CONNECTED}{controller.role}")
+            controller.subscribe(bridge.send, callback_type, host_addr, relay=relay)
+            
+            async def listen():
+                while True:
+                    packet = await read_packet(reader)
+                    if packet == EXIT:
+                        bridge.send(EXIT)
+                        return
+                    try:
+                        receive_method(packet, sender=host_addr)
+                    except Exception as e:
+                        logger.error(f"Error handling packet from [{host_addr}]: {e}")
+            listener = asyncio.create_task(listen())
+            stopper = asyncio.create_task(wait_for_event(terminate))
+            await asyncio.wait([listener, stopper], return_when=asyncio.FIRST_COMPLETED)
+            stopper.cancel()
+            listener.cancel()
+            if listener.done() and not listener.cancelled() and isinstance(listener.exception(), ConnectionError):
+                logger.error(listener.exception())
+            await close_stream(bridge.queue, sender, writer)
+        except Exception as e:
+            logger.error(f"Error connecting to server: {e}")
+        else:
+            logger.warning(f"Disconnected from server [{host}:{port}]")
+        
+        # Clean up
+        controller.unsubscribe(callback_type, host_addr)
+        return
+
+
+def create_async_socket_user(
+    host: str,
+    port: int,
+    address: str|None = None,
+    relay: bool = True,
+    *,
+    loop: asyncio.AbstractEventLoop|None = None
+) -> tuple[Controller, dict[str,Any]]:
+    """
+    Create an asyncio Socket client instance.
+    
+    Args:
+        host (str): the host address
+        port (int): the port number
+        address (str|None, optional): the address to set for the controller. Defaults to None.
+        relay (bool, optional): whether to relay messages. Defaults to True.
+        loop (asyncio.AbstractEventLoop|None, optional): the event loop to run the client on, or None to start one. Defaults to None.
+    
+    Returns:
+        tuple[Controller, dict[str,Any]]: a tuple containing the controller and a dictionary with termination event, event loop and client future.
+    """
+    user = Controller('view', JSONInterpreter())
+    if address is not None:
+        user.setAddress(address)
+    loop = loop if loop is not None else start_event_loop()[0]
+    terminate = threading.Event()
+    coroutine = AsyncSocketClient.start_client(host, port, user, relay, terminate=terminate)
+    future = asyncio.run_coroutine_threadsafe(coroutine, loop)
+    time.sleep(1)
+    return user, {
+        'terminate': terminate,
+        'loop': loop,
+        'user_future': future
+    }
+
+def create_async_socket_worker(
+    host: str,
+    port: int,
+    address: str|None = None,
+    relay: bool = True,
+    *,
+    loop: asyncio.AbstractEventLoop|None = None
+) -> tuple[Controller, dict[str,Any]]:
+    """
+    Create an asyncio Socket worker instance.
+    
+    Args:
+        host (str): the host address
+        port (int): the port number
+        address (str|None, optional): the address to set for the controller. Defaults to None.
+        relay (bool, optional): whether to relay messages. Defaults to True.
+        loop (asyncio.AbstractEventLoop|None, optional): the event loop to run the worker on, or None to start one. Defaults to None.
+    
+    Returns:
+        tuple[Controller, dict[str,Any]]: a tuple containing the controller and a dictionary with termination event, event loop and worker future.
+    """
+    worker = Controller('model', JSONInterpreter())
+    if address is not None:
+        worker.setAddress(address)
+    worker.start()
+    loop = loop if loop is not None else start_event_loop()[0]
+    terminate = threading.Event()
+    if relay:
+        coroutine = AsyncSocketClient.start_client(host, port, worker, relay, terminate=terminate)
+    else:
+        coroutine = AsyncSocketServer.start_server(host, port, worker, terminate=terminate)
+    future = asyncio.run_coroutine_threadsafe(coroutine, loop)
+    return worker, {
+        'terminate': terminate,
+        'loop': loop,
+        'worker_future': future
+    }
+
+def create_async_socket_hub(
+    host: str,
+    port: int,
+    address: str|None = None,
+    relay: bool = True,
+    *,
+    max_pending: int = 0,
+    loop: asyncio.AbstractEventLoop|None = None
+) -> tuple[Controller, dict[str,Any]]:
+    """
+    Create an asyncio Socket hub instance. The hub relays packets in the event loop, through a send
+    queue for each client, so that a slow client does not hold up the others.
+    
+    Args:
+        host (str): the host address
+        port (int): the port number
+        address (str|None, optional): the address to set for the controller. Defaults to None.
+        relay (bool, optional): whether to relay messages. Defaults to True.
+        max_pending (int, optional): maximum number of packets queued for each client, 0 for unbounded. Defaults to 0.
+        loop (asyncio.AbstractEventLoop|None, optional): the event loop to run the hub on, or None to start one. Defaults to None.
+    
+    Returns:
+        tuple[Controller, dict[str,Any]]: a tuple containing the controller and a dictionary with termination event, event loop and hub future.
+    """
+    hub = Controller('relay', JSONInterpreter())
+    if address is not None:
+        hub.setAddress(address)
+    loop = loop if loop is not None else start_event_loop()[0]
+    terminate = threading.Event()
+    coroutine = AsyncSocketServer.start_server(host, port, hub, max_pending=max_pending, terminate=terminate)
+    future = asyncio.run_coroutine_threadsafe(coroutine, loop)
+    return hub, {
+        'terminate': terminate,
+        'loop': loop,
+        'hub_future': future
+    }
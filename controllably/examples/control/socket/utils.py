@@ -1,16 +1,23 @@
 # -*- coding: utf-8 -*-
 """
 This module provides a socket server and client for managing connections in a distributed system.
+Packets are sent as length-prefixed frames, and each server or client serves all of its connections
+from one thread with a `selectors` event loop.
 
 Attributes:
-    BYTE_SIZE (int): size of the byte.
+    BYTESIZE (int): maximum number of bytes read from a socket at a time.
+    FRAME_HEADER (struct.Struct): length prefix of a frame.
+    MAX_FRAME_SIZE (int): maximum number of bytes in a frame, beyond which the connection is closed.
 
 ## Classes:
+    `FrameReader`: Class for splitting a byte stream into length-prefixed frames.
+    `FramedConnection`: Class for a non-blocking socket connection that sends and receives frames.
+    `SelectorLoop`: Class for serving many connections from one thread.
     `SocketServer`: Class for handling socket server operations.
     `SocketClient`: Class for handling socket client operations.
     
 ## Functions:
-    `create_listen_socket_callback`: Create a callback function for listening to socket data.
+    `encode_frame`: Prefix a packet with its length.
     `create_socket_user`: Create a Socket client instance.
     `create_socket_worker`: Create a Socket worker instance.
     `create_socket_hub`: Create a Socket hub instance.
@@ -19,15 +26,17 @@ Attributes:
 """
 # Standard library imports
 from __future__ import annotations
+from functools import partial
 import logging
-import select
+import selectors
 import socket
+import struct
 import threading
 import time
 from typing import Callable, Any
 
 # Local application imports
-from ....core.control import Controller
+from ....core.control import Controller, FlowControl
 from ....core.interpreter import JSONInterpreter
 
 # Configure logging
@@ -35,154 +44,471 @@ from controllably import CustomLevelFilter
 logger = logging.getLogger(__name__)
 CustomLevelFilter().setModuleLevel(__name__, logging.INFO)
 
-BYTESIZE = 1024
+BYTESIZE = 64 * 1024
+FRAME_HEADER = struct.Struct('!I')
+MAX_FRAME_SIZE = 64 * 1024 * 1024
+CONNECTED = '[CONNECTED] '
+EXIT = b'[EXIT]'
 
-def create_listen_socket_callback(client_socket: socket.socket, relay: bool) -> Callable[[Any], str]:
+def encode_frame(packet: str|bytes) -> bytes:
     """
-    Create a callback function for listening to socket data.
+    Prefix a packet with its length, so that the receiver can split the byte stream into packets.
     
     Args:
-        client_socket (socket.socket): the client socket
-        relay (bool): flag to indicate if the socket is a relay
-    
+        packet (str|bytes): the packet to send
+        
     Returns:
-        Callable[[Any], str]: a function that listens for incoming data on the socket
+        bytes: the frame
+    """
+    data = packet.encode("utf-8") if isinstance(packet, str) else bytes(packet)
+    return FRAME_HEADER.pack(len(data)) + data
+
+
+class FrameReader:
+    """
+    Class for splitting a byte stream into length-prefixed frames. A frame may arrive over several
+    reads, and several frames may arrive in one read.
+    
+    ### Constructor:
+        `max_size` (int, optional): maximum number of bytes in a frame. Defaults to MAX_FRAME_SIZE.
+    
+    ### Attributes:
+        `buffer` (bytearray): bytes received that do not yet make a complete frame.
+        `max_size` (int): maximum number of bytes in a frame.
+        
+    ### Methods:
+        `feed`: add received bytes and get the complete frames
+    """
+    
+    def __init__(self, max_size: int = MAX_FRAME_SIZE):
+        self.buffer = bytearray()
+        self.max_size = max_size
+        return
+    
+    def feed(self, data: bytes) -> list[bytes]:
+        """
+        Add received bytes and get the complete frames
+        
+        Args:
+            data (bytes): the bytes received
+            
+        Returns:
+            list[bytes]: the packets of the complete frames
+            
+        Raises:
+            ValueError: a frame is longer than the maximum size
+        """
+        self.buffer += data
+        frames = []
+        start = 0
+        while len(self.buffer) - start >= FRAME_HEADER.size:
+            length = FRAME_HEADER.unpack_from(self.buffer, start)[0]
+            if length > self.max_size:
+                raise ValueError(f"Frame of {length} bytes exceeds the maximum of {self.max_size} bytes")
+            end = start + FRAME_HEADER.size + length
+            if len(self.buffer) < end:
+                break
+            frames.append(bytes(self.buffer[start+FRAME_HEADER.size:end]))
+            start = end
+        del self.buffer[:start]
+        return frames
+
+
+class FramedConnection:
+    """
+    Class for a non-blocking socket connection that sends and receives length-prefixed frames.
+    Packets may be sent from any thread. They are written straight away while the socket accepts them,
+    and the rest is kept in a write buffer that the event loop flushes once the socket is writable.
+    
+    ### Constructor:
+        `sock` (socket.socket): the connected socket
+        `address` (str): the address of the peer
+        
+    ### Attributes:
+        `sock` (socket.socket): the connected socket
+        `address` (str): the address of the peer
+        `role` (str|None): the role of the client, set by the handshake
+        `reader` (FrameReader): reader for incoming frames
+        `write_buffer` (bytearray): bytes waiting to be written
+        `closing` (bool): flag to close the connection once the write buffer is flushed
+        `on_pending` (Callable|None): callback when bytes are left in the write buffer
+        
+    ### Methods:
+        `send`: send a packet
+        `flush`: write as much of the write buffer as the socket accepts
+        `receive`: read from the socket and get the complete packets
+        `close`: close the socket
     """
-    def listen_socket(**kwargs) -> str:
+    
+    def __init__(self, sock: socket.socket, address: str):
+        """
+        Initialize the connection
+        
+        Args:
+            sock (socket.socket): the connected socket
+            address (str): the address of the peer
+        """
+        self.sock = sock
+        self.address = address
+        self.role: str|None = None
+        self.reader = FrameReader()
+        self.write_buffer = bytearray()
+        self.closing = False
+        self.on_pending: Callable[[FramedConnection], Any]|None = None
+        self._lock = threading.Lock()
+        sock.setblocking(False)
+        return
+    
+    def send(self, packet: str|bytes):
+        """
+        Send a packet
+        
+        Args:
+            packet (str|bytes): the packet to send
+        """
+        frame = encode_frame(packet)
+        with self._lock:
+            if not self.write_buffer:
+                try:
+                    sent = self.sock.send(frame)
+                except BlockingIOError:
+                    sent = 0
+                frame = frame[sent:]
+            if not frame:
+                return
+            self.write_buffer += frame
+        if self.on_pending is not None:
+            self.on_pending(self)
+        return
+    
+    def flush(self) -> bool:
+        """
+        Write as much of the write buffer as the socket accepts
+        
+        Returns:
+            bool: whether the write buffer is empty
+        """
+        with self._lock:
+            if self.write_buffer:
+                try:
+                    sent = self.sock.send(self.write_buffer)
+                except BlockingIOError:
+                    sent = 0
+                del self.write_buffer[:sent]
+            return not self.write_buffer
+    
+    def receive(self) -> list[bytes]:
         """
-        Listen for incoming communications
+        Read from the socket and get the complete packets
+        
+        Returns:
+            list[bytes]: the packets received
+            
+        Raises:
+            EOFError: the peer closed the connection
+            ValueError: a frame is longer than the maximum size
         """
         try:
-            data = ''
-            while True:
-                fragment = client_socket.recv(BYTESIZE).decode("utf-8", "replace").replace('\uFFFD', '')  # Receive data (adjust buffer size if needed)
-                data += fragment
-                if len(fragment)==0 or len(fragment) < BYTESIZE:
-                    break
-            if not data:  # Client disconnected
-                time.sleep(1)
-                raise EOFError
-            if data == '[EXIT]':
-                client_socket.sendall("[EXIT]".encode("utf-8"))
-                raise InterruptedError
-            logger.debug(f"Received from client: {data}")
-            logger.debug(data)
-        except Exception as e:
-            logger.error(f"Error handling client: {e}")
-            raise e
-        return data.encode("utf-8") if relay else data
-    return listen_socket
+            data = self.sock.recv(BYTESIZE)
+        except BlockingIOError:
+            return []
+        if not data:
+            raise EOFError
+        return self.reader.feed(data)
+    
+    def close(self):
+        """Close the socket"""
+        with self._lock:
+            self.sock.close()
+        return
+
+
+class SelectorLoop:
+    """
+    Class for serving many connections from one thread with a `selectors` event loop.
+    Other threads hand over connections with unsent bytes through a wake-up socket pair,
+    so only the loop thread changes the selector.
+    
+    ### Attributes:
+        `selector` (selectors.BaseSelector): the selector
+        `connections` (dict[str, FramedConnection]): the connections, keyed by address
+        
+    ### Methods:
+        `addListener`: serve a listening socket
+        `addConnection`: serve a connection
+        `removeConnection`: stop serving and close a connection
+        `notify`: flush the write buffer of a connection from the loop
+        `run`: run the event loop
+        `close`: close all connections and sockets
+    """
+    
+    def __init__(self):
+        self.selector = selectors.DefaultSelector()
+        self.connections: dict[str, FramedConnection] = dict()
+        self._pending: set[FramedConnection] = set()
+        self._pending_lock = threading.Lock()
+        self._wakeup_recv, self._wakeup_send = socket.socketpair()
+        self._wakeup_recv.setblocking(False)
+        self._wakeup_send.setblocking(False)
+        self.selector.register(self._wakeup_recv, selectors.EVENT_READ)
+        return
+    
+    def addListener(self, server_socket: socket.socket, on_accept: Callable[[socket.socket], Any]):
+        """
+        Serve a listening socket
+        
+        Args:
+            server_socket (socket.socket): the listening socket
+            on_accept (Callable[[socket.socket], Any]): callback when a connection is waiting to be accepted
+        """
+        server_socket.setblocking(False)
+        self.selector.register(server_socket, selectors.EVENT_READ, on_accept)
+        return
+    
+    def addConnection(self, 
+        connection: FramedConnection, 
+        on_packet: Callable[[FramedConnection, bytes], Any], 
+        on_close: Callable[[FramedConnection], Any]|None = None
+    ):
+        """
+        Serve a connection
+        
+        Args:
+            connection (FramedConnection): the connection
+            on_packet (Callable[[FramedConnection, bytes], Any]): callback for each packet received
+            on_close (Callable[[FramedConnection], Any]|None, optional): callback when the connection is closed. Defaults to None.
+        """
+        connection.on_pending = self.notify
+        self.connections[connection.address] = connection
+        self.selector.register(connection.sock, selectors.EVENT_READ, (connection, on_packet, on_close))
+        return
+    
+    def removeConnection(self, connection: FramedConnection):
+        """
+        Stop serving and close a connection
+        
+        Args:
+            connection (FramedConnection): the connection
+        """
+        if self.connections.get(connection.address) is not connection:
+            return
+        self.connections.pop(connection.address)
+        _, _, on_close = self.selector.unregister(connection.sock).data
+        connection.close()
+        if on_close is not None:
+            on_close(connection)
+        return
+    
+    def notify(self, connection: FramedConnection):
+        """
+        Flush the write buffer of a connection from the loop
+        
+        Args:
+            connection (FramedConnection): the connection
+        """
+        with self._pending_lock:
+            self._pending.add(connection)
+        try:
+            self._wakeup_send.send(b'\x00')
+        except OSError:     # A full wake-up buffer already wakes the loop
+            pass
+        return
+    
+    def run(self, terminate: threading.Event|None = None, timeout: float = 1):
+        """
+        Run the event loop until terminated, or until there is nothing left to serve
+        
+        Args:
+            terminate (threading.Event|None, optional): the termination event. Defaults to None.
+            timeout (float, optional): time to wait for events before checking the termination event. Defaults to 1.
+        """
+        terminate = threading.Event() if terminate is None else terminate
+        while not terminate.is_set() and len(self.selector.get_map()) > 1:
+            for key, mask in self.selector.select(timeout):
+                if key.fileobj is self._wakeup_recv:
+                    self._drain_wakeup()
+                elif callable(key.data):
+                    key.data(key.fileobj)
+                else:
+                    connection, on_packet, _ = key.data
+                    if mask & selectors.EVENT_WRITE:
+                        self._flush(connection)
+                    if mask & selectors.EVENT_READ:
+                        self._read(connection, on_packet)
+            with self._pending_lock:
+                pending, self._pending = self._pending, set()
+            for connection in pending:
+                self._flush(connection)
+        self.close()
+        return
+    
+    def close(self):
+        """Close all connections and sockets"""
+        for connection in list(self.connections.values()):
+            self.removeConnection(connection)
+        for key in list(self.selector.get_map().values()):
+            self.selector.unregister(key.fileobj)
+            key.fileobj.close()
+        self._wakeup_send.close()
+        self.selector.close()
+        return
+    
+    def _drain_wakeup(self):
+        """Empty the wake-up socket"""
+        try:
+            while self._wakeup_recv.recv(BYTESIZE):
+                pass
+        except BlockingIOError:
+            pass
+        return
+    
+    def _flush(self, connection: FramedConnection):
+        """
+        Flush the write buffer of a connection, and watch for the socket to be writable if bytes are left
+        
+        Args:
+            connection (FramedConnection): the connection
+        """
+        if self.connections.get(connection.address) is not connection:
+            return
+        try:
+            done = connection.flush()
+        except OSError as e:
+            logger.error(f"Error sending to [{connection.address}]: {e}")
+            self.removeConnection(connection)
+            return
+        if done and connection.closing:
+            self.removeConnection(connection)
+            return
+        events = selectors.EVENT_READ if done else (selectors.EVENT_READ | selectors.EVENT_WRITE)
+        key = self.selector.get_key(connection.sock)
+        if key.events != events:
+            self.selector.modify(connection.sock, events, key.data)
+        return
+    
+    def _read(self, connection: FramedConnection, on_packet: Callable[[FramedConnection, bytes], Any]):
+        """
+        Read from a connection and handle the packets received
+        
+        Args:
+            connection (FramedConnection): the connection
+            on_packet (Callable[[FramedConnection, bytes], Any]): callback for each packet received
+        """
+        if self.connections.get(connection.address) is not connection:
+            return
+        try:
+            packets = connection.receive()
+        except (EOFError, OSError):
+            self.removeConnection(connection)
+            return
+        except ValueError as e:
+            logger.error(f"Closing connection to [{connection.address}]: {e}")
+            self.removeConnection(connection)
+            return
+        for packet in packets:
+            if packet == EXIT:
+                try:
+                    connection.send(EXIT)
+                except OSError:
+                    pass
+                connection.closing = True
+                break
+            logger.debug(f"Received from [{connection.address}]: {packet}")
+            try:
+                on_packet(connection, packet)
+            except Exception as e:
+                logger.error(f"Error handling packet from [{connection.address}]: {e}")
+        if connection.closing:
+            self._flush(connection)
+        return
+
 
 class SocketServer:
     @staticmethod
-    def handle_client(
-        client_socket: socket.socket, 
-        client_addr:str, 
-        controller: Controller, 
-        client_role:str|None = None, 
-        *,
-        terminate: threading.Event|None = None
-    ):
+    def handle_packet(connection: FramedConnection, packet: bytes, controller: Controller):
         """
-        Handles communication with a single client
+        Handles a packet from a client. The first packet is the handshake with the client role.
         
         Args:
-            client_socket (socket.socket): the client socket
-            client_addr (str): the client address
+            connection (FramedConnection): the client connection
+            packet (bytes): the packet
             controller (Controller): the controller
-            client_role (str|None, optional): the client role. Defaults to None.
-            terminate (threading.Event|None, optional): the termination event. Defaults to None.
         """
-        relay = (controller.role == 'relay')
-        receive_method = controller.receiveRequest
-        callback_type = 'data'
-        if relay:
+        if connection.role is None:
+            handshake = packet.decode("utf-8", "replace")
+            logger.info(handshake)
+            client_role = handshake.replace(CONNECTED, '', 1) if handshake.startswith(CONNECTED) else None
             if client_role not in ('model', 'view'):
-                raise ValueError(f"Invalid role: {client_role}")
+                logger.error(f"Invalid handshake: {handshake}")
+                connection.closing = True
+                return
+            connection.role = client_role
             callback_type = 'request' if client_role == 'model' else 'data'
-            receive_method = controller.relayData if client_role == 'model' else controller.relayRequest
-        listen_socket = create_listen_socket_callback(client_socket=client_socket, relay=relay)
-        listen_key = client_addr #if relay else 'main'
-        controller.callbacks['listen'][listen_key] = listen_socket
+            controller.subscribe(connection.send, callback_type, connection.address)
+            if client_role == 'view' and controller.role != 'model':    # Models already broadcast the registry on subscribe
+                controller.broadcastRegistry(target=[connection.address])
+            return
         
-        terminate = threading.Event() if terminate is None else terminate
-        while not terminate.is_set():
-            try:
-                data = listen_socket()
-                receive_method(data, sender=listen_key)
-            except EOFError:
-                continue
-            except (InterruptedError, Exception):
-                break
-        
-        client_socket.close()
-        logger.warning(f"Disconnected from client [{client_addr}]")
+        receive_method = controller.receiveRequest
+        if controller.role == 'relay':
+            receive_method = controller.relayData if connection.role == 'model' else controller.relayRequest
+        receive_method(packet, sender=connection.address)
+        return
+    
+    @staticmethod
+    def handle_disconnect(connection: FramedConnection, controller: Controller):
+        """
+        Cleans up after a client disconnects
         
-        # Clean up
-        controller.unsubscribe(callback_type, client_addr)
-        controller.unsubscribe('listen', listen_key)
-        controller.data_buffer.get('registration', {}).pop(client_addr, None)
+        Args:
+            connection (FramedConnection): the client connection
+            controller (Controller): the controller
+        """
+        logger.warning(f"Disconnected from client [{connection.address}]")
+        if connection.role is None:
+            return
+        callback_type = 'request' if connection.role == 'model' else 'data'
+        controller.unsubscribe(callback_type, connection.address)
+        controller.data_buffer.get('registration', {}).pop(connection.address, None)
         return
 
     @staticmethod
-    def start_server(host:str, port:int, controller: Controller, *, n_connections:int = 5, terminate: threading.Event|None = None):
+    def start_server(host:str, port:int, controller: Controller, *, n_connections:int = 128, terminate: threading.Event|None = None):
         """
-        Starts the server
+        Starts the server, serving all clients from this thread
         
         Args:
             host (str): the host
-            port (int): the port
+            port (int): the port, 0 to pick a free port
             controller (Controller): the controller
-            n_connections (int, optional): the number of connections. Defaults to 5.
+            n_connections (int, optional): the backlog of connections waiting to be accepted. Defaults to 128.
             terminate (threading.Event|None, optional): the termination event. Defaults to None
         """
         server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
         server_socket.bind((host, port))
-        server_socket.listen(n_connections)  # Listen for up to 5 connections (default)
+        server_socket.listen(n_connections)
+        port = server_socket.getsockname()[1]
 
         logger.info(f"Server listening on {host}:{port}")
         controller.setAddress(f"{host}:{port}")
-
-        threads = []
-        terminate = threading.Event() if terminate is None else terminate
-        while not terminate.is_set():
-            read_list, _, _ = select.select([server_socket], [], [], 1)
-            if server_socket not in read_list:
-                time.sleep(0.01)
-                continue
-            try:
-                client_socket, addr = server_socket.accept()
-            except TimeoutError:
-                time.sleep(0.01)
-                continue
-            
-            # client_socket, addr = server_socket.accept()  # Accept a connection
-            logger.info(f"Client connected from {addr}")
-            client_addr = f"{addr[0]}:{addr[1]}"
-            client_socket.sendall(f"[CONNECTED] {client_addr}".encode("utf-8"))
-            handshake = client_socket.recv(BYTESIZE).decode("utf-8", "replace").replace('\uFFFD', '')  # Receive response" ")[1]
-            logger.info(handshake)
-            if not handshake.startswith("[CONNECTED] "):
-                raise ConnectionError(f"Invalid handshake: {handshake}")
-            client_role = handshake.replace('[CONNECTED] ','')
-            if client_role not in ('model', 'view'):
-                raise ValueError(f"Invalid role: {client_role}")
-            callback_type = 'request' if client_role == 'model' else 'data'
-            controller.subscribe(client_socket.sendall, callback_type, client_addr)
-            if client_role == 'view':
-                controller.broadcastRegistry(target=[client_addr])
-
-            # Handle each client in a separate thread
-            client_thread = threading.Thread(
-                target = SocketServer.handle_client, daemon = True,
-                args = (client_socket,client_addr,controller,client_role), 
-                kwargs = dict(terminate=terminate),
-            )
-            client_thread.start()
-            threads.append(client_thread)
         
-        for thread in threads:
-            thread.join()
+        loop = SelectorLoop()
+        on_packet = partial(SocketServer.handle_packet, controller=controller)
+        on_close = partial(SocketServer.handle_disconnect, controller=controller)
+        def accept(server_socket: socket.socket):
+            while True:     # Accept all waiting connections, so the backlog does not overflow
+                try:
+                    client_socket, addr = server_socket.accept()
+                except (BlockingIOError, TimeoutError):
+                    return
+                logger.info(f"Client connected from {addr}")
+                client_socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                connection = FramedConnection(client_socket, f"{addr[0]}:{addr[1]}")
+                loop.addConnection(connection, on_packet, on_close)
+                connection.send(f"{CONNECTED}{connection.address}")
+        loop.addListener(server_socket, accept)
+        loop.run(terminate)
         logger.warning(f"Server [{host}:{port}] stopped.")
         return
 
@@ -199,7 +525,6 @@ class SocketClient:
             relay (bool, optional): flag to indicate relay. Defaults to False.
             terminate (threading.Event|None, optional): the termination event. Defaults to None.
         """
-        client_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         match controller.role:
             case 'model':
                 callback_type = 'data'
@@ -209,33 +534,31 @@ class SocketClient:
                 receive_method = controller.receiveData
             case _:
                 raise ValueError(f"Invalid role: {controller.role}")
-
+        
+        host_addr = f"{host}:{port}"
+        def handle_packet(connection: FramedConnection, packet: bytes):
+            if connection.role is not None:
+                receive_method(packet, sender=host_addr)
+                return
+            handshake = packet.decode("utf-8", "replace")
+            logger.info(handshake)
+            if not handshake.startswith(CONNECTED):
+                logger.error(f"Invalid handshake: {handshake}")
+                connection.closing = True
+                return
+            connection.role = controller.role
+            controller.setAddress(handshake.replace(CONNECTED, '', 1))
+            connection.send(f"{CONNECTED}{controller.role}")
+            controller.subscribe(connection.send, callback_type, host_addr, relay=relay)
+            return
+        
         try:
-            client_socket.connect((host, port))  # Connect to the server
-            host_addr = f"{host}:{port}"
+            client_socket = socket.create_connection((host, port))  # Connect to the server
+            client_socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
             logger.info(f"Connected to server at {host_addr}")
-            time.sleep(1)
-            handshake = client_socket.recv(BYTESIZE).decode("utf-8","replace").replace('\uFFFD', '')  # Receive data (adjust buffer size if needed)
-            logger.info(handshake)
-            if not handshake.startswith("[CONNECTED] "):
-                raise ConnectionError(f"Invalid handshake: {handshake}")
-            controller.setAddress(handshake.replace('[CONNECTED] ',''))
-            client_socket.sendall(f"[CONNECTED] {controller.role}".encode("utf-8"))
-            controller.subscribe(client_socket.sendall, callback_type, host_addr, relay=relay)
-            listen_socket = create_listen_socket_callback(client_socket=client_socket, relay=relay)
-            listen_key = host_addr # if relay else 'main'
-            controller.callbacks['listen'][listen_key] = listen_socket
-            
-            terminate = threading.Event() if terminate is None else terminate
-            while not terminate.is_set():
-                try:
-                    data = listen_socket()
-                    receive_method(data, sender=listen_key)
-                except EOFError:
-                    continue
-                except (InterruptedError, Exception):
-                    break
-            
+            loop = SelectorLoop()
+            loop.addConnection(FramedConnection(client_socket, host_addr), handle_packet)
+            loop.run(terminate)
         except Exception as e:
             logger.error(f"Error connecting to server: {e}")
         else:
@@ -243,7 +566,6 @@ class SocketClient:
         
         # Clean up
         controller.unsubscribe(callback_type, host_addr)
-        controller.unsubscribe('listen', listen_key)
         return
 
 
@@ -305,20 +627,30 @@ def create_socket_worker(host:str, port:int, address:str|None = None, relay:bool
         'worker_thread': worker_thread
     }
 
-def create_socket_hub(host:str, port:int, address:str|None = None, relay:bool = True) -> tuple[Controller, dict[str,Any]]:
+def create_socket_hub(
+    host:str, 
+    port:int, 
+    address:str|None = None, 
+    relay:bool = True, 
+    *, 
+    flow_control: FlowControl|None = None
+) -> tuple[Controller, dict[str,Any]]:
     """
-    Create a Socket client instance.
+    Create a Socket client instance. The hub relays packets through per-client send queues,
+    so that a slow client does not hold up the others.
     
     Args:
         host (str): the host address
         port (int): the port number
         address (str|None, optional): the address to set for the controller. Defaults to None.
         relay (bool, optional): whether to relay messages. Defaults to True.
+        flow_control (FlowControl|None, optional): flow control settings for the send queues. Defaults to None.
         
     Returns:
         tuple[Controller, dict[str,Any]]: a tuple containing the controller and a dictionary with termination event and thread information.
     """
-    hub = Controller('relay', JSONInterpreter())
+    flow_control = flow_control if flow_control is not None else FlowControl()
+    hub = Controller('relay', JSONInterpreter(), flow_control=flow_control)
     if address is not None:
         hub.setAddress(address)
     terminate = threading.Event()
@@ -0,0 +1,143 @@
+# %%
+"""
+Latency benchmark for remote calls through a `Proxy`.
+
+Measures the round-trip time of a no-op remote call (`TwoTierQueue.qsize`) over the
+socket and FastAPI examples, comparing the previous `Controller.retrieveData`, which
+polled the data buffer every 100 ms, against the event-driven implementation that
+wakes as soon as `receiveData` stores the reply.
+"""
+import builtins
+import logging
+import socket
+import statistics
+import threading
+import time
+
+import uvicorn
+
+from controllably.core.control import Controller, Proxy, TwoTierQueue
+from controllably.core.interpreter import JSONInterpreter
+from controllably.examples.control.fastapi import server as fastapi_server
+from controllably.examples.control.fastapi.utils import FastAPIUserClient, FastAPIWorkerClient
+from controllably.examples.control.socket.utils import SocketClient, SocketServer
+
+HOST = '127.0.0.1'
+N_CALLS = 50
+OBJECT_ID = 'QUEUE'
+
+class PollingController(Controller):
+    """Controller with the previous polling implementation of `retrieveData`"""
+    def retrieveData(self, request_id, timeout=5, *, sender=None, min_count=1, max_count=1, default=None, data_only=True, close_request=True):
+        all_data = dict()
+        count = 0
+        data = default
+        start_time = time.perf_counter()
+        while request_id in self.data_buffer:
+            time.sleep(0.1)
+            if min_count and (count >= min_count):
+                break
+            if (time.perf_counter()-start_time) >= timeout:
+                return all_data if len(all_data) else None
+            if len(self.data_buffer[request_id]):
+                reply_ids = list(self.data_buffer[request_id].keys())
+                for reply_id in reply_ids:
+                    response = self.data_buffer[request_id].pop(reply_id)
+                    status = response.get('status', None)
+                    data = response.get('data', default)
+                    sender = response.get('address', {}).get('sender', [])[0]
+                    if status != 'completed':
+                        error_type_name, message = data.split('!!', maxsplit=1)
+                        data = getattr(builtins, error_type_name, Exception)(message)
+                    all_data.update({(sender,reply_id[-6:]): (data if data_only else response)})
+                    count += 1
+                    if count >= max_count:
+                        break
+                    start_time = time.perf_counter()
+                continue
+            elif sender in self.callbacks['listen']:
+                self.receiveData(sender=sender, request_id=request_id)
+        if close_request:
+            self._close_request(request_id)
+        if max_count == 1:
+            return (data if data_only else response)
+        return all_data
+
+def get_free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind((HOST, 0))
+        return sock.getsockname()[1]
+
+def round_trip_ms(proxy: Proxy) -> list[float]:
+    proxy.qsize()
+    times = []
+    for _ in range(N_CALLS):
+        start_time = time.perf_counter()
+        proxy.qsize()
+        times.append((time.perf_counter() - start_time)*1000)
+    return times
+
+def bench_socket(user_class: type[Controller]) -> list[float]:
+    port = get_free_port()
+    worker = Controller('model', JSONInterpreter())
+    worker.start()
+    terminate = threading.Event()
+    threading.Thread(target=SocketServer.start_server, args=[HOST,port,worker], kwargs=dict(terminate=terminate), daemon=True).start()
+    time.sleep(1)
+    user = user_class('view', JSONInterpreter())
+    threading.Thread(target=SocketClient.start_client, args=[HOST,port,user], kwargs=dict(terminate=terminate), daemon=True).start()
+    time.sleep(3)
+    worker.register(TwoTierQueue(), OBJECT_ID)
+    time.sleep(1)
+
+    proxy = Proxy(TwoTierQueue, OBJECT_ID)
+    proxy.bindController(user)
+    times = round_trip_ms(proxy)
+    terminate.set()
+    worker.stop()
+    return times
+
+def bench_fastapi(user_class: type[Controller], url: str, worker_address: str) -> list[float]:
+    worker = Controller('model', JSONInterpreter())
+    worker.setAddress(worker_address)
+    object_id = f'{OBJECT_ID}_{worker_address}'     # the hub registry is shared between runs
+    worker.register(TwoTierQueue(), object_id)
+    worker.start()
+    worker_client = FastAPIWorkerClient(*url.rsplit(':', 1))
+    terminate = threading.Event()
+    worker_client.update_registry(worker, terminate=terminate)
+    threading.Thread(target=worker_client.create_listen_loop(worker, sender=worker_client.url, terminate=terminate), daemon=True).start()
+    time.sleep(1)
+
+    user = user_class('view', JSONInterpreter())
+    user.setAddress(f'USER_{worker_address}')
+    FastAPIUserClient(*url.rsplit(':', 1)).join_hub(user)
+    proxy = Proxy(TwoTierQueue, object_id)
+    proxy.bindController(user)
+    times = round_trip_ms(proxy)
+    terminate.set()
+    worker.stop()
+    return times
+
+def start_fastapi_server() -> str:
+    port = get_free_port()
+    config = uvicorn.Config(fastapi_server.app, host=HOST, port=port, log_level='warning')
+    threading.Thread(target=uvicorn.Server(config).run, daemon=True).start()
+    time.sleep(2)
+    return f'http://{HOST}:{port}'
+
+def summarise(name: str, times: list[float]):
+    print(f"{name:<28} {statistics.mean(times):>10.2f} {statistics.median(times):>10.2f} {max(times):>10.2f}")
+
+if __name__ == "__main__":
+    logging.disable(logging.WARNING)
+    url = start_fastapi_server()
+    results = {
+        'socket (polling)': bench_socket(PollingController),
+        'socket (event-driven)': bench_socket(Controller),
+        'fastapi (polling)': bench_fastapi(PollingController, url, 'WORKER_POLLING'),
+        'fastapi (event-driven)': bench_fastapi(Controller, url, 'WORKER_EVENT'),
+    }
+    print(f"{'round trip of no-op call':<28} {'mean (ms)':>10} {'median':>10} {'max':>10}")
+    for name, times in results.items():
+        summarise(name, times)
@@ -0,0 +1,82 @@
+# %%
+"""
+Throughput benchmark for `Controller.relay` on a hub.
+
+Relays requests from a user to a worker through a hub and measures packets per second with
+the previous default `relay_delay` of 1 s, the direct path without delay, and per-destination
+send queues with and without credits. Replies from the worker return the credits.
+
+Also relays data replies of 1 KB, 1 MB and 10 MB from a worker to a user through a hub, with
+interpreters that decode the whole packet to route it (`JSONInterpreter`, `BinaryInterpreter`)
+and with `EnvelopeInterpreter`, which routes on a small header and leaves the payload untouched.
+"""
+import logging
+import time
+
+import numpy as np
+
+from controllably.core.control import Controller, FlowControl
+from controllably.core.interpreter import BinaryInterpreter, EnvelopeInterpreter, Interpreter, JSONInterpreter
+
+N_PACKETS = 10_000
+N_PACKETS_DELAYED = 3
+PAYLOAD_SIZES = {'1 KB': 1_000, '1 MB': 1_000_000, '10 MB': 10_000_000}
+PAYLOAD_SECONDS = 1
+
+def packets_per_second(n_packets: int, **kwargs) -> float:
+    hub = Controller('relay', JSONInterpreter(), **kwargs)
+    hub.setAddress('HUB')
+    received = []
+    def worker_callback(packet: str):
+        received.append(packet)
+        reply = JSONInterpreter.encodeData(dict(data=None, request_id=str(len(received)), address=dict(sender=['WORKER'], target=['USER'])))
+        hub.relayData(reply, sender='WORKER')
+    hub.subscribe(worker_callback, 'request', 'WORKER')
+    hub.subscribe(lambda packet: None, 'data', 'USER')
+    request = JSONInterpreter.encodeRequest(dict(method='qsize', address=dict(sender=['USER'], target=['WORKER'])))
+
+    start_time = time.perf_counter()
+    for _ in range(n_packets):
+        hub.relayRequest(request)
+    while len(received) < n_packets:
+        time.sleep(0.001)
+    duration = time.perf_counter() - start_time
+    hub.unsubscribe('request', 'WORKER')
+    return n_packets / duration
+
+def replies_per_second(interpreter: Interpreter, size: int) -> float:
+    hub = Controller('relay', interpreter)
+    hub.setAddress('HUB')
+    hub.subscribe(lambda packet: None, 'data', 'USER')
+    payload = np.random.default_rng(0).integers(0, 256, size=size, dtype=np.uint8)
+    reply = interpreter.encodeData(dict(data=payload, status='completed', request_id='0', reply_id='WORKER', address=dict(sender=['WORKER'], target=['USER'])))
+    count = 0
+    start_time = time.perf_counter()
+    while (duration := time.perf_counter() - start_time) < PAYLOAD_SECONDS:
+        hub.relayData(reply)
+        count += 1
+    return count / duration
+
+if __name__ == "__main__":
+    logging.disable(logging.WARNING)
+    cases = {
+        'relay_delay=1 (old default)': (N_PACKETS_DELAYED, dict(relay_delay=1)),
+        'direct': (N_PACKETS, dict()),
+        'send queues': (N_PACKETS, dict(flow_control=FlowControl())),
+        'send queues, 8 credits': (N_PACKETS, dict(flow_control=FlowControl(max_pending=100, credits=8))),
+    }
+    print(f"{'relay mode':<30} {'packets/s':>12}")
+    for name, (n_packets, kwargs) in cases.items():
+        print(f"{name:<30} {packets_per_second(n_packets, **kwargs):>12,.0f}")
+    
+    print()
+    interpreters = {
+        'json': JSONInterpreter(),
+        'binary': BinaryInterpreter(),
+        'envelope(json)': EnvelopeInterpreter(JSONInterpreter()),
+        'envelope(binary)': EnvelopeInterpreter(BinaryInterpreter()),
+    }
+    print(f"{'interpreter':<18}" + ''.join(f"{size + ' replies/s':>18}" for size in PAYLOAD_SIZES))
+    for name, interpreter in interpreters.items():
+        rates = [replies_per_second(interpreter, size) for size in PAYLOAD_SIZES.values()]
+        print(f"{name:<18}" + ''.join(f"{rate:>18,.0f}" for rate in rates))
@@ -0,0 +1,98 @@
+# %%
+"""
+Benchmark for `Deck.isExcluded`.
+
+Builds a deck with 3 nested zones of 12 slots each, all loaded with labware, and runs
+the deck feasibility check made by `Mover.isFeasible` on random targets. Compares the
+previous path (rebuilding `Deck.exclusion_zone` and evaluating each box's parametric
+function on every call) against the cached, stacked exclusion arrays.
+
+The previous path is run on fewer targets, as it takes minutes for the full count.
+"""
+import json
+import logging
+from pathlib import Path
+import tempfile
+import time
+
+import numpy as np
+
+from controllably.core.position import Deck, Labware, Slot
+
+N_CHECKS = 100_000
+N_CHECKS_LEGACY = 2_000
+N_ZONES = 3
+N_SLOTS = 12
+SEED = 0
+LABWARE_FILE = Path(__file__).parents[2] / 'tests' / 'core' / 'examples' / 'labware_tiprack.json'
+
+def write_layout(directory: Path) -> Path:
+    """Write a main deck of 3 zones with 12 loaded slots each, returning its filepath"""
+    slots = {
+        str(idx+1): {
+            "dimensions": [127.76,85.48,0],
+            "cornerOffset": [10 + 150*(idx%4), 10 + 100*(idx//4), 0],
+            "orientation": [0,0,0],
+            "labware_file": str(LABWARE_FILE)
+        } for idx in range(N_SLOTS)
+    }
+    zone_file = directory / 'layout_zone.json'
+    zone_file.write_text(json.dumps(dict(name='zone', dimensions=[600,300,0], slots=slots)))
+    zones = {
+        chr(ord('A')+idx): {
+            "dimensions": [600,300,0],
+            "cornerOffset": [0, 300*idx, 0],
+            "orientation": [0,0,0],
+            "deck_file": str(zone_file)
+        } for idx in range(N_ZONES)
+    }
+    main_file = directory / 'layout_main.json'
+    main_file.write_text(json.dumps(dict(name='main', dimensions=[600,900,0], zones=zones)))
+    return main_file
+
+def legacy_exclusion_zone(deck: Deck) -> dict:
+    """Previous implementation of `Deck.exclusion_zone`"""
+    bounds = dict()
+    for slot in deck.slots.values():
+        if not isinstance(slot, Slot):
+            continue
+        if not isinstance(slot.loaded_labware, Labware):
+            continue
+        bounds[slot.name] = slot.loaded_labware.exclusion_zone
+    for zone_name, zone in deck.zones.items():
+        for name,bound in legacy_exclusion_zone(zone).items():
+            bounds[f"{zone_name}_{name}"] = bound
+    return bounds
+
+def legacy_is_excluded(deck: Deck, coordinates: np.ndarray) -> bool:
+    """Previous implementation of `Deck.isExcluded`, without logging"""
+    collides_with = []
+    for name,box in legacy_exclusion_zone(deck).items():
+        bounds = box.bounds
+        if all([min(b) <= coordinates[i] <= max(b) for i,b in enumerate(list(zip(*bounds)))]):
+            collides_with.append(name)
+    return len(collides_with) > 0
+
+def checks_per_second(func, deck: Deck, points: np.ndarray) -> float:
+    start_time = time.perf_counter()
+    for point in points:
+        func(deck, point)
+    return len(points) / (time.perf_counter() - start_time)
+
+if __name__ == "__main__":
+    logging.getLogger('controllably').setLevel(logging.ERROR)
+    with tempfile.TemporaryDirectory() as directory:
+        deck = Deck.fromFile(write_layout(Path(directory)))
+    rng = np.random.default_rng(SEED)
+    points = rng.uniform((0,0,0), (600,900,200), size=(N_CHECKS,3))
+    print(f"{len(deck.exclusion_zone)} exclusion zones, {N_CHECKS:,} targets")
+
+    before = checks_per_second(legacy_is_excluded, deck, points[:N_CHECKS_LEGACY])
+    after = checks_per_second(Deck.isExcluded, deck, points)
+    start_time = time.perf_counter()
+    deck.isExcluded(points)
+    batch = N_CHECKS / (time.perf_counter() - start_time)
+    print(f"{'path':<10} {'checks/s':>14} {'speedup':>8}")
+    print(f"{'before':<10} {before:>14,.0f} {1:>7.1f}x")
+    print(f"{'after':<10} {after:>14,.0f} {after/before:>7.1f}x")
+    print(f"{'batch':<10} {batch:>14,.0f} {batch/before:>7.1f}x")
@@ -0,0 +1,54 @@
+# %%
+"""
+Micro-benchmark for `BaseDevice.processOutput`.
+
+Compares the previous per-line parsing path (re-parsing the format, re-checking
+the field set and recompiling the pattern for every line) against the cached
+`OutputParser` now used by `BaseDevice`.
+"""
+from string import Formatter
+import time
+from typing import NamedTuple
+
+import parse
+
+from controllably.core.device import BaseDevice, Data
+
+IntData = NamedTuple("IntData", [("data", int), ("channel", int)])
+FloatData = NamedTuple("FloatData", [("data", float), ("channel", int)])
+CASES = (
+    ("{data}", Data, "some_output_string"),
+    ("{data},{channel}", IntData, "12345,1"),
+    ("{data},{channel}", FloatData, "123.45,1"),
+)
+N_LINES = 50_000
+
+def legacy_process_output(data:str, format_out:str, data_type:NamedTuple):
+    """Previous implementation of `BaseDevice.processOutput`, without logging"""
+    fields = set([field for _, field, _, _ in Formatter().parse(format_out) if field and not field.startswith('_')])
+    assert set(data_type._fields) == fields, "Ensure data type fields match read format fields"
+    parse_out = parse.parse(format_out, data)
+    if parse_out is None:
+        return None
+    parsed = {k:v for k,v in parse_out.named.items() if not k.startswith('_')}
+    for key, value in data_type.__annotations__.items():
+        if value is int and not parsed[key].isnumeric():
+            parsed[key] = float(parsed[key])
+        elif value is bool:
+            parsed[key] = parsed[key].lower() not in ['false', '0', 'no']
+        parsed[key] = value(parsed[key])
+    return data_type(**parsed)
+
+def lines_per_second(func, *args) -> float:
+    start_time = time.perf_counter()
+    for _ in range(N_LINES):
+        func(*args)
+    return N_LINES / (time.perf_counter() - start_time)
+
+if __name__ == "__main__":
+    device = BaseDevice()
+    print(f"{'data type':<10} {'before (lines/s)':>18} {'after (lines/s)':>18} {'speedup':>8}")
+    for format_out, data_type, line in CASES:
+        before = lines_per_second(legacy_process_output, line, format_out, data_type)
+        after = lines_per_second(device.processOutput, line, format_out, data_type)
+        print(f"{data_type.__name__:<10} {before:>18,.0f} {after:>18,.0f} {after/before:>7.1f}x")
@@ -0,0 +1,91 @@
+# %%
+"""
+Round-trip latency of the FastAPI hub, in-process with `fastapi.testclient`.
+
+A user places a command for a worker, the worker picks it up and places a reply, and the user
+picks up the reply. The worker runs in its own thread, listening for commands the way the example
+clients do, and shares the client of the user so that both talk to the one event loop of the app.
+The user measures the time from placing the command to receiving the reply. Compares the REST endpoints polled at the interval of the example clients
+(100 ms), the REST endpoints polled without delay, the REST endpoints long-polled (the hub holds
+each poll until a command or reply arrives, up to a timeout), and the WebSocket endpoints, which
+push the command to the worker and the reply to the user as soon as they are placed.
+"""
+import statistics
+import threading
+import time
+import uuid
+
+from fastapi.testclient import TestClient
+
+from controllably.examples.control.fastapi import server
+
+N_CALLS = 50
+LONG_POLL_TIMEOUT = 1
+POLL_CASES = {'REST, 100 ms polling': (0.1, 0), 'REST, no delay': (0, 0), 'REST, long poll': (0, LONG_POLL_TIMEOUT)}
+
+def make_command(worker: str, user: str) -> dict:
+    return dict(request_id=uuid.uuid4().hex, address=dict(sender=[user], target=[worker]), method='qsize')
+
+def make_reply(command: dict) -> dict:
+    return dict(
+        reply_id=uuid.uuid4().hex, request_id=command['request_id'], status='completed', data=0,
+        address=dict(sender=command['address']['target'], target=command['address']['sender'])
+    )
+
+def poll(client: TestClient, url: str, interval: float, timeout: float) -> dict:
+    while (response := client.get(url, params=dict(timeout=timeout))).status_code != 200:
+        time.sleep(interval)
+    return response.json()
+
+def rest_worker(client: TestClient, interval: float, timeout: float, stop: threading.Event):
+    while not stop.is_set():
+        response = client.get('/command/WORKER_REST', params=dict(timeout=timeout))
+        if response.status_code != 200:
+            time.sleep(interval)
+            continue
+        client.post('/reply', json=make_reply(response.json()))
+
+def rest_round_trip(client: TestClient, interval: float, timeout: float) -> float:
+    command = make_command('WORKER_REST', 'USER_REST')
+    start_time = time.perf_counter()
+    client.post('/command', json=command)
+    poll(client, f"/reply/{command['request_id']}", interval, timeout)
+    duration = time.perf_counter() - start_time
+    client.get(f"/reply/clear/{command['request_id']}")
+    return duration
+
+def websocket_worker(client: TestClient, ready: threading.Event, stop: threading.Event):
+    with client.websocket_connect('/ws/worker/WORKER_WS') as worker:
+        ready.set()
+        while not stop.is_set():
+            command = worker.receive_json()
+            worker.send_json(make_reply(command))
+
+def websocket_round_trip(user) -> float:
+    command = make_command('WORKER_WS', 'USER_WS')
+    start_time = time.perf_counter()
+    user.send_json(command)
+    user.receive_json()
+    return time.perf_counter() - start_time
+
+def summarise(name: str, times: list[float]):
+    times = [t*1000 for t in times]
+    print(f"{name:<24} {statistics.mean(times):>10.2f} {statistics.median(times):>10.2f} {max(times):>10.2f}")
+
+if __name__ == "__main__":
+    print(f"{'round trip':<24} {'mean (ms)':>10} {'median':>10} {'max':>10}")
+    with TestClient(server.app) as client:
+        for name, (interval, timeout) in POLL_CASES.items():
+            stop = threading.Event()
+            worker_thread = threading.Thread(target=rest_worker, args=(client, interval, timeout, stop), daemon=True)
+            worker_thread.start()
+            summarise(name, [rest_round_trip(client, interval, timeout) for _ in range(N_CALLS)])
+            stop.set()
+            worker_thread.join()
+        
+        ready, stop = threading.Event(), threading.Event()
+        threading.Thread(target=websocket_worker, args=(client, ready, stop), daemon=True).start()
+        ready.wait()
+        with client.websocket_connect('/ws/user/USER_WS') as user:
+            summarise('WebSocket push', [websocket_round_trip(user) for _ in range(N_CALLS)])
+        stop.set()
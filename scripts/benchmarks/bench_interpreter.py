@@ -0,0 +1,82 @@
+# %%
+"""
+Benchmark for `BinaryInterpreter` and `ProtobufInterpreter` against `JSONInterpreter`.
+
+Encodes and decodes a reply carrying a 1080p RGB camera frame, and a reply carrying a
+1M-row DataFrame of force-curve-like readings. `JSONInterpreter` pickles the frame into
+a string, and serialises the DataFrame with `to_json(orient='table')`. `BinaryInterpreter`
+carries both as raw buffers, and decodes them as views onto the message. A small command
+and its reply show the per-message overhead. `ProtobufInterpreter` is skipped if the
+`protobuf` runtime is not installed.
+"""
+import time
+
+import numpy as np
+import pandas as pd
+
+from controllably.core.interpreter import BinaryInterpreter, JSONInterpreter
+try:
+    from controllably.core.protobuf_interpreter import ProtobufInterpreter
+except ImportError:
+    ProtobufInterpreter = None
+
+N_ROWS = 1_000_000
+REPEATS = 3
+N_SMALL = 10_000
+SEED = 0
+
+def make_replies() -> dict[str, dict]:
+    rng = np.random.default_rng(SEED)
+    frame = rng.integers(0, 256, size=(1080, 1920, 3), dtype=np.uint8)
+    df = pd.DataFrame({
+        'time': np.arange(N_ROWS) * 1e-3,
+        'displacement': rng.normal(size=N_ROWS),
+        'force': rng.normal(size=N_ROWS),
+        'step': rng.integers(0, 10, size=N_ROWS),
+    })
+    reply = dict(status='completed', address=dict(sender=['WORKER'], target=['USER']), request_id='0', reply_id='1', priority=False, rank=None)
+    return {
+        '1080p frame': dict(reply, data=frame),
+        '1M-row DataFrame': dict(reply, data=df),
+    }
+
+def small_round_trip(interpreter) -> tuple[float, int]:
+    command = dict(object_id='140234', method='move', args=['z', -10.5], kwargs=dict(speed_factor=0.5), 
+        address=dict(sender=['USER'], target=['WORKER']), request_id='4d6f1c0e9a6b4f6fa7c1b0a2c3d4e5f6', priority=False, rank=None)
+    reply = dict(data=True, status='completed', address=dict(sender=['WORKER'], target=['USER']), 
+        request_id=command['request_id'], reply_id='WORKER', priority=False, rank=None)
+    start_time = time.perf_counter()
+    for _ in range(N_SMALL):
+        interpreter.decodeRequest(interpreter.encodeRequest(command))
+        packet = interpreter.encodeData(reply)
+        interpreter.decodeData(packet)
+    duration = time.perf_counter() - start_time
+    return duration/N_SMALL, len(interpreter.encodeRequest(command)) + len(packet)
+
+def round_trip(interpreter, reply: dict) -> tuple[float, float, int]:
+    encode_times, decode_times = [], []
+    for _ in range(REPEATS):
+        start_time = time.perf_counter()
+        packet = interpreter.encodeData(reply)
+        encode_times.append(time.perf_counter() - start_time)
+        start_time = time.perf_counter()
+        interpreter.decodeData(packet)
+        decode_times.append(time.perf_counter() - start_time)
+    return min(encode_times), min(decode_times), len(packet)
+
+if __name__ == "__main__":
+    replies = make_replies()
+    interpreters = [('json', JSONInterpreter), ('binary', BinaryInterpreter)]
+    if ProtobufInterpreter is not None:
+        interpreters.append(('protobuf', ProtobufInterpreter))
+    print(f"{'interpreter':<12} {'command + reply (us)':>21} {'size (B)':>9}")
+    for name, interpreter in interpreters:
+        duration, size = small_round_trip(interpreter)
+        print(f"{name:<12} {duration*1e6:>21.1f} {size:>9}")
+    print()
+    print(f"best of {REPEATS}")
+    print(f"{'payload':<18} {'interpreter':<12} {'encode (s)':>11} {'decode (s)':>11} {'size (MB)':>10}")
+    for payload, reply in replies.items():
+        for name, interpreter in interpreters:
+            encode_time, decode_time, size = round_trip(interpreter, reply)
+            print(f"{payload:<18} {name:<12} {encode_time:>11.4f} {decode_time:>11.4f} {size/1e6:>10.1f}")
@@ -0,0 +1,90 @@
+# %%
+"""
+Benchmark for payload compression in `EnvelopeInterpreter`.
+
+Sends replies from a worker to a user over a loopback TCP socket, with a throttled link
+stand-in: the sender paces its writes to a fixed bandwidth. The socket example transport
+reads text and splits JSON packets, so this sends length-prefixed packets over a plain socket
+instead. Each reply is encoded, sent, received and decoded, and the latency and bytes on the
+wire are reported for each payload, link bandwidth and codec.
+
+Payloads are a small command reply, a 100k-row force curve DataFrame and a 1080p camera
+frame of a smooth scene with sensor noise, encoded with `BinaryInterpreter`.
+"""
+import socket
+import struct
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from controllably.core.interpreter import BinaryInterpreter, EnvelopeInterpreter, COMPRESSION_CODECS
+
+BANDWIDTHS = {'1 Gbit/s': 125e6, '100 Mbit/s': 12.5e6, '10 Mbit/s': 1.25e6}
+CODECS = [None, *COMPRESSION_CODECS]
+REPEATS = 3
+CHUNK_SIZE = 64 * 1024
+SEED = 0
+LENGTH = struct.Struct('<Q')
+
+def make_payloads() -> dict[str, object]:
+    rng = np.random.default_rng(SEED)
+    n_rows = 100_000
+    time_s = np.arange(n_rows) * 1e-3
+    displacement = np.round(time_s * 0.01, 6)
+    force = np.round(np.tanh(time_s / 20) * 5 + rng.normal(scale=0.01, size=n_rows), 3)
+    curve = pd.DataFrame(dict(time=time_s, displacement=displacement, force=force, step=(time_s // 10).astype(np.int64)))
+    y, x = np.mgrid[0:1080, 0:1920]
+    scene = (np.stack([x / 1920, y / 1080, (x + y) / 3000], axis=-1) * 200).astype(np.int16)
+    frame = np.clip(scene + rng.integers(-3, 4, size=scene.shape), 0, 255).astype(np.uint8)
+    return {'command reply': True, 'force curve': curve, '1080p frame': frame}
+
+def send_throttled(sock: socket.socket, packet: bytes, bandwidth: float):
+    data = LENGTH.pack(len(packet)) + packet
+    start_time = time.perf_counter()
+    for index in range(0, len(data), CHUNK_SIZE):
+        chunk = data[index:index+CHUNK_SIZE]
+        sock.sendall(chunk)
+        wait_time = (index + len(chunk)) / bandwidth - (time.perf_counter() - start_time)
+        if wait_time > 0:
+            time.sleep(wait_time)
+
+def receive(sock: socket.socket) -> bytes:
+    header = sock.recv(LENGTH.size, socket.MSG_WAITALL)
+    length = LENGTH.unpack(header)[0]
+    buffer = bytearray(length)
+    view = memoryview(buffer)
+    received = 0
+    while received < length:
+        received += sock.recv_into(view[received:], length - received)
+    return bytes(buffer)
+
+def round_trip(interpreter: EnvelopeInterpreter, data: object, bandwidth: float) -> tuple[float, int]:
+    server = socket.create_server(('127.0.0.1', 0))
+    client = socket.create_connection(server.getsockname())
+    connection, _ = server.accept()
+    reply = dict(data=data, status='completed', request_id='0', reply_id='WORKER', address=dict(sender=['WORKER'], target=['USER']))
+    latencies = []
+    for _ in range(REPEATS):
+        start_time = time.perf_counter()
+        packet = interpreter.encodeData(reply)
+        sender = threading.Thread(target=send_throttled, args=(connection, packet, bandwidth))
+        sender.start()
+        interpreter.decodeData(receive(client))
+        latencies.append(time.perf_counter() - start_time)
+        sender.join()
+    for sock in (client, connection, server):
+        sock.close()
+    return min(latencies), LENGTH.size + len(packet)
+
+if __name__ == "__main__":
+    payloads = make_payloads()
+    print(f"best of {REPEATS}, codecs available: {list(COMPRESSION_CODECS)}")
+    print(f"{'payload':<14} {'link':<11} {'codec':<6} {'wire (kB)':>10} {'latency (s)':>12}")
+    for payload, data in payloads.items():
+        for link, bandwidth in BANDWIDTHS.items():
+            for codec in CODECS:
+                interpreter = EnvelopeInterpreter(BinaryInterpreter(), compression=codec)
+                latency, size = round_trip(interpreter, data, bandwidth)
+                print(f"{payload:<14} {link:<11} {str(codec):<6} {size/1e3:>10.1f} {latency:>12.4f}")
@@ -0,0 +1,112 @@
+# %%
+"""
+Load test for the socket hub with many workers.
+
+Starts a socket hub and simulated workers on localhost, each with its own registered queue,
+and one user that calls all workers concurrently through proxies, one caller thread per worker.
+Reports calls per second, messages per second through the hub (each call is a request and a reply,
+relayed in and out of the hub), the median and p99 round-trip latency of a call, and the number
+of threads in the process before the callers start.
+
+Compares the threaded transport (`SocketServer` / `SocketClient`, one event loop thread per hub
+and per client) with the asyncio transport (`AsyncSocketServer` / `AsyncSocketClient`, with the
+hub and all clients on one event loop). Each case runs in a fresh process.
+"""
+import json
+import logging
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+from controllably.core.control import Controller, Proxy, TwoTierQueue
+from controllably.core.interpreter import JSONInterpreter
+from controllably.examples.control.socket.async_utils import AsyncSocketClient, AsyncSocketServer, start_event_loop
+from controllably.examples.control.socket.utils import SocketClient, SocketServer
+
+HOST = '127.0.0.1'
+N_WORKERS = (50, 200)
+TRANSPORTS = ('threaded', 'asyncio')
+DURATION = 10
+MESSAGES_PER_CALL = 4
+
+def call_worker(proxy: Proxy, stop: threading.Event, times: list[float]):
+    proxy.qsize()
+    while not stop.is_set():
+        start_time = time.perf_counter()
+        proxy.qsize()
+        times.append(time.perf_counter() - start_time)
+
+def load_test(transport: str, n_workers: int) -> dict[str, float]:
+    logging.disable(logging.WARNING)
+    terminate = threading.Event()
+    hub = Controller('relay', JSONInterpreter())
+    if transport == 'asyncio':
+        loop, _ = start_event_loop()
+        run = lambda coroutine: loop.call_soon_threadsafe(loop.create_task, coroutine)
+        run(AsyncSocketServer.start_server(HOST, 0, hub, terminate=terminate))
+        start_client = lambda controller: run(AsyncSocketClient.start_client(HOST, port, controller, True, terminate=terminate))
+    else:
+        threading.Thread(target=SocketServer.start_server, args=[HOST,0,hub], kwargs=dict(terminate=terminate), daemon=True).start()
+        start_client = lambda controller: threading.Thread(
+            target=SocketClient.start_client, args=[HOST,port,controller,True], kwargs=dict(terminate=terminate), daemon=True
+        ).start()
+    time.sleep(1)
+    port = int(hub.address.rsplit(':', 1)[1])
+
+    workers = []
+    for _ in range(n_workers):
+        worker = Controller('model', JSONInterpreter())
+        worker.start()
+        start_client(worker)
+        workers.append(worker)
+    user = Controller('view', JSONInterpreter())
+    start_client(user)
+    time.sleep(3)
+    for index, worker in enumerate(workers):
+        worker.register(TwoTierQueue(), f'QUEUE{index}')
+    while len(user.registry) < n_workers:
+        time.sleep(0.1)
+    n_threads = threading.active_count()
+
+    stop = threading.Event()
+    times = [[] for _ in workers]
+    callers = []
+    for index in range(n_workers):
+        proxy = Proxy(TwoTierQueue, f'QUEUE{index}')
+        proxy.controller, proxy.remote = user, True     # bindController checks attributes with one worker per hub
+        callers.append(threading.Thread(target=call_worker, args=(proxy, stop, times[index]), daemon=True))
+    start_time = time.perf_counter()
+    for caller in callers:
+        caller.start()
+    time.sleep(DURATION)
+    stop.set()
+    for caller in callers:
+        caller.join()
+    duration = time.perf_counter() - start_time
+    terminate.set()
+
+    latencies = sorted(t*1000 for worker_times in times for t in worker_times)
+    return {
+        'threads': n_threads,
+        'calls/s': len(latencies)/duration,
+        'messages/s': MESSAGES_PER_CALL*len(latencies)/duration,
+        'p50 (ms)': statistics.median(latencies),
+        'p99 (ms)': latencies[int(0.99*(len(latencies)-1))],
+    }
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3:
+        print(json.dumps(load_test(sys.argv[1], int(sys.argv[2]))), flush=True)
+        sys.exit()
+    print(f"{'transport':<10} {'workers':>8} {'threads':>8} {'calls/s':>10} {'messages/s':>11} {'p50 (ms)':>9} {'p99 (ms)':>9}", flush=True)
+    for n_workers in N_WORKERS:
+        for transport in TRANSPORTS:
+            output = subprocess.run([sys.executable, __file__, transport, str(n_workers)], capture_output=True, text=True).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            print(
+                f"{transport:<10} {n_workers:>8} {result['threads']:>8} {result['calls/s']:>10,.0f} "
+                f"{result['messages/s']:>11,.0f} {result['p50 (ms)']:>9.2f} {result['p99 (ms)']:>9.2f}",
+                flush=True
+            )
@@ -0,0 +1,152 @@
+# %%
+"""
+Benchmark for `TwoTierQueue`.
+
+Compares the previous implementation (a `queue.Queue` for normal items next to a
+`queue.PriorityQueue` of `(rank, item)` for high-priority items, with a spinning `get`)
+against the single heap keyed by (tier, rank, sequence). Commands are mixed across the
+two tiers, with ranked, unranked and `put_first` high-priority items.
+
+Both are heaps underneath, so throughput is similar. The differences are in the CPU
+burnt by a consumer waiting on an empty queue, and in commands of equal rank, which the
+previous implementation ordered by comparing the commands themselves.
+"""
+import queue
+import random
+import threading
+import time
+from typing import Any
+
+from controllably.core.control import TwoTierQueue
+
+N_ITEMS = 50_000
+SEED = 0
+
+class LegacyTwoTierQueue:
+    """Previous implementation of `TwoTierQueue`"""
+    def __init__(self):
+        self.normal_queue = queue.Queue()
+        self.high_priority_queue = queue.PriorityQueue()
+        self.last_used_queue_normal = True
+        self.priority_counter = 0
+
+    def put(self, item: Any, *, priority: bool = False, rank: int|None = None):
+        if priority or rank is not None:
+            self.priority_counter += 1
+            rank = self.priority_counter if rank is None else rank
+            self.high_priority_queue.put((rank, item))
+        else:
+            self.normal_queue.put(item)
+
+    def put_first(self, item: Any):
+        self.high_priority_queue.put((0, item))
+
+    def get(self, block: bool = True, timeout: float|None = None) -> Any:
+        item = None
+        start_time = time.perf_counter()
+        while True:
+            if not self.high_priority_queue.empty():
+                _, item = self.high_priority_queue.get(block=False)
+                self.last_used_queue_normal = False
+                break
+            elif not self.normal_queue.empty():
+                item = self.normal_queue.get(block=False)
+                self.last_used_queue_normal = True
+                break
+            if not block:
+                break
+            if timeout is not None and (time.perf_counter()-start_time) >= timeout:
+                break
+        return item
+
+    def task_done(self):
+        return self.normal_queue.task_done() if self.last_used_queue_normal else self.high_priority_queue.task_done()
+
+def make_operations() -> list[tuple[str, int, int|None]]:
+    random.seed(SEED)
+    operations = []
+    for i in range(N_ITEMS):
+        roll = random.random()
+        if roll < 0.7:
+            operations.append(('normal', i, None))
+        elif roll < 0.85:
+            operations.append(('ranked', i, random.randint(1, 100)))
+        elif roll < 0.95:
+            operations.append(('priority', i, None))
+        else:
+            operations.append(('first', i, None))
+    return operations
+
+def fill(q, operations: list[tuple[str, int, int|None]]):
+    for kind, item, rank in operations:
+        if kind == 'normal':
+            q.put(item)
+        elif kind == 'ranked':
+            q.put(item, rank=rank)
+        elif kind == 'priority':
+            q.put(item, priority=True)
+        else:
+            q.put_first(item)
+
+def drain(q):
+    for _ in range(N_ITEMS):
+        q.get(block=False)
+        q.task_done()
+
+def single_thread(q_class, operations) -> tuple[float, float]:
+    q = q_class()
+    start_time = time.perf_counter()
+    fill(q, operations)
+    put_time = time.perf_counter() - start_time
+    start_time = time.perf_counter()
+    drain(q)
+    return put_time, time.perf_counter() - start_time
+
+def producer_consumer(q_class, operations) -> float:
+    q = q_class()
+    def consume():
+        for _ in range(N_ITEMS):
+            q.get(timeout=5)
+            q.task_done()
+    consumer = threading.Thread(target=consume)
+    start_time = time.perf_counter()
+    consumer.start()
+    fill(q, operations)
+    consumer.join()
+    return time.perf_counter() - start_time
+
+def idle_cpu_seconds(q_class, wait: float = 1) -> float:
+    q = q_class()
+    cpu_time = []
+    def consume():
+        start_time = time.thread_time()
+        q.get(timeout=wait)
+        cpu_time.append(time.thread_time() - start_time)
+    consumer = threading.Thread(target=consume)
+    consumer.start()
+    consumer.join()
+    return cpu_time[0]
+
+def equal_rank_commands(q_class) -> str:
+    q = q_class()
+    commands = [dict(method='record', args=[i]) for i in range(3)]
+    try:
+        for command in commands:
+            q.put(command, rank=1)
+        order = [q.get(block=False)['args'][0] for _ in commands]
+    except TypeError as e:
+        return f"TypeError: {e}"
+    return f"order {order}"
+
+if __name__ == "__main__":
+    operations = make_operations()
+    print(f"{N_ITEMS:,} items, 70% normal / 15% ranked / 10% priority / 5% put_first")
+    print(f"{'implementation':<12} {'put (s)':>10} {'get (s)':>10} {'producer/consumer (s)':>22}")
+    for name, q_class in (('legacy', LegacyTwoTierQueue), ('heap', TwoTierQueue)):
+        put_time, get_time = single_thread(q_class, operations)
+        concurrent_time = producer_consumer(q_class, operations)
+        print(f"{name:<12} {put_time:>10.3f} {get_time:>10.3f} {concurrent_time:>22.3f}")
+    print()
+    print(f"{'implementation':<12} {'CPU for 1 s idle get (s)':>25}   commands of equal rank")
+    for name, q_class in (('legacy', LegacyTwoTierQueue), ('heap', TwoTierQueue)):
+        print(f"{name:<12} {idle_cpu_seconds(q_class):>25.3f}   {equal_rank_commands(q_class)}")
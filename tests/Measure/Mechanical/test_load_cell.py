@@ -1,7 +1,12 @@
 # %%
 import pytest
 import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
 from controllably.Measure.Mechanical import LoadCell
+from controllably.core import datalogger
 from controllably.core.connection import get_ports
 
 PORT = 'COM32'
@@ -13,13 +18,39 @@ configs = {
     'stabilize_timeout': 1
 }
 
-pytestmark = pytest.mark.skipif((PORT not in get_ports()), reason="Requires serial connection to device")
+requires_device = pytest.mark.skipif((PORT not in get_ports()), reason="Requires serial connection to device")
 
 @pytest.fixture(scope='session')
 def load_cell():
     lc = LoadCell(**configs)
     return lc
 
+@pytest.fixture
+def offline_load_cell(monkeypatch):
+    monkeypatch.setattr(LoadCell, 'connect', lambda self: None)
+    lc = LoadCell(port='COM99', correction_parameters=(2.0, 0.5), calibration_factor=4.0)
+    lc.baseline = 0.25
+    return lc
+
+def test_dataframe_derived_columns(offline_load_cell):
+    lc = offline_load_cell
+    start = datetime(2025, 3, 21, 10, 0, 0)
+    values = [1, 2.5, -3.0, 0, 1e4]
+    lc.records.extend([(lc.device.data_type(v), start + timedelta(seconds=i)) for i,v in enumerate(values)])
+    expected = datalogger.get_dataframe(lc.records, lc.device.data_type._fields)
+    expected['corrected_value'] = expected['value'].apply(lc._correct_value)
+    expected['force'] = expected['corrected_value'].apply(lc._calculate_force)
+    df = lc.records_df
+    assert list(df.columns) == list(expected.columns)
+    assert np.allclose(df['corrected_value'], expected['corrected_value'])
+    assert np.allclose(df['force'], expected['force'])
+    
+    lc.records.append((lc.device.data_type(7.0), start + timedelta(seconds=len(values))))
+    df = lc.records_df
+    assert len(df) == len(values) + 1
+    assert df['force'].iloc[-1] == pytest.approx(lc._calculate_force(lc._correct_value(7.0)))
+
+@requires_device
 def test_get_attributes(load_cell):
     load_cell.reset()
     attributes = load_cell.getAttributes()
@@ -27,12 +58,14 @@ def test_get_attributes(load_cell):
     expected_attributes['baseline'] = 0
     assert attributes == expected_attributes, f"Expected {expected_attributes}, but got {attributes}"
 
+@requires_device
 def test_zero(load_cell):
     load_cell.reset()
     assert load_cell.baseline == 0, "Baseline should be set to 0 after resetting"
     load_cell.zero()
     assert load_cell.baseline != 0, "Baseline should be set to current reading after zeroing"
 
+@requires_device
 def test_record(load_cell):
     load_cell.reset()
     assert len(load_cell.records) == 0, "Records should be empty after resetting"
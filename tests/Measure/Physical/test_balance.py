@@ -1,7 +1,12 @@
 # %%
 import pytest
 import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
 from controllably.Measure.Physical import Balance
+from controllably.core import datalogger
 from controllably.core.connection import get_ports
 
 PORT = 'COM32'
@@ -13,13 +18,35 @@ configs = {
     'stabilize_timeout': 1
 }
 
-pytestmark = pytest.mark.skipif((PORT not in get_ports()), reason="Requires serial connection to device")
+requires_device = pytest.mark.skipif((PORT not in get_ports()), reason="Requires serial connection to device")
 
 @pytest.fixture(scope='session')
 def balance():
     bal = Balance(**configs)
     return bal
 
+@pytest.fixture
+def offline_balance(monkeypatch):
+    monkeypatch.setattr(Balance, 'connect', lambda self: None)
+    bal = Balance(port='COM99', correction_parameters=(2.0, 0.5), calibration_factor=4.0)
+    bal.baseline = 0.25
+    return bal
+
+def test_dataframe_derived_columns(offline_balance):
+    bal = offline_balance
+    start = datetime(2025, 3, 21, 10, 0, 0)
+    values = [1, 2.5, -3.0, 0, 1e4]
+    bal.buffer.extend([(bal.device.data_type(v), start + timedelta(seconds=i)) for i,v in enumerate(values)])
+    expected = datalogger.get_dataframe(bal.buffer, bal.device.data_type._fields)
+    expected['corrected_value'] = expected['value'].apply(bal._correct_value)
+    expected['force'] = expected['corrected_value'].apply(bal._calculate_force)
+    expected['mass'] = expected['corrected_value'].apply(bal._calculate_mass)
+    df = bal.buffer_df
+    assert list(df.columns) == list(expected.columns)
+    for column in ('corrected_value', 'force', 'mass'):
+        assert np.allclose(df[column], expected[column])
+
+@requires_device
 def test_get_attributes(balance):
     balance.reset()
     attributes = balance.getAttributes()
@@ -27,12 +54,14 @@ def test_get_attributes(balance):
     expected_attributes['baseline'] = 0
     assert attributes == expected_attributes, f"Expected {expected_attributes}, but got {attributes}"
 
+@requires_device
 def test_zero(balance):
     balance.reset()
     assert balance.baseline == 0, "Baseline should be set to 0 after resetting"
     balance.zero()
     assert balance.baseline != 0, "Baseline should be set to current reading after zeroing"
 
+@requires_device
 def test_record(balance):
     balance.reset()
     assert len(balance.records) == 0, "Records should be empty after resetting"
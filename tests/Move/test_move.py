@@ -0,0 +1,74 @@
+import pytest
+import os
+from pathlib import Path
+
+import numpy as np
+
+from ..context import controllably
+from controllably.core.device import BaseDevice
+from controllably.core.position import Deck, Position
+from controllably.Move.move import Mover
+
+HERE = os.environ.get("REPO_ROOT") or Path(__file__).parent.parent.absolute()
+
+class RecordingMover(Mover):
+    """Mover that records the robot coordinates it moves to, with robot and work coordinates aligned"""
+    def __init__(self, *args, **kwargs):
+        self.path = []
+        super().__init__(*args, **kwargs)
+    
+    def moveTo(self, to, speed_factor=None, *, jog=False, rapid=False, robot=False):
+        move_to = to if isinstance(to, Position) else Position(to, self.robot_position.Rotation)
+        self.path.append(tuple(move_to.coordinates))
+        self.updateRobotPosition(to=move_to)
+        return self.robot_position
+
+@pytest.fixture
+def mover(monkeypatch):
+    monkeypatch.setattr('os.getcwd', lambda : str(Path(HERE).parent))
+    deck_file_main = 'control-lab-ly/tests/core/examples/layout_main.json'
+    deck = Deck.fromFile(deck_file_main)
+    return RecordingMover(device=BaseDevice(), deck=deck, safe_height=300)
+
+def test_travel_height_same_plate(mover):
+    """Test that a hop between wells of the same plate clears the top of the plate"""
+    start = np.array([670.65, 278.64, 20])
+    end = np.array([628.02, 278.64, 20])
+    top = max(mover.deck.exclusion_zone['zone_A_slot_02'].bounds[:,2])
+    travel_height = mover._get_travel_height(start, end)
+    assert top < travel_height < mover.safe_height
+    assert travel_height == pytest.approx(top + 1.0)
+
+    # Moving straight up or down within the plate does not need to leave it
+    assert mover._get_travel_height(start, np.array([*start[:2], 10])) == pytest.approx(20)
+
+def test_travel_height_plate_to_plate(mover):
+    """Test that a hop between plates travels below safe height, clear of every plate along the way"""
+    start = np.array([670.65, 278.64, 20])
+    end = np.array([750, 75, 20])
+    tops = {name: max(zone.bounds[:,2]) for name,zone in mover.deck.exclusion_zone.items()}
+    travel_height = mover._get_travel_height(start, end)
+    assert travel_height == pytest.approx(max(tops['zone_A_slot_02'], tops['zone_A_slot_06']) + 1.0)
+
+    above_start = (*start[:2], travel_height)
+    above_end = (*end[:2], travel_height)
+    assert mover.deck.getSweptCollisions(above_start, above_end) == []
+
+    # A taller plate at the destination raises the travel height
+    end = np.array([750, 375, 20])
+    assert mover._get_travel_height(start, end) == pytest.approx(tops['zone_A_slot_04'] + 1.0)
+
+def test_safe_move_to_hover(mover):
+    """Test that safeMoveTo stays low when hovering above a plate and hopping to another well"""
+    mover.updateRobotPosition(to=Position((670.65, 278.64, 52.7)))
+    mover.safeMoveTo((628.02, 278.64, 20))
+    assert mover.path == [(628.02, 278.64, 52.7), (628.02, 278.64, 20)]
+    
+    mover.path.clear()
+    mover.safeMoveTo((670.65, 278.64, 20))
+    assert mover.path == [(628.02, 278.64, 48.7), (670.65, 278.64, 48.7), (670.65, 278.64, 20)]
+    
+    mover.path.clear()
+    mover.deck = None
+    mover.safeMoveTo((628.02, 278.64, 20))
+    assert mover.path == [(670.65, 278.64, 300), (628.02, 278.64, 300), (628.02, 278.64, 20)]
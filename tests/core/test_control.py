@@ -2,10 +2,13 @@ import pytest
 import builtins
 import logging
 import threading
+import time
+
+import numpy as np
 
 from ..context import controllably
-from controllably.core.control import ClassMethods, TwoTierQueue, Proxy, Controller
-from controllably.core.interpreter import JSONInterpreter
+from controllably.core.control import ClassMethods, DataBuffer, FlowControl, SendQueue, TwoTierQueue, Proxy, Controller
+from controllably.core.interpreter import BinaryInterpreter, EnvelopeInterpreter, JSONInterpreter
 
 HOST = '127.0.0.1'
 PORT = 12345
@@ -56,6 +59,16 @@ class MyClass:
         """Test method"""
         raise ValueError(f"Executed {arg1} {kwarg1}")
 
+class Recorder:
+    def __init__(self):
+        self.values = []
+    
+    def record(self, value:str, delay:float = 0) -> str:
+        """Test method"""
+        time.sleep(delay)
+        self.values.append(value)
+        return value
+
 def test_class_methods():
     methods = {'method1': {'parameters': {'args': [('param1', None, 'str')]}}}
     class_methods = ClassMethods(name='MyClass', methods=methods)
@@ -104,6 +117,24 @@ def test_two_tier_queue():
     assert queue.priority_counter == 0
     assert queue.last_used_queue_normal
 
+def test_two_tier_queue_ordering():
+    queue = TwoTierQueue()
+    commands = [dict(method='record', args=[i]) for i in range(6)]
+    queue.put(commands[0])
+    queue.put(commands[1], rank=2)
+    queue.put(commands[2], rank=2)
+    queue.put(commands[3], rank=1)
+    queue.put_first(commands[4])
+    queue.put(commands[5])
+    assert queue.high_priority_queue.qsize() == 4
+    assert queue.normal_queue.qsize() == 2
+    assert [queue.get_nowait()['args'][0] for _ in range(6)] == [4, 3, 1, 2, 0, 5]
+    assert queue.get_nowait() is None
+    for _ in range(6):
+        queue.task_done()
+    with pytest.raises(ValueError):
+        queue.task_done()
+
 def test_two_tier_queue_delayed_get():
     queue = TwoTierQueue()
     assert queue.empty()
@@ -287,6 +318,432 @@ def test_controller(mock_controllers_hub,caplog):
         other_worker.unregister('TEST2')
         assert f"Object not found: TEST2" in caplog.text
 
+def test_controller_retrieve_data_push():
+    user = Controller('view', JSONInterpreter())
+    user.setAddress('USER')
+    request_id = user.transmitRequest(dict(method='exposeMethods'), target=['WORKER'])
+    assert request_id in user.data_conditions
+    reply = dict(
+        data='abc', status='completed', request_id=request_id, reply_id='REPLY1',
+        address=dict(sender=['WORKER'], target=['USER'])
+    )
+    timer = threading.Timer(0.2, user.receiveData, args=[user.interpreter.encodeData(reply)])
+    start_time = time.perf_counter()
+    timer.start()
+    assert user.retrieveData(request_id, timeout=5, sender='WORKER') == 'abc'
+    assert 0.2 <= (time.perf_counter() - start_time) < 1
+    timer.join()
+    assert request_id not in user.data_buffer
+    assert request_id not in user.data_conditions
+    
+    request_id = user.transmitRequest(dict(method='exposeMethods'), target=['WORKER'])
+    assert user.retrieveData(request_id, timeout=0.2) is None
+    assert request_id in user.data_buffer
+
+def test_controller_retrieve_data_keeps_surplus_replies():
+    user = Controller('view', JSONInterpreter())
+    user.setAddress('USER')
+    request_id = user.transmitRequest(dict(method='exposeMethods'), target=['WORKER1', 'WORKER2', 'WORKER3'])
+    for i in range(3):
+        reply = dict(
+            data=i, status='completed', request_id=request_id, reply_id=f'REPLY{i}',
+            address=dict(sender=[f'WORKER{i+1}'], target=['USER'])
+        )
+        user.receiveData(user.interpreter.encodeData(reply))
+    data = user.retrieveData(request_id, min_count=2, max_count=2, close_request=False)
+    assert sorted(data.values()) == [0, 1]
+    assert len(user.data_buffer[request_id]) == 1
+    assert user.retrieveData(request_id) == 2
+    assert request_id not in user.data_buffer
+
+def test_controller_retrieve_data_pull():
+    user = Controller('view', JSONInterpreter())
+    user.setAddress('USER')
+    def listen(request_id: str, **kwargs):
+        reply = dict(
+            data='abc', status='completed', request_id=request_id, reply_id='REPLY1',
+            address=dict(sender=['WORKER'], target=['USER'])
+        )
+        return user.interpreter.encodeData(reply)
+    user.subscribe(listen, 'listen', 'WORKER')
+    request_id = user.transmitRequest(dict(method='exposeMethods'), target=['WORKER'])
+    assert user.retrieveData(request_id, sender='WORKER') == 'abc'
+
+def test_data_buffer_eviction():
+    buffer = DataBuffer(ttl=0.2, max_size=2)
+    buffer['registration'] = dict()
+    for request_id in ('REQ1', 'REQ2', 'REQ3'):
+        buffer[request_id] = dict()
+    buffer['REQ3']['REPLY'] = 'abc'
+    assert buffer.evict() == ['REQ1']
+    assert buffer.overflow_count == 1
+    assert list(buffer.outstanding()) == ['REQ2', 'REQ3']
+    assert buffer.outstanding()['REQ3']['replies'] == 1
+    
+    assert buffer.pop('REQ2') == dict()
+    time.sleep(0.3)
+    buffer['REQ4'] = dict()
+    assert buffer.evict() == ['REQ3']
+    assert buffer.expired_count == 1
+    assert set(buffer) == {'registration', 'REQ4'}
+    
+    buffer.hold('REQ4')
+    time.sleep(0.3)
+    assert buffer.evict() == []
+    buffer.release('REQ4')
+    assert buffer.evict() == []
+    assert buffer.outstanding()['REQ4']['age'] < 0.2
+    metrics = buffer.getMetrics()
+    assert metrics['requests'] == 1
+    assert metrics['expired'] == metrics['overflow'] == 1
+
+def test_controller_data_buffer_bounds():
+    user = Controller('view', JSONInterpreter(), buffer_ttl=0.3, buffer_size=3)
+    user.setAddress('USER')
+    request_ids = [user.transmitRequest(dict(method='exposeMethods'), target=['WORKER']) for _ in range(5)]
+    assert list(user.getOutstandingRequests()) == request_ids[-3:]
+    assert user.getBufferMetrics()['overflow'] == 2
+    assert request_ids[0] not in user.data_conditions
+    
+    results = []
+    waiting = threading.Thread(target=lambda: results.append(user.retrieveData(request_ids[-1], timeout=5)))
+    waiting.start()
+    time.sleep(0.4)
+    assert user.getOutstandingRequests()[request_ids[-1]]['waiting']
+    reply = dict(
+        data='abc', status='completed', request_id='UNEXPECTED', reply_id='REPLY1',
+        address=dict(sender=['WORKER'], target=['USER'])
+    )
+    user.receiveData(user.interpreter.encodeData(reply))
+    assert list(user.getOutstandingRequests()) == [request_ids[-1], 'UNEXPECTED']
+    assert user.getBufferMetrics()['expired'] == 2
+    assert waiting.is_alive()
+    
+    start_time = time.perf_counter()
+    reply.update(request_id=request_ids[-1])
+    user.receiveData(user.interpreter.encodeData(reply))
+    waiting.join()
+    assert (time.perf_counter() - start_time) < 1
+    assert results == ['abc']
+    assert list(user.getOutstandingRequests()) == ['UNEXPECTED']
+    assert user.data_conditions == dict()
+    
+    request_id = user.transmitRequest(dict(method='exposeMethods'), target=['WORKER'])
+    time.sleep(0.2)
+    assert user.retrieveData(request_id, timeout=0.2) is None
+    assert user.getOutstandingRequests()[request_id]['age'] < 0.1
+
+def test_send_queue_credits():
+    sent = []
+    send_queue = SendQueue(sent.append, credits=2)
+    for i in range(4):
+        assert send_queue.put(i)
+    time.sleep(0.3)
+    assert sent == [0, 1]
+    assert send_queue.in_flight == 2
+    assert send_queue.pending == 1
+    assert send_queue.acknowledge(5) == 2
+    time.sleep(0.3)
+    assert sent == [0, 1, 2, 3]
+    assert send_queue.sent_count == 4
+    send_queue.stop()
+    assert not send_queue.is_running
+
+def test_send_queue_credit_timeout():
+    sent = []
+    send_queue = SendQueue(sent.append, credits=1, credit_timeout=0.3)
+    for i in range(2):
+        assert send_queue.put(i)
+    time.sleep(0.15)
+    assert sent == [0]
+    time.sleep(0.45)
+    assert sent == [0, 1]
+    assert send_queue.expired_count == 1
+    assert send_queue.in_flight == 1
+    assert send_queue.acknowledge() == 1
+    send_queue.stop()
+
+def test_controller_send_queue_creation():
+    hub = Controller('relay', JSONInterpreter(), flow_control=FlowControl())
+    hub.subscribe(lambda packet: None, 'request', 'WORKER')
+    barrier = threading.Barrier(8)
+    send_queues = []
+    def get_send_queue():
+        barrier.wait()
+        send_queues.append(hub._get_send_queue('request', 'WORKER'))
+    threads = [threading.Thread(target=get_send_queue) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(set(map(id, send_queues))) == 1
+    assert send_queues[0] is hub.send_queues[('request', 'WORKER')]
+
+def test_send_queue_back_pressure():
+    release = threading.Event()
+    send_queue = SendQueue(lambda packet: release.wait(), max_pending=1, block=False)
+    assert send_queue.put(0)
+    time.sleep(0.2)
+    assert send_queue.put(1)
+    assert not send_queue.put(2)
+    assert send_queue.dropped_count == 1
+    
+    send_queue.block, send_queue.timeout = True, 0.2
+    start_time = time.perf_counter()
+    assert not send_queue.put(3)
+    assert (time.perf_counter() - start_time) >= 0.2
+    release.set()
+    send_queue.stop()
+
+def test_controller_relay_delay():
+    received = []
+    hub = Controller('relay', JSONInterpreter(), relay_delay=0.2)
+    hub.subscribe(received.append, 'data', 'USER')
+    start_time = time.perf_counter()
+    hub.relay('packet1', 'data', ['USER'])
+    assert (time.perf_counter() - start_time) < 0.1
+    hub.relay('packet2', 'data', ['USER'])
+    assert (time.perf_counter() - start_time) >= 0.2
+    assert received == ['packet1', 'packet2']
+
+def test_controller_flow_control(mock_controllers_hub):
+    worker, user, hub = mock_controllers_hub
+    hub.flow_control = FlowControl(credits=1)
+    worker.start()
+    worker.register(MyClass(10), 'TEST1')
+    proxy = Proxy(MyClass, 'TEST1')
+    proxy.bindController(user)
+    assert [proxy.method(str(i)) for i in range(5)] == [f"Executed {i}" for i in range(5)]
+    send_queue = hub.send_queues[('request', 'WORKER')]
+    assert send_queue.sent_count >= 5
+    assert send_queue.in_flight == 0
+    assert hub.acknowledge('WORKER') == 0
+    hub.unsubscribe('request', 'WORKER')
+    assert ('request', 'WORKER') not in hub.send_queues
+    worker.stop()
+
+def test_controller_concurrent_lanes(mock_controllers):
+    worker, user = mock_controllers
+    worker.concurrent = True
+    recorder1, recorder2 = Recorder(), Recorder()
+    worker.register(recorder1, 'LANE1')
+    worker.register(recorder2, 'LANE2')
+    worker.start()
+    
+    def transmit(object_id: str, value: str, delay: float = 0, **kwargs) -> str:
+        command = dict(object_id=object_id, method='record', args=[value], kwargs=dict(delay=delay))
+        return user.transmitRequest(command, target=[worker.address], **kwargs)
+    
+    start_time = time.perf_counter()
+    slow_id = transmit('LANE1', 'slow', 1)
+    time.sleep(0.2)
+    queued_ids = [transmit('LANE1', 'normal'), transmit('LANE1', 'priority', priority=True)]
+    fast_id = transmit('LANE2', 'fast')
+    assert user.retrieveData(fast_id) == 'fast'
+    assert (time.perf_counter() - start_time) < 1
+    assert worker.getLaneMetrics()['LANE1']['depth'] == 2
+    
+    assert user.retrieveData(slow_id) == 'slow'
+    assert [user.retrieveData(request_id) for request_id in queued_ids] == ['normal', 'priority']
+    assert recorder1.values == ['slow', 'priority', 'normal']
+    assert recorder2.values == ['fast']
+    
+    worker.stop()
+    metrics = worker.getLaneMetrics()
+    assert set(metrics) == {'LANE1', 'LANE2'}
+    assert metrics['LANE1']['executed'] == 3
+    assert metrics['LANE1']['depth'] == 0
+    assert 0 < metrics['LANE2']['utilisation'] < metrics['LANE1']['utilisation'] <= 1
+
+def test_controller_concurrent_batch_spanning_lanes(mock_controllers):
+    worker, user = mock_controllers
+    worker.concurrent = True
+    recorder1, recorder2 = Recorder(), Recorder()
+    worker.register(recorder1, 'LANE1')
+    worker.register(recorder2, 'LANE2')
+    worker.start()
+    
+    def record(object_id: str, value: str, delay: float = 0) -> dict:
+        return dict(object_id=object_id, method='record', args=[value], kwargs=dict(delay=delay))
+    
+    slow_id = user.transmitRequest(record('LANE1', 'slow', 0.5), target=[worker.address])
+    time.sleep(0.1)
+    batch_id = user.transmitRequest([record('LANE1', 'batch1'), record('LANE2', 'batch2')], target=[worker.address])
+    after_id = user.transmitRequest(record('LANE2', 'after'), target=[worker.address])
+    assert [result['data'] for result in user.retrieveData(batch_id)] == ['batch1', 'batch2']
+    assert user.retrieveData(after_id) == 'after'
+    assert user.retrieveData(slow_id) == 'slow'
+    assert recorder1.values == ['slow', 'batch1']
+    assert recorder2.values == ['batch2', 'after']
+    
+    worker.stop()
+    metrics = worker.getLaneMetrics()
+    assert set(metrics) == {'LANE1', 'LANE2'}
+    assert metrics['LANE1']['executed'] + metrics['LANE2']['executed'] == 3
+    assert not any(lane.is_held for lane in worker.lanes.values())
+
+def test_controller_concurrent_batches_with_priority(mock_controllers):
+    worker, user = mock_controllers
+    worker.concurrent = True
+    recorder1, recorder2 = Recorder(), Recorder()
+    worker.register(recorder1, 'LANE1')
+    worker.register(recorder2, 'LANE2')
+    worker.start()
+    
+    def record(object_id: str, value: str, delay: float = 0) -> dict:
+        return dict(object_id=object_id, method='record', args=[value], kwargs=dict(delay=delay))
+    
+    slow_id = user.transmitRequest(record('LANE1', 'slow', 0.5), target=[worker.address])
+    time.sleep(0.1)
+    normal_id = user.transmitRequest([record('LANE1', 'normal1'), record('LANE2', 'normal2')], target=[worker.address])
+    time.sleep(0.1)
+    priority_id = user.transmitRequest([record('LANE1', 'priority1'), record('LANE2', 'priority2')], target=[worker.address], priority=True)
+    assert [result['data'] for result in user.retrieveData(normal_id)] == ['normal1', 'normal2']
+    assert [result['data'] for result in user.retrieveData(priority_id)] == ['priority1', 'priority2']
+    assert user.retrieveData(slow_id) == 'slow'
+    assert recorder1.values == ['slow', 'normal1', 'priority1']
+    assert recorder2.values == ['normal2', 'priority2']
+    
+    after_id = user.transmitRequest(record('LANE2', 'after'), target=[worker.address])
+    assert user.retrieveData(after_id) == 'after'
+    worker.stop()
+    assert not any(lane.is_held for lane in worker.lanes.values())
+    assert all(lane.depth == 0 for lane in worker.lanes.values())
+
+def test_controller_binary_interpreter():
+    worker = Controller('model', BinaryInterpreter())
+    user = Controller('view', BinaryInterpreter())
+    worker.setAddress('WORKER')
+    user.setAddress('USER')
+    worker.subscribe(user.receiveData, 'data', 'USER')
+    user.subscribe(worker.receiveRequest, 'request', 'WORKER')
+    recorder = Recorder()
+    worker.register(recorder, 'RECORDER')
+    worker.start()
+    frame = np.arange(48, dtype=np.uint8).reshape(4, 4, 3)
+    request_id = user.transmitRequest(dict(object_id='RECORDER', method='record', args=[frame]), target=['WORKER'])
+    data = user.retrieveData(request_id)
+    assert isinstance(data, np.ndarray)
+    assert np.array_equal(data, frame)
+    worker.stop()
+
+def test_controller_envelope_routing():
+    hub = Controller('relay', EnvelopeInterpreter(BinaryInterpreter()))
+    worker = Controller('model', EnvelopeInterpreter(BinaryInterpreter()))
+    user = Controller('view', EnvelopeInterpreter(BinaryInterpreter()))
+    hub.setAddress('HUB')
+    worker.setAddress('WORKER')
+    user.setAddress('USER')
+    worker.subscribe(hub.relayData,'data', 'HUB', relay=True)
+    hub.subscribe(user.receiveData,'data', 'USER')
+    user.subscribe(hub.relayRequest,'request', 'HUB', relay=True)
+    hub.subscribe(worker.receiveRequest,'request', 'WORKER')
+    recorder = Recorder()
+    worker.register(recorder, 'RECORDER')
+    worker.start()
+    assert user.registry == {'RECORDER': ['WORKER']}
+    
+    decoded = []
+    hub.interpreter.interpreter.decodeRequest = lambda packet: decoded.append(packet)
+    hub.interpreter.interpreter.decodeData = lambda packet: decoded.append(packet)
+    frame = np.arange(48, dtype=np.uint8).reshape(4, 4, 3)
+    request_id = user.transmitRequest(dict(object_id='RECORDER', method='record', args=[frame]), target=['WORKER'])
+    assert np.array_equal(user.retrieveData(request_id), frame)
+    assert len(decoded) == 0
+    worker.stop()
+
+def test_controller_batch_request(mock_controllers):
+    worker, user = mock_controllers
+    recorder = Recorder()
+    worker.register(recorder, 'RECORDER')
+    worker.start()
+    commands = [
+        dict(object_id='RECORDER', method='record', args=['a']),
+        dict(object_id='RECORDER', method='missing'),
+        dict(method='getattr', args=['RECORDER', 'values']),
+    ]
+    request_id = user.transmitRequest(commands, target=[worker.address])
+    results = user.retrieveData(request_id)
+    assert [result['status'] for result in results] == ['completed', 'error', 'completed']
+    assert results[0]['data'] == 'a'
+    assert results[1]['data'].startswith('AttributeError!!')
+    assert results[2]['data'] == ['a']
+    worker.stop()
+
+def test_controller_reply_encoding_fallback(mock_controllers):
+    worker, user = mock_controllers
+    recorder = Recorder()
+    recorder.lock = threading.Lock()
+    worker.register(recorder, 'RECORDER')
+    worker.start()
+    value = {(1, 2): 'a', 3: [{(4, (5, 6)): 'b'}]}
+    request_id = user.transmitRequest(dict(object_id='RECORDER', method='record', args=[value]), target=[worker.address])
+    assert user.retrieveData(request_id) == value
+    
+    request_id = user.transmitRequest(dict(method='getattr', args=['RECORDER', 'lock']), target=[worker.address])
+    assert isinstance(user.retrieveData(request_id), TypeError)
+    request_id = user.transmitRequest(dict(object_id='RECORDER', method='record', args=['d']), target=[worker.address])
+    assert user.retrieveData(request_id) == 'd'
+    worker.stop()
+
+def test_proxy_batch(mock_controllers):
+    worker, user = mock_controllers
+    worker.register(MyClass(0), 'OBJECT1')
+    worker.start()
+    proxy = Proxy(MyClass(1), 'OBJECT1')
+    proxy.bindController(user)
+    
+    transmitted = []
+    transmit_request = user.transmitRequest
+    def count_requests(command, *args, **kwargs):
+        transmitted.append(command)
+        return transmit_request(command, *args, **kwargs)
+    user.transmitRequest = count_requests
+    with proxy.batch():
+        futures = [proxy.method(str(i)) for i in range(3)]
+        prop = proxy.prop2
+        proxy.prop1 = 5
+        error = proxy.method_exception("1", kwarg1="2")
+        assert not any(future.done() for future in futures)
+    assert len(transmitted) == 1
+    assert [future.result() for future in futures] == [f"Executed {i}" for i in range(3)]
+    assert prop.result() == 'abc'
+    assert isinstance(error.exception(), ValueError)
+    assert proxy.prop1 == 5
+    
+    with pytest.raises(KeyError):
+        with proxy.batch():
+            cancelled = proxy.method("1")
+            raise KeyError
+    assert cancelled.cancelled()
+    assert len(transmitted) == 2
+    worker.stop()
+
+def test_proxy_batch_malformed_reply(mock_controllers):
+    worker, user = mock_controllers
+    worker.register(MyClass(0), 'OBJECT1')
+    worker.start()
+    proxy = Proxy(MyClass(1), 'OBJECT1')
+    proxy.bindController(user)
+    replies = [
+        dict(status='error', data=None),
+        dict(status='completed', data=[dict(data='a', status='completed')]),
+        dict(status='completed', data=[dict(data='a', status='completed'), dict(data=None, status='error')]),
+    ]
+    user.retrieveData = lambda *args, **kwargs: replies.pop(0)
+    for _ in range(len(replies)):
+        with proxy.batch():
+            futures = [proxy.method("1"), proxy.method("2")]
+        assert all(future.done() for future in futures)
+        assert isinstance(futures[1].exception(), Exception)
+    assert futures[0].result() == 'a'
+    assert 'Unable to read response' in str(futures[1].exception())
+    
+    assert isinstance(Proxy._to_exception('ValueError!!bad value'), ValueError)
+    assert type(Proxy._to_exception('print!!not an error')) is Exception
+    assert type(Proxy._to_exception('UnicodeDecodeError!!needs more arguments')) is Exception
+    worker.stop()
+
 @pytest.mark.parametrize("object_id, method_name, args, kwargs, outcome", [
     ('WRONG_ID', 'method_unknown', ['abc'], {}, KeyError),
     ('TEST1', 'method_unknown', ['abc'], {}, AttributeError),
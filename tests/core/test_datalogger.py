@@ -1,6 +1,6 @@
 import pytest
 from collections import deque
-from datetime import datetime
+from datetime import datetime, timedelta
 import logging
 import sys
 import threading
@@ -8,10 +8,12 @@ import time
 from typing import NamedTuple
 from unittest.mock import MagicMock
 
+import numpy as np
 import pandas as pd
 
 from ..context import controllably
-from controllably.core.datalogger import get_dataframe, record, stream, monitor_plot
+from controllably.core.datalogger import (
+    ColumnStore, DataFrameCache, RecordReader, RecordWriter, MANIFEST_FILENAME, get_dataframe, record, stream, monitor_plot)
 from controllably.core.device import StreamingDevice, BaseDevice
 
 Data = NamedTuple('Data', [('field1', int), ('field2', float)])
@@ -38,6 +40,170 @@ def test_get_dataframe_with_error():
     assert list(df.columns) == ['timestamp', 'field1', 'field2']
     assert len(df) == 0
 
+def test_column_store_ring():
+    store = ColumnStore(Data, 3)
+    assert store.maxlen == 3
+    assert len(store) == 0
+    assert store.latest() is None
+    for i in range(5):
+        store.append((Data(i, i/2), datetime(2025, 3, 21, 10, i, 0)))
+    assert len(store) == 3
+    assert store.total_count == 5
+    assert store[0] == (Data(2, 1.0), datetime(2025, 3, 21, 10, 2, 0))
+    assert store[-1] == store.latest() == (Data(4, 2.0), datetime(2025, 3, 21, 10, 4, 0))
+    assert [d.field1 for d,_ in store] == [2, 3, 4]
+    with pytest.raises(IndexError):
+        store[3]
+    
+    store.extendColumns({'field1': [5, 6], 'field2': [2.5, 3.0]}, [datetime(2025, 3, 21, 10, 5, 0)]*2)
+    assert [d.field1 for d,_ in store] == [4, 5, 6]
+    store.extendColumns({'field1': np.arange(10), 'field2': np.zeros(10)}, [None]*10)
+    assert [d.field1 for d,_ in store] == [7, 8, 9]
+    assert store[-1][1] is None
+    assert store.total_count == 17
+    store.clear()
+    assert len(store) == 0
+
+def test_column_store_grow():
+    store = ColumnStore(Data, 2, grow=True)
+    assert store.maxlen is None
+    store.extend(data_store)
+    df = store.to_dataframe()
+    assert np.shares_memory(df['field1'].to_numpy(), store.getColumns()[0]['field1'])
+    store.extend(data_store)
+    store.extendColumns({'field1': [5, 6, 7], 'field2': [1.0, 2.0, 3.0]}, [datetime(2025, 3, 21, 10, 2, 0)]*3)
+    assert len(store) == 7
+    assert store[2] == data_store[0]
+    assert store[-1] == (Data(7, 3.0), datetime(2025, 3, 21, 10, 2, 0))
+    assert [d.field1 for d,_ in store] == [1, 3, 1, 3, 5, 6, 7]
+    
+    df = get_dataframe(store, fields)
+    assert list(df.columns) == ['timestamp', 'field1', 'field2']
+    assert len(df) == 7
+    assert df['field1'].tolist() == [1, 3, 1, 3, 5, 6, 7]
+    assert df['timestamp'][0] == datetime(2025, 3, 21, 10, 0, 0)
+    
+    empty_df = get_dataframe(ColumnStore(Data), fields)
+    assert list(empty_df.columns) == ['timestamp', 'field1', 'field2']
+    assert len(empty_df) == 0
+
+def test_dataframe_cache():
+    cache = DataFrameCache(fields)
+    store = deque()
+    df = cache.update(store)
+    assert list(df.columns) == ['timestamp', 'field1', 'field2']
+    assert len(df) == 0
+    
+    store.extend(data_store)
+    df = cache.update(store)
+    assert df['field1'].tolist() == [1, 3]
+    df['extra'] = 0
+    store.append((Data(5, 6.0), datetime(2025, 3, 21, 10, 2, 0)))
+    df = cache.update(store)
+    assert list(df.columns) == ['timestamp', 'field1', 'field2']
+    assert df['field1'].tolist() == [1, 3, 5]
+    assert df['timestamp'][2] == datetime(2025, 3, 21, 10, 2, 0)
+    
+    store.clear()
+    store.append((Data(7, 8.0), datetime(2025, 3, 21, 10, 3, 0)))
+    assert cache.update(store)['field1'].tolist() == [7]
+    
+    bounded_store = deque(data_store, maxlen=2)
+    assert cache.update(bounded_store)['field1'].tolist() == [1, 3]
+    bounded_store.append((Data(5, 6.0), datetime(2025, 3, 21, 10, 2, 0)))
+    assert cache.update(bounded_store)['field1'].tolist() == [3, 5]
+
+def test_dataframe_cache_incremental(monkeypatch):
+    cache = DataFrameCache(fields)
+    start = datetime(2025, 3, 21, 10, 0, 0)
+    samples = [(Data(i, i/2), start + timedelta(seconds=i)) for i in range(200)]
+    store = deque(samples[:50], maxlen=50)
+    expected = get_dataframe(store, fields)
+    df = cache.update(store)
+    assert df.equals(expected)
+    
+    converted = []
+    get_dataframe_ = controllably.core.datalogger.get_dataframe
+    def count_converted(data_store, fields):
+        converted.append(len(data_store))
+        return get_dataframe_(data_store, fields)
+    monkeypatch.setattr(controllably.core.datalogger, 'get_dataframe', count_converted)
+    for i in range(50, 200, 30):
+        store.extend(samples[i:i+30])
+        df = cache.update(store)
+        assert df.equals(get_dataframe_(store, fields))
+    assert converted == [30]*5
+    
+    df.loc[0, 'field1'] = -1
+    assert cache.update(store)['field1'][0] == 150
+    
+    store.append((Data(1, 'text'), start))
+    df = cache.update(store)
+    assert df['field2'].tolist()[-2:] == [199/2, 'text']
+
+@pytest.mark.parametrize('file_format', ['csv', 'npy'])
+@pytest.mark.parametrize('column_store', [False, True])
+def test_record_writer(tmp_path, file_format, column_store):
+    store = ColumnStore(Data, 10, grow=True) if column_store else deque()
+    writer = RecordWriter(store, tmp_path, fields, file_format=file_format, flush_every=2, fsync='always')
+    store.extend(data_store)
+    assert writer.flush() == 2
+    assert writer.flush() == 0
+    store.append((Data(5, 6.0), datetime(2025, 3, 21, 10, 2, 0)))
+    writer.stop()
+    assert writer.written_count == 3
+    assert (tmp_path / MANIFEST_FILENAME).exists()
+    
+    reader = RecordReader(tmp_path)
+    assert len(reader) == 3
+    assert reader.fields == ('field1', 'field2')
+    assert [len(df) for df in reader] == [2, 1]
+    df = reader.to_dataframe()
+    assert list(df.columns) == ['timestamp', 'field1', 'field2']
+    assert df['field1'].tolist() == [1, 3, 5]
+    assert df['timestamp'][2] == datetime(2025, 3, 21, 10, 2, 0)
+
+def test_record_writer_background(tmp_path):
+    store = deque()
+    with RecordWriter(store, tmp_path, fields, flush_every=5, flush_interval=0.2, trim=True) as writer:
+        assert writer.is_running
+        store.extend([(Data(i, i/2), datetime(2025, 3, 21, 10, 0, i)) for i in range(12)])
+        time.sleep(0.5)
+        assert writer.written_count == 12
+        assert len(store) == 0
+    assert not writer.is_running
+    assert RecordReader(tmp_path).to_dataframe()['field1'].tolist() == list(range(12))
+
+def test_record_writer_ring_overrun(tmp_path):
+    store = ColumnStore(Data, 2)
+    writer = RecordWriter(store, tmp_path, fields)
+    store.extend([(Data(i, i/2), datetime(2025, 3, 21, 10, 0, i)) for i in range(5)])
+    writer.flush()
+    assert writer.lost_count == 3
+    assert RecordReader(tmp_path).to_dataframe()['field1'].tolist() == [3, 4]
+
+def test_record_writer_bounded_deque(tmp_path):
+    store = deque(maxlen=3)
+    writer = RecordWriter(store, tmp_path, fields)
+    samples = [(Data(i, i/2), datetime(2025, 3, 21, 10, 0, i)) for i in range(13)]
+    store.extend(samples[:3])
+    assert writer.flush() == 3
+    store.extend(samples[3:5])
+    assert writer.flush() == 2
+    assert writer.lost_count == 0
+    
+    store.extend(samples[5:7])
+    writer._scan_deque()                # the writer thread checks the data store
+    store.extend(samples[7:9])          # sample 5 is dropped before it is written
+    assert writer.flush() == 3
+    assert writer.lost_count == 1
+    
+    store.extend(samples[9:13])         # overflows between checks
+    assert writer.flush() == 3
+    assert writer.lost_count == 1
+    assert writer.written_count == 11
+    assert RecordReader(tmp_path).to_dataframe()['field1'].tolist() == [0, 1, 2, 3, 4, 6, 7, 8, 10, 11, 12]
+
 @pytest.fixture
 def base_device():
     device = BaseDevice()
@@ -91,6 +257,32 @@ def test_record_with_clear_cache(base_device):
     record(False, device=base_device, data_store=data_store)
     assert len(data_store) > data_count
 
+@pytest.mark.parametrize('batch', [False, True])
+def test_record_column_store(base_device, batch):
+    base_device.connect()
+    data_store = ColumnStore(base_device.data_type, grow=True)
+    record(True, device=base_device, data_store=data_store, batch=batch)
+    start_time = time.perf_counter()
+    while len(data_store) < 10:
+        time.sleep(0.1)
+        if time.perf_counter() - start_time > 60:
+            break
+    record(False, device=base_device, data_store=data_store)
+    assert len(data_store) >= 10
+    assert data_store.latest()[0].data == 'test_output'
+
+def test_record_with_writer(base_device, tmp_path):
+    base_device.connect()
+    data_store = deque()
+    writer = RecordWriter(data_store, tmp_path, base_device.data_type._fields, flush_interval=0.1)
+    record(True, device=base_device, data_store=data_store, writer=writer)
+    assert writer.is_running
+    time.sleep(1)
+    record(False, device=base_device, data_store=data_store, writer=writer)
+    assert not writer.is_running
+    assert writer.written_count == len(data_store) > 0
+    assert len(RecordReader(tmp_path).to_dataframe()) == len(data_store)
+
 def test_stream():
     device = MagicMock(spec=StreamingDevice)
     data_store = deque()
@@ -1,4 +1,5 @@
 import pytest
+from collections import deque
 from datetime import datetime
 import logging
 import socket
@@ -11,7 +12,8 @@ import serial
 
 from ..context import controllably
 from controllably.core.device import (
-    BaseDevice, SerialDevice, SocketDevice, TimedDeviceMixin, Data, READ_FORMAT, WRITE_FORMAT)
+    BaseDevice, SerialDevice, SocketDevice, TimedDeviceMixin, Data, READ_FORMAT, WRITE_FORMAT,
+    OutputParser, get_output_parser)
 
 OtherData = NamedTuple('OtherData', [('strdata', str),('intdata', int),('floatdata', float),('booldata', bool)])
 OTHER_FORMAT = '{strdata},{intdata},{floatdata},{booldata}\n'
@@ -301,6 +303,40 @@ class TestBaseDevice:
         assert base_device.data_queue.empty()
         assert len(base_device.buffer)
 
+    def test_stream_process_batch(self, base_device):
+        base_device.connect()
+        assert base_device.is_connected
+        base_device.stream_event.set()
+        thread1 = threading.Thread(target=base_device._loop_stream,daemon=True)
+        thread2 = threading.Thread(target=base_device._loop_process_data, kwargs=dict(batch=True), daemon=True)
+        thread1.start()
+        time.sleep(1)
+        assert not base_device.data_queue.empty()
+        thread2.start()
+        base_device.stream_event.clear()
+        thread1.join()
+        thread2.join()
+        assert base_device.data_queue.empty()
+        assert len(base_device.buffer)
+        assert all(out == Data(data='test_output') for out,_ in base_device.buffer)
+    
+    def test_process_batch(self, base_device, caplog):
+        now = datetime.now()
+        items = [('abc,123,4.5,false', now), ('123abc', now), ('def,12.3,5,true', now)]
+        buffer = deque()
+        with caplog.at_level(logging.WARNING):
+            base_device._process_batch(items, buffer=buffer, format_out=OTHER_FORMAT, data_type=OtherData)
+        assert "Failed to parse data: '123abc'" in caplog.text
+        assert list(buffer) == [
+            (OtherData(strdata='abc',intdata=123,floatdata=4.5,booldata=False), now),
+            (OtherData(strdata='def',intdata=12,floatdata=5.0,booldata=True), now)
+        ]
+        
+        buffer.clear()
+        items.append(('abc,abc,4.5,false', now))
+        base_device._process_batch(items, buffer=buffer, format_out=OTHER_FORMAT, data_type=OtherData)
+        assert len(buffer) == 2
+
     def test_start_stop_stream(self, base_device):
         base_device.connect()
         assert base_device.is_connected
@@ -317,6 +353,34 @@ class TestBaseDevice:
         assert len(base_device.buffer) == 0
 
 
+def test_output_parser_batch():
+    parser = get_output_parser(OTHER_FORMAT.strip(), OtherData)
+    indices, columns = parser.parseBatch(['abc,1,4.5,no', 'bad', 'def,2.7,5,yes'])
+    assert indices == [0, 2]
+    assert columns['strdata'].tolist() == ['abc', 'def']
+    assert columns['intdata'].tolist() == [1, 2]
+    assert columns['floatdata'].tolist() == [4.5, 5.0]
+    assert columns['booldata'].tolist() == [False, True]
+    with pytest.raises(ValueError):
+        parser.parseBatch(['abc,abc,4.5,false'])
+    with pytest.raises(TypeError):
+        parser.parseBatch(['abc,1,4.5,no', None])
+    assert get_output_parser('{data:d}', Data).regex is None
+
+def test_output_parser():
+    parser = get_output_parser(OTHER_FORMAT.strip(), OtherData)
+    assert isinstance(parser, OutputParser)
+    assert get_output_parser(OTHER_FORMAT.strip(), OtherData) is parser
+    assert parser.parse('abc,12.3,4.5,no') == OtherData(strdata='abc',intdata=12,floatdata=4.5,booldata=False)
+    assert parser.parse('123abc') is None
+    with pytest.raises(ValueError, match="Failed to convert intdata"):
+        parser.parse('abc,abc,4.5,false')
+    with pytest.raises(TypeError):
+        parser.parse(None)
+    with pytest.raises(AssertionError):
+        OutputParser('{data},{other}', Data)
+
+
 @pytest.fixture
 def timed_device():
     class TestDevice(TimedDeviceMixin, BaseDevice):
@@ -1,10 +1,28 @@
+from collections import deque
+from datetime import datetime
+import pickle
+import struct
+from typing import NamedTuple
 import pytest
 import numpy as np
+import pandas as pd
 from scipy.spatial.transform import Rotation
 
 from ..context import controllably
-from controllably.core.interpreter import Interpreter, JSONInterpreter
-from controllably.core.position import Position
+from controllably.core.interpreter import Interpreter, JSONInterpreter, BinaryInterpreter, EnvelopeInterpreter, Reference, COMPRESSION_CODECS
+from controllably.core.position import Labware, Position, PositionArray
+
+ValueData = NamedTuple('ValueData', [('value', float), ('channel', int)])
+
+labware_details = {
+    "dimensions": {"xDimension": 127.76, "yDimension": 85.48, "zDimension": 14.22},
+    "ordering": [["A1", "B1"]],
+    "wells": {
+        "A1": {"depth": 10, "totalLiquidVolume": 100, "shape": "circular", "diameter": 5, "x": 10, "y": 70, "z": 4},
+        "B1": {"depth": 10, "totalLiquidVolume": 100, "shape": "circular", "diameter": 5, "x": 10, "y": 60, "z": 4}
+    },
+    "parameters": {"isTiprack": False, "isStackable": False}
+}
 
 mock_request = {
     "object_id": "",
@@ -75,6 +93,16 @@ class TestJSONInterpreter:
         assert isinstance(decoded["data"], Position)
         assert decoded == data
         
+    def test_encode_decode_data_with_position_array(self):
+        rotation = Rotation.from_euler('zyx', [[4, 5, 6], [7, 8, 9]], degrees=True)
+        positions = PositionArray([[1, 2, 3], [4, 5, 6]], rotation)
+        data = mock_data.copy()
+        data["data"] = positions
+        encoded = JSONInterpreter.encodeData(data)
+        decoded = JSONInterpreter.decodeData(encoded)
+        assert isinstance(decoded["data"], PositionArray)
+        assert decoded == data
+        
     def test_encode_decode_data_with_pickle(self):
         array = np.array([1, 2, 3])
         data = mock_data.copy()
@@ -86,3 +114,262 @@ class TestJSONInterpreter:
         assert np.array_equal(decoded_array, array)
         data.pop("data")
         assert decoded == data
+        
+    def test_encode_decode_data_with_dataframe(self):
+        df = pd.DataFrame({"x": [1.0, 2.0], "name": ["a", "b"]})
+        data = mock_data.copy()
+        data["data"] = df
+        decoded = JSONInterpreter.decodeData(JSONInterpreter.encodeData(data))
+        pd.testing.assert_frame_equal(decoded["data"], df, check_dtype=False)
+
+    @pytest.mark.parametrize("value", [
+        np.int64(3), np.float32(1.5), np.bool_(True), np.datetime64('2025-06-11T12:30:15.123456789'),
+        ValueData(1.5, 2), deque([ValueData(1.5, 2)], maxlen=10), datetime(2025, 6, 11, 12, 30, 15, 123456),
+        b"\x00\xff", 1+2j, {"nested": [ValueData(0.5, 1), np.int32(7)]}, {(1, 2): "a", 3: [{(4, (5, 6)): "b"}]}
+    ])
+    def test_encode_decode_data_with_extensions(self, value):
+        data = mock_data.copy()
+        data["data"] = value
+        encoded = JSONInterpreter.encodeData(data)
+        assert b"pickled" not in encoded
+        decoded = JSONInterpreter.decodeData(encoded)
+        assert decoded == data
+        assert type(decoded["data"]) is type(value)
+        
+    def test_encode_decode_data_with_pickle_fallback(self):
+        value = [1]
+        value.append(value)
+        decoded = JSONInterpreter.decodeData(JSONInterpreter.encodeData(dict(mock_data, data=value)))
+        assert decoded["data"][0] == 1
+        assert decoded["data"][1] is decoded["data"]
+        assert decoded["status"] == mock_data["status"]
+        
+    def test_encode_decode_namedtuple_without_type(self):
+        encoded = JSONInterpreter.encodeData(dict(data=ValueData(1.5, 2))).replace(b'"ValueData"', b'"Unknown"')
+        decoded = JSONInterpreter.decodeData(encoded)["data"]
+        assert decoded == (1.5, 2)
+        assert decoded._fields == ('value', 'channel')
+        assert type(decoded).__name__ == 'Unknown'
+        
+    def test_encode_decode_arrays(self):
+        arrays = [
+            np.arange(12, dtype=np.float32).reshape(3, 4).T,
+            np.array([1, "a", None], dtype=object),
+            np.zeros(2, dtype=[('x', '<f8', (2,)), ('y', '<i4')]),
+        ]
+        decoded = JSONInterpreter.decodeData(JSONInterpreter.encodeData(dict(data=arrays)))["data"]
+        for array, decoded_array in zip(arrays, decoded):
+            assert decoded_array.dtype == array.dtype
+            assert np.array_equal(decoded_array, array)
+        
+    def test_encode_decode_pickle_base64(self):
+        data = dict(data=[slice(1, 2)])
+        encoded = JSONInterpreter.encodeData(data)
+        assert b'"__ext__": "pickle"' in encoded
+        assert JSONInterpreter.decodeData(encoded) == data
+        
+    def test_decode_legacy_pickle(self):
+        encoded = JSONInterpreter.encodeRequest(dict(pickled=str(pickle.dumps(np.arange(3)))))
+        assert np.array_equal(JSONInterpreter.decodeData(encoded)["data"], np.arange(3))
+        
+
+@pytest.mark.parametrize("interpreter", [JSONInterpreter, BinaryInterpreter])
+def test_encode_decode_references(interpreter):
+    labware = Labware('plate', labware_details)
+    well = labware.getWell('A1')
+    decoded = interpreter.decodeData(interpreter.encodeData(dict(data=[well, labware])))["data"]
+    assert decoded[0] == Reference('Well', 'A1', ('plate',), tuple(map(float, well.center)))
+    assert decoded[1] == Reference('Labware', 'plate', (), tuple(map(float, labware.center)))
+
+executed = []
+
+def run_payload():
+    executed.append(True)
+
+class Payload:
+    def __reduce__(self):
+        return (run_payload, ())
+
+@pytest.mark.parametrize("interpreter", [JSONInterpreter, BinaryInterpreter])
+def test_request_rejects_pickle(interpreter):
+    with pytest.raises(TypeError):
+        interpreter.encodeRequest(dict(mock_request, args=[slice(1, 2)]))
+    packet = interpreter.encodeData(dict(mock_request, args=[Payload()]))
+    with pytest.raises(ValueError):
+        interpreter.decodeRequest(packet)
+    with pytest.raises(ValueError):
+        interpreter().decodeRequestHeader(packet)
+    assert executed == []
+    
+    packet = interpreter.encodeData(dict(mock_request, args=[slice(1, 2)]))
+    assert interpreter.decodeData(packet)["args"] == [slice(1, 2)]
+
+# fixture for binary interpreter
+@pytest.fixture
+def binary_interpreter():
+    return BinaryInterpreter()
+
+class TestBinaryInterpreter:
+    def test_init(self, binary_interpreter):
+        assert isinstance(binary_interpreter, BinaryInterpreter)
+        
+    def test_encode_decode_request(self):
+        encoded = BinaryInterpreter.encodeRequest(mock_request)
+        assert isinstance(encoded, bytes)
+        decoded = BinaryInterpreter.decodeRequest(encoded)
+        assert decoded == mock_request
+        
+    def test_encode_decode_data(self):
+        encoded = BinaryInterpreter.encodeData(mock_data)
+        decoded = BinaryInterpreter.decodeData(encoded)
+        assert decoded == mock_data
+        
+    @pytest.mark.parametrize("value", [
+        None, True, 0, -2**63, 2**70, 1.5, "\u00e9", b"\x00\x01", [1, [2.0, None]], (1, "a"), {1: {"a": (2,)}},
+        datetime(2025, 6, 11, 12, 30, 15, 123456), {1, 2}
+    ])
+    def test_encode_decode_values(self, value):
+        data = mock_data.copy()
+        data["data"] = value
+        decoded = BinaryInterpreter.decodeData(BinaryInterpreter.encodeData(data))
+        assert decoded == data
+        assert type(decoded["data"]) is type(value)
+        
+    def test_encode_decode_data_with_position(self):
+        rotation = Rotation.from_euler('xyz', [4, 5, 6], degrees=True)
+        position = Position([1, 2, 3], rotation, 'quaternion')
+        data = mock_data.copy()
+        data["data"] = position
+        decoded = BinaryInterpreter.decodeData(BinaryInterpreter.encodeData(data))
+        assert isinstance(decoded["data"], Position)
+        assert decoded["data"].rotation_type == 'quaternion'
+        assert decoded == data
+        
+    @pytest.mark.parametrize("array", [
+        np.arange(24, dtype=np.float32).reshape(2, 3, 4),
+        np.arange(12).reshape(3, 4).T,
+        np.zeros((0, 3)),
+        np.array(["a", "bc"]),
+        np.array(5, dtype=np.uint8),
+    ])
+    def test_encode_decode_data_with_array(self, array):
+        data = mock_data.copy()
+        data["data"] = array
+        encoded = BinaryInterpreter.encodeData(data)
+        decoded = BinaryInterpreter.decodeData(encoded)["data"]
+        assert decoded.dtype == array.dtype
+        assert np.array_equal(decoded, array)
+        if array.size:
+            assert np.shares_memory(decoded, np.frombuffer(encoded, dtype=np.uint8))
+            assert not decoded.flags.writeable
+        
+    def test_encode_decode_data_with_dataframe(self):
+        df = pd.DataFrame({
+            "x": np.arange(5.0),
+            "y": np.arange(5),
+            "name": list("abcde"),
+            "time": pd.date_range("2025-06-11", periods=5, freq="s"),
+        }, index=pd.Index(list("vwxyz"), name="key"))
+        data = mock_data.copy()
+        data["data"] = df
+        encoded = BinaryInterpreter.encodeData(data)
+        decoded = BinaryInterpreter.decodeData(encoded)["data"]
+        pd.testing.assert_frame_equal(decoded, df)
+        assert np.shares_memory(decoded["x"].to_numpy(), np.frombuffer(encoded, dtype=np.uint8))
+        
+    def test_encode_decode_data_with_series(self):
+        series = pd.Series([1.0, 2.0, 3.0], name="force")
+        data = mock_data.copy()
+        data["data"] = series
+        decoded = BinaryInterpreter.decodeData(BinaryInterpreter.encodeData(data))["data"]
+        pd.testing.assert_series_equal(decoded, series)
+        
+    def test_register_extension(self):
+        class Point:
+            def __init__(self, x, y):
+                self.x, self.y = x, y
+        Interpreter.registerExtension('Point', Point, lambda p: (p.x, p.y), lambda v: Point(*v))
+        try:
+            decoded = BinaryInterpreter.decodeData(BinaryInterpreter.encodeData(dict(data=Point(1, 2))))
+            assert isinstance(decoded["data"], Point)
+            assert (decoded["data"].x, decoded["data"].y) == (1, 2)
+        finally:
+            Interpreter.extensions.pop('Point')
+        
+    def test_decode_errors(self):
+        encoded = BinaryInterpreter.encodeData(mock_data)
+        with pytest.raises(ValueError):
+            BinaryInterpreter.decodeData(encoded[:-1])
+        with pytest.raises(ValueError):
+            BinaryInterpreter.decodeData(b"{}" + encoded[2:])
+
+@pytest.mark.parametrize("inner", [JSONInterpreter(), BinaryInterpreter()])
+class TestEnvelopeInterpreter:
+    def test_init(self, inner):
+        interpreter = EnvelopeInterpreter(inner)
+        assert interpreter.interpreter is inner
+        assert isinstance(EnvelopeInterpreter().interpreter, JSONInterpreter)
+        
+    def test_encode_decode_request(self, inner):
+        interpreter = EnvelopeInterpreter(inner)
+        encoded = interpreter.encodeRequest(mock_request)
+        assert interpreter.decodeRequest(encoded) == mock_request
+        header = interpreter.decodeRequestHeader(encoded)
+        assert header == dict(address=mock_request["address"], request_id="", reply_id="")
+        
+    def test_encode_decode_data(self, inner):
+        interpreter = EnvelopeInterpreter(inner)
+        data = dict(mock_data, address={"sender": ["WORKER"], "target": ["USER", "HUB"]}, request_id="abc", reply_id="WORKER")
+        encoded = interpreter.encodeData(data)
+        assert interpreter.decodeData(encoded) == data
+        header = interpreter.decodeDataHeader(encoded)
+        assert header == dict(address=data["address"], request_id="abc", reply_id="WORKER")
+        
+    def test_payload_untouched(self, inner):
+        interpreter = EnvelopeInterpreter(inner)
+        encoded = interpreter.encodeData(mock_data)
+        assert encoded.endswith(inner.encodeData(mock_data))
+        
+    def test_decode_errors(self, inner):
+        interpreter = EnvelopeInterpreter(inner)
+        encoded = interpreter.encodeData(mock_data)
+        with pytest.raises(ValueError):
+            interpreter.decodeDataHeader(encoded[:-1])
+        with pytest.raises(ValueError):
+            interpreter.decodeDataHeader(inner.encodeData(mock_data))
+        version_1 = struct.pack('<3sBHHHHQ', EnvelopeInterpreter.MAGIC, 1, 0, 0, 0, 0, 0)
+        with pytest.raises(ValueError):
+            interpreter.decodeDataHeader(version_1 + bytes(16))
+        
+    @pytest.mark.parametrize("compression", ["zlib", "lzma"])
+    def test_compression(self, inner, compression):
+        interpreter = EnvelopeInterpreter(inner, compression=compression, threshold=1024)
+        assert interpreter.compression == compression
+        data = dict(mock_data, data=np.zeros((100, 100)))
+        encoded = interpreter.encodeData(data)
+        assert len(encoded) < len(EnvelopeInterpreter(inner).encodeData(data))
+        decoded = EnvelopeInterpreter(inner).decodeData(encoded)
+        assert np.array_equal(decoded.pop("data"), data["data"])
+        data.pop("data")
+        assert decoded == data
+        assert interpreter.decodeDataHeader(encoded) == dict(address=mock_data["address"], request_id="", reply_id="")
+        
+    def test_compression_skipped(self, inner):
+        interpreter = EnvelopeInterpreter(inner, compression="zlib", threshold=1024)
+        assert interpreter.encodeRequest(mock_request) == EnvelopeInterpreter(inner).encodeRequest(mock_request)
+        if isinstance(inner, BinaryInterpreter):
+            data = dict(mock_data, data=np.random.default_rng(0).integers(0, 256, 4096, dtype=np.uint8))
+            assert interpreter.encodeData(data) == EnvelopeInterpreter(inner).encodeData(data)
+        
+    def test_compression_preferences(self, inner):
+        interpreter = EnvelopeInterpreter(inner, compression=["unavailable", "lzma", "zlib"])
+        assert interpreter.compression == "lzma"
+        with pytest.raises(ValueError):
+            EnvelopeInterpreter(inner, compression="unavailable")
+        encoded = interpreter.encodeData(dict(mock_data, data="a"*4096))
+        codec_id = COMPRESSION_CODECS.pop("lzma")
+        try:
+            with pytest.raises(ValueError):
+                interpreter.decodeData(encoded)
+        finally:
+            COMPRESSION_CODECS["lzma"] = codec_id
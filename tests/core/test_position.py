@@ -3,6 +3,7 @@ from copy import deepcopy
 import logging
 import os
 from pathlib import Path
+from types import SimpleNamespace
 
 from matplotlib import pyplot as plt
 import numpy as np
@@ -10,7 +11,7 @@ from scipy.spatial.transform import Rotation
 
 from ..context import controllably
 from controllably.core.position import (
-    convert_to_position, get_transform, Position, Well, Labware, Slot, Deck, BoundingVolume, BoundingBox)
+    convert_to_position, get_transform, Position, PositionArray, Well, Labware, Slot, Deck, BoundingVolume, BoundingBox)
 
 _position = Position([1, 2, 3], Rotation=Rotation.from_euler('zyx', [4, 5, 6], degrees=True))
 HERE = os.environ.get("REPO_ROOT") or Path(__file__).parent.parent.absolute()
@@ -170,6 +171,57 @@ class TestPosition:
         assert np.allclose(position.coordinates, (8,10,12))
 
 
+@pytest.fixture
+def positions():
+    rotation = Rotation.from_euler('zyx', [[4, 5, 6], [7, 8, 9], [10, 11, 12]], degrees=True)
+    return PositionArray([[1, 2, 3], [4, 5, 6], [7, 8, 9]], rotation)
+
+
+class TestPositionArray:
+    def test_init(self, positions):
+        assert isinstance(positions, PositionArray)
+        assert len(positions) == 3
+        assert np.allclose(positions.coordinates, [[1, 2, 3], [4, 5, 6], [7, 8, 9]])
+        assert np.allclose(positions.rotation, [[4, 5, 6], [7, 8, 9], [10, 11, 12]])
+        assert np.allclose(positions.z, [3, 6, 9])
+        assert np.allclose(positions.c, [4, 7, 10])
+        assert positions.rot_matrix.shape == (3, 3, 3)
+        
+        single = PositionArray([[1, 2, 3], [4, 5, 6]], Rotation.from_euler('zyx', [4, 5, 6], degrees=True))
+        assert np.allclose(single.rotation, [[4, 5, 6], [4, 5, 6]])
+        assert np.allclose(PositionArray([[1, 2, 3]]).rotation, [[0, 0, 0]])
+        with pytest.raises(AssertionError):
+            PositionArray([1, 2, 3])
+        with pytest.raises(AssertionError):
+            PositionArray([[1, 2, 3], [4, 5, 6]], Rotation.identity(3))
+            
+    def test_positions(self, positions, position):
+        assert positions[0] == position
+        assert isinstance(positions[1:], PositionArray)
+        assert len(positions[1:]) == 2
+        assert list(positions) == positions.toPositions()
+        assert PositionArray.fromPositions(positions.toPositions()) == positions
+        
+    def test_to_from_json(self, positions):
+        assert PositionArray.fromJSON(positions.toJSON()) == positions
+        assert PositionArray.fromJSON(positions.toJSON(scalar_first=True)) == positions
+        with pytest.raises(ValueError):
+            PositionArray.fromJSON(positions.toJSON().replace('xyzw', 'abcd'))
+    
+    def test_transforms(self, positions):
+        expected = [position.translate([7, 8, 9]).orientate(Rotation.from_euler('zyx', [1, 2, 3], degrees=True)) for position in positions]
+        other = Position([7, 8, 9], Rotation=Rotation.from_euler('zyx', [1, 2, 3], degrees=True))
+        assert positions.translate([7, 8, 9], inplace=False).orientate(other.Rotation, inplace=False) == PositionArray.fromPositions(expected)
+        assert positions.apply(other) == PositionArray.fromPositions([position.apply(deepcopy(other)) for position in positions])
+        
+        inverted = positions.invert()
+        assert np.allclose(inverted.coordinates, -positions.coordinates)
+        assert np.allclose(inverted.Rotation.as_quat(), positions.Rotation.inv().as_quat())
+        
+        positions.translate([[1, 1, 1], [2, 2, 2], [3, 3, 3]])
+        assert np.allclose(positions.coordinates, [[2, 3, 4], [6, 7, 8], [10, 11, 12]])
+
+
 @pytest.fixture
 def main_deck(monkeypatch):
     print(HERE)
@@ -214,6 +266,47 @@ class TestDeck:
         assert main_deck.isExcluded((749.175,375.875,52.95))
         assert not main_deck.isExcluded((0,0,0))
         
+    def test_exclusion_zone_batch(self, main_deck):
+        assert isinstance(main_deck, Deck)
+        points = np.array([(749.175,375.875,52.95), (0,0,0)])
+        assert main_deck.isExcluded(points).tolist() == [True, False]
+        collisions = main_deck.getCollisions(points)
+        assert len(collisions) == 2
+        assert collisions[0] == [name for name,zone in main_deck.exclusion_zone.items() if points[0] in zone]
+        assert collisions[1] == []
+        assert main_deck.getCollisions(points[1]) == []
+        
+    def test_swept_collisions(self, main_deck):
+        assert isinstance(main_deck, Deck)
+        inside = np.array((749.175,375.875,52.95))
+        above = inside + (0,0,500)
+        collisions = main_deck.getSweptCollisions(above - (0,300,0), above)
+        assert collisions == []
+        collisions = main_deck.getSweptCollisions(above, inside - (0,0,52.95))
+        assert collisions == main_deck.getCollisions(inside)
+        assert not main_deck.isPathExcluded([above - (0,300,0), above])
+        assert main_deck.isPathExcluded([above - (0,300,0), above, inside])
+        
+        starts = np.array([above, above])
+        ends = np.array([above + (10,0,0), inside])
+        assert [len(c) > 0 for c in main_deck.getSweptCollisions(starts, ends)] == [False, True]
+        
+    def test_exclusion_zone_cache(self, main_deck, sub_deck):
+        assert isinstance(main_deck, Deck)
+        arrays = main_deck._exclusion_arrays
+        assert main_deck._exclusion_arrays is arrays
+        assert arrays.bounds.shape == (3,2,3)
+        
+        slot = sub_deck.slots['slot_04']
+        labware = sub_deck.removeLabware(slot)
+        assert main_deck._exclusion_arrays is not arrays
+        assert 'zone_A_slot_04' not in main_deck.exclusion_zone
+        assert len(sub_deck.exclusion_zone) == 2
+        
+        sub_deck.loadLabware(slot, labware)
+        assert 'zone_A_slot_04' in main_deck.exclusion_zone
+        assert len(main_deck._exclusion_arrays.names) == 3
+        
     def test_zone(self, sub_deck):
         assert isinstance(sub_deck, Deck)
         assert sub_deck.name == 'zone_A'
@@ -349,6 +442,31 @@ class TestLabware:
         assert labware.listColumns() == [[f'{r}{i}' for r in 'ABCDEFGH'] for i in range(1,13)]
         assert labware.listRows() == [[f'{r}{i}' for i in range(1,13)] for r in 'ABCDEFGH']
         
+    def test_well_tables(self, labware, sub_deck):
+        assert isinstance(labware, Labware)
+        assert labware.well_tops.shape == (96,3)
+        assert np.allclose(labware.well_tops, [well.center + (0,0,well.depth) for well in labware.wells.values()])
+        assert np.allclose(labware.well_centers[0], (779.65,425.0,9))
+        assert np.allclose(labware.well_base_areas, np.pi * 3**2)
+        indices = labware.getWellIndices(labware.columns[3])
+        assert np.allclose(labware.well_tops[indices], [labware.getWell(name).top for name in labware.columns[3]])
+        with pytest.raises(ValueError):
+            labware.well_tops[0,0] = 0
+        well = labware.getWell('A1')
+        top = well.top
+        top[2] -= 5
+        center = well.center
+        center[2] += 1
+        assert np.allclose(well.top, labware.well_tops[0])
+        assert np.allclose(well.center, labware.well_centers[0])
+        with pytest.raises(AssertionError):
+            labware.getWellIndices(['Z99'])
+        
+        sub_deck.transferLabware(labware.parent, sub_deck.slots['slot_01'])
+        assert np.allclose(labware.well_offsets[0], (14.5,73.15,9))
+        assert np.allclose(labware.getWell('A1').center, labware.reference.coordinates + labware.reference.Rotation.apply((14.5,73.15,9)))
+        assert np.allclose(labware.well_tops, [well.center + (0,0,well.depth) for well in labware.wells.values()])
+        
 
 class TestLabwareStackable:
     def test_init(self, labware_stackable):
@@ -503,6 +621,23 @@ def test_bounding_box():
     box = BoundingBox(reference=reference, dimensions=dimensions, buffer=buffer)
     assert box.contains([0.5, 0.5, 0.5])
     assert not box.contains([1.5, 1.5, 1.5])
+    assert box.is_axis_aligned
+
+def test_bounding_box_rotated():
+    reference = Position([0, 0, 0], Rotation=Rotation.from_euler('zyx', [45, 0, 0], degrees=True))
+    box = BoundingBox(reference=reference, dimensions=[2, 1, 1])
+    assert not box.is_axis_aligned
+    assert np.allclose(box.local_bounds, [[0, 0, 0], [2, 1, 1]])
+    assert box.contains([0.5, 1, 0.5])
+    assert not box.contains([1, -0.5, 0.5])
+    
+def test_deck_swept_rotated():
+    box = BoundingBox(reference=Position([0, 0, 0], Rotation=Rotation.from_euler('zyx', [45, 0, 0], degrees=True)), dimensions=[2, 1, 1])
+    deck = Deck(name='deck', _details=dict())
+    deck._exclusion_cache = SimpleNamespace(version=deck._exclusion_version, zones=dict(box=box), arrays=Deck._stack_exclusion_zone(dict(box=box)))
+    assert deck.getSweptCollisions([-1, 1, 0.5], [2, 1, 0.5]) == ['box']
+    assert deck.getSweptCollisions([-1, 0.5, 0.5], [0.2, -0.5, 0.5]) == []
+    assert deck.getSweptCollisions([0.5, 1, 2], [0.5, 1, 1.5]) == []
 
 
 class TestDrawing:
@@ -0,0 +1,91 @@
+from datetime import datetime
+import pytest
+import numpy as np
+import pandas as pd
+from scipy.spatial.transform import Rotation
+
+pytest.importorskip("google.protobuf")
+
+from ..context import controllably
+from controllably.core.protobuf_interpreter import ProtobufInterpreter
+from controllably.core.position import Position
+
+mock_request = {
+    "object_id": "",
+    "method": "",
+    "args": [""],
+    "kwargs": {"":""},
+    "address": {"sender": [""], "target": [""]},
+    "request_id": "",
+    "priority": False,
+    "rank": 0
+}
+mock_data = {
+    "data": None,
+    "status": "",
+    "address": {"sender": [""], "target": [""]},
+    "request_id": "",
+    "reply_id": "",
+    "priority": False,
+    "rank": 0
+}
+
+# fixture for protobuf interpreter
+@pytest.fixture
+def protobuf_interpreter():
+    return ProtobufInterpreter()
+
+class TestProtobufInterpreter:
+    def test_init(self, protobuf_interpreter):
+        assert isinstance(protobuf_interpreter, ProtobufInterpreter)
+        
+    def test_encode_decode_request(self):
+        encoded = ProtobufInterpreter.encodeRequest(mock_request)
+        assert isinstance(encoded, bytes)
+        decoded = ProtobufInterpreter.decodeRequest(encoded)
+        assert decoded == mock_request
+        
+    def test_encode_decode_request_off_schema(self):
+        command = dict(method='batch', args=[[dict(object_id='A', method='b', args=[1, 2.5])]], rank=None, request_id=5)
+        decoded = ProtobufInterpreter.decodeRequest(ProtobufInterpreter.encodeRequest(command))
+        assert decoded == command
+        
+    def test_encode_decode_data(self):
+        encoded = ProtobufInterpreter.encodeData(mock_data)
+        decoded = ProtobufInterpreter.decodeData(encoded)
+        assert decoded == mock_data
+        
+    @pytest.mark.parametrize("value", [
+        None, True, 0, -2**63, 2**70, 1.5, "é", b"\x00\x01", [1, [2.0, None]], (1, "a"), {1: {"a": (2,)}}, [],
+        datetime(2025, 6, 11, 12, 30, 15, 123456), {1, 2}
+    ])
+    def test_encode_decode_values(self, value):
+        data = mock_data.copy()
+        data["data"] = value
+        decoded = ProtobufInterpreter.decodeData(ProtobufInterpreter.encodeData(data))
+        assert decoded == data
+        assert type(decoded["data"]) is type(value)
+        
+    def test_encode_decode_data_with_position(self):
+        rotation = Rotation.from_euler('xyz', [4, 5, 6], degrees=True)
+        position = Position([1, 2, 3], rotation)
+        data = mock_data.copy()
+        data["data"] = position
+        decoded = ProtobufInterpreter.decodeData(ProtobufInterpreter.encodeData(data))
+        assert isinstance(decoded["data"], Position)
+        assert decoded == data
+        
+    def test_encode_decode_data_with_array(self):
+        array = np.arange(24, dtype=np.float32).reshape(2, 3, 4).T
+        data = mock_data.copy()
+        data["data"] = array
+        decoded = ProtobufInterpreter.decodeData(ProtobufInterpreter.encodeData(data))["data"]
+        assert decoded.dtype == array.dtype
+        assert np.array_equal(decoded, array)
+        
+    def test_encode_decode_data_with_dataframe(self):
+        df = pd.DataFrame({"x": np.arange(5.0), "name": list("abcde")})
+        data = mock_data.copy()
+        data["data"] = df
+        decoded = ProtobufInterpreter.decodeData(ProtobufInterpreter.encodeData(data))["data"]
+        pd.testing.assert_frame_equal(decoded, df)
@@ -0,0 +1,83 @@
+import pytest
+import threading
+import time
+
+pytest.importorskip("fastapi")
+
+from fastapi.testclient import TestClient
+
+from controllably.examples.control.fastapi import server
+
+def make_command(request_id, worker, user):
+    return dict(request_id=request_id, address=dict(sender=[user], target=[worker]), method='qsize')
+
+def make_reply(command):
+    return dict(
+        reply_id='REPLY', request_id=command['request_id'], status='completed', data=1,
+        address=dict(sender=command['address']['target'], target=command['address']['sender'])
+    )
+
+@pytest.fixture
+def client():
+    with TestClient(server.app) as client:
+        yield client
+
+def test_websocket_push(client):
+    pending = make_command('PENDING', 'WORKER_WS', 'USER_WS')
+    client.post('/command', json=pending)
+    with client.websocket_connect('/ws/worker/WORKER_WS') as worker, client.websocket_connect('/ws/user/USER_WS') as user:
+        assert worker.receive_json()['request_id'] == 'PENDING'
+        assert server.outbound_commands['WORKER_WS'].empty()
+
+        command = make_command('PUSHED', 'WORKER_WS', 'USER_WS')
+        user.send_json(command)
+        assert worker.receive_json() == server.Command(**command).model_dump()
+        worker.send_json(make_reply(command))
+        reply = user.receive_json()
+        assert reply['request_id'] == 'PUSHED'
+        assert reply['data'] == 1
+        assert 'PUSHED' not in server.outbound_replies
+    assert 'USER_WS' not in server.reply_channels
+
+def test_rest_without_websocket(client):
+    command = make_command('POLLED', 'WORKER_REST', 'USER_REST')
+    assert client.post('/command', json=command).json() == {'request_id': 'POLLED'}
+    assert client.get('/command/WORKER_REST').json()['request_id'] == 'POLLED'
+    assert client.get('/command/WORKER_REST').status_code == 404
+    client.post('/reply', json=make_reply(command))
+    assert client.get('/reply/POLLED').json()['data'] == 1
+    client.get('/reply/clear/POLLED')
+
+def test_long_poll(client):
+    start_time = time.perf_counter()
+    assert client.get('/command/WORKER_POLL', params=dict(timeout=0.2)).status_code == 404
+    assert client.get('/reply/MISSING', params=dict(timeout=0.2)).status_code == 404
+    assert time.perf_counter() - start_time >= 0.4
+    assert client.get('/command/WORKER_POLL', params=dict(timeout=server.MAX_WAIT+1)).status_code == 422
+
+    command = make_command('WAITED', 'WORKER_POLL', 'USER_POLL')
+    timer = threading.Timer(0.2, client.post, args=['/reply'], kwargs=dict(json=make_reply(command)))
+    timer.start()
+    response = client.get('/reply/WAITED', params=dict(timeout=5))
+    timer.join()
+    assert response.json()['data'] == 1
+    client.get('/reply/clear/WAITED')
+
+def test_command_queue_full(client, monkeypatch):
+    monkeypatch.setitem(server.outbound_commands, 'WORKER_FULL', server.TargetQueue(maxsize=2))
+    responses = [client.post('/command', json=make_command(f'FULL{i}', 'WORKER_FULL', 'USER_FULL')) for i in range(3)]
+    assert [response.status_code for response in responses] == [200, 200, 503]
+    assert list(client.get('/commands').json()['WORKER_FULL']) == ['FULL0', 'FULL1']
+    client.get('/command/clear/WORKER_FULL')
+    assert server.outbound_commands['WORKER_FULL'].empty()
+
+def test_reply_buffer_eviction():
+    buffer = server.ReplyBuffer(ttl=0.1, maxsize=2)
+    replies = [server.Reply(**make_reply(make_command(f'REQ{i}', 'WORKER', 'USER'))) for i in range(3)]
+    for reply in replies:
+        buffer.put(reply)
+    assert 'REQ0' not in buffer
+    assert buffer.get('REQ2') == replies[2]
+    time.sleep(0.15)
+    assert buffer.get('REQ1') is None
+    assert len(buffer.replies) == 0
@@ -1,14 +1,88 @@
 import pytest
+import asyncio
+import socket
 import threading
 import time
 
 from controllably.core.control import Controller, Proxy, TwoTierQueue
 from controllably.core.interpreter import JSONInterpreter
-from controllably.examples.control.socket.utils import SocketClient, SocketServer
+from controllably.examples.control.socket.async_utils import create_async_socket_hub, create_async_socket_user, create_async_socket_worker, read_packet
+from controllably.examples.control.socket.utils import (
+    BYTESIZE, FrameReader, FramedConnection, SelectorLoop, SocketClient, SocketServer, encode_frame
+)
 
 HOST = '127.0.0.1'
 PORT = 12345
 
+@pytest.mark.parametrize("size", [0, 1, BYTESIZE-4, BYTESIZE, 3*BYTESIZE])
+@pytest.mark.parametrize("chunk_size", [1, 7, BYTESIZE])
+def test_frame_reader(size, chunk_size):
+    packets = [bytes(range(256))*(size//256) + b'x'*(size%256), b'{"data": 1}']
+    stream = b''.join(encode_frame(packet) for packet in packets)
+    reader = FrameReader()
+    frames = []
+    for index in range(0, len(stream), chunk_size):
+        frames.extend(reader.feed(stream[index:index+chunk_size]))
+    assert frames == packets
+    assert not reader.buffer
+
+def test_frame_reader_max_size():
+    reader = FrameReader(max_size=16)
+    assert reader.feed(encode_frame(b'x'*16)) == [b'x'*16]
+    with pytest.raises(ValueError):
+        reader.feed(encode_frame(b'x'*17))
+    with pytest.raises(ValueError):
+        FrameReader().feed(b'{"data": 1}')
+
+def test_selector_loop_oversized_frame():
+    local, remote = socket.socketpair()
+    remote.setblocking(True)
+    remote.settimeout(5)
+    loop = SelectorLoop()
+    closed = []
+    connection = FramedConnection(local, 'remote')
+    loop.addConnection(connection, lambda connection, packet: None, closed.append)
+    terminate = threading.Event()
+    loop_thread = threading.Thread(target=loop.run, args=(terminate, 0.1), daemon=True)
+    loop_thread.start()
+    
+    remote.sendall(b'{"data": 1}')
+    assert remote.recv(BYTESIZE) == b''
+    terminate.set()
+    loop_thread.join()
+    assert closed == [connection]
+    assert 'remote' not in loop.connections
+    remote.close()
+
+def test_selector_loop_write_buffer():
+    local, remote = socket.socketpair()
+    remote.setblocking(True)
+    loop = SelectorLoop()
+    received = []
+    connection = FramedConnection(local, 'remote')
+    loop.addConnection(connection, lambda connection, packet: received.append(packet))
+    terminate = threading.Event()
+    loop_thread = threading.Thread(target=loop.run, args=(terminate, 0.1), daemon=True)
+    loop_thread.start()
+    
+    packet = b'x' * (10 * BYTESIZE * 16)
+    connection.send(packet)
+    connection.send('end')
+    assert connection.write_buffer     # The peer is not reading yet
+    reader = FrameReader()
+    frames = []
+    while len(frames) < 2:
+        frames.extend(reader.feed(remote.recv(BYTESIZE)))
+    assert frames == [packet, b'end']
+    
+    remote.sendall(encode_frame('hello') + encode_frame('world')[:5])
+    remote.sendall(encode_frame('world')[5:] + encode_frame('[EXIT]'))
+    assert reader.feed(remote.recv(BYTESIZE)) == [b'[EXIT]']
+    loop_thread.join(timeout=5)
+    assert not loop_thread.is_alive()
+    assert received == [b'hello', b'world']
+    remote.close()
+
 @pytest.mark.socket
 def test_client_server():
     worker = Controller('model', JSONInterpreter())
@@ -91,3 +165,91 @@ def test_hub_spoke():
     assert not user_thread.is_alive()
     assert not worker_thread.is_alive()
     assert not hub_thread.is_alive()
+
+@pytest.mark.socket
+def test_async_hub_spoke():
+    hub, hub_pack = create_async_socket_hub(HOST, 0)
+    time.sleep(0.5)
+    port = int(hub.address.rsplit(':', 1)[1])
+    
+    worker, worker_pack = create_async_socket_worker(HOST, port, loop=hub_pack['loop'])
+    threaded_worker = Controller('model', JSONInterpreter())
+    threaded_worker.start()
+    worker_terminate = threading.Event()
+    worker_thread = threading.Thread(target=SocketClient.start_client, args=[HOST,port,threaded_worker,True], kwargs={'terminate':worker_terminate}, daemon=True)
+    worker_thread.start()
+    user, user_pack = create_async_socket_user(HOST, port, loop=hub_pack['loop'])
+    assert not hub_pack['hub_future'].done()
+    assert not worker_pack['worker_future'].done()
+    assert not user_pack['user_future'].done()
+    
+    worker.register(TwoTierQueue(), 'TEST1')
+    threaded_worker.register(TwoTierQueue(), 'TEST2')
+    time.sleep(1)
+    assert user.registry == {'TEST1': [worker.address], 'TEST2': [threaded_worker.address]}
+    
+    for object_id in ('TEST1', 'TEST2'):
+        p = Proxy(TwoTierQueue, object_id)
+        p.controller, p.remote = user, True
+        p.put_nowait('12345')
+        assert p.qsize() == 1
+        assert p.get() == '12345'
+    
+    user.callbacks['request'][f"{HOST}:{port}"](b'[EXIT]')
+    user_pack['user_future'].result(timeout=5)
+    assert f"{HOST}:{port}" not in user.callbacks['request']
+    worker_terminate.set()
+    worker_pack['terminate'].set()
+    hub_pack['terminate'].set()
+    worker_thread.join()
+    worker_pack['worker_future'].result(timeout=5)
+    hub_pack['hub_future'].result(timeout=5)
+    assert not hub.callbacks['request']
+    assert not hub.callbacks['data']
+
+@pytest.mark.socket
+def test_async_hub_stop_with_clients():
+    hub, hub_pack = create_async_socket_hub(HOST, 0)
+    time.sleep(0.5)
+    port = int(hub.address.rsplit(':', 1)[1])
+    worker, worker_pack = create_async_socket_worker(HOST, port, loop=hub_pack['loop'])
+    threaded_user = Controller('view', JSONInterpreter())
+    user_thread = threading.Thread(target=SocketClient.start_client, args=[HOST,port,threaded_user,True], daemon=True)
+    user_thread.start()
+    time.sleep(1)
+    assert len(hub.callbacks['request']) == 1
+    assert len(hub.callbacks['data']) == 1
+    
+    hub_pack['terminate'].set()
+    hub_pack['hub_future'].result(timeout=5)
+    assert not hub.callbacks['request']
+    assert not hub.callbacks['data']
+    worker_pack['worker_future'].result(timeout=5)
+    user_thread.join(timeout=5)
+    assert not user_thread.is_alive()
+
+def test_read_packet_max_size():
+    async def read(data: bytes, max_size: int) -> bytes:
+        reader = asyncio.StreamReader()
+        reader.feed_data(data)
+        reader.feed_eof()
+        return await read_packet(reader, max_size)
+    
+    assert asyncio.run(read(encode_frame(b'x'*16), 16)) == b'x'*16
+    with pytest.raises(ConnectionError):
+        asyncio.run(read(encode_frame(b'x'*17), 16))
+
+@pytest.mark.socket
+def test_async_hub_oversized_frame():
+    hub, hub_pack = create_async_socket_hub(HOST, 0)
+    time.sleep(0.5)
+    port = int(hub.address.rsplit(':', 1)[1])
+    with socket.create_connection((HOST, port), timeout=5) as client:
+        client.sendall(b'{"data": 1}')
+        while client.recv(BYTESIZE):
+            pass
+    
+    hub_pack['terminate'].set()
+    hub_pack['hub_future'].result(timeout=5)
+    assert not hub.callbacks['request']
+    assert not hub.callbacks['data']